@@ -0,0 +1,71 @@
+"""
+bench_log_formatter.py — How many log lines per second can we format?
+
+Formats the same mix of log records with the OLD JsonFormatter (dict +
+json.dumps + datetime per line) and the current one, and prints lines per
+second for each. Run it on the Pi itself to get Pi numbers:
+
+Usage:
+    python3 bench_log_formatter.py            # 200000 lines each
+    python3 bench_log_formatter.py 50000
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.loggingx.event_log import JSON_BACKEND, JsonFormatter
+
+
+class OldJsonFormatter(logging.Formatter):
+    """The formatter as it was before (for comparison only)."""
+    def format(self, record):
+        log_entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": record.levelname,
+            "module": record.name,
+            "message": record.getMessage(),
+        }
+        if hasattr(record, "detail"):
+            log_entry["detail"] = record.detail
+        return json.dumps(log_entry)
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    """A typical mix: mostly plain messages, some with a detail dict."""
+    records = []
+    modules = ["talk_engine", "controller", "usb_monitor", "system_monitor"]
+    for n in range(count):
+        record = logging.LogRecord(modules[n % 4], logging.INFO, __file__, 0,
+                                   f"Key {n % 15 + 1} went red after 4.2 ms", None, None)
+        record.created = 1760850000.0 + n / 1000.0     # ~1000 lines per second of "log time"
+        if n % 10 == 0:
+            record.detail = {"key": n % 15 + 1, "latency_ms": 4.2, "channel": "director"}
+        records.append(record)
+    return records
+
+
+def lines_per_second(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    started = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - started)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    records = make_records(count)
+
+    print("=" * 60)
+    print(f"📝 LOG FORMATTER BENCHMARK ({count} lines, JSON backend: {JSON_BACKEND})")
+    print("=" * 60)
+    old = lines_per_second(OldJsonFormatter(), records)
+    new = lines_per_second(JsonFormatter(), records)
+    print(f"Old JsonFormatter : {old:12,.0f} lines/s")
+    print(f"New JsonFormatter : {new:12,.0f} lines/s   ({new / old:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
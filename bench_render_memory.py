@@ -0,0 +1,206 @@
+"""
+bench_render_memory.py — Does painting keys leak memory?
+
+A station runs for weeks on a 1 GB Pi, repainting keys all day. Every
+update makes view models, format dicts, Pillow images and byte buffers; if
+even a few bytes per update stay behind, the Pi runs out of memory some
+day in the middle of a show.
+
+This drives key updates through the REAL renderer and a real StreamDock293
+device class, on a FakeTransport instead of USB (see ui_renderer/fake_device.py):
+
+    fast path   renderer.update()          → key cache → transport write
+    slow path   renderer._render_channel() → draw file → set_key_image()
+                                             → _to_native_format() → write
+
+After a warm-up (so the key cache is full), tracemalloc watches every
+allocation. Memory in use is sampled at intervals (after a gc), and the
+report shows:
+
+    - retained growth: memory in use at the end minus at the start
+    - steady-state bytes per update (growth over the second half of the run)
+    - the top allocation sites that grew
+
+Usage:
+    python3 bench_render_memory.py                        # 1,000,000 fast-path updates
+    python3 bench_render_memory.py 100000 --slow 5000     # plus 5000 slow-path updates
+    python3 bench_render_memory.py --max-growth-kb 256    # allowed growth per run
+
+Exits with 1 if retained memory grew more than allowed (default 512 KB).
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from SteamDock.Devices.StreamDock293 import StreamDock293
+from src.ui_renderer.fake_device import FakeTransport
+from src.ui_renderer.renderer import MiraBoxRenderer
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+
+DEFAULT_UPDATES = 1_000_000
+DEFAULT_MAX_GROWTH_KB = 512
+DEVICE_INFO = {"vendor_id": 0x5500, "product_id": 0x1001, "path": "/dev/hidraw-bench"}
+LABELS = ["Director", "Producer", "Camera 1", "Camera 2", "Audio"]
+
+
+@dataclass
+class MemoryReport:
+    """
+    Memory use over one run.
+
+    Fields:
+        name: Which path was driven ("fast" / "slow")
+        updates: Key updates measured (after the warm-up)
+        seconds: How long they took
+        baseline_bytes: Memory in use when measuring started
+        final_bytes: Memory in use at the end (after a gc)
+        peak_bytes: Most memory in use at any moment
+        samples: (updates so far, memory in use) at every interval
+        top_sites: The allocation sites that grew most, as text
+    """
+    name: str
+    updates: int
+    seconds: float
+    baseline_bytes: int
+    final_bytes: int
+    peak_bytes: int
+    samples: list[tuple[int, int]] = field(default_factory=list)
+    top_sites: list[str] = field(default_factory=list)
+
+    @property
+    def growth_bytes(self) -> int:
+        return self.final_bytes - self.baseline_bytes
+
+    @property
+    def bytes_per_update(self) -> float:
+        """Growth per update over the second half of the run (the warm-up effects are over by then)."""
+        if len(self.samples) < 2:
+            return self.growth_bytes / self.updates if self.updates else 0.0
+        (first_n, first_bytes), (last_n, last_bytes) = self.samples[len(self.samples) // 2], self.samples[-1]
+        if last_n == first_n:
+            (first_n, first_bytes) = self.samples[0]
+        return (last_bytes - first_bytes) / (last_n - first_n) if last_n > first_n else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"{self.name}: {self.updates} updates in {self.seconds:.1f} s "
+            f"({self.updates / self.seconds:,.0f}/s under tracemalloc)" if self.seconds else f"{self.name}: no updates",
+            f"  retained growth   {self.growth_bytes / 1024:>10.1f} KB",
+            f"  bytes per update  {self.bytes_per_update:>10.3f}   (steady state)",
+            f"  peak above start  {(self.peak_bytes - self.baseline_bytes) / 1024:>10.1f} KB",
+        ]
+        if self.top_sites:
+            lines.append("  top growing allocation sites:")
+            lines.extend(f"    {site}" for site in self.top_sites)
+        return "\n".join(lines)
+
+
+def make_renderer(cache_dir: str | Path) -> MiraBoxRenderer:
+    """A renderer on a StreamDock293 that writes to a FakeTransport."""
+    deck = StreamDock293(FakeTransport(keep_writes=64), DEVICE_INFO)
+    renderer = MiraBoxRenderer(device=deck)
+    renderer.key_cache.cache_dir = Path(cache_dir)
+    return renderer
+
+
+def channel_for(n: int) -> ChannelView:
+    """Update number n: keys 1-15 in turn, each flipping between grey and red."""
+    key = n % 15 + 1
+    color = ButtonColor.RED if (n // 15) % 2 else ButtonColor.GREY
+    return ChannelView(key, LABELS[key % len(LABELS)], color, f"ch-{key}")
+
+
+def measure(name: str, paint: Callable[[int], None], updates: int,
+            interval: int | None = None, warmup: int = 1000, top: int = 10) -> MemoryReport:
+    """Call paint(n) `updates` times under tracemalloc, sampling memory every `interval` updates."""
+    interval = interval or max(1, updates // 20)
+    for n in range(warmup):
+        paint(n)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.take_snapshot()
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        samples = [(0, baseline_bytes)]
+        started = time.perf_counter()
+        for n in range(updates):
+            paint(warmup + n)
+            if (n + 1) % interval == 0:
+                gc.collect()
+                samples.append((n + 1, tracemalloc.get_traced_memory()[0]))
+        seconds = time.perf_counter() - started
+
+        gc.collect()
+        final_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    not_ours = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    growth = snapshot.filter_traces(not_ours).compare_to(baseline.filter_traces(not_ours), "lineno")
+    top_sites = [str(stat) for stat in growth if stat.size_diff > 0][:top]
+    return MemoryReport(name, updates, seconds, baseline_bytes, final_bytes, peak_bytes, samples, top_sites)
+
+
+def run_fast(updates: int, cache_dir: str | Path, **options) -> MemoryReport:
+    """Key updates the way the controller sends them: renderer.update() → cached image → write."""
+    renderer = make_renderer(cache_dir)
+    try:
+        return measure("fast", lambda n: renderer.update(
+            MiraBoxViewModel(is_online=True, channels=[channel_for(n)])), updates, **options)
+    finally:
+        renderer.close()
+
+
+def run_slow(updates: int, cache_dir: str | Path, **options) -> MemoryReport:
+    """Key updates through the drawing + library conversion path."""
+    renderer = make_renderer(cache_dir)
+    cwd = os.getcwd()
+    os.chdir(cache_dir)              # set_key_image() writes a Temporary.jpg into the current directory
+    try:
+        return measure("slow", lambda n: renderer._render_channel(channel_for(n)),
+                       updates, warmup=min(100, updates), **options)
+    finally:
+        os.chdir(cwd)
+        renderer.close()
+
+
+def main():
+    args = sys.argv[1:]
+    slow = 0
+    max_growth_kb = DEFAULT_MAX_GROWTH_KB
+    if "--slow" in args:
+        index = args.index("--slow")
+        slow = int(args[index + 1])
+        del args[index:index + 2]
+    if "--max-growth-kb" in args:
+        index = args.index("--max-growth-kb")
+        max_growth_kb = float(args[index + 1])
+        del args[index:index + 2]
+    updates = int(args[0]) if args else DEFAULT_UPDATES
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        reports = [run_fast(updates, cache_dir)]
+        if slow:
+            reports.append(run_slow(slow, cache_dir))
+
+    failed = False
+    for report in reports:
+        print(report.format())
+        if report.growth_bytes > max_growth_kb * 1024:
+            print(f"FAIL: {report.name} path kept {report.growth_bytes / 1024:.1f} KB "
+                  f"(allowed: {max_growth_kb} KB)")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,15 +19,20 @@ How to use:
         print(f"Staying in safe mode because: {outcome.reason}")
 """
 
-import json
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 from src.shared.enums import AgentState
 from src.shared.errors import IdentityError
 from src.bootstrap.identity import DeviceIdentity, load_identity
-from src.bootstrap.preflight import PreflightSummary, run_all_preflight_checks
+from src.bootstrap.preflight import PreflightSummary, is_critical_failure, run_all_preflight_checks
+from src.bootstrap.preflight_cache import PreflightCache, hardware_fingerprint
+from src.bootstrap.preflight_history import PreflightHistory
 from src.loggingx.event_log import get_logger
+from src.loggingx.boot_profiler import get_boot_profiler
 
 logger = get_logger("bootstrap")
 
@@ -47,12 +52,15 @@ class BootstrapOutcome:
         identity: The device identity (or None if identity loading failed)
         preflight: The full preflight summary (or None if it never ran)
         reason: Human-readable explanation of the outcome
+        preflight_from_cache: True if the preflight result came from the
+                              warm-restart cache (a fresh run is verifying it)
     """
     success: bool
     state: AgentState
     identity: DeviceIdentity | None
     preflight: PreflightSummary | None
     reason: str
+    preflight_from_cache: bool = False
 
 
 # ──────────────────────────────────────────────────
@@ -63,17 +71,25 @@ def run_bootstrap(
     identity_path: str | Path = "/etc/ixg-agent/identity.json",
     config_cache_dir: str | Path = "/var/cache/ixg-agent",
     preflight_save_path: str | Path | None = None,
+    preflight_cache_ttl: float | None = None,
+    on_preflight_verified: Callable[[PreflightSummary], None] | None = None,
 ) -> BootstrapOutcome:
     """
     Run the full bootstrap sequence:
         1. Load identity ("who am I?")
-        2. Run preflight checks ("is my equipment ready?")
+        2. Run preflight checks ("is my equipment ready?") for this station's profile
         3. Decide: proceed or stay in safe mode
 
     Args:
         identity_path: Where the identity JSON file is on disk.
         config_cache_dir: Where cached config files are stored.
-        preflight_save_path: Optional path to save the preflight summary for later comparison.
+        preflight_save_path: Optional preflight history file (JSON Lines) to append the
+                             summary to, for later comparison between boots.
+        preflight_cache_ttl: If set, trust a cached preflight result up to this many
+                             seconds old when the hardware fingerprint matches
+                             (warm restart). None disables the cache.
+        on_preflight_verified: Called from a background thread with the fresh summary
+                               after a cached result was used.
 
     Returns:
         A BootstrapOutcome telling the rest of the agent what to do.
@@ -82,9 +98,11 @@ def run_bootstrap(
 
     # ── Step 1: Load Identity ──────────────────────
     logger.info("Step 1: Loading device identity...")
+    profiler = get_boot_profiler()
     identity = None
     try:
-        identity = load_identity(identity_path)
+        with profiler.phase("bootstrap.identity"):
+            identity = load_identity(identity_path)
         logger.info(f"Identity OK: device_id={identity.device_id}")
     except IdentityError as e:
         # Identity is MISSING or BROKEN — this is a hard failure.
@@ -102,20 +120,42 @@ def run_bootstrap(
 
     # ── Step 2: Run Preflight Checks ───────────────
     logger.info("Step 2: Running preflight checks...")
-    preflight_summary = run_all_preflight_checks(config_cache_dir=config_cache_dir)
+    preflight_started = time.monotonic()
+    preflight_summary = None
+    from_cache = False
+    cache = PreflightCache(config_cache_dir, preflight_cache_ttl) if preflight_cache_ttl else None
+
+    if cache:
+        fingerprint = hardware_fingerprint()
+        preflight_summary = cache.load(fingerprint, identity.profile)
+        if preflight_summary:
+            from_cache = True
+            logger.info("Preflight: using cached result (hardware unchanged), verifying in background")
+            _verify_cached_preflight(cache, preflight_summary, config_cache_dir,
+                                     identity.profile, on_preflight_verified, preflight_save_path)
+
+    if preflight_summary is None:
+        # Only the checks that apply to this station's profile are run
+        preflight_summary = run_all_preflight_checks(
+            config_cache_dir=config_cache_dir,
+            profile=identity.profile,
+        )
+        # Only remember good results — a failure must always be re-checked
+        if cache and not preflight_summary.has_critical_failure:
+            cache.save(preflight_summary, fingerprint, identity.profile)
+
+    profiler.record("bootstrap.preflight", preflight_started, time.monotonic())
 
-    # Save the preflight summary to disk (for incident comparison later)
-    if preflight_save_path:
+    # Save the preflight summary to disk (for incident comparison later).
+    # A cached result is not news: the background verification saves the fresh one.
+    if preflight_save_path and not from_cache:
         _save_preflight_summary(preflight_summary, preflight_save_path)
 
     # ── Step 3: Decide ─────────────────────────────
     if preflight_summary.has_critical_failure:
-        # At least one critical check failed (e.g. no mic).
+        # At least one critical check failed (e.g. no mic), or was skipped.
         # We stay in safe mode — can listen but cannot transmit.
-        failed_critical = [
-            r for r in preflight_summary.results
-            if r.status.value == "FAIL" and r.severity.value == "CRITICAL"
-        ]
+        failed_critical = [r for r in preflight_summary.results if is_critical_failure(r)]
         failed_names = [r.check_name for r in failed_critical]
         reason = f"Critical preflight failures: {failed_names}"
         logger.error(reason)
@@ -126,6 +166,7 @@ def run_bootstrap(
             identity=identity,
             preflight=preflight_summary,
             reason=reason,
+            preflight_from_cache=from_cache,
         )
 
     # ── All good! ──────────────────────────────────
@@ -137,40 +178,66 @@ def run_bootstrap(
         identity=identity,
         preflight=preflight_summary,
         reason=reason,
+        preflight_from_cache=from_cache,
     )
 
 
+def _verify_cached_preflight(
+    cache: PreflightCache,
+    cached: PreflightSummary,
+    config_cache_dir: str | Path,
+    profile: str,
+    on_verified: Callable[[PreflightSummary], None] | None,
+    save_path: str | Path | None = None,
+) -> threading.Thread:
+    """
+    Re-run the real checks in the background after trusting a cached result.
+    Refreshes (or drops) the cache, saves the fresh result to the history
+    and reports what changed.
+    """
+    def verify():
+        try:
+            fresh = run_all_preflight_checks(config_cache_dir=config_cache_dir, profile=profile)
+            if fresh.has_critical_failure:
+                cache.invalidate()
+            else:
+                cache.save(fresh, hardware_fingerprint(), profile)
+            if save_path:
+                _save_preflight_summary(fresh, save_path)
+
+            before = {r.check_name: r.status for r in cached.results}
+            changed = [r.check_name for r in fresh.results if before.get(r.check_name) != r.status]
+            if changed:
+                logger.warning(f"Background preflight differs from cached result: {changed}")
+            else:
+                logger.info("Background preflight confirmed the cached result")
+
+            if on_verified:
+                on_verified(fresh)
+        except Exception as e:
+            logger.error(f"Background preflight verification failed: {e}")
+
+    thread = threading.Thread(target=verify, name="PreflightVerifyThread", daemon=True)
+    thread.start()
+    return thread
+
+
 def _save_preflight_summary(summary: PreflightSummary, save_path: str | Path) -> None:
     """
-    Save the preflight summary to a JSON file on disk.
+    Append the preflight summary to the history file on disk.
 
     This is useful for support teams: they can compare today's preflight
-    with yesterday's to see what changed.
+    with yesterday's to see what changed (see preflight_history.py).
+    One append per boot, so one fsync per boot — that is the intended cost.
     """
-    path = Path(save_path)
     try:
-        # Make sure the parent directory exists
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Convert the summary into a dictionary we can save as JSON
-        data = {
-            "timestamp": summary.timestamp,
-            "has_critical_failure": summary.has_critical_failure,
-            "results": [
-                {
-                    "check_name": r.check_name,
-                    "severity": r.severity.value,
-                    "status": r.status.value,
-                    "detail": r.detail,
-                }
-                for r in summary.results
-            ],
-        }
-
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
-
-        logger.info(f"Preflight summary saved to {path}")
+        history = PreflightHistory(save_path)
+        try:
+            boot_id = history.append(summary)
+        finally:
+            history.close()
+
+        logger.info(f"Preflight summary saved to {save_path} (boot_id={boot_id})")
     except Exception as e:
         # Saving is best-effort — don't crash just because we can't save logs
         logger.warning(f"Could not save preflight summary: {e}")
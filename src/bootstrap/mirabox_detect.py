@@ -0,0 +1,191 @@
+"""
+mirabox_detect.py — Finds the MiraBox (StreamDock) by its USB IDs.
+
+Every USB device has a Vendor ID (who made it) and a Product ID (which
+model it is). The SteamDock library keeps the list of known models in
+`SteamDock.ProductIDs.g_products`:
+
+    (0x5500, 0x1001, StreamDock293)
+    (0x6603, 0x1002, StreamDockN3)
+    ...
+
+Instead of asking the HID library to enumerate every device (slow, and
+needs the device to be free), we read what the kernel already knows from
+sysfs, once:
+
+    /sys/class/hidraw/hidraw3/device
+        -> .../1-1.3/1-1.3:1.0/0003:5500:1001.0004
+                      ^^^^^^^^^  ^^^^ ^^^^ ^^^^
+                      USB        bus  VID  PID
+                      interface
+
+Each hidraw node is looked up in a {(vid, pid): model} dictionary, so the
+check is exact: a keyboard no longer counts as a MiraBox.
+
+The last match is remembered, so the renderer can connect straight to it
+without enumerating again.
+
+How to use:
+    match = find_mirabox()
+    if match:
+        print(match.model_name, match.hidraw)     # "StreamDock293 /dev/hidraw3"
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("mirabox_detect")
+
+
+@dataclass
+class MiraBoxMatch:
+    """
+    A MiraBox found in sysfs.
+
+    Fields:
+        model: The SteamDock device class, e.g. StreamDock293
+        vendor_id / product_id: The USB IDs it was matched by
+        hidraw: The device node, e.g. "/dev/hidraw3"
+        usb_interface: The USB interface name, e.g. "1-1.3:1.0". This is the
+                       same path hidapi (libusb backend) reports for the device.
+    """
+    model: type
+    vendor_id: int
+    product_id: int
+    hidraw: str
+    usb_interface: str
+
+    @property
+    def model_name(self) -> str:
+        return self.model.__name__
+
+    def to_dict(self) -> dict:
+        """The plain-data part (the model is found again from the IDs)."""
+        return {
+            "vendor_id": self.vendor_id,
+            "product_id": self.product_id,
+            "hidraw": self.hidraw,
+            "usb_interface": self.usb_interface,
+        }
+
+    def device_info(self) -> dict:
+        """The dict a SteamDock device class is constructed with."""
+        return {
+            "path": self.usb_interface,
+            "vendor_id": self.vendor_id,
+            "product_id": self.product_id,
+        }
+
+
+# ──────────────────────────────────────────────────
+# Known models, indexed by (vendor_id, product_id)
+# ──────────────────────────────────────────────────
+
+_product_index: dict[tuple[int, int], type] | None = None
+
+
+def _get_product_index() -> dict[tuple[int, int], type]:
+    """Build the {(vid, pid): model} lookup from g_products once."""
+    global _product_index
+    if _product_index is None:
+        # (OSError: the library is there but its native HID library is not installed)
+        try:
+            from SteamDock.ProductIDs import g_products
+        except (ImportError, OSError) as e:
+            logger.warning(f"SteamDock product table not available: {e}")
+            g_products = []
+        index = {}
+        for vendor_id, product_id, model in g_products:
+            index.setdefault((vendor_id, product_id), model)
+        _product_index = index
+    return _product_index
+
+
+# ──────────────────────────────────────────────────
+# The sysfs scan
+# ──────────────────────────────────────────────────
+
+def _hid_ids(hid_device: Path) -> tuple[int, int] | None:
+    """
+    Read (vendor_id, product_id) of a HID device directory.
+
+    The directory name is "BUS:VID:PID.INSTANCE" (e.g. "0003:5500:1001.0004");
+    its uevent file says the same as "HID_ID=0003:00005500:00001001".
+    """
+    try:
+        for line in (hid_device / "uevent").read_text().splitlines():
+            if line.startswith("HID_ID="):
+                _bus, vendor, product = line.split("=", 1)[1].split(":")
+                return int(vendor, 16), int(product, 16)
+    except (OSError, ValueError):
+        pass
+
+    parts = hid_device.name.split(".")[0].split(":")
+    if len(parts) == 3:
+        try:
+            return int(parts[1], 16), int(parts[2], 16)
+        except ValueError:
+            pass
+    return None
+
+
+def _hidraw_sort_key(name: str) -> tuple[int, str]:
+    """hidraw2 before hidraw10 (a plain string sort gets this wrong)."""
+    digits = name[len("hidraw"):]
+    return (int(digits) if digits.isdigit() else 1 << 30, name)
+
+
+_last_match: MiraBoxMatch | None = None
+
+
+def find_mirabox(sys_root: str | Path = "/sys") -> MiraBoxMatch | None:
+    """
+    Scan every /sys/class/hidraw node and return the first known StreamDock
+    model (interface 0, the one the SteamDock library talks to), or None.
+
+    Only reads sysfs, so it costs a few milliseconds and never opens the device.
+    """
+    global _last_match
+    index = _get_product_index()
+    hidraw_dir = Path(sys_root) / "class" / "hidraw"
+    try:
+        names = sorted(os.listdir(hidraw_dir), key=_hidraw_sort_key)
+    except OSError:
+        names = []
+
+    match = None
+    for name in names:
+        hid_device = Path(os.path.realpath(hidraw_dir / name / "device"))
+        ids = _hid_ids(hid_device)
+        if ids is None or ids not in index:
+            continue
+
+        usb_interface = hid_device.parent.name      # e.g. "1-1.3:1.0"
+        if not usb_interface.endswith(".0"):
+            continue  # Same rule as the transport: only interface 0
+
+        match = MiraBoxMatch(index[ids], ids[0], ids[1], f"/dev/{name}", usb_interface)
+        break
+
+    _last_match = match
+    return match
+
+
+def mirabox_from_dict(data: dict) -> MiraBoxMatch | None:
+    """Rebuild a match saved with to_dict() (None if the model is unknown)."""
+    try:
+        ids = (int(data["vendor_id"]), int(data["product_id"]))
+        model = _get_product_index().get(ids)
+        if model is None:
+            return None
+        return MiraBoxMatch(model, ids[0], ids[1], str(data["hidraw"]), str(data["usb_interface"]))
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def last_mirabox_match() -> MiraBoxMatch | None:
+    """The result of the most recent find_mirabox() (None if never run or not found)."""
+    return _last_match
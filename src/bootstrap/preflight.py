@@ -15,19 +15,41 @@ Each check has a severity:
     WARNING  = if this fails, we note it but keep going
 
 At the end, we collect all results into a summary.
+
+Speed matters here: the Pi cannot go live until preflight is done. So:
+    - We read the list of sound cards ONCE per run (the "ALSA inventory"),
+      straight from /proc/asound. We only fall back to `arecord -l` /
+      `aplay -l` if /proc is not available.
+    - All checks then run at the same time (in threads), each with its own
+      timeout, and the whole run has an overall deadline.
+    - Every result records how long its check took (duration_ms).
+
+Which checks run is decided by a registry (see PreflightRegistry): each
+check declares its name, severity, dependencies, timeout and the station
+profiles it applies to.
 """
 
+import re
 import subprocess
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
 from src.shared.enums import CheckSeverity, CheckStatus
+from src.bootstrap.mirabox_detect import find_mirabox
 from src.loggingx.event_log import get_logger
+from src.loggingx.boot_profiler import get_boot_profiler
 
 logger = get_logger("preflight")
 
+# Default time limits (seconds)
+DEFAULT_CHECK_TIMEOUT = 5.0   # one check
+DEFAULT_DEADLINE = 8.0        # the whole preflight run
+
 
 # ──────────────────────────────────────────────────
 # Data containers — hold results for each check
@@ -50,6 +72,7 @@ class PreflightResult:
     severity: CheckSeverity     # CRITICAL or WARNING
     status: CheckStatus         # PASS, FAIL, or SKIP
     detail: str                 # Human-readable explanation
+    duration_ms: float = 0.0    # How long the check took to run
 
 
 @dataclass
@@ -59,53 +82,246 @@ class PreflightSummary:
 
     Fields:
         results: list of every individual check result
-        has_critical_failure: True if ANY critical check failed
+        has_critical_failure: True if ANY critical check failed (or was skipped,
+                              see is_critical_failure)
         timestamp: when the checks were run
+        duration_ms: how long the whole preflight run took
     """
     results: list[PreflightResult] = field(default_factory=list)
     has_critical_failure: bool = False
     timestamp: str = ""
+    duration_ms: float = 0.0
+
+
+def is_critical_failure(result: PreflightResult) -> bool:
+    """
+    A CRITICAL check that did not pass. A skipped one counts too: it is
+    skipped because a check it depends on failed (maybe only a WARNING
+    one), so we don't know the critical hardware is there.
+    """
+    return (result.severity == CheckSeverity.CRITICAL
+            and result.status in (CheckStatus.FAIL, CheckStatus.SKIP))
+
+
+def summary_to_dict(summary: PreflightSummary) -> dict:
+    """Turn a PreflightSummary into plain JSON-friendly data."""
+    return {
+        "timestamp": summary.timestamp,
+        "has_critical_failure": summary.has_critical_failure,
+        "duration_ms": round(summary.duration_ms, 2),
+        "results": [
+            {
+                "check_name": r.check_name,
+                "severity": r.severity.value,
+                "status": r.status.value,
+                "detail": r.detail,
+                "duration_ms": round(r.duration_ms, 2),
+            }
+            for r in summary.results
+        ],
+    }
+
+
+def summary_from_dict(data: dict) -> PreflightSummary:
+    """Rebuild a PreflightSummary from summary_to_dict() output."""
+    return PreflightSummary(
+        results=[
+            PreflightResult(
+                check_name=r["check_name"],
+                severity=CheckSeverity(r["severity"]),
+                status=CheckStatus(r["status"]),
+                detail=r["detail"],
+                duration_ms=float(r.get("duration_ms", 0.0)),
+            )
+            for r in data["results"]
+        ],
+        has_critical_failure=bool(data["has_critical_failure"]),
+        timestamp=data.get("timestamp", ""),
+        duration_ms=float(data.get("duration_ms", 0.0)),
+    )
 
 
 # ──────────────────────────────────────────────────
-# Individual check functions
-# Each function returns ONE PreflightResult
+# ALSA inventory — the list of sound cards, read ONCE per run
 # ──────────────────────────────────────────────────
 
-def check_audio_capture_device() -> PreflightResult:
+@dataclass
+class AlsaCard:
     """
-    Check: Is the Headset Microphone plugged in?
+    One sound card as the kernel sees it.
 
-    We look for the specific USB device string "KT USB Audio".
-    (Found at 'card 4' in aplay output).
+    Example (/proc/asound/cards):
+         4 [Audio          ]: USB-Audio - KT USB Audio
+                              KTMicro KT USB Audio at usb-0000:01:00.0-1.3, full speed
+    becomes:
+        AlsaCard(index=4, card_id="Audio", name="KT USB Audio", long_name="KTMicro ...")
     """
-    check_name = "headset_mic"
-    severity = CheckSeverity.CRITICAL
+    index: int
+    card_id: str
+    name: str
+    long_name: str = ""
+    has_capture: bool = False
+    has_playback: bool = False
+
+    def matches(self, text: str) -> bool:
+        return text in self.name or text in self.long_name or text in self.card_id
 
+
+@dataclass
+class AlsaInventory:
+    """
+    Every sound card on the box, plus where the list came from.
+
+    Fields:
+        cards: The cards we found
+        source: "proc" (read /proc/asound), "subprocess" (arecord/aplay fallback)
+                or "unavailable" (neither worked)
+        error: Why the inventory is empty/partial, if something went wrong
+    """
+    cards: list[AlsaCard] = field(default_factory=list)
+    source: str = "proc"
+    error: str | None = None
+
+    def has_capture(self, text: str) -> bool:
+        """Is there a capture-capable card whose name contains `text`?"""
+        return any(c.has_capture and c.matches(text) for c in self.cards)
+
+    def has_playback(self, text: str) -> bool:
+        """Is there a playback-capable card whose name contains `text`?"""
+        return any(c.has_playback and c.matches(text) for c in self.cards)
+
+
+# " 4 [Audio          ]: USB-Audio - KT USB Audio"
+_PROC_CARD_LINE = re.compile(r"^\s*(\d+)\s+\[([^\]]*)\]:\s*(.*?)\s+-\s+(.*)$")
+# "card 4: Audio [KT USB Audio], device 0: USB Audio [USB Audio]"
+_APLAY_CARD_LINE = re.compile(r"^card\s+(\d+):\s*(\S+)\s+\[([^\]]*)\]")
+
+
+def _read_proc_inventory(proc_root: Path) -> AlsaInventory:
+    """Parse /proc/asound/cards and /proc/asound/pcm (no subprocess)."""
+    cards: dict[int, AlsaCard] = {}
+    last_card = None
+    for line in (proc_root / "cards").read_text().splitlines():
+        match = _PROC_CARD_LINE.match(line)
+        if match:
+            index = int(match.group(1))
+            last_card = AlsaCard(index, match.group(2).strip(), match.group(4).strip())
+            cards[index] = last_card
+        elif last_card is not None and line.strip():
+            # The indented line right after a card is its long name
+            last_card.long_name = line.strip()
+            last_card = None
+
+    # "04-00: USB Audio : USB Audio : playback 1 : capture 1"
+    pcm_path = proc_root / "pcm"
+    if pcm_path.exists():
+        for line in pcm_path.read_text().splitlines():
+            card_part, _, rest = line.partition("-")
+            if not card_part.strip().isdigit() or int(card_part) not in cards:
+                continue
+            card = cards[int(card_part)]
+            card.has_capture = card.has_capture or "capture" in rest
+            card.has_playback = card.has_playback or "playback" in rest
+
+    return AlsaInventory(cards=list(cards.values()), source="proc")
+
+
+def _list_cards_with(command: str, timeout: float) -> tuple[str, str | None]:
+    """Run `<command> -l` and return (stdout, error)."""
     try:
-        # Run "arecord -l" to list capture devices
         result = subprocess.run(
-            ["arecord", "-l"],
+            [command, "-l"],
             capture_output=True,
             text=True,
-            timeout=5,
+            timeout=timeout,
         )
-        # Look for our specific headset device name
-        if "KT USB Audio" in result.stdout:
-            return PreflightResult(check_name, severity, CheckStatus.PASS,
-                                   "Headset microphone found (KT USB Audio)")
-        else:
-            return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                                   "Headset microphone NOT found (KT USB Audio missing)")
+        return result.stdout, None
     except FileNotFoundError:
-        return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               "arecord command not found")
+        return "", f"{command} command not found"
     except Exception as e:
+        return "", f"{command} failed: {e}"
+
+
+def _read_subprocess_inventory(timeout: float) -> AlsaInventory:
+    """Fallback: ask `arecord -l` and `aplay -l` (slow, only used without /proc)."""
+    # Run both at the same time so a wedged ALSA stack costs one timeout, not two
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        capture_out, playback_out = pool.map(
+            lambda command: _list_cards_with(command, timeout), ["arecord", "aplay"]
+        )
+
+    cards: dict[int, AlsaCard] = {}
+    errors = []
+    for (stdout, error), attr in ((capture_out, "has_capture"), (playback_out, "has_playback")):
+        if error:
+            errors.append(error)
+        for line in stdout.splitlines():
+            match = _APLAY_CARD_LINE.match(line)
+            if match:
+                index = int(match.group(1))
+                card = cards.setdefault(index, AlsaCard(index, match.group(2), match.group(3)))
+                setattr(card, attr, True)
+
+    return AlsaInventory(
+        cards=list(cards.values()),
+        source="subprocess",
+        error="; ".join(errors) or None,
+    )
+
+
+def build_alsa_inventory(
+    proc_root: str | Path = "/proc/asound",
+    timeout: float = DEFAULT_CHECK_TIMEOUT,
+) -> AlsaInventory:
+    """
+    List every sound card on the box.
+
+    Reads /proc/asound directly (microseconds). Only if that is missing do
+    we fall back to running arecord/aplay.
+
+    Args:
+        proc_root: Where the ALSA proc files live (tests point this at tmp_path).
+        timeout: Per-command timeout for the subprocess fallback.
+    """
+    proc_root = Path(proc_root)
+    try:
+        return _read_proc_inventory(proc_root)
+    except OSError as e:
+        logger.warning(f"Cannot read {proc_root} ({e}), falling back to arecord/aplay")
+
+    inventory = _read_subprocess_inventory(timeout)
+    if not inventory.cards and inventory.error:
+        inventory.source = "unavailable"
+    return inventory
+
+
+# ──────────────────────────────────────────────────
+# Individual check functions
+# Each function returns ONE PreflightResult
+# ──────────────────────────────────────────────────
+
+def check_audio_capture_device(inventory: AlsaInventory | None = None) -> PreflightResult:
+    """
+    Check: Is the Headset Microphone plugged in?
+
+    We look for the specific USB device string "KT USB Audio".
+    (Found at 'card 4' in aplay output).
+    """
+    check_name = "headset_mic"
+    severity = CheckSeverity.CRITICAL
+    inventory = inventory or build_alsa_inventory()
+
+    if inventory.has_capture("KT USB Audio"):
+        return PreflightResult(check_name, severity, CheckStatus.PASS,
+                               "Headset microphone found (KT USB Audio)")
+    if inventory.source == "unavailable":
         return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               f"Error checking headset mic: {e}")
+                               f"Error checking headset mic: {inventory.error}")
+    return PreflightResult(check_name, severity, CheckStatus.FAIL,
+                           "Headset microphone NOT found (KT USB Audio missing)")
 
 
-def check_audio_playback_device() -> PreflightResult:
+def check_audio_playback_device(inventory: AlsaInventory | None = None) -> PreflightResult:
     """
     Check: Are the Headset Headphones plugged in?
 
@@ -114,52 +330,41 @@ def check_audio_playback_device() -> PreflightResult:
     """
     check_name = "headset_speakers"
     severity = CheckSeverity.CRITICAL
+    inventory = inventory or build_alsa_inventory()
 
-    try:
-        # Run "aplay -l" to list playback devices
-        result = subprocess.run(
-            ["aplay", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if "KT USB Audio" in result.stdout:
-            return PreflightResult(check_name, severity, CheckStatus.PASS,
-                                   "Headset speakers found (KT USB Audio)")
-        else:
-            return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                                   "Headset speakers NOT found (KT USB Audio missing)")
-    except FileNotFoundError:
-        return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               "aplay command not found")
-    except Exception as e:
+    if inventory.has_playback("KT USB Audio"):
+        return PreflightResult(check_name, severity, CheckStatus.PASS,
+                               "Headset speakers found (KT USB Audio)")
+    if inventory.source == "unavailable":
         return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               f"Error checking headset speakers: {e}")
+                               f"Error checking headset speakers: {inventory.error}")
+    return PreflightResult(check_name, severity, CheckStatus.FAIL,
+                           "Headset speakers NOT found (KT USB Audio missing)")
 
 
-def check_mirabox_reachable() -> PreflightResult:
+def check_mirabox_reachable(sys_root: str | Path = "/sys") -> PreflightResult:
     """
     Check: Is the MiraBox control surface reachable?
 
-    For now we check generic USB HID devices, but in production
-    we would look for a specific Vendor ID/Product ID.
+    We scan /sys/class/hidraw once and match each device's Vendor ID /
+    Product ID against the known StreamDock models (see mirabox_detect.py).
+    The match is remembered so the renderer can connect without enumerating.
     """
     check_name = "mirabox_reachable"
     severity = CheckSeverity.CRITICAL
 
-    # Placeholder: check if any HID devices exist
-    hid_paths = [f"/dev/hidraw{i}" for i in range(10)]
-    found = any(os.path.exists(p) for p in hid_paths)
+    match = find_mirabox(sys_root)
 
-    if found:
+    if match:
         return PreflightResult(check_name, severity, CheckStatus.PASS,
-                               "Control surface found (USB HID detected)")
+                               f"Control surface found: {match.model_name} "
+                               f"({match.vendor_id:04x}:{match.product_id:04x}) at {match.hidraw}")
     else:
         return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               "No control surface found (no /dev/hidraw detected)")
+                               "No control surface found (no hidraw device matches a known StreamDock VID/PID)")
 
 
-def check_phone_audio() -> PreflightResult:
+def check_phone_audio(inventory: AlsaInventory | None = None) -> PreflightResult:
     """
     Check: Is the Phone Audio line connected?
 
@@ -167,23 +372,16 @@ def check_phone_audio() -> PreflightResult:
     """
     check_name = "phone_audio"
     severity = CheckSeverity.WARNING
+    inventory = inventory or build_alsa_inventory()
 
-    try:
-        result = subprocess.run(
-            ["arecord", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if "ICUSBAUDIO7D" in result.stdout:
-             return PreflightResult(check_name, severity, CheckStatus.PASS,
-                                   "Phone audio line found (ICUSBAUDIO7D)")
-        else:
-            return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                                   "Phone audio line NOT found (ICUSBAUDIO7D missing)")
-    except Exception as e:
+    if inventory.has_capture("ICUSBAUDIO7D"):
+        return PreflightResult(check_name, severity, CheckStatus.PASS,
+                               "Phone audio line found (ICUSBAUDIO7D)")
+    if inventory.source == "unavailable":
         return PreflightResult(check_name, severity, CheckStatus.FAIL,
-                               f"Error checking phone audio: {e}")
+                               f"Error checking phone audio: {inventory.error}")
+    return PreflightResult(check_name, severity, CheckStatus.FAIL,
+                           "Phone audio line NOT found (ICUSBAUDIO7D missing)")
 
 
 def check_clock_sync() -> PreflightResult:
@@ -232,48 +430,322 @@ def check_config_cache_dir(config_cache_dir: str | Path = "/var/cache/ixg-agent"
                            f"Config cache directory OK: {cache_path}")
 
 
+# ──────────────────────────────────────────────────
+# Check registry — which checks exist, and how they relate
+# ──────────────────────────────────────────────────
+
+@dataclass
+class PreflightContext:
+    """
+    Everything a check may need, built once per preflight run.
+
+    Fields:
+        config_cache_dir: The agent's cache directory
+        inventory: The shared ALSA sound card list
+        profile: The station profile from DeviceIdentity (None = unknown)
+    """
+    config_cache_dir: Path
+    inventory: AlsaInventory
+    profile: str | None = None
+
+
+@dataclass
+class PreflightCheck:
+    """
+    One registered check.
+
+    Fields:
+        name: Short name like "headset_mic" (also the result's check_name)
+        severity: CRITICAL or WARNING
+        run: Function that takes a PreflightContext and returns a PreflightResult
+        depends_on: Names of checks that must PASS first. If one of them
+                    fails (or is skipped), this check is SKIPped.
+        timeout: Max seconds this check may take
+        profiles: Station profiles this check applies to (None = all profiles)
+        triggers: udev subsystems whose events can change this check's result
+                  (e.g. {"sound"}). Used to re-run only the affected checks
+                  while the agent is running. Empty = boot-time only.
+    """
+    name: str
+    severity: CheckSeverity
+    run: Callable[[PreflightContext], PreflightResult]
+    depends_on: tuple[str, ...] = ()
+    timeout: float = DEFAULT_CHECK_TIMEOUT
+    profiles: frozenset[str] | None = None
+    triggers: frozenset[str] = frozenset()
+
+    def applies_to(self, profile: str | None) -> bool:
+        return self.profiles is None or profile in self.profiles
+
+
+class PreflightRegistry:
+    """
+    The list of known checks. New station profiles (more phone lines, a
+    second deck) register their own checks instead of editing a list.
+
+    How to use:
+        registry = PreflightRegistry()
+
+        @registry.check("second_deck", CheckSeverity.CRITICAL,
+                        depends_on=("mirabox_reachable",),
+                        profiles={"dual-deck-v1"})
+        def check_second_deck(ctx: PreflightContext) -> PreflightResult:
+            ...
+    """
+    def __init__(self):
+        self._checks: dict[str, PreflightCheck] = {}
+
+    def register(self, check: PreflightCheck) -> PreflightCheck:
+        """Add a check. Raises ValueError if the name is already taken."""
+        if check.name in self._checks:
+            raise ValueError(f"Preflight check already registered: {check.name}")
+        self._checks[check.name] = check
+        return check
+
+    def check(
+        self,
+        name: str,
+        severity: CheckSeverity,
+        depends_on: tuple[str, ...] = (),
+        timeout: float = DEFAULT_CHECK_TIMEOUT,
+        profiles: set[str] | None = None,
+        triggers: set[str] = frozenset(),
+    ):
+        """Decorator form of register()."""
+        def decorator(func):
+            self.register(PreflightCheck(
+                name, severity, func, tuple(depends_on), timeout,
+                frozenset(profiles) if profiles is not None else None,
+                frozenset(triggers),
+            ))
+            return func
+        return decorator
+
+    def names(self) -> list[str]:
+        return list(self._checks)
+
+    def select(self, profile: str | None = None) -> list[PreflightCheck]:
+        """
+        The checks that apply to `profile`, in registration order.
+
+        A dependency on a check that does not apply to this profile is
+        ignored (it can't fail). A dependency on a name that was never
+        registered, or a dependency cycle, raises ValueError.
+        """
+        selected = [c for c in self._checks.values() if c.applies_to(profile)]
+        for c in selected:
+            unknown = [d for d in c.depends_on if d not in self._checks]
+            if unknown:
+                raise ValueError(f"Preflight check {c.name} depends on unknown checks: {unknown}")
+        _check_for_cycles(selected)
+        return selected
+
+
+def _check_for_cycles(checks: list[PreflightCheck]) -> None:
+    """Raise ValueError if the depends_on links form a loop."""
+    deps = {c.name: [d for d in c.depends_on] for c in checks}
+    visiting, done = set(), set()
+
+    def visit(name, path):
+        if name in done or name not in deps:
+            return
+        if name in visiting:
+            raise ValueError(f"Preflight dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for name in deps:
+        visit(name, [])
+
+
+# The built-in checks. The lambdas look the check functions up when they
+# run, so tests can still patch e.g. `preflight.check_phone_audio`.
+DEFAULT_REGISTRY = PreflightRegistry()
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "headset_mic", CheckSeverity.CRITICAL,
+    lambda ctx: check_audio_capture_device(ctx.inventory),
+    triggers=frozenset({"sound"})))
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "headset_speakers", CheckSeverity.CRITICAL,
+    lambda ctx: check_audio_playback_device(ctx.inventory),
+    triggers=frozenset({"sound"})))
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "mirabox_reachable", CheckSeverity.CRITICAL,
+    lambda ctx: check_mirabox_reachable(),
+    triggers=frozenset({"hid", "hidraw"})))
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "phone_audio", CheckSeverity.WARNING,
+    lambda ctx: check_phone_audio(ctx.inventory),
+    triggers=frozenset({"sound"})))
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "clock_sync", CheckSeverity.WARNING,
+    lambda ctx: check_clock_sync()))
+DEFAULT_REGISTRY.register(PreflightCheck(
+    "config_cache_dir", CheckSeverity.WARNING,
+    lambda ctx: check_config_cache_dir(ctx.config_cache_dir)))
+
+
+# ──────────────────────────────────────────────────
+# Scheduler — run checks in parallel, respecting dependencies
+# ──────────────────────────────────────────────────
+
+def _timed(check: PreflightCheck, context: PreflightContext) -> PreflightResult:
+    """Run one check and stamp how long it took on its result."""
+    start = time.monotonic()
+    result = check.run(context)
+    end = time.monotonic()
+    result.duration_ms = (end - start) * 1000.0
+    get_boot_profiler().record(f"bootstrap.preflight.{check.name}", start, end)
+    return result
+
+
+def run_preflight_checks(
+    checks: list[PreflightCheck],
+    context: PreflightContext,
+    check_timeout: float = DEFAULT_CHECK_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+    started: float | None = None,
+) -> list[PreflightResult]:
+    """
+    Run `checks` as fast as their dependencies allow.
+
+    - Checks with no (pending) dependencies run at the same time.
+    - A check starts as soon as everything it depends on has PASSed.
+    - If a dependency FAILs or is SKIPped, the check is SKIPped.
+    - A check running longer than min(its timeout, check_timeout) FAILs.
+    - When the overall deadline passes, everything unfinished FAILs.
+
+    Returns results in the same order as `checks`.
+    """
+    started = time.monotonic() if started is None else started
+    results: dict[str, PreflightResult] = {}
+    selected = {c.name for c in checks}
+    waiting = list(checks)
+    running = {}   # future → (check, submit time)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(checks)), thread_name_prefix="preflight")
+    try:
+        while waiting or running:
+            # 1. Start or skip every waiting check whose dependencies are settled
+            for check in list(waiting):
+                deps = [d for d in check.depends_on if d in selected]
+                failed = [d for d in deps if d in results and results[d].status != CheckStatus.PASS]
+                if failed:
+                    waiting.remove(check)
+                    results[check.name] = PreflightResult(
+                        check.name, check.severity, CheckStatus.SKIP,
+                        f"Skipped: depends on {failed} which did not pass")
+                elif all(d in results for d in deps):
+                    waiting.remove(check)
+                    running[executor.submit(_timed, check, context)] = (check, time.monotonic())
+
+            if not running:
+                continue
+
+            # 2. Wait until something finishes, times out, or the deadline hits
+            now = time.monotonic()
+            deadline_at = started + deadline
+            next_timeout = min(
+                [submitted + min(c.timeout, check_timeout) for c, submitted in running.values()]
+                + [deadline_at]
+            )
+            done, _ = wait(list(running), timeout=max(0.0, next_timeout - now),
+                           return_when=FIRST_COMPLETED)
+
+            # 3. Collect finished checks
+            for future in done:
+                check, _submitted = running.pop(future)
+                try:
+                    results[check.name] = future.result()
+                except Exception as e:
+                    results[check.name] = PreflightResult(
+                        check.name, check.severity, CheckStatus.FAIL, f"Check crashed: {e}")
+
+            # 4. Give up on checks that ran too long
+            now = time.monotonic()
+            for future, (check, submitted) in list(running.items()):
+                limit = min(check.timeout, check_timeout)
+                if now >= deadline_at or now - submitted >= limit:
+                    running.pop(future)
+                    results[check.name] = PreflightResult(
+                        check.name, check.severity, CheckStatus.FAIL,
+                        f"Check timed out after {now - submitted:.1f}s",
+                        duration_ms=(now - submitted) * 1000.0)
+
+            if now >= deadline_at:
+                for check in waiting:
+                    results[check.name] = PreflightResult(
+                        check.name, check.severity, CheckStatus.FAIL,
+                        "Not run: preflight deadline reached")
+                waiting.clear()
+    finally:
+        # Don't wait for a wedged check — its result is already recorded as FAIL
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [results[c.name] for c in checks]
+
+
 # ──────────────────────────────────────────────────
 # Run ALL checks and produce a summary
 # ──────────────────────────────────────────────────
 
-def run_all_preflight_checks(config_cache_dir: str | Path = "/var/cache/ixg-agent") -> PreflightSummary:
+def run_all_preflight_checks(
+    config_cache_dir: str | Path = "/var/cache/ixg-agent",
+    check_timeout: float = DEFAULT_CHECK_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+    profile: str | None = None,
+    registry: PreflightRegistry | None = None,
+) -> PreflightSummary:
     """
-    Run every preflight check and collect the results.
+    Run every preflight check that applies to this station and collect the results.
+
+    The sound card list is built once and shared. Then the scheduler runs
+    independent checks in parallel (see run_preflight_checks).
 
     Args:
         config_cache_dir: Path to the config cache directory to check.
+        check_timeout: Max seconds for any single check.
+        deadline: Max seconds for the whole run (inventory + checks).
+        profile: Station profile (DeviceIdentity.profile) used to pick checks.
+        registry: Where to find checks (defaults to the built-in ones).
 
     Returns:
         A PreflightSummary with all results and whether any critical check failed.
     """
-    # Run each check and collect results
-    results = [
-        check_audio_capture_device(),
-        check_audio_playback_device(),
-        check_mirabox_reachable(),
-        check_phone_audio(),
-        check_clock_sync(),
-        check_config_cache_dir(config_cache_dir),
-    ]
-
-    # Did ANY critical check fail?
-    has_critical_failure = any(
-        r.status == CheckStatus.FAIL and r.severity == CheckSeverity.CRITICAL
-        for r in results
+    started = time.monotonic()
+    checks = (registry or DEFAULT_REGISTRY).select(profile)
+    context = PreflightContext(
+        config_cache_dir=Path(config_cache_dir),
+        inventory=build_alsa_inventory(timeout=min(check_timeout, deadline)),
+        profile=profile,
     )
 
+    results = run_preflight_checks(checks, context, check_timeout, deadline, started)
+
+    # Did ANY critical check fail (or get skipped)?
+    has_critical_failure = any(is_critical_failure(r) for r in results)
+
     # Log each result
     for r in results:
-        level = "error" if (r.status == CheckStatus.FAIL and r.severity == CheckSeverity.CRITICAL) else \
-                "warning" if r.status == CheckStatus.FAIL else "info"
+        level = "error" if is_critical_failure(r) else \
+                "warning" if r.status != CheckStatus.PASS else "info"
         getattr(logger, level)(
-            f"[{r.severity.value}] {r.check_name}: {r.status.value} — {r.detail}"
+            f"[{r.severity.value}] {r.check_name}: {r.status.value} — {r.detail} ({r.duration_ms:.1f} ms)"
         )
 
+    duration_ms = (time.monotonic() - started) * 1000.0
+    logger.info(f"Preflight finished in {duration_ms:.1f} ms "
+                f"({len(checks)} checks for profile {profile}, "
+                f"ALSA inventory from {context.inventory.source})")
+
     summary = PreflightSummary(
         results=results,
         has_critical_failure=has_critical_failure,
         timestamp=datetime.now(timezone.utc).isoformat(),
+        duration_ms=duration_ms,
     )
 
     return summary
@@ -0,0 +1,172 @@
+"""
+preflight_cache.py — Remembers the last good preflight for fast restarts.
+
+When the agent process restarts (crash, update, systemd restart) the
+hardware usually has NOT changed. Re-running every check from scratch just
+keeps the operator staring at a dark deck.
+
+So after a successful preflight we save:
+    - the PreflightSummary
+    - a "fingerprint" of the hardware: USB topology, ALSA card IDs and
+      hidraw nodes, hashed into one short string
+
+On the next start, if the fingerprint is the same and the saved result is
+not too old, bootstrap trusts it immediately and re-checks in the
+background.
+
+Any plug/unplug event (seen by the USB monitor) deletes the cache, because
+from that moment the saved result may be wrong.
+
+How to use:
+    cache = PreflightCache("/var/cache/ixg-agent", max_age=600)
+    fingerprint = hardware_fingerprint()
+    summary = cache.load(fingerprint)      # None if missing/stale/different
+    ...
+    cache.save(summary, fingerprint)
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from src.bootstrap.preflight import PreflightSummary, summary_from_dict, summary_to_dict
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("preflight_cache")
+
+CACHE_FILE_NAME = "preflight_cache.json"
+DEFAULT_MAX_AGE = 600.0   # seconds a cached result may be trusted
+
+# " 4 [Audio          ]: USB-Audio - KT USB Audio"
+_CARD_LINE = re.compile(r"^\s*\d+\s+\[")
+
+
+# ──────────────────────────────────────────────────
+# Hardware fingerprint
+# ──────────────────────────────────────────────────
+
+def _usb_topology(sys_root: Path) -> list[str]:
+    """Every USB device as "port:vendor:product", e.g. "1-1.3:31b2:0011"."""
+    entries = []
+    usb_dir = sys_root / "bus" / "usb" / "devices"
+    try:
+        names = sorted(os.listdir(usb_dir))
+    except OSError:
+        return entries
+
+    for name in names:
+        try:
+            vendor = (usb_dir / name / "idVendor").read_text().strip()
+            product = (usb_dir / name / "idProduct").read_text().strip()
+        except OSError:
+            continue  # Interfaces (e.g. "1-1.3:1.0") have no IDs
+        entries.append(f"usb={name}:{vendor}:{product}")
+    return entries
+
+
+def _alsa_cards(proc_root: Path) -> list[str]:
+    """The card lines from /proc/asound/cards (index, ID and name)."""
+    try:
+        text = (proc_root / "cards").read_text()
+    except OSError:
+        return []
+    return [f"alsa={line.strip()}" for line in text.splitlines() if _CARD_LINE.match(line)]
+
+
+def _hidraw_nodes(sys_root: Path) -> list[str]:
+    """Every hidraw node name, e.g. "hidraw0"."""
+    try:
+        return [f"hidraw={name}" for name in sorted(os.listdir(sys_root / "class" / "hidraw"))]
+    except OSError:
+        return []
+
+
+def hardware_fingerprint(
+    sys_root: str | Path = "/sys",
+    proc_root: str | Path = "/proc/asound",
+) -> str:
+    """
+    A short hash of the hardware that preflight cares about.
+    Same hardware in the same ports → same fingerprint.
+
+    Only reads a few small sysfs/procfs files, so it costs milliseconds.
+    """
+    sys_root, proc_root = Path(sys_root), Path(proc_root)
+    parts = _usb_topology(sys_root) + _alsa_cards(proc_root) + _hidraw_nodes(sys_root)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# ──────────────────────────────────────────────────
+# The cache file
+# ──────────────────────────────────────────────────
+
+class PreflightCache:
+    """
+    Reads/writes the cached PreflightSummary in the config cache directory.
+    """
+    def __init__(self, cache_dir: str | Path, max_age: float = DEFAULT_MAX_AGE):
+        self.path = Path(cache_dir) / CACHE_FILE_NAME
+        self.max_age = max_age
+
+    def load(self, fingerprint: str, profile: str | None = None) -> PreflightSummary | None:
+        """
+        Return the cached summary if it matches `fingerprint` and `profile`
+        (different profiles run different checks) and is fresh.
+        Returns None (never raises) otherwise.
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable preflight cache {self.path}: {e}")
+            return None
+
+        if data.get("fingerprint") != fingerprint:
+            logger.info("Preflight cache miss: hardware fingerprint changed")
+            return None
+
+        if data.get("profile") != profile:
+            logger.info("Preflight cache miss: station profile changed")
+            return None
+
+        age = time.time() - float(data.get("saved_at", 0))
+        if age < 0 or age > self.max_age:
+            logger.info(f"Preflight cache miss: result is {age:.0f}s old (max {self.max_age:.0f}s)")
+            return None
+
+        try:
+            return summary_from_dict(data["summary"])
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring malformed preflight cache {self.path}: {e}")
+            return None
+
+    def save(self, summary: PreflightSummary, fingerprint: str, profile: str | None = None) -> None:
+        """Save a summary atomically (write temp file, then rename). Best-effort."""
+        data = {
+            "fingerprint": fingerprint,
+            "profile": profile,
+            "saved_at": time.time(),
+            "summary": summary_to_dict(summary),
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save preflight cache: {e}")
+
+    def invalidate(self) -> None:
+        """Forget the cached result (e.g. after a plug/unplug event)."""
+        try:
+            self.path.unlink()
+            logger.info("Preflight cache invalidated (hardware changed)")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not invalidate preflight cache: {e}")
@@ -0,0 +1,308 @@
+"""
+preflight_history.py — Every preflight result, one line per boot.
+
+Support teams want to compare "today's preflight with yesterday's". One
+pretty-printed JSON file that is overwritten every boot can't do that, so
+this module keeps an APPEND-ONLY history in JSON Lines format:
+
+    {"boot_id":"6f1c...","t":1760850000.1,"summary":{...}}
+    {"boot_id":"a02d...","t":1760936400.7,"summary":{...}}
+
+Why JSON Lines?
+    - Adding a boot is ONE small append (no rewrite of the whole file)
+    - A half-written last line after a power cut only loses that line
+    - Humans can still read it with `tail`
+
+A boot appends ONE line, from a history that lives just for that boot, so
+every append is fsynced right away: one fsync per boot is the intended
+cost (a boot's record should survive a power cut right after it).
+
+The file is kept to roughly `max_entries` boots (older ones are dropped
+when it grows 50% past the limit). To know when that happens without
+reading the whole file every boot, the line count is kept in a tiny
+sidecar file next to it (`preflight_history.jsonl.count`, "<bytes> <lines>").
+If the sidecar doesn't match the file's size (e.g. after a power cut), the
+lines are counted once more.
+
+How to use:
+    history = PreflightHistory("/var/cache/ixg-agent/preflight_history.jsonl")
+    history.append(summary)
+    history.query(check_name="headset_mic", since=time.time() - 86400)
+    history.diff(boot_a, boot_b)     # which checks changed status?
+    history.close()
+
+From the command line (diffs the last two boots by default):
+    python -m src.bootstrap.preflight_history /var/cache/ixg-agent/preflight_history.jsonl
+    python -m src.bootstrap.preflight_history <path> <boot_a> <boot_b>
+"""
+
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.shared.enums import CheckStatus
+from src.bootstrap.preflight import (
+    PreflightResult,
+    PreflightSummary,
+    summary_from_dict,
+    summary_to_dict,
+)
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("preflight_history")
+
+HISTORY_FILE_NAME = "preflight_history.jsonl"
+DEFAULT_MAX_ENTRIES = 500
+
+
+@dataclass
+class HistoryEntry:
+    """One boot's preflight run."""
+    boot_id: str
+    t: float                    # Unix time it was recorded
+    summary: PreflightSummary
+
+
+@dataclass
+class CheckChange:
+    """
+    One check whose status differs between two boots.
+    `before`/`after` is None if the check did not run in that boot.
+    """
+    check_name: str
+    before: CheckStatus | None
+    after: CheckStatus | None
+
+
+class PreflightHistory:
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.count_path = self.path.with_name(self.path.name + ".count")
+        self.max_entries = max_entries
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._line_count = 0
+
+        # In-memory index, built lazily by _load()
+        self._loaded = False
+        self._entries: list[HistoryEntry] = []
+        self._times: list[float] = []                 # for time-range bisect
+        self._by_boot: dict[str, int] = {}            # boot_id → entry position
+        self._by_check: dict[str, list[int]] = {}     # check name → entry positions
+
+    # ── Writing ────────────────────────────────────
+
+    def append(self, summary: PreflightSummary, boot_id: str | None = None) -> str:
+        """
+        Append one summary as a single line. Returns its boot_id.
+        """
+        boot_id = boot_id or uuid.uuid4().hex[:12]
+        entry = HistoryEntry(boot_id, time.time(), summary)
+        line = json.dumps(
+            {"boot_id": boot_id, "t": round(entry.t, 3), "summary": summary_to_dict(summary)},
+            separators=(",", ":"),
+        ) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._line_count = self._read_line_count()
+            self._file.write(line)
+            self._sync_locked()
+            self._line_count += 1
+            self._write_line_count()
+
+            if self._loaded:
+                self._index(entry)
+            if self._line_count > self.max_entries * 1.5:
+                self._load()
+                self._compact_locked()
+
+        return boot_id
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _sync_locked(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _read_line_count(self) -> int:
+        """Lines in the file: from the sidecar if it matches the file's size, else counted."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        try:
+            sidecar_size, lines = (int(n) for n in self.count_path.read_text().split())
+            if sidecar_size == size:
+                return lines
+        except (OSError, ValueError):
+            pass
+        # Counting newlines is much cheaper than parsing every entry
+        return self.path.read_bytes().count(b"\n")
+
+    def _write_line_count(self) -> None:
+        """Best-effort: a lost or stale sidecar only costs one recount."""
+        try:
+            self.count_path.write_text(f"{self.path.stat().st_size} {self._line_count}\n")
+        except OSError as e:
+            logger.warning(f"Could not save preflight history line count: {e}")
+
+    def _compact_locked(self) -> None:
+        """Rewrite the file with only the newest max_entries boots (atomic rename)."""
+        keep = self._entries[-self.max_entries:]
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for e in keep:
+                f.write(json.dumps(
+                    {"boot_id": e.boot_id, "t": round(e.t, 3), "summary": summary_to_dict(e.summary)},
+                    separators=(",", ":"),
+                ) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self._reset_index()
+        for e in keep:
+            self._index(e)
+        self._line_count = len(keep)
+        self._write_line_count()
+        logger.info(f"Preflight history compacted to {len(keep)} boots")
+
+    # ── Reading ────────────────────────────────────
+
+    def boots(self) -> list[str]:
+        """All boot IDs, oldest first."""
+        self._load()
+        return [e.boot_id for e in self._entries]
+
+    def get(self, boot_id: str) -> PreflightSummary | None:
+        self._load()
+        position = self._by_boot.get(boot_id)
+        return None if position is None else self._entries[position].summary
+
+    def query(
+        self,
+        check_name: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[tuple[str, float, PreflightResult]]:
+        """
+        Results for one check (or all checks) within a time range.
+
+        Args:
+            check_name: Only this check (uses the per-check index). None = all.
+            since / until: Unix time bounds (inclusive). None = open-ended.
+
+        Returns:
+            (boot_id, time, PreflightResult) tuples, oldest first.
+        """
+        self._load()
+        lo = 0 if since is None else bisect.bisect_left(self._times, since)
+        hi = len(self._times) if until is None else bisect.bisect_right(self._times, until)
+
+        if check_name is None:
+            positions = range(lo, hi)
+        else:
+            indexed = self._by_check.get(check_name, [])
+            positions = indexed[bisect.bisect_left(indexed, lo):bisect.bisect_left(indexed, hi)]
+
+        found = []
+        for position in positions:
+            entry = self._entries[position]
+            for result in entry.summary.results:
+                if check_name is None or result.check_name == check_name:
+                    found.append((entry.boot_id, entry.t, result))
+        return found
+
+    def diff(self, boot_a: str, boot_b: str) -> list[CheckChange]:
+        """
+        Which checks changed status between two boots?
+        Raises KeyError if either boot_id is unknown.
+        """
+        self._load()
+        before = {r.check_name: r.status for r in self._entries[self._by_boot[boot_a]].summary.results}
+        after = {r.check_name: r.status for r in self._entries[self._by_boot[boot_b]].summary.results}
+
+        changes = []
+        for name in list(before) + [n for n in after if n not in before]:
+            if before.get(name) != after.get(name):
+                changes.append(CheckChange(name, before.get(name), after.get(name)))
+        return changes
+
+    # ── Index ──────────────────────────────────────
+
+    def _reset_index(self) -> None:
+        self._entries, self._times = [], []
+        self._by_boot, self._by_check = {}, {}
+
+    def _index(self, entry: HistoryEntry) -> None:
+        position = len(self._entries)
+        self._entries.append(entry)
+        self._times.append(entry.t)
+        self._by_boot[entry.boot_id] = position
+        for result in entry.summary.results:
+            self._by_check.setdefault(result.check_name, []).append(position)
+
+    def _load(self) -> None:
+        """Read the whole file once and build the indexes (skips damaged lines)."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._reset_index()
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            data = json.loads(line)
+                            self._index(HistoryEntry(
+                                data["boot_id"], float(data["t"]), summary_from_dict(data["summary"])))
+                        except (json.JSONDecodeError, KeyError, ValueError, TypeError):
+                            continue   # e.g. a line cut short by a power loss
+            except FileNotFoundError:
+                pass
+            self._loaded = True
+
+
+def _format_change(change: CheckChange) -> str:
+    before = change.before.value if change.before else "-"
+    after = change.after.value if change.after else "-"
+    return f"  {change.check_name:<24} {before:>5} -> {after}"
+
+
+if __name__ == "__main__":
+    history = PreflightHistory(sys.argv[1] if len(sys.argv) > 1 else
+                               f"/var/cache/ixg-agent/{HISTORY_FILE_NAME}")
+    boots = history.boots()
+    if len(sys.argv) > 3:
+        boot_a, boot_b = sys.argv[2], sys.argv[3]
+    elif len(boots) >= 2:
+        boot_a, boot_b = boots[-2], boots[-1]
+    else:
+        print(f"{len(boots)} boot(s) in history, nothing to compare.")
+        sys.exit(0)
+
+    changes = history.diff(boot_a, boot_b)
+    print(f"Preflight changes {boot_a} -> {boot_b}: {len(changes)}")
+    for change in changes:
+        print(_format_change(change))
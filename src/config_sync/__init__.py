@@ -0,0 +1,107 @@
+"""
+config_sync/__init__.py — Keeps the station config in step with the control plane.
+
+On boot the station does NOT wait for the network:
+
+    1. The ConfigStore loads the last config from the cache directory
+       → the deck can show the right channels straight away
+    2. ConfigSyncer then asks the control plane (in the background) for
+       the deltas since our version and applies them one by one
+    3. If our version is too old for deltas, it downloads the full config
+
+Only when there is NO cached config at all does the station have to wait
+for the first sync (the SYNCING_CONFIG state).
+
+How to use:
+    store = ConfigStore(config_cache_dir)
+    syncer = ConfigSyncer(store, source)
+    syncer.start()           # background reconcile
+    ...
+    syncer.stop()
+"""
+
+import threading
+from typing import Callable
+
+from src.shared.errors import ConfigSyncError
+from src.config_sync.store import ConfigStore, StationConfig
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("config_sync")
+
+DEFAULT_SYNC_INTERVAL = 60.0   # seconds between background reconciles
+
+
+class ConfigSyncer:
+    """
+    Brings a ConfigStore up to date from a config source (anything with
+    `deltas_since(version)` and `full_config()`).
+    """
+    def __init__(
+        self,
+        store: ConfigStore,
+        source,
+        interval: float = DEFAULT_SYNC_INTERVAL,
+        on_synced: Callable[[StationConfig], None] | None = None,
+    ):
+        self.store = store
+        self.source = source
+        self.interval = interval
+        self.on_synced = on_synced
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def reconcile(self) -> StationConfig:
+        """
+        Apply every missing delta, or the full config if deltas can't be used.
+        Returns the config we ended up with.
+
+        Raises:
+            ConfigSyncError: If the config could not be committed.
+            Any error from the source (e.g. network) is passed on.
+        """
+        before = self.store.version
+        deltas = self.source.deltas_since(before)
+
+        if deltas is None:
+            logger.info(f"Config version {before} too old for deltas, fetching full config")
+            self.store.replace(self.source.full_config())
+        else:
+            try:
+                for delta in deltas:
+                    self.store.apply(delta)
+            except ConfigSyncError as e:
+                logger.warning(f"Config delta rejected ({e}), fetching full config")
+                self.store.replace(self.source.full_config())
+
+        config = self.store.config
+        if config.version != before:
+            logger.info(f"Config synced: version {before} -> {config.version}")
+            if self.on_synced:
+                self.on_synced(config)
+        return config
+
+    def try_reconcile(self) -> None:
+        """reconcile(), but a failure only logs (we keep running on the cached config)."""
+        try:
+            self.reconcile()
+        except Exception as e:
+            logger.warning(f"Config sync failed, keeping version {self.store.version}: {e}")
+
+    # ── Background reconcile ───────────────────────
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="ConfigSyncThread", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            self.try_reconcile()
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,56 @@
+"""
+source.py — A stand-in for the control plane's config service.
+
+The real control plane is not wired up yet. This class behaves like it
+does from the station's point of view, so the sync logic (and the tests)
+can be written now:
+
+    source.deltas_since(40)   # [ConfigDelta(40→41), ConfigDelta(41→42)]
+    source.deltas_since(3)    # None — too old, those deltas were dropped
+    source.full_config()      # the complete StationConfig at the latest version
+
+Anything that offers these two methods can be handed to ConfigSyncer.
+
+How to use:
+    source = LocalConfigSource()
+    source.publish(ConfigDelta(0, 1, upsert={"director": {"label": "Director", "key": 1}}))
+"""
+
+
+from src.config_sync.store import ConfigDelta, StationConfig, apply_delta
+from src.loggingx.lock_profiler import profiled_lock
+
+DEFAULT_KEEP_DELTAS = 100   # older deltas are dropped → clients must resync fully
+
+
+class LocalConfigSource:
+    def __init__(self, initial: StationConfig | None = None, keep_deltas: int = DEFAULT_KEEP_DELTAS):
+        self.keep_deltas = keep_deltas
+        self._config = initial or StationConfig()
+        self._deltas: list[ConfigDelta] = []
+        self._lock = profiled_lock("config_source")
+
+    def publish(self, delta: ConfigDelta) -> StationConfig:
+        """Make a new version available (raises ConfigSyncError if it doesn't fit)."""
+        with self._lock:
+            self._config = apply_delta(self._config, delta)
+            self._deltas.append(delta)
+            del self._deltas[:-self.keep_deltas]
+            return self._config
+
+    def deltas_since(self, version: int) -> list[ConfigDelta] | None:
+        """
+        The deltas that bring `version` up to date ([] if already current).
+        None if they are no longer kept (the caller needs full_config()).
+        """
+        with self._lock:
+            if version == self._config.version:
+                return []
+            for position, delta in enumerate(self._deltas):
+                if delta.from_version == version:
+                    return list(self._deltas[position:])
+            return None
+
+    def full_config(self) -> StationConfig:
+        with self._lock:
+            return self._config
@@ -0,0 +1,286 @@
+"""
+store.py — The station config, saved on disk under a version number.
+
+The control plane decides what each station shows: which channels exist,
+what their buttons are labelled, which key they live on and how their
+talk button behaves (PTT or LATCH). We keep the last config we received in
+the config cache directory so the station can go live straight away on
+the next boot, even if the network is down:
+
+    /var/cache/ixg-agent/station_config.json
+    {
+        "version": 42,
+        "channels": {
+            "director": {"label": "Director", "key": 1, "talk_mode": "PTT"},
+            "producer": {"label": "Producer", "key": 2, "talk_mode": "LATCH"}
+        }
+    }
+
+Changes arrive as small "deltas" (version 42 → 43: relabel one channel)
+instead of the whole config. Every change is committed atomically:
+
+    1. Write the new config to a temporary file and fsync it
+    2. Rename it over the old file (a rename is all-or-nothing)
+
+So a power cut leaves either the old config or the new one, never half.
+
+Lookups ("which channel is on key 3?") happen on every button press, so
+they never touch the disk: the whole config and a key → channel index are
+loaded into memory once, and swapped in one step after each commit.
+
+How to use:
+    store = ConfigStore("/var/cache/ixg-agent")
+    store.version                  # 42 (0 = nothing cached yet)
+    store.channel_for_key(3)       # ChannelConfig(...) or None
+    store.apply(delta)             # Commit a ConfigDelta (42 → 43)
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from src.shared.enums import TalkMode
+from src.shared.errors import ConfigSyncError
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("config_store")
+
+CONFIG_FILE_NAME = "station_config.json"
+
+
+# ──────────────────────────────────────────────────
+# Data containers
+# ──────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ChannelConfig:
+    """
+    How ONE intercom channel appears on this station.
+
+    Fields:
+        channel_id: Stable ID from the control plane, e.g. "director"
+        label: Text on the button, e.g. "Director"
+        key: Which MiraBox key (1-15) the channel lives on
+        talk_mode: PTT (hold to talk), LATCH (press on, press off) or
+                   AUTO (tap to latch, hold to talk)
+    """
+    channel_id: str
+    label: str
+    key: int
+    talk_mode: TalkMode = TalkMode.PTT
+
+
+@dataclass(frozen=True)
+class StationConfig:
+    """
+    The whole config at one version. Never changed in place: a commit
+    builds a new StationConfig and swaps it in.
+    """
+    version: int = 0
+    channels: dict[str, ChannelConfig] = field(default_factory=dict)
+
+
+@dataclass
+class ConfigDelta:
+    """
+    The changes that turn version `from_version` into `to_version`.
+
+    Fields:
+        upsert: channel_id → fields to set (a new channel needs all of
+                label/key/talk_mode; an existing one only the changed ones)
+        remove: channel IDs to delete
+    """
+    from_version: int
+    to_version: int
+    upsert: dict[str, dict] = field(default_factory=dict)
+    remove: list[str] = field(default_factory=list)
+
+
+def channel_to_dict(channel: ChannelConfig) -> dict:
+    return {"label": channel.label, "key": channel.key, "talk_mode": channel.talk_mode.value}
+
+
+def channel_from_dict(channel_id: str, data: dict) -> ChannelConfig:
+    return ChannelConfig(
+        channel_id=channel_id,
+        label=str(data["label"]),
+        key=int(data["key"]),
+        talk_mode=TalkMode(data.get("talk_mode", TalkMode.PTT.value)),
+    )
+
+
+def config_to_dict(config: StationConfig) -> dict:
+    return {
+        "version": config.version,
+        "channels": {cid: channel_to_dict(c) for cid, c in config.channels.items()},
+    }
+
+
+def config_from_dict(data: dict) -> StationConfig:
+    return StationConfig(
+        version=int(data["version"]),
+        channels={cid: channel_from_dict(cid, c) for cid, c in data.get("channels", {}).items()},
+    )
+
+
+def delta_to_dict(delta: ConfigDelta) -> dict:
+    return {
+        "from_version": delta.from_version,
+        "to_version": delta.to_version,
+        "upsert": delta.upsert,
+        "remove": delta.remove,
+    }
+
+
+def delta_from_dict(data: dict) -> ConfigDelta:
+    return ConfigDelta(
+        from_version=int(data["from_version"]),
+        to_version=int(data["to_version"]),
+        upsert=dict(data.get("upsert", {})),
+        remove=list(data.get("remove", [])),
+    )
+
+
+def apply_delta(config: StationConfig, delta: ConfigDelta) -> StationConfig:
+    """
+    Build the config that `delta` produces from `config`.
+
+    Raises:
+        ConfigSyncError: If the delta does not start at config.version (we
+                         missed one, so a full resync is needed) or would
+                         leave the config invalid (e.g. two channels on one key).
+    """
+    if delta.from_version != config.version:
+        raise ConfigSyncError(
+            f"Delta {delta.from_version}->{delta.to_version} does not apply to version {config.version}")
+    if delta.to_version <= delta.from_version:
+        raise ConfigSyncError(f"Delta goes backwards: {delta.from_version}->{delta.to_version}")
+
+    channels = dict(config.channels)
+    for channel_id in delta.remove:
+        channels.pop(channel_id, None)
+
+    for channel_id, changes in delta.upsert.items():
+        current = channels.get(channel_id)
+        merged = channel_to_dict(current) if current else {}
+        merged.update(changes)
+        try:
+            channels[channel_id] = channel_from_dict(channel_id, merged)
+        except (KeyError, ValueError, TypeError) as e:
+            raise ConfigSyncError(f"Invalid channel {channel_id!r} in delta: {e}")
+
+    new_config = StationConfig(delta.to_version, channels)
+    _validate(new_config)
+    return new_config
+
+
+def _validate(config: StationConfig) -> None:
+    """Two channels on one key would make a button press ambiguous."""
+    seen: dict[int, str] = {}
+    for channel in config.channels.values():
+        if channel.key in seen:
+            raise ConfigSyncError(
+                f"Channels {seen[channel.key]!r} and {channel.channel_id!r} both use key {channel.key}")
+        seen[channel.key] = channel.channel_id
+
+
+# ──────────────────────────────────────────────────
+# The store
+# ──────────────────────────────────────────────────
+
+class ConfigStore:
+    """
+    The current StationConfig: loaded once, looked up from memory,
+    committed to disk atomically.
+    """
+    def __init__(self, cache_dir: str | Path):
+        self.path = Path(cache_dir) / CONFIG_FILE_NAME
+        self._commit_lock = profiled_lock("config_store.commit")
+        self._listeners: list[Callable[[StationConfig], None]] = []
+
+        # (config, key → channel index). Readers take the whole tuple, and a
+        # commit replaces it in one assignment, so they never see a mix.
+        self._snapshot: tuple[StationConfig, dict[int, ChannelConfig]] = (StationConfig(), {})
+        self._load()
+
+    # ── Lookups (memory only) ──────────────────────
+
+    @property
+    def config(self) -> StationConfig:
+        return self._snapshot[0]
+
+    @property
+    def version(self) -> int:
+        return self._snapshot[0].version
+
+    def channel(self, channel_id: str) -> ChannelConfig | None:
+        return self._snapshot[0].channels.get(channel_id)
+
+    def channel_for_key(self, key: int) -> ChannelConfig | None:
+        return self._snapshot[1].get(key)
+
+    def subscribe(self, callback: Callable[[StationConfig], None]) -> None:
+        """Call `callback(config)` after every commit."""
+        self._listeners.append(callback)
+
+    # ── Commits ────────────────────────────────────
+
+    def apply(self, delta: ConfigDelta) -> StationConfig:
+        """
+        Apply one delta and commit it.
+
+        Raises:
+            ConfigSyncError: If the delta doesn't fit the current version.
+        """
+        with self._commit_lock:
+            return self._commit(apply_delta(self.config, delta))
+
+    def replace(self, config: StationConfig) -> StationConfig:
+        """Commit a complete config (full resync)."""
+        _validate(config)
+        with self._commit_lock:
+            return self._commit(config)
+
+    def _commit(self, config: StationConfig) -> StationConfig:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(config_to_dict(config), f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            raise ConfigSyncError(f"Could not save station config: {e}")
+
+        self._swap(config)
+        logger.info(f"Station config committed: version {config.version} "
+                    f"({len(config.channels)} channels)")
+        for callback in list(self._listeners):
+            try:
+                callback(config)
+            except Exception as e:
+                logger.error(f"Config listener failed: {e}")
+        return config
+
+    def _swap(self, config: StationConfig) -> None:
+        self._snapshot = (config, {c.key: c for c in config.channels.values()})
+
+    def _load(self) -> None:
+        """Preload the cached config (a missing or broken file means version 0)."""
+        try:
+            with open(self.path, "r") as f:
+                config = config_from_dict(json.load(f))
+            _validate(config)
+        except FileNotFoundError:
+            logger.info("No cached station config yet")
+            return
+        except (OSError, json.JSONDecodeError, KeyError, ValueError, TypeError, ConfigSyncError) as e:
+            logger.warning(f"Ignoring unreadable station config {self.path}: {e}")
+            return
+        self._swap(config)
+        logger.info(f"Station config loaded: version {config.version} "
+                    f"({len(config.channels)} channels)")
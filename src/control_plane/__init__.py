@@ -0,0 +1,3 @@
+"""
+control_plane package — The agent's connection to the central server.
+"""
@@ -0,0 +1,365 @@
+"""
+client.py — Talks to the control plane over HTTP.
+
+Hundreds of stations talk to the same control plane on busy show networks,
+so the client is careful with connections and retries:
+
+    Keep-alive pool   A few HTTP/1.1 connections are opened once and
+                      reused. No TCP (or TLS) handshake per request.
+                      Parallel calls each borrow their own connection.
+    Session token     The device secret is used ONCE to get a short-lived
+                      token (HMAC signature, the secret itself never goes
+                      over the wire). The token is cached and reused until
+                      shortly before it expires, or until the server says 401.
+    Backoff           Failed calls (network error, 5xx, 429) are retried
+                      after a random wait that grows: ~0.25s, ~0.5s, ~1s...
+                      The randomness ("jitter") stops 300 stations that lost
+                      the network at the same moment from all retrying at
+                      the same moment too.
+    Metrics           Every call's latency and outcome is counted per
+                      endpoint (see `client.metrics.snapshot()`).
+
+The client also works as a config source for ConfigSyncer: it has
+`deltas_since(version)` and `full_config()`.
+
+How to use:
+    client = ControlPlaneClient("https://cp.example.net", identity)
+    client.register()                   # optional: happens on first call anyway
+    deltas = client.deltas_since(store.version)
+    print(client.metrics.snapshot())
+"""
+
+import hashlib
+import hmac
+import http.client
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import urlencode, urlsplit
+
+from src.bootstrap.identity import DeviceIdentity
+from src.config_sync.store import (
+    ConfigDelta,
+    StationConfig,
+    config_from_dict,
+    delta_from_dict,
+)
+from src.shared.errors import ControlPlaneError
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("control_plane")
+
+DEFAULT_TIMEOUT = 5.0          # seconds per request
+DEFAULT_POOL_SIZE = 4          # max open connections
+TOKEN_REFRESH_MARGIN = 30.0    # renew the session this many seconds before expiry
+
+# Worth retrying: the server may be restarting or overloaded
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+# ──────────────────────────────────────────────────
+# Backoff
+# ──────────────────────────────────────────────────
+
+@dataclass
+class BackoffPolicy:
+    """
+    Exponential backoff with "full jitter": before retry N we wait a random
+    time between 0 and min(max_delay, base_delay * 2**N).
+    """
+    base_delay: float = 0.25
+    max_delay: float = 10.0
+    max_attempts: int = 4          # first try + 3 retries
+
+    def delay(self, retry: int, rng: random.Random | None = None) -> float:
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry))
+        return (rng or random).uniform(0.0, ceiling)
+
+
+# ──────────────────────────────────────────────────
+# Metrics
+# ──────────────────────────────────────────────────
+
+@dataclass
+class EndpointStats:
+    """Counters for one endpoint, e.g. "GET /v1/config"."""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    latencies_ms: deque = field(default_factory=lambda: deque(maxlen=512))
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+class ClientMetrics:
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.connections_opened = 0
+        self.sessions_opened = 0
+        self._lock = profiled_lock("control_plane.metrics")
+
+    def record(self, endpoint: str, latency_ms: float, ok: bool, retries: int) -> None:
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.retries += retries
+            stats.latencies_ms.append(latency_ms)
+            if not ok:
+                stats.errors += 1
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def count_session(self) -> None:
+        with self._lock:
+            self.sessions_opened += 1
+
+    def snapshot(self) -> dict:
+        """Plain numbers, ready to log or publish."""
+        with self._lock:
+            return {
+                "connections_opened": self.connections_opened,
+                "sessions_opened": self.sessions_opened,
+                "endpoints": {
+                    name: {
+                        "requests": s.requests,
+                        "errors": s.errors,
+                        "retries": s.retries,
+                        "p50_ms": round(s.percentile(50), 2),
+                        "p95_ms": round(s.percentile(95), 2),
+                    }
+                    for name, s in self.endpoints.items()
+                },
+            }
+
+
+# ──────────────────────────────────────────────────
+# Connection pool
+# ──────────────────────────────────────────────────
+
+class ConnectionPool:
+    """
+    Keeps up to `size` keep-alive connections to one host. A connection is
+    borrowed for one request/response and then handed back for reuse.
+    """
+    def __init__(self, base_url: str, size: int, timeout: float, metrics: ClientMetrics):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.metrics = metrics
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = profiled_lock("control_plane.pool")
+
+    def acquire(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """Borrow a connection. Returns (connection, was_reused)."""
+        if not self._slots.acquire(timeout=timeout):
+            raise ControlPlaneError("No free control-plane connection (pool exhausted)")
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._open(), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _open(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        self.metrics.count_connection()
+        return cls(self.host, self.port, timeout=self.timeout)
+
+
+# ──────────────────────────────────────────────────
+# The client
+# ──────────────────────────────────────────────────
+
+def sign_session_request(secret: str, device_id: str, timestamp: int, nonce: str) -> str:
+    """HMAC-SHA256 over "device_id\\ntimestamp\\nnonce" with the device secret."""
+    message = f"{device_id}\n{timestamp}\n{nonce}".encode("utf-8")
+    return hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+class ControlPlaneClient:
+    def __init__(
+        self,
+        base_url: str,
+        identity: DeviceIdentity,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        backoff: BackoffPolicy | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        self.identity = identity
+        self.timeout = timeout
+        self.backoff = backoff or BackoffPolicy()
+        self.metrics = ClientMetrics()
+        self.pool = ConnectionPool(base_url, pool_size, timeout, self.metrics)
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+        # Cached session (token, monotonic expiry time)
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._session_lock = profiled_lock("control_plane.session")
+
+    # ── Public calls ───────────────────────────────
+
+    def register(self) -> str:
+        """Open (or reuse) a session. Returns the session token."""
+        return self._session_token()
+
+    def deltas_since(self, version: int) -> list[ConfigDelta] | None:
+        """Config deltas after `version`; None if the server no longer has them."""
+        status, body = self._call("GET", "/v1/config/deltas", query={"since": version},
+                                  allow_status={410})
+        if status == 410:
+            return None
+        return [delta_from_dict(d) for d in body.get("deltas", [])]
+
+    def full_config(self) -> StationConfig:
+        _status, body = self._call("GET", "/v1/config")
+        return config_from_dict(body["config"])
+
+    def close(self) -> None:
+        self.pool.close()
+
+    # ── Session ────────────────────────────────────
+
+    def _session_token(self, force: bool = False) -> str:
+        with self._session_lock:
+            if not force and self._token and time.monotonic() < self._token_expires - TOKEN_REFRESH_MARGIN:
+                return self._token
+
+            timestamp, nonce = int(time.time()), uuid.uuid4().hex
+            payload = {
+                "device_id": self.identity.device_id,
+                "profile": self.identity.profile,
+                "config_version": self.identity.config_version,
+                "timestamp": timestamp,
+                "nonce": nonce,
+                "signature": sign_session_request(self.identity.secret, self.identity.device_id,
+                                                  timestamp, nonce),
+            }
+            _status, body = self._call("POST", "/v1/session", payload=payload, auth=False)
+            self._token = body["token"]
+            self._token_expires = time.monotonic() + float(body.get("expires_in", 300))
+            self.metrics.count_session()
+            logger.info(f"Control-plane session opened for {self.identity.device_id}")
+            return self._token
+
+    # ── Request machinery ──────────────────────────
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        query: dict | None = None,
+        payload: dict | None = None,
+        auth: bool = True,
+        allow_status: set[int] = frozenset(),
+    ) -> tuple[int, dict]:
+        """
+        One logical call: retries with backoff, renews the session once on 401.
+        Returns (status, parsed JSON body).
+        """
+        endpoint = f"{method} {path}"
+        target = self.pool.prefix + path + (f"?{urlencode(query)}" if query else "")
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+
+        started = time.monotonic()
+        retries = 0
+        renewed_session = False
+        last_error = None
+
+        while True:
+            headers = {"Content-Type": "application/json", "Accept": "application/json"}
+            if auth:
+                headers["Authorization"] = f"Bearer {self._session_token()}"
+            try:
+                status, data = self._send(method, target, body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                status, data, last_error = None, None, f"{type(e).__name__}: {e}"
+            else:
+                if status == 401 and auth and not renewed_session:
+                    renewed_session = True      # token expired server-side: renew and retry now
+                    self._session_token(force=True)
+                    continue
+                if 200 <= status < 300 or status in allow_status:
+                    self.metrics.record(endpoint, (time.monotonic() - started) * 1000.0, True, retries)
+                    return status, self._parse(data)
+                last_error = f"HTTP {status}"
+                if status not in RETRYABLE_STATUS:
+                    break
+
+            if retries + 1 >= self.backoff.max_attempts:
+                break
+            delay = self.backoff.delay(retries, self._rng)
+            retries += 1
+            logger.warning(f"{endpoint} failed ({last_error}), retry {retries} in {delay:.2f}s")
+            self._sleep(delay)
+
+        self.metrics.record(endpoint, (time.monotonic() - started) * 1000.0, False, retries)
+        raise ControlPlaneError(f"{endpoint} failed after {retries + 1} attempt(s): {last_error}")
+
+    def _send(self, method: str, target: str, body: bytes | None, headers: dict) -> tuple[int, bytes]:
+        """Send one request on a pooled connection. Returns (status, raw body)."""
+        conn, reused = self.pool.acquire(self.timeout)
+        try:
+            return self._roundtrip(conn, method, target, body, headers)
+        except (OSError, http.client.HTTPException):
+            if not reused:
+                raise
+
+        # The server had already closed this idle keep-alive connection. That
+        # is not a real failure: drop the other idle ones (probably stale too)
+        # and try once more on a new connection.
+        self.pool.close()
+        conn, _reused = self.pool.acquire(self.timeout)
+        return self._roundtrip(conn, method, target, body, headers)
+
+    def _roundtrip(self, conn, method: str, target: str, body: bytes | None, headers: dict) -> tuple[int, bytes]:
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()   # must be fully read before the connection is reused
+        except (OSError, http.client.HTTPException):
+            self.pool.release(conn, reusable=False)
+            raise
+        self.pool.release(conn, reusable=not response.will_close)
+        return response.status, data
+
+    @staticmethod
+    def _parse(data: bytes) -> dict:
+        if not data:
+            return {}
+        try:
+            return json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ControlPlaneError(f"Control plane sent invalid JSON: {e}")
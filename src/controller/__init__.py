@@ -5,24 +5,153 @@ This is the main class that runs the show. It:
 1.  Runs Bootstrap (Security/Hardware Check)
 2.  Starts Hardware Manager (Monitoring)
 3.  Enters the Main Loop (Wait for calls)
+
+The main loop is an asyncio Reactor (see reactor.py): udev events, timers
+and the pressure signal are all handled on one event loop, and slow work
+(drawing, USB writes, HTTP) runs in a small thread pool.
+
+Deck key presses skip the loop: they go straight to the talk engine (see
+src/talk_engine), which turns the key red within a few milliseconds.
+
+Deck paints that only change a label (or blank a removed key) are not
+urgent: they go through a RenderQueue, which slows them down or drops
+them while the Pi is under pressure. Colour changes (talk, online /
+offline, errors) are always painted at once.
 """
 
+import asyncio
+import logging
+import os
+import signal
 import time
 import sys
 import threading
+from collections import deque
 from src.shared.enums import AgentState
 from src.loggingx.event_log import get_logger
 from src.bootstrap import run_bootstrap
+from src.bootstrap.preflight_history import HISTORY_FILE_NAME as PREFLIGHT_HISTORY_FILE
 from src.hardware_manager import HardwareManager
+from src.controller.health_watch import ContinuousHealthChecker
+from src.controller.reactor import Reactor
+from src.controller.state_machine import StateMachine, Transition
+from src.config_sync import ConfigSyncer
+from src.config_sync.store import ConfigStore, config_to_dict
+from src.control_plane.client import ControlPlaneClient
+from src.controller.snapshot import (
+    AgentSnapshot,
+    SnapshotWriter,
+    load_snapshot,
+    recovering_view,
+)
+from src.bootstrap.mirabox_detect import mirabox_from_dict
+from src.bootstrap.preflight_cache import hardware_fingerprint
+from src.ui_renderer.logic import resolve_priority
+from src.ui_renderer.render_queue import RenderQueue
+from src.ui_renderer.renderer import MiraBoxRenderer
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+from src.talk_engine import TalkEngine
+from src.loggingx.boot_profiler import append_boot_history, get_boot_profiler
+from src.loggingx.event_journal import STATE_CODES, EventJournal, EventType
+from src.loggingx.lock_profiler import profiled_lock
 
 logger = get_logger("controller")
 
+# How long a cached preflight result may be trusted on a warm restart (seconds)
+PREFLIGHT_CACHE_TTL = 600.0
+
+# Set this environment variable to the control plane's URL to sync config from it
+CONTROL_PLANE_URL_ENV = "IXG_CONTROL_PLANE_URL"
+
+# A crash snapshot older than this is not used to repaint the deck (seconds)
+SNAPSHOT_MAX_AGE = 300.0
+SNAPSHOT_REFRESH_INTERVAL = 30.0
+
+# After a move to SAFE_MODE the deck must show OFFLINE within this time (ms)
+SAFE_MODE_PAINT_BUDGET_MS = 500.0
+
+# The states the health checker may move the agent out of (it is running with a config)
+HEALTH_DRIVEN_STATES = frozenset({AgentState.LIVE, AgentState.DEGRADED, AgentState.SAFE_MODE})
+
+
+class _CurrentKeysOnly:
+    """What the render queue paints through: the controller skips keys that changed meanwhile."""
+    def __init__(self, controller):
+        self._controller = controller
+
+    def update(self, view_model: MiraBoxViewModel):
+        self._controller._paint_queued(view_model)
+
+
+def _blank_key(key: int) -> ChannelView:
+    """What a key shows once its channel is gone from the config."""
+    return ChannelView(key, "", ButtonColor.BLACK, None)
+
+
 class MainController:
-    def __init__(self):
-        self.state = AgentState.BOOTING
-        self.hardware_manager = None
+    def __init__(self, config_source=None, hardware_manager=None, renderer=None,
+                 health_checker=None, recorder=None):
+        """
+        Every argument is optional: by default the controller builds the
+        real thing itself. Tests and replays (see replay.py) pass fakes.
+
+        Args:
+            config_source: Where station config comes from (the control plane)
+            hardware_manager: e.g. a FakeHardwareManager
+            renderer: e.g. MiraBoxRenderer(device=FakeDeck())
+            health_checker: Anything with state / on_udev_event / apply_summary / stop
+            recorder: An InputRecorder, to record every input for a later replay
+        """
+        # Deck keys → talk on/off (PTT / LATCH / AUTO), painted on the fast path
+        self.talk_engine = TalkEngine(
+            self._channel_for_key,
+            paint_key=self._paint_talk_key,
+            on_change=self._on_talk_change,
+        )
+
+        # Every state change goes through the machine (validated, timed, announced).
+        # The talk engine listens first: SAFE_MODE switches talk off before anything else.
+        self.machine = StateMachine(AgentState.BOOTING)
+        self.machine.subscribe(self.talk_engine.on_transition)
+        self.machine.subscribe(self._on_transition)
+        self.machine.subscribe(self._journal_transition)
+        self.safe_mode_paint_ms = deque(maxlen=64)   # SAFE_MODE move → OFFLINE painted
+        self.hardware_manager = hardware_manager
+        # Where station config comes from (the control plane); None = cached config only
+        self.config_source = config_source
+        self.config_store = None
+        self.config_syncer = None
+        self.config_cache_dir = None
+        self.outcome = None
+        self.health_checker = health_checker
+        self.renderer = renderer
+        self.render_queue = None                 # RenderQueue for non-critical paints
+        self.recorder = recorder
+        self.journal = None                      # EventJournal: binary record of key/USB/state events
+        self.resumed_from = None                 # AgentSnapshot we repainted from, if any
+        self._snapshot_writer = None
+        self._fingerprint = None                 # hardware fingerprint (None = recompute)
+        self._painted: dict[int, ChannelView] = {}   # key → what it shows now
+        self._painted_lock = profiled_lock("controller.painted")   # held while picking keys, not writing
+        self._key_versions: dict[int, int] = {}      # key → how often its look was picked
+        self._verified_preflight = None  # Background re-check that finished before services started
         self._stop_event = threading.Event()
 
+        # The main loop. Everything below reacts to events posted into it.
+        self.reactor = Reactor()
+        self.reactor.on("paint", self._paint_async)
+        self.reactor.on("pressure", self._on_pressure)
+        self._paint_lock = None   # asyncio.Lock, created on the loop
+
+    @property
+    def state(self) -> AgentState:
+        return self.machine.state
+
+    @property
+    def talk_states(self) -> dict[str, bool]:
+        """channel_id → True for every channel that is talking."""
+        return self.talk_engine.talk_states
+
     def boot(self):
         """
         Phase 1: Bootstrap.
@@ -37,18 +166,24 @@ class MainController:
         from pathlib import Path
         
         cwd = os.getcwd()
+        self.config_cache_dir = cwd
+        self._open_journal()
         outcome = run_bootstrap(
             identity_path=Path(cwd) / "identity.json",
-            config_cache_dir=cwd
+            config_cache_dir=cwd,
+            preflight_save_path=Path(cwd) / PREFLIGHT_HISTORY_FILE,
+            preflight_cache_ttl=PREFLIGHT_CACHE_TTL,
+            on_preflight_verified=self._on_preflight_verified,
         )
+        self.outcome = outcome
         
         if outcome.success:
             logger.info(f"Bootstrap PASS. Moving to {outcome.state.value}...")
-            self.state = outcome.state
+            self.machine.transition(outcome.state, "bootstrap passed")
             return True
         else:
             logger.critical(f"Bootstrap FAILED. Reason: {outcome.reason}")
-            self.state = AgentState.SAFE_MODE
+            self.machine.transition(AgentState.SAFE_MODE, f"bootstrap failed: {outcome.reason}")
             return False
 
     def start_services(self):
@@ -62,46 +197,442 @@ class MainController:
         logger.info("=== PHASE 2: STARTING SERVICES ===")
         
         # Start Hardware Manager
-        self.hardware_manager = HardwareManager()
-        self.hardware_manager.start()
-        
-        self.state = AgentState.READY
-        logger.info("Services Started. Agent is READY.")
+        with get_boot_profiler().phase("start_services.hardware_manager"):
+            if self.hardware_manager is None:
+                self.hardware_manager = HardwareManager(config_cache_dir=self.config_cache_dir)
+            if self.reactor.running:
+                self.hardware_manager.attach(self.reactor)
+                self.hardware_manager.subscribe_pressure(
+                    lambda level: self.reactor.post("pressure", level))
+            else:
+                self.hardware_manager.start()
+
+        # Keep the preflight checklist current: plug/unplug events re-run
+        # only the affected checks and may move us to DEGRADED / SAFE_MODE.
+        if self.health_checker is None:
+            self.health_checker = ContinuousHealthChecker(
+                self.config_cache_dir,
+                self.outcome.identity.profile if self.outcome and self.outcome.identity else None,
+                on_state_change=self._on_health_state,
+                initial=self.outcome.preflight if self.outcome else None,
+            )
+        self.hardware_manager.add_usb_listener(self.health_checker.on_udev_event)
+        if self._verified_preflight is not None:
+            self.health_checker.apply_summary(self._verified_preflight)
+
+        # Station config: go live from the cached copy, reconcile in the background
+        with get_boot_profiler().phase("start_services.config"):
+            self._open_config_store()
+
+        if self.config_store.version > 0:
+            self.machine.transition(self.health_checker.state, "cached station config loaded")
+            logger.info(f"Services Started. Agent is {self.state.value} "
+                        f"(station config version {self.config_store.version}).")
+        elif self.config_syncer:
+            self.machine.transition(AgentState.SYNCING_CONFIG, "no cached station config")
+            logger.info("Services Started. Waiting for the first station config...")
+        else:
+            self.machine.transition(AgentState.READY, "no config source")
+            logger.info("Services Started. Agent is READY (no station config yet).")
+
+        # Started last, so a quick first sync can't be overwritten by the state above
+        if self.config_syncer:
+            if self.reactor.running:
+                self.reactor.every(self.config_syncer.interval, self.config_syncer.try_reconcile,
+                                   name="config-sync")
+            else:
+                self.config_syncer.start()
+
+        # The deck: already connected if we resumed from a snapshot
+        with get_boot_profiler().phase("start_services.deck"):
+            if self.renderer is None:
+                self.renderer = MiraBoxRenderer()
+                self.renderer.journal = self.journal
+        self._start_render_queue()
+        self._snapshot_writer = SnapshotWriter(self.config_cache_dir)
+        self.hardware_manager.add_usb_listener(self._on_usb_event)
+        self.hardware_manager.add_metrics_listener(self._on_metrics)
+        self.config_store.subscribe(self._on_config_changed)
+        self._paint()
+
+    def _resume_from_snapshot(self) -> bool:
+        """
+        Crash restart: if a recent snapshot matches this hardware, connect to
+        the saved deck and paint the last view model (greyed) right away,
+        before bootstrap. Returns True if we did.
+        """
+        cache_dir = self.config_cache_dir or os.getcwd()
+        snapshot = load_snapshot(cache_dir, SNAPSHOT_MAX_AGE)
+        if snapshot is None:
+            return False
+
+        self._fingerprint = hardware_fingerprint()
+        if snapshot.fingerprint != self._fingerprint:
+            logger.info("Snapshot ignored: hardware changed since it was taken")
+            return False
+
+        match = mirabox_from_dict(snapshot.deck) if snapshot.deck else None
+        self.renderer = MiraBoxRenderer(match)
+        self.renderer.update(recovering_view(snapshot.view_model))
+        self.talk_engine.restore(snapshot.talk_states)
+        self.resumed_from = snapshot
+        logger.info(f"Resumed from snapshot (was {snapshot.state.value}): "
+                    f"deck repainted after {get_boot_profiler().total_ms():.0f} ms")
+        return True
+
+    def deck_keys(self) -> dict[int, tuple[str, str]]:
+        """What every painted key shows: key → (label, color)."""
+        with self._painted_lock:
+            return {key: (view.label, view.color.value) for key, view in sorted(self._painted.items())}
+
+    def _current_view_model(self) -> MiraBoxViewModel:
+        """What the deck should show for the current state and config."""
+        online = self.state in (AgentState.READY, AgentState.LIVE, AgentState.DEGRADED)
+        can_talk = self.state in (AgentState.LIVE, AgentState.DEGRADED)
+        channels = []
+        if self.config_store:
+            for channel in sorted(self.config_store.config.channels.values(), key=lambda c: c.key):
+                talking = can_talk and self.talk_engine.is_talking(channel.channel_id)
+                channels.append(resolve_priority(channel.key, channel.label, talking, False, online, False))
+        return MiraBoxViewModel(is_online=online, channels=channels)
+
+    def _paint(self):
+        """Repaint the keys whose look changed, and offer a snapshot."""
+        # The keys are picked under the lock and written outside it, so a talk
+        # press never waits behind a full repaint (see _write_claimed)
+        claimed = []
+        with self._painted_lock:
+            view_model = self._current_view_model()
+            changed = [c for c in view_model.channels if self._painted.get(c.index) != c]
+            # Keys whose channel was removed from the config are blanked
+            shown = {c.index for c in view_model.channels}
+            removed = [_blank_key(key) for key in self._painted if key not in shown]
+
+            # A new colour is news (talk, online/offline, errors): paint it now.
+            # A new label or a blanked key can wait, and is shed under pressure.
+            critical = [c for c in changed
+                        if c.index not in self._painted or self._painted[c.index].color != c.color]
+            background = [c for c in changed if c not in critical] + removed
+            if self.render_queue is None:
+                critical, background = critical + background, []
+            if critical:
+                claimed = self._claim(critical)
+            if background:
+                # Marked as painted only once the queue has painted them
+                self.render_queue.submit(MiraBoxViewModel(is_online=view_model.is_online,
+                                                          channels=background), critical=False)
+        if claimed:
+            self._write_claimed(claimed, lambda views: self.renderer.update(
+                MiraBoxViewModel(is_online=view_model.is_online, channels=views)))
+
+        if self._fingerprint is None:
+            self._fingerprint = hardware_fingerprint()
+        match = self.renderer.match
+        self._snapshot_writer.update(AgentSnapshot(
+            state=self.state,
+            view_model=view_model,
+            talk_states=self.talk_engine.talk_states,
+            deck=match.to_dict() if match else None,
+            fingerprint=self._fingerprint,
+            saved_at=time.time(),
+        ))
+
+    def _paint_queued(self, view_model: MiraBoxViewModel):
+        """Render queue thread: paint the non-critical updates that are still current."""
+        with self._painted_lock:
+            wanted = {c.index: c for c in self._current_view_model().channels}
+            due = [c for c in view_model.channels
+                   if (wanted.get(c.index) == c if c.index in wanted else c.index in self._painted)
+                   and self._painted.get(c.index) != c]
+            claimed = self._claim(due)
+        if claimed:
+            self._write_claimed(claimed, lambda views: self.renderer.update(
+                MiraBoxViewModel(is_online=view_model.is_online, channels=views)))
+
+    def _claim(self, channels: list[ChannelView]) -> list[tuple[ChannelView, int]]:
+        """Lock must be held. Record these looks as painted: (view, version) to write."""
+        claimed = []
+        for channel in channels:
+            version = self._key_versions.get(channel.index, 0) + 1
+            self._key_versions[channel.index] = version
+            claimed.append((channel, version))
+        self._mark_painted(channels)
+        return claimed
+
+    def _write_claimed(self, claimed: list[tuple[ChannelView, int]], write):
+        """
+        Write claimed keys (lock NOT held). A key picked again while we wrote
+        may have been written before us, so ours could be the stale one:
+        write its newest look again, until our write is the last.
+        """
+        while claimed:
+            write([view for view, _version in claimed])
+            with self._painted_lock:
+                stale = [view.index for view, version in claimed
+                         if self._key_versions[view.index] != version]
+                claimed = self._claim([self._painted.get(key, _blank_key(key)) for key in stale])
+
+    def _mark_painted(self, channels: list[ChannelView]):
+        """Lock must be held."""
+        for channel in channels:
+            if channel == _blank_key(channel.index):
+                self._painted.pop(channel.index, None)
+            else:
+                self._painted[channel.index] = channel
+
+    def _start_render_queue(self):
+        """Non-critical paints go through a queue that follows the pressure level."""
+        if self.render_queue is not None or self.renderer is None:
+            return
+        self.render_queue = RenderQueue(_CurrentKeysOnly(self))
+        self.render_queue.start()
+        if self.hardware_manager:
+            self.hardware_manager.subscribe_pressure(self.render_queue.apply_pressure)
+
+    def _request_paint(self):
+        """Repaint soon (on the reactor if it runs, else right now). Any thread."""
+        if self.reactor.running:
+            self.reactor.post("paint")
+        elif self._snapshot_writer:
+            self._paint()
+
+    async def _paint_async(self):
+        """Paint in the thread pool, one paint at a time."""
+        if self._snapshot_writer is None:
+            return   # Services not started yet: nothing to paint on
+        async with self._paint_lock:
+            await self.reactor.run_blocking(self._paint)
+
+    def _open_journal(self):
+        if self.journal is not None:
+            return
+        try:
+            self.journal = EventJournal(self.config_cache_dir)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No event journal: {e}")
+            return
+        if self.renderer:
+            self.renderer.journal = self.journal
+
+    def _on_key(self, device, key, pressed):
+        """Deck reader thread: note the key in the journal, then on to the talk engine."""
+        if self.journal:
+            self.journal.record(EventType.KEY_DOWN if pressed else EventType.KEY_UP, key=key)
+        if self.recorder:
+            self.recorder.record("key", key=key, pressed=bool(pressed))
+        self.talk_engine.on_key(device, key, pressed)
+
+    def _journal_transition(self, transition: Transition):
+        if self.journal:
+            self.journal.record(EventType.STATE_CHANGE, key=STATE_CODES[transition.from_state],
+                                value=STATE_CODES[transition.to_state],
+                                payload=transition.reason.encode("utf-8", errors="replace"))
+
+    def _channel_for_key(self, key: int):
+        return self.config_store.channel_for_key(key) if self.config_store else None
+
+    def _paint_talk_key(self, channel, talking: bool):
+        """Talk engine hot path: repaint just this key (deck reader thread)."""
+        if self.renderer is None:
+            return
+        view = resolve_priority(channel.key, channel.label, talking, False, True, False)
+        with self._painted_lock:
+            claimed = self._claim([view])
+        self._write_claimed(claimed, lambda views: [self.renderer.paint_key(v) for v in views])
+
+    def _on_talk_change(self, channel_id: str, talking: bool):
+        """Talk went on/off: refresh the snapshot (and any key the fast path missed)."""
+        if self.journal:
+            channel = self.config_store.channel(channel_id) if self.config_store else None
+            self.journal.record(EventType.TALK, key=channel.key if channel else 0, value=int(talking),
+                                payload=channel_id.encode("utf-8", errors="replace"))
+        self._request_paint()
+
+    def _on_config_changed(self, config):
+        if self.recorder:
+            self.recorder.record("config", config=config_to_dict(config))
+        self._prewarm_keys()
+        self._request_paint()
+
+    def _prewarm_keys(self):
+        """Draw every talk key look ahead of time, so no press pays for Pillow."""
+        if self.renderer and self.config_store:
+            self.renderer.prewarm([c.label for c in self.config_store.config.channels.values()])
+
+    def _on_pressure(self, level):
+        logger.info(f"Pressure level is now {level.value}")
+        # Label updates shed under pressure are painted once it eases
+        self._request_paint()
+
+    def _on_usb_event(self, device):
+        """Plug/unplug: the hardware fingerprint must be worked out again."""
+        self._fingerprint = None
+        if self.recorder:
+            self.recorder.record_udev(device)
+        if self.journal:
+            self.journal.record(EventType.UDEV, value=int(device.action == "add"),
+                                payload=str(device.sys_name).encode("utf-8", errors="replace"))
+
+    def _on_metrics(self, metrics):
+        if self.recorder:
+            self.recorder.record_metrics(metrics)
+
+    def _open_config_store(self):
+        """Load the cached station config and prepare the background syncer."""
+        self.config_store = ConfigStore(self.config_cache_dir)
+        identity = self.outcome.identity if self.outcome else None
+        if identity and identity.config_version != self.config_store.version:
+            logger.info(f"Identity says config version {identity.config_version}, "
+                        f"cache has {self.config_store.version}")
+
+        control_plane_url = os.environ.get(CONTROL_PLANE_URL_ENV)
+        if self.config_source is None and control_plane_url and identity:
+            self.config_source = ControlPlaneClient(control_plane_url, identity)
+
+        if self.config_source is None:
+            logger.warning("No config source configured. Using the cached station config only.")
+            return
+        self.config_syncer = ConfigSyncer(self.config_store, self.config_source,
+                                          on_synced=self._on_config_synced)
+
+    def _on_config_synced(self, config):
+        """A newer station config was committed."""
+        if self.state == AgentState.SYNCING_CONFIG:
+            self.machine.transition(self.health_checker.state if self.health_checker else AgentState.READY,
+                                    f"first station config received (version {config.version})")
+
+    def _on_preflight_verified(self, summary):
+        """The background re-check after a warm restart has finished."""
+        if self.health_checker:
+            self.health_checker.apply_summary(summary)
+        else:
+            self._verified_preflight = summary
+
+    def _on_health_state(self, state: AgentState, reason: str):
+        """
+        The continuous health checker decided we are LIVE / DEGRADED / SAFE_MODE.
+        Before the agent is running (no station config yet) the decision is
+        only kept by the health checker: _on_config_synced applies it once a
+        config arrives, so a health callback can't make us LIVE without one.
+        """
+        if self.recorder:
+            self.recorder.record("health", state=state.value, reason=reason)
+        if self.state not in HEALTH_DRIVEN_STATES:
+            logger.info(f"Health check says {state.value} ({reason}); applied once the agent is running")
+            return
+        if state != self.state:
+            logger.warning(f"Health check moves the agent to {state.value}: {reason}")
+        self.machine.transition(state, reason)
+
+    def _on_transition(self, transition: Transition):
+        """Runs on the thread that changed the state (after the talk engine)."""
+        if not self.reactor.running:
+            self._request_paint()
+
+    async def _on_transition_async(self, transition: Transition):
+        """Repaint for the new state (on the reactor) and time the SAFE_MODE paint."""
+        await self._paint_async()
+        if transition.to_state == AgentState.SAFE_MODE:
+            latency_ms = (time.monotonic() - transition.at) * 1000.0
+            self.safe_mode_paint_ms.append(latency_ms)
+            if latency_ms > SAFE_MODE_PAINT_BUDGET_MS:
+                logger.warning(f"OFFLINE painted {latency_ms:.0f} ms after SAFE_MODE "
+                               f"(budget {SAFE_MODE_PAINT_BUDGET_MS:.0f} ms)")
 
     def run(self):
         """
         Phase 3: Main Loop.
         Keep the program running forever (until stopped).
         """
+        try:
+            self.reactor.run(self._serve())
+        except KeyboardInterrupt:
+            logger.info("Stopping agent (User Interrupt)...")
+        finally:
+            self.stop()
+
+    async def _serve(self):
+        """Boot on the reactor, then hook every event source into it."""
+        profiler = get_boot_profiler()
+        self._paint_lock = asyncio.Lock()
+        self.machine.subscribe_async(self._on_transition_async, self.reactor.loop)
+
+        # 0. Crash restart? Show the last known deck straight away
+        with profiler.phase("resume"):
+            self._resume_from_snapshot()
+
         # 1. Boot
-        if not self.boot():
+        with profiler.phase("bootstrap"):
+            booted = self.boot()
+        if not booted:
+            self._finish_boot_profile()
             logger.error("System halted due to bootstrap failure.")
+            self.reactor.stop()
             return
 
         # 2. Start Services
-        self.start_services()
+        with profiler.phase("start_services"):
+            self.start_services()
+        self._finish_boot_profile()
+
+        if self.recorder and self.health_checker:
+            self.recorder.begin(self.state, self.health_checker.state,
+                                self.config_store.config, self.talk_states)
 
         # 3. Main Loop
+        if self.renderer:
+            # Key presses go straight from the deck's reader thread to the
+            # talk engine: no hop through the loop on the way to a red key.
+            self.renderer.set_key_callback(self._on_key)
+            self.reactor.spawn(self.reactor.run_blocking(self._prewarm_keys), name="prewarm-keys")
+        if self._snapshot_writer:
+            # Keeps the crash snapshot recent even when nothing changes
+            self.reactor.every(SNAPSHOT_REFRESH_INTERVAL, self._paint_async, name="snapshot", blocking=False)
+        try:
+            self.reactor.loop.add_signal_handler(signal.SIGTERM, self.reactor.stop)
+        except (NotImplementedError, RuntimeError):
+            pass   # Not on the main thread (e.g. tests) or not supported
         logger.info("=== PHASE 3: MAIN LOOP ===")
         logger.info("Waiting for calls... (Press Ctrl+C to stop)")
-        
-        try:
-            while not self._stop_event.is_set():
-                # In the future, we will check for incoming calls here.
-                # For now, just sleep and save CPU.
-                time.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("Stopping agent (User Interrupt)...")
-        finally:
-            self.stop()
+
+    def _finish_boot_profile(self):
+        """Stop the boot stopwatch, log where the time went and save it to history."""
+        profiler = get_boot_profiler()
+        total_ms = profiler.finish()
+        logger.info(f"Boot took {total_ms:.1f} ms (state={self.state.value})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(profiler.format_summary())
+        if self.config_cache_dir:
+            append_boot_history(profiler, self.config_cache_dir, extra={"state": self.state.value})
 
     def stop(self):
         """
         Clean shutdown.
         """
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
         logger.info("Stopping all services...")
+        self.reactor.stop()
+        if self.config_syncer:
+            self.config_syncer.stop()
+        if isinstance(self.config_source, ControlPlaneClient):
+            self.config_source.close()
+        if self.health_checker:
+            self.health_checker.stop()
+        if self._snapshot_writer:
+            self._snapshot_writer.close()
+        if self.render_queue:
+            self.render_queue.stop()
+        if self.recorder:
+            self.recorder.end(self.state, self.deck_keys())
+        if self.renderer:
+            self.renderer.close()
         if self.hardware_manager:
             self.hardware_manager.stop()
+        if self.journal:
+            self.journal.close()
+        logger.info(f"State metrics: {self.machine.metrics()}")
         logger.info("Agent Stopped.")
 
 if __name__ == "__main__":
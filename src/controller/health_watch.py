@@ -0,0 +1,228 @@
+"""
+controller/health_watch.py — Keeps the preflight checklist up to date while running.
+
+Preflight only runs once at boot. If the headset mic is unplugged during a
+show, the agent must notice and stop offering talk. This module re-runs the
+preflight checks WHILE RUNNING, but only when needed:
+
+    1. The USB monitor reports a plug/unplug event (no polling!)
+    2. Events are "coalesced": one plug-in produces a burst of udev events
+       (usb, sound, hid, input...), so we wait `coalesce_window` seconds
+       after the first one and handle the whole burst at once
+    3. Only the checks whose `triggers` match the subsystems in the burst
+       are re-run (a sound event re-runs the audio checks, not the deck check)
+    4. The combined results decide the agent state:
+           any CRITICAL check failing → SAFE_MODE (talk forcibly off)
+           any WARNING check failing  → DEGRADED
+           everything passing         → LIVE
+
+The time from the first udev event to the state change is measured and
+kept in `latencies_ms`. Re-checks are given a deadline so that this stays
+under `latency_budget_ms`.
+
+How to use:
+    checker = ContinuousHealthChecker(
+        config_cache_dir, profile, on_state_change=controller.on_health_state,
+        initial=bootstrap_outcome.preflight,
+    )
+    hardware_manager.add_usb_listener(checker.on_udev_event)
+"""
+
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+from src.shared.enums import AgentState, CheckStatus
+from src.bootstrap.preflight import (
+    DEFAULT_REGISTRY,
+    PreflightContext,
+    PreflightRegistry,
+    PreflightResult,
+    PreflightSummary,
+    build_alsa_inventory,
+    is_critical_failure,
+    run_preflight_checks,
+)
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("health_watch")
+
+DEFAULT_COALESCE_WINDOW = 0.2     # seconds to gather a burst of udev events
+DEFAULT_LATENCY_BUDGET_MS = 1000.0
+
+
+def state_for_results(results: list[PreflightResult]) -> AgentState:
+    """Decide LIVE / DEGRADED / SAFE_MODE from a set of check results."""
+    if any(is_critical_failure(r) for r in results):
+        return AgentState.SAFE_MODE
+    failed = [r for r in results if r.status == CheckStatus.FAIL]
+    if failed:
+        return AgentState.DEGRADED
+    return AgentState.LIVE
+
+
+class ContinuousHealthChecker:
+    """
+    Holds the latest result of every preflight check and re-runs the
+    affected ones when udev reports a change.
+    """
+    def __init__(
+        self,
+        config_cache_dir: str | Path,
+        profile: str | None,
+        on_state_change: Callable[[AgentState, str], None],
+        initial: PreflightSummary | None = None,
+        registry: PreflightRegistry | None = None,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS,
+    ):
+        self.config_cache_dir = Path(config_cache_dir)
+        self.profile = profile
+        self.on_state_change = on_state_change
+        self.registry = registry or DEFAULT_REGISTRY
+        self.coalesce_window = coalesce_window
+        self.latency_budget_ms = latency_budget_ms
+
+        # Latest result per check name (starts with the boot preflight)
+        self.results: dict[str, PreflightResult] = {}
+        if initial:
+            self.results = {r.check_name: r for r in initial.results}
+        self.state = state_for_results(list(self.results.values()))
+
+        # Event → state-change latency for the last evaluations (ms)
+        self.latencies_ms = deque(maxlen=100)
+        self.evaluations = 0
+
+        self._lock = profiled_lock("health_watch")
+        self._eval_lock = profiled_lock("health_watch.eval")
+        self._pending: set[str] = set()
+        self._first_event_at: float | None = None
+        self._timer: threading.Timer | None = None
+
+    # ── Inputs ─────────────────────────────────────
+
+    def on_udev_event(self, device) -> None:
+        """
+        USB listener: remember which subsystem changed and schedule ONE
+        evaluation for the whole burst.
+        """
+        subsystem = getattr(device, "subsystem", None)
+        if not subsystem:
+            return
+        with self._lock:
+            self._pending.add(subsystem)
+            if self._timer is None:
+                self._first_event_at = time.monotonic()
+                self._timer = threading.Timer(self.coalesce_window, self._run_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def apply_summary(self, summary: PreflightSummary) -> None:
+        """Take in a full preflight run (e.g. the background re-check after a warm restart)."""
+        with self._eval_lock:
+            for r in summary.results:
+                self.results[r.check_name] = r
+            self._update_state("full preflight re-check", None)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+
+    # ── Evaluation ─────────────────────────────────
+
+    def _run_pending(self) -> None:
+        with self._lock:
+            subsystems = self._pending
+            first_event_at = self._first_event_at
+            self._pending = set()
+            self._first_event_at = None
+            self._timer = None
+        try:
+            self.evaluate(subsystems, first_event_at)
+        except Exception as e:
+            logger.error(f"Continuous health check failed: {e}")
+
+    def evaluate(self, subsystems: set[str], first_event_at: float | None = None) -> AgentState:
+        """
+        Re-run the checks triggered by `subsystems` and update the state.
+        Returns the (possibly new) state.
+        """
+        with self._eval_lock:
+            checks = self._affected_checks(subsystems)
+            if not checks:
+                return self.state
+
+            # Leave room in the latency budget for the coalescing wait
+            started = time.monotonic()
+            waited = started - first_event_at if first_event_at is not None else 0.0
+            deadline = max(0.05, self.latency_budget_ms / 1000.0 - waited)
+
+            # A dependency that is NOT being re-run keeps its last result;
+            # if that result is not PASS, the dependent is skipped as at boot.
+            names = {c.name for c in checks}
+            runnable = []
+            for check in checks:
+                blocked = [d for d in check.depends_on if d not in names
+                           and d in self.results and self.results[d].status != CheckStatus.PASS]
+                if blocked:
+                    self.results[check.name] = PreflightResult(
+                        check.name, check.severity, CheckStatus.SKIP,
+                        f"Skipped: depends on {blocked} which did not pass")
+                else:
+                    runnable.append(check)
+
+            context = PreflightContext(
+                config_cache_dir=self.config_cache_dir,
+                inventory=build_alsa_inventory(timeout=deadline),
+                profile=self.profile,
+            )
+            for result in run_preflight_checks(runnable, context, check_timeout=deadline,
+                                               deadline=deadline, started=started):
+                self.results[result.check_name] = result
+
+            self.evaluations += 1
+            reason = f"re-checked {sorted(names)} after udev events on {sorted(subsystems)}"
+            return self._update_state(reason, first_event_at)
+
+    def _affected_checks(self, subsystems: set[str]) -> list:
+        """Checks triggered by `subsystems`, plus everything that depends on them."""
+        all_checks = self.registry.select(self.profile)
+        names = {c.name for c in all_checks if c.triggers & subsystems}
+        grew = bool(names)
+        while grew:
+            grew = False
+            for check in all_checks:
+                if check.name not in names and any(d in names for d in check.depends_on):
+                    names.add(check.name)
+                    grew = True
+        return [c for c in all_checks if c.name in names]
+
+    def _update_state(self, reason: str, first_event_at: float | None) -> AgentState:
+        new_state = state_for_results(list(self.results.values()))
+        failing = [r.check_name for r in self.results.values() if r.status == CheckStatus.FAIL]
+
+        if new_state != self.state:
+            old_state, self.state = self.state, new_state
+            logger.warning(f"Health: {old_state.value} -> {new_state.value} "
+                           f"({reason}; failing={failing})")
+            try:
+                self.on_state_change(new_state, f"{reason}; failing={failing}")
+            except Exception as e:
+                logger.error(f"Health state listener failed: {e}")
+
+        if first_event_at is not None:
+            latency_ms = (time.monotonic() - first_event_at) * 1000.0
+            self.latencies_ms.append(latency_ms)
+            if latency_ms > self.latency_budget_ms:
+                logger.warning(f"Health detection took {latency_ms:.0f} ms "
+                               f"(budget {self.latency_budget_ms:.0f} ms)")
+            else:
+                logger.debug("Health detection took %.1f ms", latency_ms)
+
+        return self.state
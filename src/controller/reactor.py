@@ -0,0 +1,195 @@
+"""
+controller/reactor.py — One event loop for everything the controller reacts to.
+
+Before this, the controller slept in a `while True: time.sleep(1)` loop and
+the real work happened on threads it could not see or stop. The reactor
+puts it all on ONE asyncio loop instead:
+
+    udev events     the USB monitor's socket is watched by the loop itself
+    timers          `every()` runs periodic jobs (system sampling, config sync)
+    signals         anything can `post()` an event from any thread
+                    (e.g. the pressure level changed)
+
+Events are handled one at a time, in the order they arrived, so two
+handlers never race each other.
+
+Work that blocks (Pillow drawing, ctypes USB writes, HTTP calls, psutil)
+must not run on the loop, or every other event would wait. It goes to a
+small thread pool with `await reactor.run_blocking(func, ...)`.
+
+`stop()` (safe from any thread or a signal handler) cancels every task,
+removes the fd watchers and waits for the pool, so shutdown is clean.
+
+How to use:
+    reactor = Reactor()
+    reactor.on("pressure", handle_pressure)          # sync or async handler
+    hardware_manager.subscribe_pressure(lambda level: reactor.post("pressure", level))
+
+    async def setup():
+        reactor.every(60.0, syncer.reconcile)         # runs in the pool
+    reactor.run(setup())                              # blocks until stop()
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("reactor")
+
+DEFAULT_MAX_WORKERS = 2   # threads for blocking work (a Pi has 4 cores)
+
+
+class Reactor:
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+        # Counters (handy for tests and health rollups)
+        self.dispatched = 0
+        self.dispatch_latency_ms = deque(maxlen=256)   # post() → handler start
+
+        self._handlers: dict[str, list[Callable]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._readers: list[int] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._stopped: asyncio.Event | None = None
+        self._ready = threading.Event()
+        self._stop_requested = False
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    # ── Running ────────────────────────────────────
+
+    def run(self, setup=None) -> None:
+        """
+        Run the loop on this thread until stop() is called.
+        `setup` (a coroutine) runs first, on the loop.
+        """
+        asyncio.run(self._main(setup))
+
+    def stop(self) -> None:
+        """Ask the loop to shut down. Safe from any thread."""
+        self._stop_requested = True
+        if self.loop is not None and self._stopped is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass   # Loop already closed
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the loop is running (for other threads and tests)."""
+        return self._ready.wait(timeout)
+
+    async def _main(self, setup) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="ReactorWorker")
+        try:
+            if setup is not None:
+                await setup
+            self._ready.set()
+            if not self._stop_requested:
+                await self._stopped.wait()
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        for fd in self._readers:
+            self.loop.remove_reader(fd)
+        self._readers.clear()
+
+        tasks = [t for t in self._tasks if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        # Don't wait for jobs that are stuck in a blocking call forever
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Reactor stopped ({self.dispatched} events dispatched)")
+
+    # ── Events ─────────────────────────────────────
+
+    def on(self, event: str, handler: Callable) -> None:
+        """Call `handler(*args)` for every post(event, *args). May be async."""
+        self._handlers.setdefault(event, []).append(handler)
+
+    def post(self, event: str, *args) -> None:
+        """Queue an event. Safe from any thread; handled in arrival order."""
+        if self.loop is None:
+            return
+        posted_at = time.monotonic()
+        try:
+            self.loop.call_soon_threadsafe(self._dispatch, event, args, posted_at)
+        except RuntimeError:
+            pass   # Loop already closed (shutting down)
+
+    def _dispatch(self, event: str, args: tuple, posted_at: float) -> None:
+        self.dispatch_latency_ms.append((time.monotonic() - posted_at) * 1000.0)
+        self.dispatched += 1
+        for handler in self._handlers.get(event, []):
+            try:
+                result = handler(*args)
+                if inspect.isawaitable(result):
+                    self.spawn(result, name=f"event:{event}")
+            except Exception as e:
+                logger.error(f"Handler for {event!r} failed: {e}")
+
+    # ── Tasks, timers, fds ─────────────────────────
+
+    def spawn(self, coro, name: str | None = None) -> asyncio.Task:
+        """Run a coroutine on the loop; it is cancelled on stop()."""
+        task = self.loop.create_task(self._guard(coro, name), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @staticmethod
+    async def _guard(coro, name: str | None):
+        try:
+            return await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Task {name or coro!r} failed: {e}")
+
+    def every(self, interval: float | Callable[[], float], func: Callable, name: str | None = None,
+              blocking: bool = True) -> asyncio.Task:
+        """
+        Run `func()` now and then every `interval` seconds (`interval` may be
+        a function, read each time — e.g. slower under pressure).
+        blocking=True runs func in the thread pool. A failure is logged and
+        the timer keeps going.
+        """
+        async def loop():
+            while True:
+                try:
+                    if blocking:
+                        await self.run_blocking(func)
+                    else:
+                        result = func()
+                        if inspect.isawaitable(result):
+                            await result
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Timer {name or func!r} failed: {e}")
+                await asyncio.sleep(interval() if callable(interval) else interval)
+        return self.spawn(loop(), name=name)
+
+    def add_reader(self, fd: int, callback: Callable[[], None]) -> None:
+        """Call `callback()` on the loop whenever `fd` is readable (e.g. a udev socket)."""
+        self.loop.add_reader(fd, callback)
+        self._readers.append(fd)
+
+    async def run_blocking(self, func: Callable, *args):
+        """Run a blocking function in the bounded thread pool and await its result."""
+        return await self.loop.run_in_executor(self._executor, func, *args)
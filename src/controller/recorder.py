@@ -0,0 +1,106 @@
+"""
+controller/recorder.py — Records every input the controller sees.
+
+"The Director key flickered twice during the second act" is hard to act
+on. With recording switched on, the agent writes down everything that
+came IN, with the time it came in:
+
+    {"kind": "start", "state": "LIVE", "health_state": "LIVE", "config": {...}, "talk_states": {}}
+    {"t": 12.031402, "kind": "key", "key": 3, "pressed": true}
+    {"t": 12.270911, "kind": "key", "key": 3, "pressed": false}
+    {"t": 14.5, "kind": "udev", "action": "remove", "subsystem": "sound", "sys_name": "card1", ...}
+    {"t": 15.0, "kind": "metrics", "cpu_percent": 97.5, ...}
+    {"t": 15.2, "kind": "health", "state": "SAFE_MODE", "reason": "headset_mic failed"}
+    {"t": 31.8, "kind": "config", "config": {"version": 43, ...}}
+    {"t": 3601.2, "kind": "end", "state": "LIVE", "keys": {"1": ["Director", "GREY"], ...}}
+
+`t` is seconds since the recording began. The "end" line says what the
+deck showed when recording stopped, so a replay can check it ends up the
+same (see replay.py).
+
+Health decisions are recorded as inputs too: they come from probing this
+Pi's sound cards and HID devices, which a replay on another machine can't
+repeat.
+
+Lines are buffered in memory and written in chunks, so recording adds no
+disk write to a key press. (A crash loses the last unwritten lines.)
+
+How to use:
+    recorder = InputRecorder("/var/cache/ixg-agent/show.jsonl")
+    controller = MainController(recorder=recorder)
+"""
+
+import json
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.config_sync.store import StationConfig, config_to_dict
+from src.shared.enums import AgentState
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("recorder")
+
+
+class InputRecorder:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.events = 0
+        self._file = None
+        self._started_at = 0.0
+        self._lock = profiled_lock("input_recorder")
+
+    @property
+    def recording(self) -> bool:
+        return self._file is not None
+
+    def begin(self, state: AgentState, health_state: AgentState, config: StationConfig,
+              talk_states: dict[str, bool]) -> None:
+        """Start a new recording (the header says where the replay has to start from)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._file = open(self.path, "w")
+            self._started_at = time.monotonic()
+            self._write({
+                "kind": "start",
+                "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "state": state.value,
+                "health_state": health_state.value,
+                "config": config_to_dict(config),
+                "talk_states": talk_states,
+            })
+        logger.info(f"Recording controller inputs to {self.path}")
+
+    def record(self, kind: str, **data) -> None:
+        """One input. Does nothing until begin()."""
+        if self._file is None:
+            return
+        entry = {"t": round(time.monotonic() - self._started_at, 6), "kind": kind, **data}
+        with self._lock:
+            if self._file is not None:
+                self._write(entry)
+                self.events += 1
+
+    def record_metrics(self, metrics) -> None:
+        self.record("metrics", **asdict(metrics))
+
+    def record_udev(self, device) -> None:
+        self.record("udev", action=device.action, subsystem=device.subsystem,
+                    sys_name=str(device.sys_name), device_path=str(device.device_path),
+                    properties={k: device.get(k) for k in ("ID_MODEL", "ID_VENDOR") if device.get(k)})
+
+    def end(self, state: AgentState, keys: dict[int, tuple[str, str]]) -> None:
+        """Write what the deck shows now and close the file."""
+        self.record("end", state=state.value, keys={str(k): list(v) for k, v in keys.items()})
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logger.info(f"Recorded {self.events} controller inputs to {self.path}")
+
+    def _write(self, entry: dict) -> None:
+        """Lock must be held."""
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
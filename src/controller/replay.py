@@ -0,0 +1,354 @@
+"""
+controller/replay.py — Plays a recording (see recorder.py) back into a MainController.
+
+The controller under replay is the REAL one: real state machine, talk
+engine, config store and renderer. Only the edges are fake:
+
+    deck            FakeDeck / FakeTransport (ui_renderer/fake_device.py)
+    USB + metrics   FakeHardwareManager (hardware_manager/fake.py)
+    health checks   the recorded decisions, in order
+    control plane   the recorded configs, in order
+
+Inputs are fed at the speed they were recorded (speed=1.0), faster
+(speed=10.0) or as fast as possible (speed=None). The talk engine gets the
+RECORDED time of every key event, so taps, holds and switch bounce are
+judged exactly as they were during the show, whatever the speed: the same
+recording always gives the same result.
+
+The report says:
+    - how long each kind of input took to handle (and key press → USB write)
+    - what the deck shows at the end, and whether that matches what the
+      recording says the deck showed (`mismatches`)
+
+So a recorded show hour becomes a performance regression test.
+
+How to use:
+    report = ReplayHarness("show.jsonl", "/tmp/replay-cache", speed=None).run()
+    assert not report.mismatches
+    print(report.format())
+
+From the command line:
+    python -m src.controller.replay show.jsonl            # as fast as possible
+    python -m src.controller.replay show.jsonl --speed 1  # real time
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.shared.enums import AgentState
+from src.config_sync.store import ConfigStore, StationConfig, config_from_dict
+from src.hardware_manager.fake import FakeHardwareManager, FakeUdevDevice
+from src.hardware_manager.system import SystemMetrics
+from src.ui_renderer.fake_device import FakeDeck, FakeTransport, KeyWrite
+from src.ui_renderer.renderer import MiraBoxRenderer
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("replay")
+
+# Every kind of input a recording can hold
+INPUT_KINDS = ("key", "udev", "metrics", "config", "health")
+
+
+def load_recording(path: str | Path) -> tuple[dict, list[dict], dict | None]:
+    """
+    Read a recording: (start header, inputs in time order, end record or None).
+
+    Raises:
+        ValueError: If the file doesn't start with a "start" header.
+    """
+    header, inputs, end = None, [], None
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["kind"] == "start":
+                header = entry
+            elif entry["kind"] == "end":
+                end = entry
+            elif entry["kind"] in INPUT_KINDS:
+                inputs.append(entry)
+    if header is None:
+        raise ValueError(f"{path} is not a recording (no start line)")
+    inputs.sort(key=lambda e: e["t"])
+    return header, inputs, end
+
+
+# ──────────────────────────────────────────────────
+# Stand-ins for the recorded edges
+# ──────────────────────────────────────────────────
+
+class ReplayConfigSource:
+    """A config source that only knows the config the recording says arrived last."""
+    def __init__(self, config: StationConfig):
+        self.config = config
+
+    def deltas_since(self, version: int):
+        return [] if version == self.config.version else None   # None → fetch full_config()
+
+    def full_config(self) -> StationConfig:
+        return self.config
+
+
+class ReplayHealthChecker:
+    """Replaces the continuous health checker: its decisions are in the recording."""
+    def __init__(self, state: AgentState):
+        self.state = state
+
+    def on_udev_event(self, device) -> None:
+        pass
+
+    def apply_summary(self, summary) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class _ReplayClock:
+    """The talk engine's clock: stands still at the recorded time of the current input."""
+    def __init__(self):
+        self.base = time.monotonic()
+        self.offset = 0.0
+
+    def now(self) -> float:
+        return self.base + self.offset
+
+
+# ──────────────────────────────────────────────────
+# Report
+# ──────────────────────────────────────────────────
+
+@dataclass
+class ReplayReport:
+    """
+    What happened during one replay.
+
+    Fields:
+        inputs: Inputs fed to the controller
+        recorded_seconds: Length of the recording
+        replay_seconds: How long the replay took
+        final_state: The controller's state at the end
+        keys: What every key shows at the end: key → (label, color)
+        latencies_ms: Stage → handling times in ms. Stages are the input
+                      kinds, plus "key_to_write" (key event → USB write)
+        mismatches: Differences from the recording's "end" line (empty = same)
+    """
+    inputs: int
+    recorded_seconds: float
+    replay_seconds: float
+    final_state: AgentState
+    keys: dict[int, tuple[str, str]]
+    latencies_ms: dict[str, list[float]] = field(default_factory=dict)
+    mismatches: list[str] = field(default_factory=list)
+
+    def stage_summary(self) -> dict[str, dict]:
+        """Stage → {count, p50_ms, p95_ms, max_ms}."""
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "max_ms": round(max(values), 3),
+            }
+            for stage, values in sorted(self.latencies_ms.items()) if values
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"Replayed {self.inputs} inputs ({self.recorded_seconds:.1f} s recorded) "
+            f"in {self.replay_seconds:.2f} s; final state {self.final_state.value}",
+            f"  {'stage':<14} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}",
+        ]
+        for stage, s in self.stage_summary().items():
+            lines.append(f"  {stage:<14} {s['count']:>7} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['max_ms']:>9.3f}")
+        if self.mismatches:
+            lines.append("MISMATCHES:")
+            lines.extend(f"  {m}" for m in self.mismatches)
+        else:
+            lines.append("Deck and state match the recording.")
+        return "\n".join(lines)
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+# ──────────────────────────────────────────────────
+# The harness
+# ──────────────────────────────────────────────────
+
+class ReplayHarness:
+    def __init__(
+        self,
+        recording: str | Path,
+        cache_dir: str | Path,
+        speed: float | None = 1.0,
+        write_delay: float = 0.0,
+    ):
+        """
+        Args:
+            recording: A file written by InputRecorder
+            cache_dir: An empty directory for the controller's files
+            speed: 1.0 = as recorded, 10.0 = ten times faster, None = no waiting
+            write_delay: Seconds every fake USB write takes (a slow deck)
+        """
+        self.recording = Path(recording)
+        self.cache_dir = Path(cache_dir)
+        self.speed = speed
+        self.deck = FakeDeck(FakeTransport(write_delay))
+        self.hardware = FakeHardwareManager()
+        self.controller = None
+
+        self._latencies: dict[str, list[float]] = {}
+        self._key_sent_at: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def run(self) -> ReplayReport:
+        header, inputs, end = load_recording(self.recording)
+        controller = self._start(header)
+        self.controller = controller
+
+        started = time.perf_counter()
+        try:
+            for entry in inputs:
+                self._wait_until(started, entry["t"])
+                self._feed(controller, entry)
+            if inputs:
+                # A release that was still waiting out the debounce time is real
+                self._clock.offset = inputs[-1]["t"] + controller.talk_engine.debounce
+                controller.talk_engine.settle()
+            if controller.render_queue:
+                controller.render_queue.wait_idle()   # label updates the queue still holds
+        finally:
+            replay_seconds = time.perf_counter() - started
+            controller.stop()
+
+        report = ReplayReport(
+            inputs=len(inputs),
+            recorded_seconds=inputs[-1]["t"] if inputs else 0.0,
+            replay_seconds=replay_seconds,
+            final_state=controller.state,
+            keys=controller.deck_keys(),
+            latencies_ms=self._latencies,
+        )
+        if end is not None:
+            report.mismatches = self._compare(report, end)
+        return report
+
+    # ── Setup ──────────────────────────────────────
+
+    def _start(self, header: dict):
+        """A controller in the state the recording started in, on fake hardware."""
+        # Imported here: the controller package imports this module's neighbours
+        from src.controller import MainController
+
+        config = config_from_dict(header["config"])
+        if config.version > 0:
+            ConfigStore(self.cache_dir).replace(config)
+
+        controller = MainController(
+            config_source=ReplayConfigSource(config),
+            hardware_manager=self.hardware,
+            renderer=MiraBoxRenderer(device=self.deck),
+            health_checker=ReplayHealthChecker(AgentState(header["health_state"])),
+        )
+        controller.config_cache_dir = self.cache_dir
+        controller._fingerprint = "replay"          # don't probe this machine's hardware
+
+        self._clock = _ReplayClock()
+        controller.talk_engine.clock = self._clock.now
+        self.deck.transport.on_write = self._on_write
+
+        controller.machine.transition(AgentState.DISCOVERING_HW, "replay")
+        controller.start_services()
+        if controller.config_syncer:
+            controller.config_syncer.stop()          # configs come from the recording, in order
+        start_state = AgentState(header["state"])
+        if controller.state != start_state and controller.machine.can_transition(start_state):
+            controller.machine.transition(start_state, "replay start")
+        controller.talk_engine.restore(header.get("talk_states", {}))
+        controller._paint()
+        controller.renderer.set_key_callback(controller._on_key)
+        return controller
+
+    def _wait_until(self, started: float, t: float) -> None:
+        if self.speed:
+            delay = t / self.speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+    # ── Feeding inputs ─────────────────────────────
+
+    def _feed(self, controller, entry: dict) -> None:
+        kind = entry["kind"]
+        self._clock.offset = entry["t"]
+        began = time.perf_counter()
+
+        if kind == "key":
+            with self._lock:
+                self._key_sent_at[entry["key"]] = began
+            if entry["pressed"]:
+                self.deck.press(entry["key"])
+            else:
+                self.deck.release(entry["key"])
+            with self._lock:
+                self._key_sent_at.pop(entry["key"], None)   # no write: not a talk change
+        elif kind == "udev":
+            self.hardware.emit_usb(FakeUdevDevice(
+                entry["action"], entry["subsystem"], entry["sys_name"],
+                entry.get("device_path", ""), entry.get("properties", {})))
+        elif kind == "metrics":
+            self.hardware.feed_metrics(SystemMetrics(**{
+                k: v for k, v in entry.items() if k not in ("t", "kind")}))
+        elif kind == "config":
+            controller.config_source.config = config_from_dict(entry["config"])
+            controller.config_syncer.try_reconcile()
+        elif kind == "health":
+            controller.health_checker.state = AgentState(entry["state"])
+            controller._on_health_state(AgentState(entry["state"]), entry.get("reason", ""))
+
+        self._add_latency(kind, (time.perf_counter() - began) * 1000.0)
+
+    def _on_write(self, write: KeyWrite) -> None:
+        """FakeTransport hook: a key image went out. Was it for a key press?"""
+        with self._lock:
+            sent_at = self._key_sent_at.pop(write.key, None)
+        if sent_at is not None:
+            self._add_latency("key_to_write", (time.perf_counter() - sent_at) * 1000.0)
+
+    def _add_latency(self, stage: str, ms: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(stage, []).append(ms)
+
+    # ── Checking ───────────────────────────────────
+
+    def _compare(self, report: ReplayReport, end: dict) -> list[str]:
+        mismatches = []
+        if report.final_state.value != end["state"]:
+            mismatches.append(f"state: recorded {end['state']}, replayed {report.final_state.value}")
+        recorded_keys = {int(k): tuple(v) for k, v in end.get("keys", {}).items()}
+        for key in sorted(recorded_keys.keys() | report.keys.keys()):
+            recorded, replayed = recorded_keys.get(key), report.keys.get(key)
+            if recorded != replayed:
+                mismatches.append(f"key {key}: recorded {recorded}, replayed {replayed}")
+        return mismatches
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    speed = None
+    if "--speed" in args:
+        index = args.index("--speed")
+        speed = float(args[index + 1])
+        del args[index:index + 2]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        report = ReplayHarness(args[0], cache_dir, speed=speed).run()
+    print(report.format())
+    sys.exit(1 if report.mismatches else 0)
@@ -0,0 +1,219 @@
+"""
+controller/snapshot.py — Remembers what the deck looked like, for crash restarts.
+
+If the agent crashes in the middle of a show, the operator stares at a dark
+deck until boot has finished again. To avoid that, the controller keeps a
+small snapshot on disk:
+
+    {
+        "state": "LIVE",
+        "saved_at": 1760850000.1,
+        "fingerprint": "3fa4c2...",          # hardware fingerprint at the time
+        "deck": {"vendor_id": 21760, "product_id": 4097,
+                 "hidraw": "/dev/hidraw3", "usb_interface": "1-1.3:1.0"},
+        "talk_states": {"producer": true},    # latched channels
+        "view_model": {"is_online": true, "channels": [...]}
+    }
+
+On the next start, if the snapshot is recent and the hardware fingerprint
+still matches, the controller connects straight to the saved deck and
+paints the last view model GREYED OUT ("recovering") before bootstrap even
+begins. Once boot completes, the real view model replaces it.
+
+Writing is cheap but not free (SD card wear), so the SnapshotWriter:
+    - only writes when something changed (or every `refresh_interval`
+      seconds, so a quiet but healthy station still has a recent snapshot)
+    - writes at most once every `min_interval` seconds (a change in between
+      is written when the interval is up)
+    - writes to a temp file and renames it (never a half-written snapshot)
+
+How to use:
+    writer = SnapshotWriter(cache_dir)
+    writer.update(snapshot)          # cheap, call as often as you like
+    writer.close()                   # writes anything pending
+
+    snapshot = load_snapshot(cache_dir, max_age=300)
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.shared.enums import AgentState
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("snapshot")
+
+SNAPSHOT_FILE_NAME = "agent_snapshot.json"
+DEFAULT_MIN_INTERVAL = 2.0    # seconds between snapshot writes
+DEFAULT_REFRESH_INTERVAL = 60.0   # rewrite an unchanged snapshot this often (keeps it "recent")
+DEFAULT_MAX_AGE = 300.0       # older snapshots are not trusted for a fast restart
+
+
+@dataclass
+class AgentSnapshot:
+    """
+    What the agent looked like at one moment.
+
+    Fields:
+        state: The AgentState at the time
+        view_model: What the deck was showing
+        talk_states: channel_id → True for latched (talking) channels
+        deck: The connected MiraBox (vendor_id, product_id, hidraw,
+              usb_interface) or None
+        fingerprint: hardware_fingerprint() at the time
+        saved_at: Unix time it was taken
+    """
+    state: AgentState
+    view_model: MiraBoxViewModel
+    talk_states: dict[str, bool] = field(default_factory=dict)
+    deck: dict | None = None
+    fingerprint: str = ""
+    saved_at: float = 0.0
+
+
+def snapshot_to_dict(snapshot: AgentSnapshot) -> dict:
+    return {
+        "state": snapshot.state.value,
+        "saved_at": snapshot.saved_at,
+        "fingerprint": snapshot.fingerprint,
+        "deck": snapshot.deck,
+        "talk_states": snapshot.talk_states,
+        "view_model": {
+            "is_online": snapshot.view_model.is_online,
+            "channels": [
+                {"index": c.index, "label": c.label, "color": c.color.value, "icon": c.icon}
+                for c in snapshot.view_model.channels
+            ],
+        },
+    }
+
+
+def snapshot_from_dict(data: dict) -> AgentSnapshot:
+    vm = data["view_model"]
+    return AgentSnapshot(
+        state=AgentState(data["state"]),
+        view_model=MiraBoxViewModel(
+            is_online=bool(vm["is_online"]),
+            channels=[
+                ChannelView(int(c["index"]), str(c["label"]), ButtonColor(c["color"]), c.get("icon"))
+                for c in vm["channels"]
+            ],
+        ),
+        talk_states={str(k): bool(v) for k, v in data.get("talk_states", {}).items()},
+        deck=data.get("deck"),
+        fingerprint=str(data.get("fingerprint", "")),
+        saved_at=float(data.get("saved_at", 0.0)),
+    )
+
+
+def recovering_view(view_model: MiraBoxViewModel) -> MiraBoxViewModel:
+    """
+    The last view model, greyed out: same labels on the same keys, but no
+    key shows RED (nobody is really talking until the agent is back).
+    """
+    return MiraBoxViewModel(
+        is_online=False,
+        channels=[
+            ChannelView(c.index, c.label,
+                        ButtonColor.BLACK if c.color == ButtonColor.BLACK else ButtonColor.GREY,
+                        c.icon)
+            for c in view_model.channels
+        ],
+    )
+
+
+def load_snapshot(cache_dir: str | Path, max_age: float = DEFAULT_MAX_AGE) -> AgentSnapshot | None:
+    """The saved snapshot if it exists and is recent enough, else None (never raises)."""
+    path = Path(cache_dir) / SNAPSHOT_FILE_NAME
+    try:
+        with open(path, "r") as f:
+            snapshot = snapshot_from_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+    age = time.time() - snapshot.saved_at
+    if age < 0 or age > max_age:
+        logger.info(f"Snapshot is {age:.0f}s old (max {max_age:.0f}s), not resuming from it")
+        return None
+    return snapshot
+
+
+class SnapshotWriter:
+    """Saves AgentSnapshots: only on change, rate-limited, atomically."""
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self.path = Path(cache_dir) / SNAPSHOT_FILE_NAME
+        self.min_interval = min_interval
+        self.refresh_interval = refresh_interval
+        self.writes = 0
+
+        self._lock = profiled_lock("snapshot_writer")
+        self._pending: dict | None = None      # newest content not yet written
+        self._last_written: dict | None = None
+        self._last_write_at = 0.0
+        self._timer: threading.Timer | None = None
+
+    def update(self, snapshot: AgentSnapshot) -> None:
+        """Offer the current snapshot. Written now, later, or not at all (unchanged)."""
+        data = snapshot_to_dict(snapshot)
+        with self._lock:
+            if self._same_content(data, self._pending or self._last_written):
+                if self._pending or time.monotonic() - self._last_write_at < self.refresh_interval:
+                    return
+            self._pending = data
+            wait = self._last_write_at + self.min_interval - time.monotonic()
+            if wait <= 0:
+                self._write_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write the pending snapshot now (if any)."""
+        with self._lock:
+            self._write_locked()
+
+    def close(self) -> None:
+        self.flush()
+
+    @staticmethod
+    def _same_content(a: dict, b: dict | None) -> bool:
+        """Equal apart from the time it was taken."""
+        if b is None:
+            return False
+        return {k: v for k, v in a.items() if k != "saved_at"} == \
+               {k: v for k, v in b.items() if k != "saved_at"}
+
+    def _write_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending is None:
+            return
+
+        data, self._pending = self._pending, None
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save snapshot: {e}")
+            return
+        self._last_written = data
+        self._last_write_at = time.monotonic()
+        self.writes += 1
@@ -0,0 +1,178 @@
+"""
+controller/state_machine.py — The rules for moving between AgentStates.
+
+AgentState (see shared/enums.py) only names the stages. This module says
+which moves between them are ALLOWED, and tells everyone who cares when
+one happens:
+
+    BOOTING ──► DISCOVERING_HW ──► REGISTERING ──► SYNCING_CONFIG ──► READY
+                                                                        │
+                         SAFE_MODE ◄──► DEGRADED ◄──► LIVE ◄────────────┘
+
+(plus a few shortcuts, see TRANSITIONS below). Any state can fall into
+SAFE_MODE; BOOTING can only be left, never re-entered.
+
+The table is a dict of frozensets, so checking a move is one lookup. A move
+that is not in the table raises StateTransitionError instead of silently
+putting the agent into a state nobody planned for.
+
+Listeners are told about every move:
+    - sync listeners run right away, on the thread that made the move
+      (use these for things that must happen NOW, like forcing talk off)
+    - async listeners are scheduled on an asyncio loop (e.g. the reactor),
+      for slow work like repainting the deck
+
+The machine also keeps simple metrics: how many times each move happened
+and how long the agent spent in each state.
+
+How to use:
+    machine = StateMachine()
+    machine.subscribe(lambda t: print(t.from_state, "->", t.to_state))
+    machine.transition(AgentState.DISCOVERING_HW, "bootstrap passed")
+    print(machine.metrics())
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from src.shared.enums import AgentState
+from src.shared.errors import StateTransitionError
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("state_machine")
+
+S = AgentState
+
+# Every state → the states it may move to
+TRANSITIONS: dict[AgentState, frozenset[AgentState]] = {
+    S.BOOTING: frozenset({S.DISCOVERING_HW, S.SAFE_MODE}),
+    S.DISCOVERING_HW: frozenset({S.REGISTERING, S.SYNCING_CONFIG, S.READY,
+                                 S.LIVE, S.DEGRADED, S.SAFE_MODE}),
+    S.REGISTERING: frozenset({S.SYNCING_CONFIG, S.READY, S.LIVE, S.DEGRADED, S.SAFE_MODE}),
+    S.SYNCING_CONFIG: frozenset({S.REGISTERING, S.READY, S.LIVE, S.DEGRADED, S.SAFE_MODE}),
+    S.READY: frozenset({S.SYNCING_CONFIG, S.LIVE, S.DEGRADED, S.SAFE_MODE}),
+    S.LIVE: frozenset({S.READY, S.DEGRADED, S.SAFE_MODE}),
+    S.DEGRADED: frozenset({S.READY, S.LIVE, S.SAFE_MODE}),
+    S.SAFE_MODE: frozenset({S.READY, S.LIVE, S.DEGRADED}),
+}
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    One move of the state machine.
+
+    Fields:
+        from_state / to_state: Where we were and where we are now
+        reason: Why (for the logs)
+        at: time.monotonic() when it happened (to measure reaction latency)
+    """
+    from_state: AgentState
+    to_state: AgentState
+    reason: str
+    at: float
+
+
+class StateMachine:
+    def __init__(
+        self,
+        initial: AgentState = AgentState.BOOTING,
+        transitions: dict[AgentState, frozenset[AgentState]] | None = None,
+    ):
+        self.transitions = transitions if transitions is not None else TRANSITIONS
+        self._state = initial
+        self._entered_at = time.monotonic()
+        self._lock = profiled_lock("state_machine")
+
+        self._listeners: list[Callable[[Transition], None]] = []
+        self._async_listeners: list[tuple[Callable[[Transition], Awaitable], asyncio.AbstractEventLoop]] = []
+
+        # Metrics
+        self.transition_counts: dict[tuple[AgentState, AgentState], int] = {}
+        self._time_in_state: dict[AgentState, float] = {}
+
+    @property
+    def state(self) -> AgentState:
+        return self._state
+
+    def can_transition(self, to_state: AgentState) -> bool:
+        return to_state in self.transitions.get(self._state, frozenset())
+
+    # ── Listeners ──────────────────────────────────
+
+    def subscribe(self, listener: Callable[[Transition], None]) -> None:
+        """Call `listener(transition)` on the moving thread, right after each move."""
+        self._listeners.append(listener)
+
+    def subscribe_async(self, listener: Callable[[Transition], Awaitable], loop: asyncio.AbstractEventLoop) -> None:
+        """Schedule `await listener(transition)` on `loop` after each move."""
+        self._async_listeners.append((listener, loop))
+
+    # ── Moving ─────────────────────────────────────
+
+    def transition(self, to_state: AgentState, reason: str = "") -> bool:
+        """
+        Move to `to_state`. Returns False (and tells nobody) if we are
+        already there.
+
+        Raises:
+            StateTransitionError: If the move is not in the table.
+        """
+        with self._lock:
+            from_state = self._state
+            if to_state == from_state:
+                return False
+            if to_state not in self.transitions.get(from_state, frozenset()):
+                raise StateTransitionError(
+                    f"{from_state.value} -> {to_state.value} is not allowed ({reason or 'no reason'})")
+
+            now = time.monotonic()
+            self._time_in_state[from_state] = self._time_in_state.get(from_state, 0.0) + (now - self._entered_at)
+            self._state, self._entered_at = to_state, now
+            key = (from_state, to_state)
+            self.transition_counts[key] = self.transition_counts.get(key, 0) + 1
+            transition = Transition(from_state, to_state, reason, now)
+
+        logger.info(f"State {from_state.value} -> {to_state.value}" + (f": {reason}" if reason else ""))
+        self._notify(transition)
+        return True
+
+    def _notify(self, transition: Transition) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(transition)
+            except Exception as e:
+                logger.error(f"State listener {listener!r} failed: {e}")
+
+        for listener, loop in list(self._async_listeners):
+            if loop.is_closed():
+                continue
+            future = asyncio.run_coroutine_threadsafe(listener(transition), loop)
+            future.add_done_callback(self._log_async_failure)
+
+    @staticmethod
+    def _log_async_failure(future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Async state listener failed: {future.exception()}")
+
+    # ── Metrics ────────────────────────────────────
+
+    def time_in_state(self) -> dict[AgentState, float]:
+        """Seconds spent in each state so far (including the current stay)."""
+        with self._lock:
+            totals = dict(self._time_in_state)
+            totals[self._state] = totals.get(self._state, 0.0) + (time.monotonic() - self._entered_at)
+        return totals
+
+    def metrics(self) -> dict:
+        """Plain numbers, ready to log or publish."""
+        with self._lock:
+            counts = {f"{a.value}->{b.value}": n for (a, b), n in self.transition_counts.items()}
+        return {
+            "state": self._state.value,
+            "transitions": counts,
+            "seconds_in_state": {s.value: round(t, 3) for s, t in self.time_in_state().items()},
+        }
@@ -2,31 +2,66 @@
 hardware_manager/__init__.py — The "Boss" of hardware monitoring.
 
 This module starts two background workers:
-1.  System Monitor (Checks CPU/RAM every 5 seconds)
+1.  System Monitor (Checks CPU/RAM every few seconds, logs only changes)
 2.  USB Monitor (Waits for plug/unplug events)
+
+It also publishes a "pressure level" (NORMAL / ELEVATED / CRITICAL) worked
+out from temperature, throttling, CPU and memory. Other subsystems call
+`subscribe_pressure()` to slow down their non-essential work when it rises.
 """
 
 import threading
 import time
+from pathlib import Path
 
 from src.loggingx.event_log import get_logger
-from src.hardware_manager.system import get_system_metrics, log_system_health
+from src.shared.enums import PressureLevel
+from src.hardware_manager.system import HealthConfig, HealthMonitor, get_system_metrics
+from src.hardware_manager.pressure import PressureConfig, PressureMonitor
 from src.hardware_manager.usb import USBWatcher
+from src.bootstrap.preflight_cache import PreflightCache
 
 logger = get_logger("hardware_manager")
 
+# How much slower the system monitor samples at each pressure level
+PRESSURE_SAMPLE_SCALE = {
+    PressureLevel.NORMAL: 1.0,
+    PressureLevel.ELEVATED: 2.0,
+    PressureLevel.CRITICAL: 3.0,
+}
+
 class HardwareManager:
     """
     Orchestrates hardware monitoring threads.
     Runs continuously in the background.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        health_config: HealthConfig | None = None,
+        pressure_config: PressureConfig | None = None,
+        config_cache_dir: str | Path | None = None,
+    ):
         self._stop_event = threading.Event()
+        self.health_config = health_config or HealthConfig()
+        self.health_monitor = HealthMonitor(self.health_config)
+
+        # Pressure level: our own monitors are the first subscribers
+        self.pressure_monitor = PressureMonitor(pressure_config)
+        self._sample_scale = 1.0
+        self.subscribe_pressure(self._on_pressure_change)
+        self.subscribe_pressure(self.health_monitor.apply_pressure)
         self._usb_watcher = USBWatcher()
+        self._metrics_listeners = []
+
+        # Any plug/unplug means the cached preflight result can't be trusted
+        if config_cache_dir is not None:
+            self._preflight_cache = PreflightCache(config_cache_dir)
+            self._usb_watcher.add_listener(lambda device: self._preflight_cache.invalidate())
         
         # Threads
         self._system_thread = None
         self._usb_thread = None
+        self._attached = False   # True when running on a reactor (see attach())
 
     def start(self):
         """
@@ -35,7 +70,7 @@ class HardwareManager:
         logger.info("Starting Hardware Manager...")
         self._stop_event.clear()
 
-        # 1. Start System Monitor Thread (Checks CPU/RAM every 5s)
+        # 1. Start System Monitor Thread (Checks CPU/RAM every sample_interval)
         self._system_thread = threading.Thread(
             target=self._system_monitor_loop,
             name="SystemMonitorThread",
@@ -54,30 +89,81 @@ class HardwareManager:
 
         logger.info("Hardware Manager is RUNNING (Background threads started)")
 
+    def attach(self, reactor):
+        """
+        Run on the controller's reactor instead of our own threads: the loop
+        watches the udev socket, and system sampling becomes a reactor timer.
+        (Use this OR start(), not both.)
+        """
+        logger.info("Starting Hardware Manager (on the reactor)...")
+        self._usb_watcher.monitor.start()
+        reactor.add_reader(self._usb_watcher.monitor.fileno(), self._usb_watcher.drain)
+        reactor.every(self.current_interval, self.sample_once, name="system-monitor")
+        self._attached = True
+
     def stop(self):
         """
         Signal threads to stop.
         """
         logger.info("Stopping Hardware Manager...")
         self._stop_event.set()
+        if self._attached:
+            # The reactor timer has no exit path of its own to flush from
+            self.health_monitor.log_rollup()
         # Note: USB thread might ignore this as pyudev blocks, 
         # but daemon threads will die when main program exits anyway.
 
+    def add_usb_listener(self, callback):
+        """Call `callback(device)` for every USB add/remove event."""
+        self._usb_watcher.add_listener(callback)
+
+    def add_metrics_listener(self, callback):
+        """Call `callback(metrics)` with every system sample (SystemMetrics)."""
+        self._metrics_listeners.append(callback)
+
+    def subscribe_pressure(self, callback):
+        """
+        Call `callback(level)` whenever the pressure level changes
+        (and once right away with the current level).
+        """
+        self.pressure_monitor.subscribe(callback)
+
+    def _on_pressure_change(self, level: PressureLevel):
+        """Sample less often while the Pi is struggling."""
+        self._sample_scale = PRESSURE_SAMPLE_SCALE[level]
+
+    def current_interval(self) -> float:
+        """Seconds until the next system sample (longer under pressure)."""
+        return self.health_config.sample_interval * self._sample_scale
+
+    def sample_once(self):
+        """Take one system sample."""
+        # 1. Get stats
+        metrics = get_system_metrics()
+        # 2. Track them (only logs OK<->HIGH changes and rollups)
+        self.health_monitor.observe(metrics)
+        # 3. Update the pressure level (notifies subscribers on change)
+        self.pressure_monitor.observe(metrics)
+        for callback in list(self._metrics_listeners):
+            try:
+                callback(metrics)
+            except Exception as e:
+                logger.error(f"Metrics listener failed: {e}")
+
     def _system_monitor_loop(self):
         """
         Periodically check system health.
         """
         while not self._stop_event.is_set():
             try:
-                # 1. Get stats
-                metrics = get_system_metrics()
-                # 2. Log them (warn if high)
-                log_system_health(metrics)
+                self.sample_once()
             except Exception as e:
                 logger.error(f"Error in System Monitor: {e}")
 
-            # Sleep for 5 seconds (or until stopped)
-            if self._stop_event.wait(timeout=5.0):
+            # Sleep until the next sample (or until stopped)
+            if self._stop_event.wait(timeout=self.current_interval()):
                 break
-        
+
+        # Flush whatever we collected since the last rollup
+        self.health_monitor.log_rollup()
         logger.info("System Monitor Loop stopped.")
@@ -0,0 +1,84 @@
+"""
+hardware_manager/fake.py — Hardware monitoring without the hardware.
+
+FakeHardwareManager has the same methods the controller uses on a real
+HardwareManager, but starts no threads and opens no udev socket. Instead
+the test (or a replay) hands it events:
+
+    hw = FakeHardwareManager()
+    controller = MainController(hardware_manager=hw)
+    hw.emit_usb(FakeUdevDevice("remove", "sound", "card1"))
+    hw.feed_metrics(SystemMetrics(95.0, 40.0, 20.0, temperature_c=81.0))
+
+USB events go to the listeners in the order they were added (like the
+real USBWatcher). Metrics go through the REAL health and pressure
+monitors, so pressure levels change exactly as they would on a Pi.
+"""
+
+from dataclasses import dataclass, field
+
+from src.loggingx.event_log import get_logger
+from src.hardware_manager.pressure import PressureConfig, PressureMonitor
+from src.hardware_manager.system import HealthConfig, HealthMonitor, SystemMetrics
+
+logger = get_logger("hardware_manager")
+
+
+@dataclass
+class FakeUdevDevice:
+    """The few pyudev.Device attributes our listeners read."""
+    action: str
+    subsystem: str
+    sys_name: str
+    device_path: str = ""
+    properties: dict = field(default_factory=dict)
+
+    def get(self, key: str, default=None):
+        return self.properties.get(key, default)
+
+
+class FakeHardwareManager:
+    def __init__(self, health_config: HealthConfig | None = None, pressure_config: PressureConfig | None = None):
+        self.health_monitor = HealthMonitor(health_config or HealthConfig())
+        self.pressure_monitor = PressureMonitor(pressure_config)
+        self.pressure_monitor.subscribe(self.health_monitor.apply_pressure)
+        self._usb_listeners = []
+        self._metrics_listeners = []
+
+    def start(self):
+        pass
+
+    def attach(self, reactor):
+        pass
+
+    def stop(self):
+        pass
+
+    def add_usb_listener(self, callback):
+        self._usb_listeners.append(callback)
+
+    def add_metrics_listener(self, callback):
+        self._metrics_listeners.append(callback)
+
+    def subscribe_pressure(self, callback):
+        self.pressure_monitor.subscribe(callback)
+
+    # ── Events ─────────────────────────────────────
+
+    def emit_usb(self, device) -> None:
+        """One plug/unplug event, to every USB listener."""
+        for callback in list(self._usb_listeners):
+            try:
+                callback(device)
+            except Exception as e:
+                logger.error(f"USB event listener failed: {e}")
+
+    def feed_metrics(self, metrics: SystemMetrics) -> None:
+        """One system sample, as if sample_once() had taken it."""
+        self.health_monitor.observe(metrics)
+        self.pressure_monitor.observe(metrics)
+        for callback in list(self._metrics_listeners):
+            try:
+                callback(metrics)
+            except Exception as e:
+                logger.error(f"Metrics listener failed: {e}")
@@ -0,0 +1,147 @@
+"""
+pressure.py — Turns raw metrics into ONE "how stressed is the Pi?" level.
+
+A Raspberry Pi slows itself down (throttles) when it gets too hot or the
+power supply sags. When that happens, the talk indicator must stay
+responsive, so everything else should back off.
+
+This module looks at:
+    - SoC temperature
+    - The firmware throttling flags
+    - CPU and memory usage
+
+...and publishes a PressureLevel: NORMAL, ELEVATED or CRITICAL.
+
+Other parts of the agent subscribe and react:
+    - The render queue lowers its frame rate and skips non-critical updates
+    - The system monitor samples less often
+    - Health rollups get longer
+
+How to use:
+    monitor = PressureMonitor()
+    monitor.subscribe(lambda level: print("Pressure is now", level))
+    monitor.observe(get_system_metrics())   # call every sample
+
+Going UP happens immediately. Going DOWN only happens after the metrics
+have been calm for `clear_samples` samples in a row, so we don't bounce.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from src.shared.enums import PressureLevel
+from src.hardware_manager.system import SystemMetrics
+from src.loggingx.event_log import get_logger
+
+logger = get_logger("pressure")
+
+
+# Raspberry Pi firmware throttling bits ("currently" bits, not "has occurred")
+THROTTLE_UNDER_VOLTAGE = 0x1
+THROTTLE_FREQ_CAPPED = 0x2
+THROTTLE_THROTTLED = 0x4
+THROTTLE_SOFT_TEMP_LIMIT = 0x8
+
+# Levels from lowest to highest, so we can compare them
+_LEVEL_ORDER = [PressureLevel.NORMAL, PressureLevel.ELEVATED, PressureLevel.CRITICAL]
+_RANK = {level: rank for rank, level in enumerate(_LEVEL_ORDER)}
+
+
+@dataclass
+class PressureConfig:
+    """
+    Thresholds for each pressure level.
+
+    Fields:
+        temp_elevated / temp_critical: SoC °C for ELEVATED / CRITICAL
+        cpu_elevated / cpu_critical: CPU % for ELEVATED / CRITICAL
+        mem_elevated / mem_critical: Memory % for ELEVATED / CRITICAL
+        clear_samples: Calm samples in a row needed before stepping DOWN
+    """
+    temp_elevated: float = 70.0
+    temp_critical: float = 80.0
+    cpu_elevated: float = 85.0
+    cpu_critical: float = 97.0
+    mem_elevated: float = 85.0
+    mem_critical: float = 95.0
+    clear_samples: int = 3
+
+
+def classify_pressure(metrics: SystemMetrics, config: PressureConfig) -> PressureLevel:
+    """
+    Work out the pressure level for ONE sample (no memory of the past).
+    The worst signal wins.
+    """
+    flags = metrics.throttled_flags
+    temp = metrics.temperature_c
+
+    if (flags & THROTTLE_THROTTLED
+            or (temp is not None and temp >= config.temp_critical)
+            or metrics.cpu_percent >= config.cpu_critical
+            or metrics.memory_percent >= config.mem_critical):
+        return PressureLevel.CRITICAL
+
+    if (flags & (THROTTLE_UNDER_VOLTAGE | THROTTLE_FREQ_CAPPED | THROTTLE_SOFT_TEMP_LIMIT)
+            or (temp is not None and temp >= config.temp_elevated)
+            or metrics.cpu_percent >= config.cpu_elevated
+            or metrics.memory_percent >= config.mem_elevated):
+        return PressureLevel.ELEVATED
+
+    return PressureLevel.NORMAL
+
+
+class PressureMonitor:
+    """
+    Keeps the current PressureLevel and tells subscribers when it changes.
+    """
+    def __init__(self, config: PressureConfig | None = None):
+        self.config = config or PressureConfig()
+        self.level = PressureLevel.NORMAL
+        self._calm_samples = 0
+        self._subscribers: list[Callable[[PressureLevel], None]] = []
+
+    def subscribe(self, callback: Callable[[PressureLevel], None]) -> None:
+        """
+        Register a function to call with the new level on every change.
+        It is called once right away with the current level.
+        """
+        self._subscribers.append(callback)
+        callback(self.level)
+
+    def observe(self, metrics: SystemMetrics) -> PressureLevel:
+        """
+        Feed one metrics sample. Returns the (possibly new) current level.
+        """
+        sample_level = classify_pressure(metrics, self.config)
+
+        if _RANK[sample_level] > _RANK[self.level]:
+            # Getting worse → react immediately
+            self._calm_samples = 0
+            self._set_level(sample_level, metrics)
+        elif _RANK[sample_level] < _RANK[self.level]:
+            # Getting better → wait until it has been calm for a while
+            self._calm_samples += 1
+            if self._calm_samples >= self.config.clear_samples:
+                self._calm_samples = 0
+                self._set_level(sample_level, metrics)
+        else:
+            self._calm_samples = 0
+
+        return self.level
+
+    def _set_level(self, level: PressureLevel, metrics: SystemMetrics) -> None:
+        old = self.level
+        self.level = level
+        msg = (f"Pressure {old.value} -> {level.value} "
+               f"(temp={metrics.temperature_c}C, throttled=0x{metrics.throttled_flags:x}, "
+               f"CPU={metrics.cpu_percent}%, RAM={metrics.memory_percent}%)")
+        if _RANK[level] > _RANK[old]:
+            logger.warning(msg)
+        else:
+            logger.info(msg)
+
+        for callback in list(self._subscribers):
+            try:
+                callback(level)
+            except Exception as e:
+                logger.error(f"Pressure subscriber failed: {e}")
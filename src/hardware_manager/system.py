@@ -3,24 +3,79 @@ system.py — Watches CPU, Memory, and Disk usage.
 
 This module uses `psutil` to fetch system metrics.
 It helps us know if the Pi is overloaded or running out of space.
+
+Logging every sample would write ~17,000 lines a day to the SD card, so the
+HealthMonitor only logs when something CHANGES:
+    - a resource goes from OK to HIGH (WARNING)
+    - a resource comes back from HIGH to OK (INFO)
+    - every `rollup_interval` seconds, one compact min/avg/max line (INFO)
+
+To stop a value hovering around the threshold from flapping OK/HIGH/OK/HIGH,
+each resource has TWO thresholds (hysteresis):
+    enter HIGH when value >  warn
+    leave HIGH when value <= clear   (clear is lower than warn)
 """
 
+import time
 import psutil
 from dataclasses import dataclass
+from src.shared.enums import PressureLevel, ResourceState
 from src.loggingx.event_log import get_logger
 
 logger = get_logger("system_monitor")
 
+# Where the kernel exposes SoC temperature (millidegrees C) and, on a Pi,
+# the firmware throttling flags (hex bitmask).
+THERMAL_ZONE_PATH = "/sys/class/thermal/thermal_zone0/temp"
+THROTTLED_PATH = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+
 @dataclass
 class SystemMetrics:
     cpu_percent: float
     memory_percent: float
     disk_percent: float
+    temperature_c: float | None = None  # SoC temperature (None if unknown)
+    throttled_flags: int = 0            # Raspberry Pi get_throttled bits
+
+
+# ──────────────────────────────────────────────────
+# Configuration — thresholds and intervals
+# ──────────────────────────────────────────────────
+
+@dataclass
+class HealthConfig:
+    """
+    Thresholds and timings for the health monitor.
+
+    Fields:
+        cpu_warn / cpu_clear:   CPU % to enter / leave the HIGH state
+        mem_warn / mem_clear:   Memory % to enter / leave the HIGH state
+        disk_warn / disk_clear: Disk % to enter / leave the HIGH state
+        sample_interval: Seconds between two metric samples
+        rollup_interval: Seconds between two min/avg/max summary lines
+    """
+    cpu_warn: float = 80.0
+    cpu_clear: float = 70.0
+    mem_warn: float = 80.0
+    mem_clear: float = 75.0
+    disk_warn: float = 90.0
+    disk_clear: float = 88.0
+    sample_interval: float = 5.0
+    rollup_interval: float = 900.0
+
+    def thresholds(self) -> dict[str, tuple[float, float]]:
+        """Return {resource: (warn, clear)} for every watched resource."""
+        return {
+            "cpu": (self.cpu_warn, self.cpu_clear),
+            "memory": (self.mem_warn, self.mem_clear),
+            "disk": (self.disk_warn, self.disk_clear),
+        }
+
 
 def get_system_metrics() -> SystemMetrics:
     """
     Fetch current system usage stats.
-    
+
     Returns:
         SystemMetrics object with cpu, memory, and disk usage percentages.
     """
@@ -28,30 +83,184 @@ def get_system_metrics() -> SystemMetrics:
     # The very first call returns 0.0, but subsequent calls are accurate.
     # This is non-blocking, which is good for our loop.
     cpu = psutil.cpu_percent(interval=None)
-    
+
     mem = psutil.virtual_memory().percent
     disk = psutil.disk_usage("/").percent
-    
-    return SystemMetrics(cpu, mem, disk)
 
-def log_system_health(metrics: SystemMetrics):
+    return SystemMetrics(cpu, mem, disk, read_soc_temperature(), read_throttle_flags())
+
+
+def read_soc_temperature() -> float | None:
+    """
+    Read the SoC temperature in °C from the kernel thermal zone.
+    Returns None on machines without one (e.g. a dev laptop VM).
+    """
+    try:
+        with open(THERMAL_ZONE_PATH) as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+def read_throttle_flags() -> int:
+    """
+    Read the Raspberry Pi firmware throttling bits (same as `vcgencmd get_throttled`).
+    Reading sysfs is cheap; spawning vcgencmd every sample is not.
+    Returns 0 when the file is missing (not a Pi).
     """
-    Log the health status.
-    If usage is high (>80%), log a WARNING.
+    try:
+        with open(THROTTLED_PATH) as f:
+            return int(f.read().strip(), 16)
+    except (OSError, ValueError):
+        return 0
+
+
+def _metric_values(metrics: SystemMetrics) -> dict[str, float]:
+    """Map a SystemMetrics sample onto the resource names used in HealthConfig."""
+    return {
+        "cpu": metrics.cpu_percent,
+        "memory": metrics.memory_percent,
+        "disk": metrics.disk_percent,
+    }
+
+
+def log_system_health(metrics: SystemMetrics, config: HealthConfig | None = None):
+    """
+    Log ONE health sample (no state tracking).
+    If usage is above the configured warn thresholds, log a WARNING.
     Otherwise, log INFO.
+
+    The background monitor uses HealthMonitor instead, which only logs
+    changes. This is kept for one-off checks from scripts.
     """
-    # Thresholds for warning
-    CPU_WARN_THRESHOLD = 80.0
-    MEM_WARN_THRESHOLD = 80.0
-    DISK_WARN_THRESHOLD = 90.0
+    config = config or HealthConfig()
+    values = _metric_values(metrics)
 
     msg = (f"System Health: CPU={metrics.cpu_percent}% | "
            f"RAM={metrics.memory_percent}% | "
            f"Disk={metrics.disk_percent}%")
 
-    if (metrics.cpu_percent > CPU_WARN_THRESHOLD or 
-        metrics.memory_percent > MEM_WARN_THRESHOLD or 
-        metrics.disk_percent > DISK_WARN_THRESHOLD):
+    if any(values[name] > warn for name, (warn, _clear) in config.thresholds().items()):
         logger.warning(f"HIGH LOAD DETECTED: {msg}")
     else:
         logger.info(msg)
+
+
+# ──────────────────────────────────────────────────
+# Health Monitor — state-change-only logging
+# ──────────────────────────────────────────────────
+
+@dataclass
+class _RollupStats:
+    """Running min/avg/max for one resource since the last rollup."""
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+# How much longer rollups get at each pressure level
+PRESSURE_ROLLUP_SCALE = {
+    PressureLevel.NORMAL: 1.0,
+    PressureLevel.ELEVATED: 2.0,
+    PressureLevel.CRITICAL: 4.0,
+}
+
+
+class HealthMonitor:
+    """
+    Tracks an OK/HIGH state per resource and logs only when it changes.
+
+    Usage:
+        monitor = HealthMonitor(HealthConfig(rollup_interval=600))
+        monitor.observe(get_system_metrics())   # call every sample
+    """
+    def __init__(self, config: HealthConfig | None = None):
+        self.config = config or HealthConfig()
+
+        # Current state per resource ("cpu", "memory", "disk")
+        self.states = {name: ResourceState.OK for name in self.config.thresholds()}
+        # How many OK<->HIGH changes have been logged so far
+        self.transitions = 0
+
+        # Stretched by apply_pressure() when the Pi is under load
+        self.rollup_scale = 1.0
+
+        self._stats = {name: _RollupStats() for name in self.states}
+        self._last_rollup = None
+
+    def apply_pressure(self, level: PressureLevel) -> None:
+        """Lengthen the rollup interval while the Pi is under pressure."""
+        self.rollup_scale = PRESSURE_ROLLUP_SCALE[level]
+
+    def observe(self, metrics: SystemMetrics, now: float | None = None) -> list[tuple[str, ResourceState]]:
+        """
+        Feed one sample into the monitor.
+
+        Args:
+            metrics: The latest SystemMetrics sample.
+            now: Monotonic time of the sample (defaults to time.monotonic()).
+                 Tests pass synthetic values here.
+
+        Returns:
+            The (resource, new_state) transitions caused by this sample.
+        """
+        now = time.monotonic() if now is None else now
+        if self._last_rollup is None:
+            self._last_rollup = now
+
+        values = _metric_values(metrics)
+        changed = []
+
+        for name, (warn, clear) in self.config.thresholds().items():
+            value = values[name]
+            self._stats[name].add(value)
+
+            current = self.states[name]
+            if current == ResourceState.OK and value > warn:
+                new_state = ResourceState.HIGH
+            elif current == ResourceState.HIGH and value <= clear:
+                new_state = ResourceState.OK
+            else:
+                continue
+
+            self.states[name] = new_state
+            self.transitions += 1
+            changed.append((name, new_state))
+            if new_state == ResourceState.HIGH:
+                logger.warning(f"HIGH LOAD DETECTED: {name}={value}% (> {warn}%)")
+            else:
+                logger.info(f"Load back to normal: {name}={value}% (<= {clear}%)")
+
+        if now - self._last_rollup >= self.config.rollup_interval * self.rollup_scale:
+            self.log_rollup(now)
+
+        return changed
+
+    def log_rollup(self, now: float | None = None) -> None:
+        """
+        Write one compact min/avg/max line for every resource, then reset.
+        Does nothing if no samples arrived since the last rollup.
+        """
+        now = time.monotonic() if now is None else now
+        parts = []
+        for name, stats in self._stats.items():
+            if stats.count == 0:
+                continue
+            avg = stats.total / stats.count
+            parts.append(
+                f"{name}={stats.minimum:.0f}/{avg:.0f}/{stats.maximum:.0f}"
+                f"[{self.states[name].value}]"
+            )
+        if parts:
+            count = max(s.count for s in self._stats.values())
+            logger.info(f"Health rollup (min/avg/max %, {count} samples): {' '.join(parts)}")
+
+        self._stats = {name: _RollupStats() for name in self._stats}
+        self._last_rollup = now
@@ -3,6 +3,10 @@ usb.py — Watches USB devices (plug/unplug).
 
 This module uses `pyudev` to listen to Linux kernel events.
 When you plug in a device, it wakes up and logs the event.
+
+Other parts of the agent can listen too:
+    watcher.add_listener(lambda device: print(device.action))
+Listeners are called on the USB monitor thread for every add/remove event.
 """
 
 import pyudev
@@ -20,8 +24,19 @@ class USBWatcher:
         # "hid" -> Human Interface Devices (MiraBox, Keyboard)
         self.monitor.filter_by(subsystem='sound')
         self.monitor.filter_by(subsystem='hid')
+        self.monitor.filter_by(subsystem='hidraw')  # The MiraBox's raw HID node
         self.monitor.filter_by(subsystem='input')  # Catch-all for input devices
 
+        # Functions to call with every add/remove event
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """
+        Call `callback(device)` for every add/remove event.
+        Runs on the USB monitor thread, so keep it short.
+        """
+        self._listeners.append(callback)
+
     def start_monitoring(self):
         """
         Start the loop. This function BLOCKS forever, so run it in a thread!
@@ -31,6 +46,17 @@ class USBWatcher:
         for device in iter(self.monitor.poll, None):
             self._handle_event(device)
 
+    def drain(self):
+        """
+        Handle every event that is waiting, without blocking. For event
+        loops that watch `monitor.fileno()` instead of running a thread.
+        """
+        while True:
+            device = self.monitor.poll(timeout=0)
+            if device is None:
+                return
+            self._handle_event(device)
+
     def _handle_event(self, device):
         """
         Process a single USB event.
@@ -56,6 +82,15 @@ class USBWatcher:
             logger.warning(f"➖ {msg}")
             self._check_specific_device(device, added=False)
 
+        else:
+            return
+
+        for callback in list(self._listeners):
+            try:
+                callback(device)
+            except Exception as e:
+                logger.error(f"USB event listener failed: {e}")
+
     def _check_specific_device(self, device, added: bool):
         """
         Check if the device is one of our critical hardware pieces.
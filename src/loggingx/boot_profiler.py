@@ -0,0 +1,250 @@
+"""
+boot_profiler.py — A stopwatch for startup.
+
+When a station takes 40 seconds to come up, we need to know WHERE the time
+went. The boot profiler records how long each startup phase took:
+
+    imports                                   0.0 ms  +196.0 ms
+    logging_setup                           196.1 ms  +16.2 ms
+    bootstrap                               212.4 ms  +180.2 ms
+      bootstrap.identity                    212.6 ms  +1.1 ms
+      bootstrap.preflight                   213.8 ms  +178.4 ms
+        bootstrap.preflight.headset_mic     214.0 ms  +0.3 ms
+    ...
+
+Times are taken from time.monotonic(), so they are not affected by the
+clock being changed (e.g. NTP fixing a Pi that booted in 1970).
+
+Every boot is appended as ONE compact JSON line to `boot_history.jsonl`
+in the config cache directory, so regressions are visible across releases
+and across the fleet.
+
+How to use:
+    from src.loggingx.boot_profiler import get_boot_profiler
+    profiler = get_boot_profiler()
+
+    with profiler.phase("bootstrap.identity"):
+        load_identity(...)
+
+    profiler.mark("first_paint")          # a moment, not a duration
+    print(profiler.format_summary())
+
+To look at the history:
+    python -m src.loggingx.boot_profiler /var/cache/ixg-agent
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.loggingx.event_log import get_logger
+from src.loggingx.tracing import get_tracer
+
+logger = get_logger("boot_profiler")
+
+HISTORY_FILE_NAME = "boot_history.jsonl"
+DEFAULT_HISTORY_ENTRIES = 200   # boots kept in the history file
+
+
+@dataclass
+class PhaseTiming:
+    """
+    One timed phase.
+
+    Fields:
+        name: Dotted name, e.g. "bootstrap.preflight" (dots show nesting)
+        start_ms: When it started, in ms since the profiler's origin
+        duration_ms: How long it took (0 for a mark)
+    """
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+class BootProfiler:
+    """
+    Collects PhaseTimings for one boot. Thread-safe (preflight checks record
+    from their worker threads).
+    """
+    def __init__(self, origin: float | None = None):
+        # Time zero for this boot (monotonic seconds)
+        self.origin = time.monotonic() if origin is None else origin
+        self.phases: list[PhaseTiming] = []
+        self.finished = False
+        self._marks = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the code inside the `with` block as phase `name`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.monotonic())
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Record a phase from two time.monotonic() readings (also a trace span)."""
+        get_tracer().add(name, int(start * 1e9), int(end * 1e9))
+        with self._lock:
+            if self.finished:
+                return  # e.g. a background re-check after boot completed
+            self.phases.append(PhaseTiming(
+                name,
+                (start - self.origin) * 1000.0,
+                (end - start) * 1000.0,
+            ))
+
+    def mark(self, name: str) -> None:
+        """Record a single moment (e.g. "first_paint") once. Cheap to call again."""
+        if name in self._marks or self.finished:
+            return
+        self._marks.add(name)
+        now = time.monotonic()
+        self.record(name, now, now)
+
+    def finish(self) -> float:
+        """Stop recording (boot is done). Returns total boot time in ms."""
+        with self._lock:
+            self.finished = True
+            self._total_ms = (time.monotonic() - self.origin) * 1000.0
+            return self._total_ms
+
+    def total_ms(self) -> float:
+        if self.finished:
+            return self._total_ms
+        return (time.monotonic() - self.origin) * 1000.0
+
+    def to_record(self) -> dict:
+        """One boot as a compact dict: {phase: [start_ms, duration_ms]}."""
+        return {
+            "boot_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "total_ms": round(self.total_ms(), 1),
+            "phases": {
+                p.name: [round(p.start_ms, 1), round(p.duration_ms, 1)]
+                for p in sorted(self.phases, key=lambda p: p.start_ms)
+            },
+        }
+
+    def format_summary(self) -> str:
+        """A human-readable table of this boot's phases."""
+        return format_boot_record(self.to_record())
+
+
+# ──────────────────────────────────────────────────
+# The process-wide profiler
+# ──────────────────────────────────────────────────
+
+_profiler = BootProfiler()
+
+
+def get_boot_profiler() -> BootProfiler:
+    """The profiler for the current boot."""
+    return _profiler
+
+
+def reset_boot_profiler(origin: float | None = None) -> BootProfiler:
+    """
+    Start a fresh profile (e.g. from main.py, with `origin` taken before the
+    heavy imports so they are counted too).
+    """
+    global _profiler
+    _profiler = BootProfiler(origin)
+    return _profiler
+
+
+# ──────────────────────────────────────────────────
+# History file
+# ──────────────────────────────────────────────────
+
+def append_boot_history(
+    profiler: BootProfiler,
+    cache_dir: str | Path,
+    max_entries: int = DEFAULT_HISTORY_ENTRIES,
+    extra: dict | None = None,
+) -> None:
+    """
+    Append this boot as one JSON line. When the file grows past 1.5x
+    `max_entries`, it is trimmed back to the newest `max_entries` (so we
+    don't rewrite it on every boot). Best-effort: never raises.
+
+    Args:
+        extra: Additional fields to store, e.g. {"version": "0.1.0"}
+    """
+    path = Path(cache_dir) / HISTORY_FILE_NAME
+    record = profiler.to_record()
+    if extra:
+        record.update(extra)
+
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        lines = path.read_text().splitlines()
+        if len(lines) > max_entries * 1.5:
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text("\n".join(lines[-max_entries:]) + "\n")
+            tmp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not save boot history: {e}")
+
+
+def load_boot_history(cache_dir: str | Path) -> list[dict]:
+    """Every boot in the history file, oldest first (bad lines are skipped)."""
+    path = Path(cache_dir) / HISTORY_FILE_NAME
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def format_boot_record(record: dict) -> str:
+    """Table of one boot's phases, indented by nesting depth."""
+    lines = [f"Boot profile ({record['boot_at']}): total {record['total_ms']:.1f} ms"]
+    for name, (start_ms, duration_ms) in record["phases"].items():
+        indent = "  " * (name.count(".") + 1)
+        lines.append(f"{indent}{name:<{40 - len(indent)}} {start_ms:>9.1f} ms  +{duration_ms:.1f} ms")
+    return "\n".join(lines)
+
+
+def format_history_summary(entries: list[dict]) -> str:
+    """Per-phase average and worst duration across many boots."""
+    if not entries:
+        return "No boot history."
+
+    durations: dict[str, list[float]] = {}
+    for entry in entries:
+        for name, (_start, duration) in entry.get("phases", {}).items():
+            durations.setdefault(name, []).append(duration)
+    totals = [e["total_ms"] for e in entries]
+
+    lines = [
+        f"{len(entries)} boots: total avg {sum(totals) / len(totals):.1f} ms, "
+        f"worst {max(totals):.1f} ms, last {totals[-1]:.1f} ms",
+        f"  {'phase':<38} {'avg ms':>9} {'worst ms':>9} {'last ms':>9}",
+    ]
+    last_phases = entries[-1].get("phases", {})
+    for name, values in durations.items():
+        last = last_phases.get(name, [0.0, float("nan")])[1]
+        lines.append(f"  {name:<38} {sum(values) / len(values):>9.1f} {max(values):>9.1f} {last:>9.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    history = load_boot_history(sys.argv[1] if len(sys.argv) > 1 else "/var/cache/ixg-agent")
+    print(format_history_summary(history))
+    if history:
+        print()
+        print(format_boot_record(history[-1]))
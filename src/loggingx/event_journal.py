@@ -0,0 +1,205 @@
+"""
+event_journal.py — A flight recorder for high-rate events.
+
+Key presses, USB writes, udev events and state changes can come in at
+hundreds per second. One JSON log line each would be far too much, but
+after an incident we DO want to know exactly what happened in the last
+few minutes.
+
+The event journal keeps them as small fixed-size binary records (48 bytes)
+in a ring file in the config cache directory:
+
+    /var/cache/ixg-agent/events.journal
+    ┌────────┬──────────┬──────────┬─────┬──────────┐
+    │ header │ record 0 │ record 1 │ ... │ record N │   ← oldest are overwritten
+    └────────┴──────────┴──────────┴─────┴──────────┘
+
+Each record holds: sequence number, time (monotonic ns), event type,
+device, key, a value and up to 20 bytes of payload.
+
+The file is memory-mapped. Writing a record is a struct.pack_into() into
+that memory: no system call and no file write on the hot path. The kernel
+writes the pages out by itself, so the journal survives the agent
+crashing (after a POWER cut the last seconds may be missing, unless
+flush() ran).
+
+Every time the journal is opened, it writes an OPEN record with the wall
+clock time, so the reader can show real timestamps.
+
+How to use:
+    journal = EventJournal("/var/cache/ixg-agent")
+    journal.record(EventType.KEY_DOWN, key=3)
+    journal.record(EventType.UDEV, value=1, payload=b"hidraw0")
+    journal.close()
+
+To read it (as JSON lines, oldest first):
+    python -m src.loggingx.event_journal /var/cache/ixg-agent
+    python -m src.loggingx.event_journal /var/cache/ixg-agent --last 300    # last 5 minutes
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from enum import IntEnum
+from pathlib import Path
+
+from src.shared.enums import AgentState
+from src.loggingx.lock_profiler import profiled_lock
+
+JOURNAL_FILE_NAME = "events.journal"
+DEFAULT_CAPACITY = 65536          # records (3 MB): many minutes of busy events
+
+MAGIC = b"IXGJ"
+VERSION = 1
+# magic, version, record size, capacity, next sequence number (64 bytes with padding)
+HEADER = struct.Struct("<4sHHIQ44x")
+SEQUENCE_OFFSET = 12              # where "next sequence number" sits in the header
+SEQUENCE = struct.Struct("<Q")
+# sequence, monotonic ns, event type, device, key, (padding), value, payload
+RECORD = struct.Struct("<QqHHhxxi20s")
+WALL_CLOCK = struct.Struct("<q")
+
+# AgentState ↔ the small number stored in STATE_CHANGE records
+STATE_CODES = {state: code for code, state in enumerate(AgentState)}
+STATES_BY_CODE = list(AgentState)
+
+
+class EventType(IntEnum):
+    OPEN = 1             # journal opened; payload = wall clock ns (for the reader)
+    KEY_DOWN = 2         # deck key pressed (key = 1-15)
+    KEY_UP = 3           # deck key released
+    WRITE_OK = 4         # key image written to the deck (key, value = transport result)
+    WRITE_FAILED = 5     # key image write raised
+    UDEV = 6             # USB plug event (value: 1 = add, 0 = remove; payload = device name)
+    STATE_CHANGE = 7     # agent state (key = from, value = to; payload = start of the reason)
+    TALK = 8             # talk on/off (key, value: 1 = on, 0 = off; payload = channel ID)
+
+
+class EventJournal:
+    def __init__(self, directory: str | Path, capacity: int = DEFAULT_CAPACITY):
+        self.path = Path(directory) / JOURNAL_FILE_NAME
+        self.capacity = capacity
+        self._lock = profiled_lock("event_journal")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = HEADER.size + capacity * RECORD.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)          # new file, or another capacity: start over
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+
+        magic, version, record_size, file_capacity, next_sequence = HEADER.unpack_from(self._map, 0)
+        if (magic, version, record_size, file_capacity) != (MAGIC, VERSION, RECORD.size, capacity):
+            self._map[:] = bytes(size)
+            next_sequence = 1
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, capacity, next_sequence)
+        self._next = next_sequence
+        self.record(EventType.OPEN, payload=WALL_CLOCK.pack(time.time_ns()))
+
+    def record(self, event: int, device: int = 0, key: int = 0, value: int = 0, payload: bytes = b"") -> None:
+        """Append one event (payloads longer than 20 bytes are cut)."""
+        now = time.monotonic_ns()
+        with self._lock:
+            if self._map.closed:
+                return
+            sequence = self._next
+            self._next = sequence + 1
+            RECORD.pack_into(self._map, HEADER.size + (sequence % self.capacity) * RECORD.size,
+                             sequence, now, event, device, key, value, payload)
+            # Header last: a record is complete before it is counted
+            SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, sequence + 1)
+
+    def flush(self) -> None:
+        """Push the pages to disk now (msync). Not needed to survive a crash."""
+        with self._lock:
+            self._map.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map.closed:
+                return
+            self._map.flush()
+            self._map.close()
+
+
+# ──────────────────────────────────────────────────
+# Reading
+# ──────────────────────────────────────────────────
+
+def read_journal(directory: str | Path) -> list[dict]:
+    """
+    Every event still in the journal, oldest first, as plain dicts.
+    `wall_time` is worked out from the OPEN record before it (None if
+    that was already overwritten).
+    """
+    path = Path(directory) / JOURNAL_FILE_NAME
+    data = path.read_bytes()
+    magic, version, record_size, capacity, next_sequence = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not an event journal (version {VERSION})")
+
+    records = []
+    oldest = max(1, next_sequence - capacity)
+    for slot in range(capacity):
+        record = RECORD.unpack_from(data, HEADER.size + slot * RECORD.size)
+        if oldest <= record[0] < next_sequence:
+            records.append(record)
+    records.sort()
+
+    events = []
+    anchor = None              # (monotonic ns, wall clock ns) of the last OPEN
+    for sequence, mono_ns, event, device, key, value, payload in records:
+        if event == EventType.OPEN:
+            anchor = (mono_ns, WALL_CLOCK.unpack_from(payload)[0])
+        events.append(_decode(sequence, mono_ns, event, device, key, value, payload, anchor))
+    return events
+
+
+def _decode(sequence, mono_ns, event, device, key, value, payload, anchor) -> dict:
+    entry = {"seq": sequence, "mono_ns": mono_ns}
+    entry["wall_time"] = (anchor[1] + mono_ns - anchor[0]) / 1e9 if anchor else None
+    try:
+        entry["event"] = EventType(event).name
+    except ValueError:
+        entry["event"] = f"UNKNOWN_{event}"
+    entry.update({"device": device, "key": key, "value": value})
+
+    if event == EventType.STATE_CHANGE:
+        entry["from_state"] = _state_name(key)
+        entry["to_state"] = _state_name(value)
+    if event != EventType.OPEN:
+        text = payload.rstrip(b"\0").decode("utf-8", errors="replace")
+        if text:
+            entry["payload"] = text
+    return entry
+
+
+def _state_name(code: int) -> str:
+    return STATES_BY_CODE[code].value if 0 <= code < len(STATES_BY_CODE) else str(code)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    last = None
+    if "--last" in args:
+        index = args.index("--last")
+        last = float(args[index + 1])
+        del args[index:index + 2]
+    events = read_journal(args[0] if args else "/var/cache/ixg-agent")
+    if last is not None and events:
+        # Walk back from the newest event; a jump forwards in time means an
+        # earlier boot (the monotonic clock restarts at every boot)
+        cutoff = events[-1]["mono_ns"] - int(last * 1e9)
+        start = len(events) - 1
+        while start > 0 and cutoff <= events[start - 1]["mono_ns"] <= events[start]["mono_ns"]:
+            start -= 1
+        events = events[start:]
+    for entry in events:
+        print(json.dumps(entry))
@@ -17,11 +17,47 @@ How to use in other files:
     logger = get_logger("bootstrap")
     logger.info("Starting preflight checks")
     logger.error("Microphone not found!")
+
+By default each log line is written to the console right away, on the
+thread that logged it. The running agent switches to QUEUED logging
+instead (see log_queue.py), so a slow console never holds up key handling:
+
+    enable_queued_logging()     # every logger, including existing ones
+
+It also turns on rate limiting (see rate_limit.py), so a flood of the same
+line is written once plus a "repeated N times" summary:
+
+    enable_rate_limiting()
+
+Log levels come from a registry that can be changed while running (see
+levels.py); until it is enabled, every module logs at DEBUG:
+
+    enable_log_levels("/etc/ixg-agent/log_levels.json")
 """
 
+import atexit
 import logging
 import json
-from datetime import datetime, timezone
+import time
+from json.encoder import encode_basestring_ascii
+
+# Optional: a faster JSON library for the structured extras
+try:
+    import orjson
+
+    def _dumps_value(value) -> str:
+        return orjson.dumps(value, default=str).decode("utf-8")
+    JSON_BACKEND = "orjson"
+except ImportError:
+    def _dumps_value(value) -> str:
+        return json.dumps(value, default=str)
+    JSON_BACKEND = "json"
+
+# Attributes every LogRecord has. Anything else was passed with `extra=`.
+_PLAIN_RECORD_SIZE = len(logging.LogRecord("", 0, "", 0, "", None, None).__dict__)
+_STANDARD_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message", "asctime", "taskName",
+}
 
 
 class JsonFormatter(logging.Formatter):
@@ -32,24 +68,61 @@ class JsonFormatter(logging.Formatter):
         INFO:bootstrap:Starting preflight checks
 
     Our formatter writes structured JSON like:
-        {"timestamp": "2026-02-14T12:00:01Z", "level": "INFO", ...}
+        {"timestamp": "2026-02-14T12:00:01.000123+00:00", "level": "INFO", ...}
+
+    It runs for every log line, so it is written for speed rather than
+    beauty: the timestamp is the record's own (when it was LOGGED), the
+    "YYYY-MM-DDTHH:MM:SS" part is worked out once per second, and the
+    level/module part of the line is built once per logger and reused.
+    Only the message (and any extras) are encoded each time.
+
+    Extras are passed through:
+        logger.info("Check done", extra={"detail": {...}, "check": "mic"})
+        → {..., "message": "Check done", "detail": {...}, "check": "mic"}
     """
 
+    def __init__(self, fmt=None, datefmt=None, style="%"):
+        super().__init__(fmt, datefmt, style)
+        self._second = None
+        self._second_prefix = ""
+        self._fixed: dict[tuple[str, str], str] = {}   # (level, module) → encoded fields
+
     def format(self, record):
-        # Build a dictionary (like a form with fields)
-        log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "level": record.levelname,         # e.g. "INFO", "ERROR"
-            "module": record.name,             # e.g. "bootstrap"
-            "message": record.getMessage(),    # the actual text
-        }
+        # When it was logged (not when it was formatted: with queued
+        # logging that happens later, on the writer thread)
+        created = record.created
+        second = int(created)
+        if second != self._second:
+            self._second_prefix = '{"timestamp": "' + time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = second
 
-        # If extra data was attached, include it
-        if hasattr(record, "detail"):
-            log_entry["detail"] = record.detail
+        fixed = self._fixed.get((record.levelname, record.name))
+        if fixed is None:
+            fixed = ('+00:00", "level": ' + encode_basestring_ascii(record.levelname) +
+                     ', "module": ' + encode_basestring_ascii(record.name) + ', "message": ')
+            self._fixed[(record.levelname, record.name)] = fixed
 
-        # Convert the dictionary to a JSON text string
-        return json.dumps(log_entry)
+        parts = [
+            self._second_prefix, ".%06d" % int((created - second) * 1e6), fixed,
+            encode_basestring_ascii(record.getMessage()),
+        ]
+
+        # If extra data was attached, include it ("detail" first, as always)
+        extras = (record.__dict__.keys() - _STANDARD_RECORD_ATTRS
+                  if len(record.__dict__) > _PLAIN_RECORD_SIZE else None)
+        if extras:
+            if "detail" in extras:
+                parts.append(', "detail": ' + _dumps_value(record.detail))
+            for key in sorted(extras - {"detail"}):
+                parts.append(", " + encode_basestring_ascii(key) + ": " + _dumps_value(record.__dict__[key]))
+        if record.exc_info:
+            parts.append(', "exception": ' + encode_basestring_ascii(self.formatException(record.exc_info)))
+        elif record.exc_text:
+            # Already rendered, e.g. by queued logging on the caller's thread
+            parts.append(', "exception": ' + encode_basestring_ascii(record.exc_text))
+
+        parts.append("}")
+        return "".join(parts)
 
 
 def get_logger(module_name: str) -> logging.Logger:
@@ -73,11 +146,144 @@ def get_logger(module_name: str) -> logging.Logger:
     # Only add a handler if this logger doesn't have one yet
     # (prevents duplicate log lines if get_logger is called twice)
     if not logger.handlers:
-        logger.setLevel(logging.DEBUG)
+        if _log_levels is not None:
+            _log_levels.attach(logger)
+        else:
+            logger.setLevel(logging.DEBUG)
 
-        # Console handler — prints logs to the terminal
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(JsonFormatter())
-        logger.addHandler(console_handler)
+        handler = _new_handler()
+        logger.addHandler(handler)
+        _our_handlers[module_name] = handler
+        if _rate_limiter is not None:
+            logger.addFilter(_rate_limiter)
 
     return logger
+
+
+# ──────────────────────────────────────────────────
+# Queued logging
+# ──────────────────────────────────────────────────
+
+_our_handlers: dict[str, logging.Handler] = {}   # logger name → the handler get_logger added
+_queued_writer = None
+_rate_limiter = None
+_log_levels = None
+
+
+def _new_handler() -> logging.Handler:
+    if _queued_writer is not None:
+        return _queued_writer.handler
+    # Console handler — prints logs to the terminal
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(JsonFormatter())
+    return console_handler
+
+
+def _swap_handlers() -> None:
+    """Give every logger made by get_logger the current kind of handler."""
+    for name, old in list(_our_handlers.items()):
+        logger = logging.getLogger(name)
+        new = _new_handler()
+        logger.handlers = [new if h is old else h for h in logger.handlers]
+        _our_handlers[name] = new
+
+
+def enable_queued_logging(stream=None, maxsize: int | None = None, batch_size: int | None = None,
+                          sinks=()):
+    """
+    Switch every get_logger() logger (existing and future) to queued logging.
+    `sinks` are extra places every line goes to (e.g. a RotatingGzipFileSink).
+    Returns the BackgroundLogWriter (its counters show drops and batches).
+    Calling it again returns the writer that is already running.
+    """
+    global _queued_writer
+    if _queued_writer is not None:
+        return _queued_writer
+
+    from src.loggingx.log_queue import DEFAULT_BATCH_SIZE, DEFAULT_MAX_QUEUE, BackgroundLogWriter
+    writer = BackgroundLogWriter(
+        stream,
+        JsonFormatter(),
+        maxsize=maxsize or DEFAULT_MAX_QUEUE,
+        batch_size=batch_size or DEFAULT_BATCH_SIZE,
+        sinks=sinks,
+    )
+    writer.start()
+    _queued_writer = writer
+    _swap_handlers()
+    atexit.register(disable_queued_logging)   # don't lose the last lines on exit
+    return writer
+
+
+def disable_queued_logging() -> None:
+    """Write what is still queued and go back to direct console logging."""
+    global _queued_writer
+    writer, _queued_writer = _queued_writer, None
+    if writer is None:
+        return
+    _swap_handlers()
+    writer.stop()
+
+
+# ──────────────────────────────────────────────────
+# Rate limiting
+# ──────────────────────────────────────────────────
+
+def enable_rate_limiting(**options):
+    """
+    Add one shared LogRateLimiter to every get_logger() logger (existing
+    and future). `options` go to LogRateLimiter (window, rate, burst...).
+    Returns the limiter (its counters show what was suppressed).
+    """
+    global _rate_limiter
+    if _rate_limiter is not None:
+        return _rate_limiter
+
+    from src.loggingx.rate_limit import LogRateLimiter
+    _rate_limiter = LogRateLimiter(**options)
+    for name in _our_handlers:
+        logging.getLogger(name).addFilter(_rate_limiter)
+    atexit.register(disable_rate_limiting)   # write the last summaries on exit
+    return _rate_limiter
+
+
+def disable_rate_limiting() -> None:
+    """Write pending summaries and remove the limiter from every logger."""
+    global _rate_limiter
+    limiter, _rate_limiter = _rate_limiter, None
+    if limiter is None:
+        return
+    for name in _our_handlers:
+        logging.getLogger(name).removeFilter(limiter)
+    limiter.close()
+
+
+# ──────────────────────────────────────────────────
+# Log levels
+# ──────────────────────────────────────────────────
+
+def enable_log_levels(path=None, default="INFO"):
+    """
+    Take every get_logger() logger's level (existing and future) from a
+    LogLevels registry, loaded from the JSON file at `path` if given.
+    Returns the registry, to change levels with.
+    """
+    global _log_levels
+    from src.loggingx.levels import LogLevels
+    _log_levels = LogLevels(path, default)
+    for name in _our_handlers:
+        _log_levels.attach(logging.getLogger(name))
+    return _log_levels
+
+
+def get_log_levels():
+    """The registry from enable_log_levels() (None if not enabled)."""
+    return _log_levels
+
+
+def disable_log_levels() -> None:
+    """Back to DEBUG for every get_logger() logger."""
+    global _log_levels
+    _log_levels = None
+    for name in _our_handlers:
+        logging.getLogger(name).setLevel(logging.DEBUG)
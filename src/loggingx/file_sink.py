@@ -0,0 +1,266 @@
+"""
+file_sink.py — Log files that are kind to the Pi's SD card.
+
+SD cards wear out from many small writes. So instead of writing every log
+line straight to disk, the file sink:
+
+    Buffers       lines are collected in memory and written in chunks of
+                  `buffer_size` bytes (or after `flush_interval` seconds)
+    Syncs rarely  fsync (forcing the data onto the card) happens at most
+                  every `fsync_interval` seconds, not per line
+    Rotates       when the file reaches `max_bytes` or is `rotate_interval`
+                  seconds old, it is closed and a new one started
+    Compresses    the closed file is gzipped in the background, reading and
+                  writing in small chunks (never the whole file in memory)
+    Caps disk use the oldest .gz files are deleted so everything together
+                  stays under `max_total_bytes`
+
+    logs/agent.log                              ← being written
+    logs/agent.log.20261019-031500.gz           ← older, compressed
+    logs/agent.log.20261018-221500.gz
+
+It also counts what it writes, so we can check "write amplification": how
+many bytes hit the disk (active file + .gz files) for every byte of log
+text. `stats()` returns the numbers; a warning is logged when the disk
+write rate goes over `write_budget_bps`.
+
+The sink behaves like a stream (write/flush/close), so the queued log
+writer can write to it directly (see enable_queued_logging()).
+
+How to use:
+    sink = RotatingGzipFileSink("/var/log/ixg-agent")
+    sink.write(line + "\\n")
+    sink.flush()       # cheap: only writes if the buffer is due
+    sink.close()       # writes and fsyncs everything
+"""
+
+import gzip
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("file_sink")
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024          # rotate at 5 MB ...
+DEFAULT_ROTATE_INTERVAL = 24 * 3600.0        # ... or once a day
+DEFAULT_MAX_TOTAL_BYTES = 50 * 1024 * 1024   # all log files together
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0                 # seconds a line may wait in memory
+DEFAULT_FSYNC_INTERVAL = 10.0                # seconds between fsyncs
+DEFAULT_WRITE_BUDGET_BPS = 20 * 1024         # disk bytes/s before we warn
+COMPRESS_CHUNK_SIZE = 64 * 1024
+RATE_WINDOW = 60.0                           # seconds the write rate is averaged over
+
+
+class RotatingGzipFileSink:
+    def __init__(
+        self,
+        directory: str | Path,
+        base_name: str = "agent.log",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rotate_interval: float = DEFAULT_ROTATE_INTERVAL,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        write_budget_bps: float = DEFAULT_WRITE_BUDGET_BPS,
+        compress_level: int = 5,
+    ):
+        self.directory = Path(directory)
+        self.base_name = base_name
+        self.path = self.directory / base_name
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.max_total_bytes = max_total_bytes
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.write_budget_bps = write_budget_bps
+        self.compress_level = compress_level
+
+        # Counters
+        self.logged_bytes = 0         # log text handed to us
+        self.file_bytes = 0           # written to the active files
+        self.compressed_bytes = 0     # written as .gz
+        self.fsyncs = 0
+        self.rotations = 0
+        self.deleted_segments = 0
+
+        self._lock = profiled_lock("log_file_sink")
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        self._recent_writes = deque()           # (monotonic time, disk bytes)
+        self._over_budget = False
+        self._compressors: list[threading.Thread] = []
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    # ── Stream interface ───────────────────────────
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        with self._lock:
+            self._buffer.append(data)
+            self._buffered += len(data)
+            self.logged_bytes += len(data)
+            if self._buffered >= self.buffer_size:
+                self._write_buffer_locked()
+
+    def flush(self) -> None:
+        """Write the buffer if it has waited `flush_interval` seconds (cheap to call often)."""
+        with self._lock:
+            if self._buffered and time.monotonic() - self._last_write_at >= self.flush_interval:
+                self._write_buffer_locked()
+
+    def close(self) -> None:
+        """Write and fsync everything, and wait for running compressions."""
+        with self._lock:
+            self._write_buffer_locked()
+            self._fsync_locked()
+            self._file.close()
+            compressors, self._compressors = self._compressors, []
+        for compressor in compressors:
+            compressor.join()
+
+    # ── Writing ────────────────────────────────────
+
+    def _open(self) -> None:
+        self._file = open(self.path, "ab", buffering=0)
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._opened_at = time.monotonic()
+        self._last_write_at = self._opened_at
+        self._last_fsync_at = self._opened_at
+
+    def _write_buffer_locked(self) -> None:
+        now = time.monotonic()
+        if self._buffered:
+            data = b"".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            self._file.write(data)
+            self._size += len(data)
+            self.file_bytes += len(data)
+            self._count_disk_write(len(data), now)
+        self._last_write_at = now
+
+        if now - self._last_fsync_at >= self.fsync_interval:
+            self._fsync_locked()
+        if self._size >= self.max_bytes or (self._size and now - self._opened_at >= self.rotate_interval):
+            self._rotate_locked()
+
+    def _fsync_locked(self) -> None:
+        try:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+        except OSError:
+            pass
+        self._last_fsync_at = time.monotonic()
+
+    # ── Rotation and compression ───────────────────
+
+    def _rotate_locked(self) -> None:
+        self._fsync_locked()
+        self._file.close()
+        segment = self.directory / f"{self.base_name}.{time.strftime('%Y%m%d-%H%M%S')}"
+        n = 1
+        while segment.exists() or segment.with_name(segment.name + ".gz").exists():
+            segment = self.directory / f"{self.base_name}.{time.strftime('%Y%m%d-%H%M%S')}-{n}"
+            n += 1
+        os.replace(self.path, segment)
+        self.rotations += 1
+        self._open()
+
+        # Compress in the background so logging carries on meanwhile
+        self._compressors = [t for t in self._compressors if t.is_alive()]
+        compressor = threading.Thread(target=self._compress, args=(segment,),
+                                      name="LogCompressThread", daemon=True)
+        self._compressors.append(compressor)
+        compressor.start()
+
+    def _compress(self, segment: Path) -> None:
+        gz_path = segment.with_name(segment.name + ".gz")
+        tmp_path = segment.with_name(segment.name + ".gz.tmp")
+        try:
+            with open(segment, "rb") as src, open(tmp_path, "wb") as raw:
+                with gzip.GzipFile(filename=segment.name, mode="wb", fileobj=raw,
+                                   compresslevel=self.compress_level) as gz:
+                    shutil.copyfileobj(src, gz, COMPRESS_CHUNK_SIZE)
+                raw.flush()
+                os.fsync(raw.fileno())
+                size = raw.tell()
+            os.replace(tmp_path, gz_path)
+            os.remove(segment)
+        except OSError as e:
+            logger.error(f"Could not compress {segment.name}: {e}")
+            return
+        with self._lock:
+            self.compressed_bytes += size
+            self._count_disk_write(size, time.monotonic())
+        self._enforce_cap()
+
+    def segments(self) -> list[Path]:
+        """The compressed files, oldest first."""
+        def age_key(path: Path):
+            try:
+                return (path.stat().st_mtime, path.name)
+            except OSError:
+                return (0.0, path.name)
+        return sorted(self.directory.glob(f"{self.base_name}.*.gz"), key=age_key)
+
+    def _enforce_cap(self) -> None:
+        """Delete the oldest .gz files until everything fits in max_total_bytes."""
+        segments = self.segments()
+        sizes = {}
+        for segment in segments:
+            try:
+                sizes[segment] = segment.stat().st_size
+            except OSError:
+                sizes[segment] = 0
+        total = sum(sizes.values()) + self._size
+        for segment in segments:
+            if total <= self.max_total_bytes:
+                break
+            try:
+                segment.unlink()
+            except OSError:
+                continue
+            total -= sizes[segment]
+            self.deleted_segments += 1
+
+    # ── Write rate ─────────────────────────────────
+
+    def _count_disk_write(self, size: int, now: float) -> None:
+        """Lock must be held."""
+        self._recent_writes.append((now, size))
+        while self._recent_writes and now - self._recent_writes[0][0] > RATE_WINDOW:
+            self._recent_writes.popleft()
+
+        over = self._write_rate(now) > self.write_budget_bps
+        if over and not self._over_budget:
+            logger.warning(f"Log files are writing {self._write_rate(now):.0f} B/s to disk "
+                           f"(budget {self.write_budget_bps:.0f} B/s)")
+        self._over_budget = over
+
+    def _write_rate(self, now: float) -> float:
+        return sum(size for _t, size in self._recent_writes) / RATE_WINDOW
+
+    def stats(self) -> dict:
+        """Plain numbers, ready to log or publish."""
+        with self._lock:
+            disk = self.file_bytes + self.compressed_bytes
+            return {
+                "logged_bytes": self.logged_bytes,
+                "disk_bytes": disk,
+                "write_amplification": round(disk / self.logged_bytes, 3) if self.logged_bytes else 0.0,
+                "disk_bytes_per_sec": round(self._write_rate(time.monotonic()), 1),
+                "fsyncs": self.fsyncs,
+                "rotations": self.rotations,
+                "deleted_segments": self.deleted_segments,
+            }
@@ -0,0 +1,265 @@
+"""
+levels.py — Change log levels while the agent is running.
+
+In production we want quiet logs (INFO and up). While chasing a problem we
+want DEBUG from ONE module, e.g. usb_monitor or ui_renderer, without
+editing code or restarting the station (a restart often makes the problem
+go away).
+
+The levels live in a small JSON file:
+
+    /etc/ixg-agent/log_levels.json
+    {
+        "default": "INFO",
+        "loggers": {"usb_monitor": "DEBUG"}
+    }
+
+and can be changed live in two ways:
+
+    Signal    edit the file, then `kill -USR1 <pid>`: the file is read again
+              (anything set through the socket is dropped)
+    Socket    a local control socket takes one-line commands:
+                  python -m src.loggingx.levels get
+                  python -m src.loggingx.levels set usb_monitor DEBUG
+                  python -m src.loggingx.levels reset usb_monitor
+                  python -m src.loggingx.levels reload
+
+A level that is off costs (almost) nothing: logger.debug() checks the level
+BEFORE it builds a record or formats anything. For that to hold, hot paths
+pass values as %-arguments instead of an f-string (an f-string is formatted
+before the call even starts):
+
+    logger.debug("Key %d painted in %.1f ms", key, ms)      # free when off
+    logger.debug(f"Key {key} painted in {ms:.1f} ms")       # always formatted
+
+How to use:
+    from src.loggingx.event_log import enable_log_levels
+    levels = enable_log_levels("/etc/ixg-agent/log_levels.json")
+    levels.set_level("usb_monitor", "DEBUG")
+    install_reload_signal(levels)
+    LogLevelServer(levels, "/run/ixg-agent/log-levels.sock").start()
+"""
+
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+DEFAULT_LEVEL = logging.INFO
+DEFAULT_LEVELS_PATH = "/etc/ixg-agent/log_levels.json"
+DEFAULT_SOCKET_PATH = "/run/ixg-agent/log-levels.sock"
+
+
+def parse_level(level: str | int) -> int:
+    """ "debug", "DEBUG" or 10 → 10. Raises ValueError for anything else."""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level!r}")
+    return value
+
+
+class LogLevels:
+    """
+    The level of every module logger: a default, plus overrides per logger
+    (from the file, or set live).
+    """
+    def __init__(self, path: str | Path | None = None, default: str | int = DEFAULT_LEVEL):
+        self.path = Path(path) if path else None
+        self.default = parse_level(default)
+        self._initial_default = self.default
+        self._overrides: dict[str, int] = {}
+        self._loggers: dict[str, logging.Logger] = {}   # loggers that follow the default
+        self._lock = threading.RLock()
+        if self.path:
+            self.reload()
+
+    # ── Lookups ────────────────────────────────────
+
+    def level_for(self, name: str) -> int:
+        return self._overrides.get(name, self.default)
+
+    def levels(self) -> dict:
+        """{"default": "INFO", "loggers": {name: level name}} for every known logger."""
+        with self._lock:
+            names = sorted(self._loggers.keys() | self._overrides.keys())
+            return {
+                "default": logging.getLevelName(self.default),
+                "loggers": {name: logging.getLevelName(self.level_for(name)) for name in names},
+            }
+
+    # ── Changes ────────────────────────────────────
+
+    def attach(self, logger: logging.Logger) -> None:
+        """Give `logger` its level now and whenever the levels change."""
+        with self._lock:
+            self._loggers[logger.name] = logger
+            logger.setLevel(self.level_for(logger.name))
+
+    def set_level(self, name: str, level: str | int) -> None:
+        """Set one logger's level ("default" sets the default for all the others)."""
+        level = parse_level(level)
+        with self._lock:
+            if name == "default":
+                self.default = level
+                self._apply_all()
+            else:
+                self._overrides[name] = level
+                logging.getLogger(name).setLevel(level)
+        _logger().info(f"Log level of {name} set to {logging.getLevelName(level)}")
+
+    def reset(self, name: str | None = None) -> None:
+        """Drop the override for `name` (or every override) so the default applies again."""
+        with self._lock:
+            if name is None:
+                self._overrides.clear()
+                self._apply_all()
+            elif self._overrides.pop(name, None) is not None:
+                logging.getLogger(name).setLevel(
+                    self.default if name in self._loggers else logging.NOTSET)
+
+    def reload(self) -> None:
+        """
+        Read the levels file again. A missing file means "defaults"; a broken
+        one is reported and the current levels are kept.
+        """
+        if not self.path:
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            default = parse_level(data.get("default", self._initial_default))
+            overrides = {str(name): parse_level(level) for name, level in data.get("loggers", {}).items()}
+        except FileNotFoundError:
+            default, overrides = self._initial_default, {}
+        except (OSError, ValueError, AttributeError) as e:
+            _logger().error(f"Could not read log levels from {self.path}: {e}")
+            return
+
+        with self._lock:
+            previous = set(self._overrides)
+            self.default = default
+            self._overrides = overrides
+            for name in previous - overrides.keys() - self._loggers.keys():
+                logging.getLogger(name).setLevel(logging.NOTSET)
+            self._apply_all()
+        _logger().info(f"Log levels loaded: {self.levels()}")
+
+    def _apply_all(self) -> None:
+        """Lock must be held."""
+        for name, logger in self._loggers.items():
+            logger.setLevel(self.level_for(name))
+        for name, level in self._overrides.items():
+            if name not in self._loggers:
+                logging.getLogger(name).setLevel(level)
+
+    # ── Control commands ───────────────────────────
+
+    def command(self, line: str) -> dict:
+        """
+        Run one control command and return the reply:
+            get | set <logger> <level> | reset [<logger>] | reload
+        """
+        words = line.split()
+        try:
+            if not words or words[0] == "get":
+                pass
+            elif words[0] == "set" and len(words) == 3:
+                self.set_level(words[1], words[2])
+            elif words[0] == "reset" and len(words) <= 2:
+                self.reset(words[1] if len(words) == 2 else None)
+            elif words[0] == "reload" and len(words) == 1:
+                self.reload()
+            else:
+                return {"ok": False, "error": f"Unknown command: {line.strip()!r}"}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, **self.levels()}
+
+
+def _logger() -> logging.Logger:
+    # Imported here: event_log imports this module
+    from src.loggingx.event_log import get_logger
+    return get_logger("log_levels")
+
+
+# ──────────────────────────────────────────────────
+# Signal and control socket
+# ──────────────────────────────────────────────────
+
+def install_reload_signal(levels: LogLevels, signum: int = signal.SIGUSR1) -> None:
+    """Read the levels file again whenever the process gets `signum` (`kill -USR1 <pid>`)."""
+    def reload_in_background(_signum, _frame):
+        threading.Thread(target=levels.reload, name="LogLevelReloadThread", daemon=True).start()
+
+    signal.signal(signum, reload_in_background)
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            reply = self.server.levels.command(raw.decode("utf-8", errors="replace"))
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class LogLevelServer:
+    """
+    The control socket: a unix socket only this user can open (mode 0600),
+    served by one background thread.
+    """
+    def __init__(self, levels: LogLevels, path: str | Path = DEFAULT_SOCKET_PATH):
+        self.levels = levels
+        self.path = Path(path)
+        self._server = None
+        self._thread = None
+
+    def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.path.unlink()          # left over from a previous run
+        except FileNotFoundError:
+            pass
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(str(self.path), _CommandHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        self._server.levels = self.levels
+        self._thread = threading.Thread(target=self._server.serve_forever, name="LogLevelServerThread",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def send_command(line: str, path: str | Path = DEFAULT_SOCKET_PATH, timeout: float = 2.0) -> dict:
+    """Send one command to a running agent and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(line.encode("utf-8") + b"\n")
+        with sock.makefile("rb") as replies:
+            return json.loads(replies.readline())
+
+
+if __name__ == "__main__":
+    socket_path = os.environ.get("IXG_LOG_SOCKET", DEFAULT_SOCKET_PATH)
+    reply = send_command(" ".join(sys.argv[1:]) or "get", socket_path)
+    print(json.dumps(reply, indent=2))
+    sys.exit(0 if reply.get("ok") else 1)
@@ -0,0 +1,371 @@
+"""
+lock_profiler.py — Where do the agent's threads WAIT?
+
+The agent runs several threads: the main loop, the system and USB
+monitors, a StreamDock reader per deck, the log writer and the render
+queue. When a key press feels slow under load, the question is often not
+"what is slow" but "who is waiting for whom".
+
+The lock profiler answers that. Locks made with profiled_lock() record,
+per name:
+
+    acquisitions   how often the lock was taken
+    contended      how often it was already held (the caller had to wait)
+    wait           time spent waiting for it (total / max)
+    hold           time it was held (total / max)
+
+Queues registered with watch_queue() are sampled every few seconds (last,
+mean and max depth), and so is every thread's CPU time, read from
+/proc/self/task/<tid>/stat. A lock with a long total wait, held by a
+thread that is busy on the CPU, is a real serialization point.
+
+Profiling is OFF unless enabled, and then profiled_lock() returns a plain
+threading.Lock: there is no cost at all. Profiling must be enabled BEFORE
+the objects owning the locks are created (main.py does it first thing).
+
+How to use:
+    from src.loggingx.lock_profiler import profiled_lock, watch_queue
+
+    self._lock = profiled_lock("talk_engine")
+    watch_queue("render_queue", self.depth)
+
+    profiler = get_lock_profiler()
+    profiler.enable()
+    profiler.start(report_path="/tmp/lock-profile.json")    # sampling thread
+    print(profiler.format_report())
+
+The running agent enables it when IXG_LOCK_PROFILE is set to a file path;
+the report there is rewritten every sampling interval.
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_SAMPLE_INTERVAL = 5.0          # seconds between queue / thread CPU samples
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+
+
+@dataclass
+class LockStats:
+    """
+    Everything measured about one named lock (several locks may share a name).
+
+    Fields:
+        name: The name given to profiled_lock()
+        acquisitions: Times the lock was taken
+        contended: Times it was already held and the caller had to wait
+        wait_ns / max_wait_ns: Time spent waiting for it (total / longest)
+        hold_ns / max_hold_ns: Time it was held (total / longest)
+    """
+    name: str
+    acquisitions: int = 0
+    contended: int = 0
+    wait_ns: int = 0
+    max_wait_ns: int = 0
+    hold_ns: int = 0
+    max_hold_ns: int = 0
+
+
+@dataclass
+class QueueStats:
+    """Sampled depth of one watched queue."""
+    name: str
+    samples: int = 0
+    last: int = 0
+    total: int = 0
+    max: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+
+@dataclass
+class ThreadCpu:
+    """
+    CPU use of one thread over the last sampling interval.
+
+    Fields:
+        tid: Kernel thread ID
+        name: Python thread name (or the kernel's, for threads Python didn't start)
+        cpu_seconds: User + system CPU time since the thread started
+        cpu_percent: Share of one core used during the last interval
+    """
+    tid: int
+    name: str
+    cpu_seconds: float
+    cpu_percent: float = 0.0
+
+
+class ProfiledLock:
+    """
+    A threading.Lock (or RLock) that measures itself. Works with `with`,
+    and as the lock of a threading.Condition (plain locks only).
+
+    All counters are updated while the wrapped lock is held, so they need
+    no lock of their own.
+    """
+    __slots__ = ("_lock", "_stats", "_depth", "_held_since")
+
+    def __init__(self, stats: LockStats, reentrant: bool = False):
+        self._lock = threading.RLock() if reentrant else threading.Lock()
+        self._stats = stats
+        self._depth = 0
+        self._held_since = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            waited = 0
+        elif not blocking:
+            return False
+        else:
+            started = time.perf_counter_ns()
+            if not self._lock.acquire(True, timeout):
+                return False
+            waited = time.perf_counter_ns() - started
+
+        stats = self._stats
+        stats.acquisitions += 1
+        if waited:
+            stats.contended += 1
+            stats.wait_ns += waited
+            if waited > stats.max_wait_ns:
+                stats.max_wait_ns = waited
+        self._depth += 1
+        if self._depth == 1:
+            self._held_since = time.perf_counter_ns()
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            held = time.perf_counter_ns() - self._held_since
+            stats = self._stats
+            stats.hold_ns += held
+            if held > stats.max_hold_ns:
+                stats.max_hold_ns = held
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._depth > 0
+
+    __enter__ = acquire
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class LockProfiler:
+    def __init__(self):
+        self.enabled = False
+        self._locks: dict[str, LockStats] = {}
+        self._queues: dict[str, tuple[Callable[[], Callable[[], int] | None], QueueStats]] = {}
+        self._threads: dict[int, ThreadCpu] = {}
+        self._last_sample = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Locks made from now on are plain locks (existing ones keep measuring)."""
+        self.enabled = False
+
+    def clear(self) -> None:
+        """Forget every lock, queue and thread sample."""
+        with self._lock:
+            self._locks.clear()
+            self._queues.clear()
+            self._threads.clear()
+
+    # ── Instrumenting ──────────────────────────────
+
+    def lock(self, name: str, reentrant: bool = False):
+        """A new lock: a ProfiledLock while enabled, a plain one otherwise."""
+        if not self.enabled:
+            return threading.RLock() if reentrant else threading.Lock()
+        with self._lock:
+            stats = self._locks.setdefault(name, LockStats(name))
+        return ProfiledLock(stats, reentrant)
+
+    def watch_queue(self, name: str, depth: Callable[[], int]) -> None:
+        """
+        Sample `depth()` at every interval. A bound method is held weakly, so
+        watching a queue doesn't keep it alive. Does nothing while disabled.
+        """
+        if not self.enabled:
+            return
+        if hasattr(depth, "__self__"):
+            ref = weakref.WeakMethod(depth)
+        else:
+            ref = lambda: depth
+        with self._lock:
+            self._queues[name] = (ref, QueueStats(name))
+
+    # ── Sampling ───────────────────────────────────
+
+    def sample(self) -> None:
+        """Take one queue depth and thread CPU sample (the sampling thread calls this)."""
+        with self._lock:
+            queues = list(self._queues.items())
+        for name, (ref, stats) in queues:
+            depth = ref()
+            if depth is None:                       # the queue is gone
+                with self._lock:
+                    self._queues.pop(name, None)
+                continue
+            try:
+                value = int(depth())
+            except Exception:
+                continue
+            stats.samples += 1
+            stats.last = value
+            stats.total += value
+            stats.max = max(stats.max, value)
+
+        now = time.monotonic()
+        elapsed = now - self._last_sample if self._last_sample else 0.0
+        threads = {}
+        for cpu in thread_cpu_times():
+            before = self._threads.get(cpu.tid)
+            if before is not None and elapsed > 0:
+                cpu.cpu_percent = round(100.0 * (cpu.cpu_seconds - before.cpu_seconds) / elapsed, 1)
+            threads[cpu.tid] = cpu
+        with self._lock:
+            self._threads = threads
+            self._last_sample = now
+
+    def start(self, interval: float = DEFAULT_SAMPLE_INTERVAL, report_path: str | Path | None = None) -> None:
+        """Sample every `interval` seconds on a daemon thread, rewriting `report_path` each time."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval, report_path), name="LockProfilerThread", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self, interval: float, report_path) -> None:
+        self.sample()
+        while not self._stop.wait(interval):
+            self.sample()
+            if report_path:
+                try:
+                    self.dump(report_path)
+                except OSError:
+                    pass
+
+    # ── Reporting ──────────────────────────────────
+
+    def report(self) -> dict:
+        """Locks (most waited-for first), queues and threads (busiest first), as plain data."""
+        with self._lock:
+            locks = [asdict(s) for s in self._locks.values()]
+            queues = [{**asdict(s), "mean": round(s.mean, 2)} for _ref, s in self._queues.values()]
+            threads = [asdict(t) for t in self._threads.values()]
+        locks.sort(key=lambda s: s["wait_ns"], reverse=True)
+        threads.sort(key=lambda t: t["cpu_percent"], reverse=True)
+        return {"locks": locks, "queues": queues, "threads": threads}
+
+    def metrics(self) -> dict[str, float]:
+        """The report as flat metric name → value pairs, e.g. "lock.talk_engine.wait_ms"."""
+        report = self.report()
+        metrics = {}
+        for s in report["locks"]:
+            prefix = f"lock.{s['name']}"
+            metrics[f"{prefix}.acquisitions"] = s["acquisitions"]
+            metrics[f"{prefix}.contended"] = s["contended"]
+            metrics[f"{prefix}.wait_ms"] = round(s["wait_ns"] / 1e6, 3)
+            metrics[f"{prefix}.max_wait_ms"] = round(s["max_wait_ns"] / 1e6, 3)
+            metrics[f"{prefix}.hold_ms"] = round(s["hold_ns"] / 1e6, 3)
+            metrics[f"{prefix}.max_hold_ms"] = round(s["max_hold_ns"] / 1e6, 3)
+        for q in report["queues"]:
+            metrics[f"queue.{q['name']}.depth"] = q["last"]
+            metrics[f"queue.{q['name']}.mean_depth"] = q["mean"]
+            metrics[f"queue.{q['name']}.max_depth"] = q["max"]
+        for t in report["threads"]:
+            metrics[f"thread.{t['name']}.cpu_percent"] = t["cpu_percent"]
+        return metrics
+
+    def format_report(self) -> str:
+        report = self.report()
+        lines = [f"  {'lock':<26} {'taken':>8} {'contended':>10} {'wait ms':>10} "
+                 f"{'max wait':>9} {'hold ms':>10} {'max hold':>9}"]
+        for s in report["locks"]:
+            lines.append(
+                f"  {s['name']:<26} {s['acquisitions']:>8} {s['contended']:>10} "
+                f"{s['wait_ns'] / 1e6:>10.2f} {s['max_wait_ns'] / 1e6:>9.2f} "
+                f"{s['hold_ns'] / 1e6:>10.2f} {s['max_hold_ns'] / 1e6:>9.2f}")
+        if report["queues"]:
+            lines.append(f"  {'queue':<26} {'depth':>8} {'mean':>10} {'max':>10}")
+            for q in report["queues"]:
+                lines.append(f"  {q['name']:<26} {q['last']:>8} {q['mean']:>10.2f} {q['max']:>10}")
+        if report["threads"]:
+            lines.append(f"  {'thread':<26} {'tid':>8} {'cpu %':>10} {'cpu s':>10}")
+            for t in report["threads"]:
+                lines.append(f"  {t['name']:<26} {t['tid']:>8} {t['cpu_percent']:>10.1f} {t['cpu_seconds']:>10.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path: str | Path) -> Path:
+        """Write the report (and metrics) as JSON, atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({**self.report(), "metrics": self.metrics()}, f, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+
+def thread_cpu_times(task_dir: str | Path = "/proc/self/task") -> list[ThreadCpu]:
+    """CPU time of every thread of this process (empty where there is no /proc)."""
+    names = {t.native_id: t.name for t in threading.enumerate()}
+    threads = []
+    try:
+        entries = os.listdir(task_dir)
+    except OSError:
+        return threads
+    for entry in entries:
+        try:
+            with open(os.path.join(task_dir, entry, "stat")) as f:
+                stat = f.read()
+        except OSError:
+            continue                                # the thread ended meanwhile
+        # "tid (comm) state ppid ..." — comm may hold spaces and brackets
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 2:].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        tid = int(entry)
+        threads.append(ThreadCpu(tid, names.get(tid, comm), (utime + stime) / _CLOCK_TICKS))
+    return threads
+
+
+# ──────────────────────────────────────────────────
+# The process-wide profiler
+# ──────────────────────────────────────────────────
+
+_profiler = LockProfiler()
+
+# Shortcuts for instrumenting code: `self._lock = profiled_lock("talk_engine")`
+profiled_lock = _profiler.lock
+watch_queue = _profiler.watch_queue
+
+
+def get_lock_profiler() -> LockProfiler:
+    return _profiler
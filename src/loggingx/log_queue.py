@@ -0,0 +1,220 @@
+"""
+log_queue.py — Logging that never makes the caller wait.
+
+A normal logging handler does all the work on the thread that logs:
+building the JSON line, then writing it to the console. If the console
+(or journald behind it) is slow for a moment, EVERY thread that logs is
+slow too — including the deck's key reader and the paint path.
+
+Queued logging splits the job in two:
+
+    caller thread       logger.info(...)  →  message and traceback made into
+                                             text, record appended to a queue
+                                             (a few microseconds, never blocks)
+    writer thread       takes everything that has piled up, formats it and
+                        writes it as ONE batch, then flushes once
+
+The message is made into text on the caller's thread (like the standard
+QueueHandler does), so an argument that changes after the call can't
+change the line that is written later.
+
+The queue has a size limit. If the writer can't keep up (console stuck),
+new records are DROPPED and counted instead of piling up in memory or
+blocking the caller. The writer reports the count in the log as soon as it
+can ("Dropped 120 log records").
+
+Besides the console, the writer can copy every batch to extra "sinks"
+(anything with write/flush/close, e.g. the log file in file_sink.py).
+When nothing has been logged for `idle_flush` seconds it calls flush() on
+them, so a buffered sink doesn't sit on the last lines forever.
+
+How to use:
+    writer = BackgroundLogWriter(sys.stderr)
+    writer.start()
+    logger.addHandler(writer.handler)
+    ...
+    writer.stop()        # writes everything still queued
+
+Usually you don't do this by hand: see enable_queued_logging() in event_log.py.
+"""
+
+import copy
+import json
+import logging
+import sys
+import threading
+from collections import deque
+
+from src.loggingx.lock_profiler import profiled_lock, watch_queue
+
+DEFAULT_MAX_QUEUE = 10000     # records waiting to be written
+DEFAULT_BATCH_SIZE = 256      # records per write() call
+DEFAULT_IDLE_FLUSH = 1.0      # seconds of quiet before sinks are flushed
+
+
+class QueuedLogHandler(logging.Handler):
+    """Hands every prepared record to a BackgroundLogWriter. Does no JSON formatting or I/O."""
+    def __init__(self, writer: "BackgroundLogWriter"):
+        super().__init__()
+        self.writer = writer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Handler.handle() would take the handler lock around emit();
+        # enqueueing is already thread-safe, so skip it.
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.writer.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Like QueueHandler.prepare(): a copy with the message (and any
+        traceback) already made into text, so nothing the record points to
+        can change before the writer thread formats it.
+        """
+        record = copy.copy(record)            # other handlers may still use the original
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.writer.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BackgroundLogWriter:
+    def __init__(
+        self,
+        stream=None,
+        formatter: logging.Formatter | None = None,
+        maxsize: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        sinks=(),
+        idle_flush: float = DEFAULT_IDLE_FLUSH,
+    ):
+        if formatter is None:
+            from src.loggingx.event_log import JsonFormatter
+            formatter = JsonFormatter()
+        self.stream = stream if stream is not None else sys.stderr
+        self.formatter = formatter
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.sinks = list(sinks)
+        self.idle_flush = idle_flush
+        self.handler = QueuedLogHandler(self)
+
+        # Counters
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+
+        self._records = deque()              # append/popleft are thread-safe
+        self._dropped_lock = threading.Lock()   # only taken when dropping
+        self._wake = threading.Event()
+        self._write_lock = profiled_lock("log_writer.write")
+        self._reported_dropped = 0
+        self._stopping = False
+        self._thread = None
+        watch_queue("log_writer", self.depth)
+
+    # ── Caller side (hot path) ─────────────────────
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if len(self._records) >= self.maxsize:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        self._records.append(record)
+        self._wake.set()
+
+    def depth(self) -> int:
+        """Records waiting to be written."""
+        return len(self._records)
+
+    # ── Writer thread ──────────────────────────────
+
+    def start(self) -> None:
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="LogWriterThread", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Write what is still queued, stop the thread and close the sinks."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except (OSError, ValueError):
+                pass
+
+    def flush(self) -> None:
+        """Write everything queued so far, on the calling thread."""
+        while self._write_batch():
+            pass
+
+    def _run(self) -> None:
+        while True:
+            if not self._wake.wait(self.idle_flush):
+                self._flush_sinks()      # quiet for a while: let buffered sinks catch up
+                continue
+            self._wake.clear()
+            while self._write_batch():
+                pass
+            if self._stopping:
+                break
+
+    def _write_batch(self) -> bool:
+        """Format and write up to batch_size records. Returns False if there was nothing to do."""
+        with self._write_lock:
+            records = []
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self._records.popleft())
+                except IndexError:
+                    break
+
+            lines = [self._format(record) for record in records]
+            dropped = self.dropped - self._reported_dropped
+            if dropped > 0:
+                self._reported_dropped += dropped
+                lines.append(self._format(logging.LogRecord(
+                    "log_queue", logging.WARNING, __file__, 0,
+                    f"Dropped {dropped} log records (queue full, {self.dropped} in total)", None, None)))
+            if not lines:
+                return False
+
+            text = "\n".join(lines) + "\n"
+            for stream in [self.stream, *self.sinks]:
+                try:
+                    stream.write(text)
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass   # Console gone (closed pipe), disk full...: nothing sensible to do
+            self.written += len(records)
+            self.batches += 1
+            return True
+
+    def _flush_sinks(self) -> None:
+        with self._write_lock:
+            for sink in self.sinks:
+                try:
+                    sink.flush()
+                except (OSError, ValueError):
+                    pass
+
+    def _format(self, record: logging.LogRecord) -> str:
+        try:
+            return self.formatter.format(record)
+        except Exception as e:
+            return json.dumps({"level": "ERROR", "module": "log_queue",
+                               "message": f"Unformattable log record from {record.name}: {e!r}"})
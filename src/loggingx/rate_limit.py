@@ -0,0 +1,201 @@
+"""
+rate_limit.py — Stops a misbehaving device from flooding the log.
+
+A udev storm, a deck that keeps failing to read, or a Pi that stays busy
+can produce the SAME line thousands of times a minute. That fills the SD
+card and, worse, makes logging the thing the CPU is busiest with.
+
+LogRateLimiter is a logging filter with two rules:
+
+    Deduplicate   The same (logger, level, message) again within `window`
+                  seconds is dropped. Numbers don't count: we log with
+                  f-strings, so "Key 3 went red 41 ms" and "Key 5 went red
+                  38 ms" are the same line. Once the window is over, ONE
+                  summary line says how many were dropped:
+                      "Transport read failed (repeated 4182 times in 10s)"
+    Rate limit    Each logger gets a token bucket: `burst` lines at once,
+                  then `rate` lines per second on average. Lines beyond that
+                  are dropped and reported the same way:
+                      "Rate limit: suppressed 250 lines from usb_monitor"
+
+CRITICAL lines are never dropped.
+
+Dropping must be cheap, or a flood would still eat the CPU: it is one
+dictionary lookup and a counter under an uncontended lock. Counters
+(`suppressed_duplicates`, `suppressed_rate_limited`, `suppressed_by_logger`)
+show how much was dropped.
+
+Summary lines carry a `repeated` (or `suppressed`) extra field, so they are
+easy to find in the JSON logs. They are written by the next line that comes
+through, or by a timer once the window is over, so the last burst of a
+storm is reported too. close() writes whatever is still pending.
+
+How to use:
+    limiter = LogRateLimiter(window=10.0, rate=20.0, burst=50)
+    logger.addFilter(limiter)
+
+Usually through enable_rate_limiting() in event_log.py (all loggers at once).
+"""
+
+import logging
+import re
+import threading
+import time
+
+DEFAULT_WINDOW = 10.0       # seconds an identical line stays suppressed
+DEFAULT_RATE = 20.0         # lines per second per logger, on average
+DEFAULT_BURST = 50          # lines a logger may write at once
+DEFAULT_MAX_KEYS = 4096     # distinct messages remembered at most
+SWEEP_INTERVAL = 1.0        # seconds between checks for finished windows
+
+_DIGITS = re.compile(r"\d+")
+
+
+class LogRateLimiter(logging.Filter):
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        exempt_level: int = logging.CRITICAL,
+    ):
+        super().__init__()
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.exempt_level = exempt_level
+
+        # Counters
+        self.suppressed_duplicates = 0
+        self.suppressed_rate_limited = 0
+        self.suppressed_by_logger: dict[str, int] = {}
+
+        self._lock = threading.Lock()
+        # (logger, level, message without numbers) → [window start, suppressed count, first message]
+        self._seen: dict[tuple, list] = {}
+        # logger → [tokens, last refill, suppressed since last summary, level of last suppressed]
+        self._buckets: dict[str, list] = {}
+        self._next_sweep = 0.0
+        self._timer: threading.Timer | None = None   # writes summaries when no line comes by
+        self._closed = False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, "repeated") or hasattr(record, "suppressed"):
+            return True                     # Our own summary lines
+        if record.levelno >= self.exempt_level:
+            return True
+
+        now = time.monotonic()
+        key = (record.name, record.levelno, _DIGITS.sub("#", str(record.msg)))
+        summaries = None
+        with self._lock:
+            if now >= self._next_sweep:
+                summaries = self._sweep_locked(now)
+
+            entry = self._seen.get(key)
+            if entry is not None:
+                if now - entry[0] < self.window:
+                    entry[1] += 1
+                    self._count_locked(record.name)
+                    self.suppressed_duplicates += 1
+                    allowed = False
+                else:
+                    if entry[1]:
+                        summaries = (summaries or []) + [self._repeat_summary(key, entry)]
+                    entry[0], entry[1], entry[2] = now, 0, record.msg
+                    allowed = self._take_token_locked(record, now)
+            else:
+                allowed = self._take_token_locked(record, now)
+                if allowed:
+                    if len(self._seen) >= self.max_keys:
+                        summaries = (summaries or []) + self._sweep_locked(now, force=True)
+                    self._seen[key] = [now, 0, record.msg]
+            if not allowed:
+                self._arm_timer_locked()
+
+        if summaries:
+            _emit(summaries)
+        return allowed
+
+    def flush(self) -> None:
+        """Write every pending summary now (e.g. before shutting down)."""
+        with self._lock:
+            summaries = self._sweep_locked(time.monotonic(), force=True)
+        _emit(summaries)
+
+    def close(self) -> None:
+        """Stop the summary timer and write what is still pending."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+
+    def _on_timer(self) -> None:
+        """No line came by since the storm: write the summaries of finished windows."""
+        with self._lock:
+            self._timer = None
+            summaries = self._sweep_locked(time.monotonic())
+            if any(entry[1] for entry in self._seen.values()):
+                self._arm_timer_locked()     # a window still running has drops to report
+        _emit(summaries)
+
+    # ── Internals (lock held) ──────────────────────
+
+    def _arm_timer_locked(self) -> None:
+        if self._timer is None and not self._closed:
+            self._timer = threading.Timer(min(self.window, SWEEP_INTERVAL * 5), self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _count_locked(self, name: str) -> None:
+        self.suppressed_by_logger[name] = self.suppressed_by_logger.get(name, 0) + 1
+
+    def _take_token_locked(self, record: logging.LogRecord, now: float) -> bool:
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [float(self.burst), now, 0, logging.NOTSET]
+        tokens = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return True
+        bucket[0] = tokens
+        bucket[2] += 1
+        bucket[3] = max(bucket[3], record.levelno)
+        self._count_locked(record.name)
+        self.suppressed_rate_limited += 1
+        return False
+
+    def _sweep_locked(self, now: float, force: bool = False) -> list[logging.LogRecord]:
+        """Forget finished windows; return summary records for what they dropped."""
+        self._next_sweep = now + SWEEP_INTERVAL
+        summaries = []
+        for key in [k for k, e in self._seen.items() if force or now - e[0] >= self.window]:
+            entry = self._seen.pop(key)
+            if entry[1]:
+                summaries.append(self._repeat_summary(key, entry))
+        for name, bucket in self._buckets.items():
+            if bucket[2]:
+                record = logging.LogRecord(name, bucket[3], __file__, 0,
+                                           f"Rate limit: suppressed {bucket[2]} lines from {name}",
+                                           None, None)
+                record.suppressed = bucket[2]
+                summaries.append(record)
+                bucket[2], bucket[3] = 0, logging.NOTSET
+        return summaries
+
+    def _repeat_summary(self, key: tuple, entry: list) -> logging.LogRecord:
+        name, level, _ = key
+        record = logging.LogRecord(name, level, __file__, 0,
+                                   f"{entry[2]} (repeated {entry[1]} times in {self.window:.0f}s)", None, None)
+        record.repeated = entry[1]
+        return record
+
+
+def _emit(records: list[logging.LogRecord]) -> None:
+    for record in records:
+        logging.getLogger(record.name).handle(record)
@@ -0,0 +1,225 @@
+"""
+tracing.py — Where did the time go in ONE slow key update?
+
+The boot profiler answers "which startup phase was slow". Tracing answers
+the same question for anything, any time: was it Pillow drawing the
+button, the JPEG encoding, the filesystem, ctypes or the USB device?
+
+A span is a named piece of work with a start and an end (monotonic
+nanoseconds) and the thread that did it. Spans go into a small ring
+buffer per thread (no lock shared between threads, the oldest spans are
+overwritten), and can be dumped at any moment as a Chrome trace file:
+open it in chrome://tracing or https://ui.perfetto.dev to see every
+thread on a timeline.
+
+    render.draw         ███
+    render.transform       ██
+    render.encode            ████
+    transport.write              ███████████
+
+Tracing is OFF unless enabled. While off, a span costs one attribute
+check (`enabled`) and nothing is recorded.
+
+How to use:
+    from src.loggingx.tracing import get_tracer, span, traced
+
+    with span("render.encode", key=3):
+        image.save(path, "JPEG")
+
+    @traced("transport.write")
+    def write(...): ...
+
+    get_tracer().enable()
+    get_tracer().dump("/tmp/agent-trace.json")
+
+The running agent enables it when IXG_TRACE_DIR is set; `kill -USR2 <pid>`
+then writes a trace file into that directory (see install_dump_signal()).
+"""
+
+import functools
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+DEFAULT_BUFFER_SIZE = 8192       # spans kept per thread
+
+
+class _Span:
+    """One span being timed (used as a `with` block)."""
+    __slots__ = ("_buffer", "_name", "_args", "_start")
+
+    def __init__(self, buffer: deque, name: str, args: dict | None):
+        self._buffer = buffer
+        self._name = name
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # deque.append with a maxlen is atomic: a dump may read it meanwhile
+        self._buffer.append((self._name, self._start, time.monotonic_ns(), self._args))
+        return False
+
+
+class _NoSpan:
+    """What span() returns while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.enabled = False
+        self.buffer_size = buffer_size
+        self._local = threading.local()
+        # One entry per thread that ever recorded: (native thread id, name, ring buffer)
+        self._buffers: list[tuple[int, str, deque]] = []
+        self._lock = threading.Lock()        # only taken when a thread records its first span
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        """Forget every recorded span."""
+        with self._lock:
+            for _tid, _name, buffer in self._buffers:
+                buffer.clear()
+
+    # ── Recording ──────────────────────────────────
+
+    def span(self, name: str, **args):
+        """Time the `with` block as span `name`. `args` are shown with it in the viewer."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self._buffer(), name, args or None)
+
+    def traced(self, name: str | None = None):
+        """Decorator: every call of the function is a span (named after it by default)."""
+        def decorate(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self._buffer(), span_name, None):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add(self, name: str, start_ns: int, end_ns: int, **args) -> None:
+        """Record a span that was timed elsewhere (time.monotonic_ns() readings)."""
+        if self.enabled:
+            self._buffer().append((name, start_ns, end_ns, args or None))
+
+    def _buffer(self) -> deque:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = deque(maxlen=self.buffer_size)
+            thread = threading.current_thread()
+            with self._lock:
+                self._buffers.append((threading.get_native_id(), thread.name, buffer))
+        return buffer
+
+    # ── Export ─────────────────────────────────────
+
+    def spans(self) -> list[dict]:
+        """Every recorded span, oldest first: {name, start_ns, end_ns, tid, thread, args}."""
+        with self._lock:
+            buffers = list(self._buffers)
+        spans = []
+        for tid, thread_name, buffer in buffers:
+            for name, start, end, args in _snapshot(buffer):
+                spans.append({"name": name, "start_ns": start, "end_ns": end,
+                              "tid": tid, "thread": thread_name, "args": args or {}})
+        spans.sort(key=lambda s: s["start_ns"])
+        return spans
+
+    def to_chrome_trace(self) -> dict:
+        """The spans in Chrome's trace-event format ("X" = complete events, times in µs)."""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for s in self.spans():
+            threads[s["tid"]] = s["thread"]
+            event = {
+                "name": s["name"],
+                "cat": s["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": s["start_ns"] / 1000.0,
+                "dur": (s["end_ns"] - s["start_ns"]) / 1000.0,
+                "pid": pid,
+                "tid": s["tid"],
+            }
+            if s["args"]:
+                event["args"] = s["args"]
+            events.append(event)
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str | Path) -> Path:
+        """Write the Chrome trace file (atomically) and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, separators=(",", ":"), default=str)
+        os.replace(tmp_path, path)
+        return path
+
+
+def _snapshot(buffer: deque) -> list:
+    """Copy a ring buffer that its thread may be appending to right now."""
+    for _attempt in range(3):
+        try:
+            return list(buffer)
+        except RuntimeError:             # "deque mutated during iteration"
+            continue
+    return []
+
+
+# ──────────────────────────────────────────────────
+# The process-wide tracer
+# ──────────────────────────────────────────────────
+
+_tracer = Tracer()
+
+# Shortcuts for instrumenting code: `with span("render.draw"):` / `@traced()`
+span = _tracer.span
+traced = _tracer.traced
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def install_dump_signal(directory: str | Path, signum: int = signal.SIGUSR2) -> None:
+    """
+    Write a trace file into `directory` whenever the process gets `signum`
+    (`kill -USR2 <pid>`). The file is written by a short-lived thread, not
+    inside the signal handler.
+    """
+    def dump_in_background(_signum, _frame):
+        path = Path(directory) / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        threading.Thread(target=_tracer.dump, args=(path,), name="TraceDumpThread", daemon=True).start()
+
+    signal.signal(signum, dump_in_background)
@@ -8,19 +8,76 @@ Usage:
 
 import sys
 import os
+import time
+
+# Taken before the heavy imports so the boot profile counts them too
+_IMPORTS_START = time.monotonic()
 
 # Ensure the current directory is in the python path
 sys.path.append(os.getcwd())
 
+from src.loggingx.boot_profiler import reset_boot_profiler
+from src.loggingx.event_log import enable_log_levels, enable_queued_logging, enable_rate_limiting
+from src.loggingx.levels import DEFAULT_LEVELS_PATH, DEFAULT_SOCKET_PATH, LogLevelServer, install_reload_signal
+from src.loggingx.file_sink import RotatingGzipFileSink
+from src.loggingx.lock_profiler import get_lock_profiler
+from src.loggingx.tracing import get_tracer, install_dump_signal
 from src.controller import MainController
+from src.controller.recorder import InputRecorder
+
+# Right after the imports: the setup in main() is timed as its own phase
+_IMPORTS_END = time.monotonic()
+
+# Set this environment variable to a directory to keep log files there
+LOG_DIR_ENV = "IXG_LOG_DIR"
+# ... and this one to a directory to turn tracing on (kill -USR2 writes a trace there)
+TRACE_DIR_ENV = "IXG_TRACE_DIR"
+# Where the log levels file and the control socket live (see loggingx/levels.py)
+LOG_LEVELS_ENV = "IXG_LOG_LEVELS"
+LOG_SOCKET_ENV = "IXG_LOG_SOCKET"
+# Set this to a file path to record every controller input (see controller/replay.py)
+RECORD_PATH_ENV = "IXG_RECORD_PATH"
+# Set this to a file path to profile lock waits, queue depths and thread CPU into it
+LOCK_PROFILE_ENV = "IXG_LOCK_PROFILE"
 
 def main():
     print("="*60)
     print("🤖 STARTING COMMS AGENT")
     print("="*60)
+    setup_start = time.monotonic()
+
+    # First: only locks created after this are profiled
+    lock_profile = os.environ.get(LOCK_PROFILE_ENV)
+    if lock_profile:
+        get_lock_profiler().enable()
+        get_lock_profiler().start(report_path=lock_profile)
+
+    # Log lines are written by a background thread from here on,
+    # and also to rotating log files if a log directory is set
+    log_dir = os.environ.get(LOG_DIR_ENV)
+    enable_queued_logging(sinks=[RotatingGzipFileSink(log_dir)] if log_dir else ())
+    enable_rate_limiting()
+
+    # Quiet by default; levels can be changed live (kill -USR1, or the socket)
+    levels = enable_log_levels(os.environ.get(LOG_LEVELS_ENV, DEFAULT_LEVELS_PATH))
+    install_reload_signal(levels)
+    try:
+        LogLevelServer(levels, os.environ.get(LOG_SOCKET_ENV, DEFAULT_SOCKET_PATH)).start()
+    except OSError as e:
+        print(f"WARNING: No log level control socket: {e}")
+
+    trace_dir = os.environ.get(TRACE_DIR_ENV)
+    if trace_dir:
+        get_tracer().enable()
+        install_dump_signal(trace_dir)
+
+    profiler = reset_boot_profiler(origin=_IMPORTS_START)
+    profiler.record("imports", _IMPORTS_START, _IMPORTS_END)
+    profiler.record("logging_setup", setup_start, time.monotonic())
 
     try:
-        app = MainController()
+        record_path = os.environ.get(RECORD_PATH_ENV)
+        app = MainController(recorder=InputRecorder(record_path) if record_path else None)
         app.run()
     except KeyboardInterrupt:
         print("\n\nNOTICE: Agent stopped by user.")
@@ -52,3 +52,24 @@ class CheckStatus(Enum):
 class TalkMode(Enum):
     PTT = "PTT"      # Push-To-Talk: hold the button to talk, release to stop
     LATCH = "LATCH"  # Latch: press once to start talking, press again to stop
+    AUTO = "AUTO"    # Both: a quick tap latches, a long hold talks only while held
+
+
+# --- Resource State ---
+# How busy one system resource (CPU, memory, disk) is right now.
+# Used by the health monitor so it only logs when the state CHANGES.
+
+class ResourceState(Enum):
+    OK = "OK"        # Usage is normal
+    HIGH = "HIGH"    # Usage crossed the warning threshold
+
+
+# --- Pressure Level ---
+# How hard the Pi is being pushed (heat, throttling, CPU, memory).
+# Subsystems slow down non-essential work when this goes up, so the
+# talk indicator stays responsive.
+
+class PressureLevel(Enum):
+    NORMAL = "NORMAL"        # Run everything at full speed
+    ELEVATED = "ELEVATED"    # Getting hot/busy — slow down extras
+    CRITICAL = "CRITICAL"    # Throttling — only the essentials
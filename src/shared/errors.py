@@ -44,3 +44,41 @@ class BootstrapError(Exception):
     This is the "catch-all" if something unexpected goes wrong during startup.
     """
     pass
+
+
+class ConfigSyncError(Exception):
+    """
+    Raised when a station config change cannot be applied.
+
+    Examples:
+        - A delta starts at a different version than the one we have
+          (we missed an update, so a full resync is needed)
+        - The new config is invalid (two channels on the same key)
+        - The config file could not be written
+    """
+    pass
+
+
+class ControlPlaneError(Exception):
+    """
+    Raised when a call to the control plane fails for good
+    (after retries), or its answer makes no sense.
+
+    Examples:
+        - Server unreachable or returning 5xx on every attempt
+        - Session refused (wrong device secret)
+        - Response body is not valid JSON
+    """
+    pass
+
+
+class StateTransitionError(Exception):
+    """
+    Raised when the agent is asked to move between two states that the
+    state machine does not allow.
+
+    Examples:
+        - Going back to BOOTING once boot has finished
+        - Jumping from BOOTING straight to LIVE (skipping the hardware checks)
+    """
+    pass
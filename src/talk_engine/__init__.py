@@ -0,0 +1,293 @@
+"""
+talk_engine/__init__.py — Turns deck key presses into talk on/off.
+
+Every talk key belongs to a channel, and the channel's TalkMode decides
+what a press means:
+
+    PTT     talk while the key is held, stop on release
+    LATCH   each press toggles talk on/off
+    AUTO    talk starts on press; a quick tap (shorter than
+            `hold_threshold`) leaves it latched on, a long hold stops
+            it on release. A press while latched turns it off.
+
+Two things matter more than anything else here:
+
+    Speed   The operator must SEE the key go red the moment they press it.
+            Key events are handled straight on the deck's reader thread and
+            the key is repainted on the renderer's fast path (a cached,
+            pre-encoded image, one USB write). The time from the key event
+            to the red key is measured against `latency_budget_ms`.
+
+    Safety  Talk is only allowed while the agent is LIVE or DEGRADED; in
+            any other state presses are ignored, and every channel is
+            switched off at once when the agent leaves those states (a
+            latched channel does NOT come back on by itself when we
+            recover). Only while still booting are the channels restored
+            from a crash snapshot kept, until boot ends.
+
+Switches bounce: one physical press can arrive as press-release-press
+within a few milliseconds. A press that comes within `debounce` seconds
+of the last accepted event on its key is ignored, and so are repeats (a
+"press" for a key that is already down). A release is never thrown
+away: one that comes too soon after its press waits out the debounce
+time, and only a new press within that time cancels it as bounce. A
+lost release would leave a push-to-talk channel stuck on.
+
+How to use:
+    engine = TalkEngine(store.channel_for_key, paint_key=paint, on_change=changed)
+    machine.subscribe(engine.on_transition)     # enforces SAFE_MODE talk-off
+    renderer.set_key_callback(engine.on_key)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from src.shared.enums import AgentState, TalkMode
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock
+
+logger = get_logger("talk_engine")
+
+DEFAULT_HOLD_THRESHOLD = 0.35     # seconds: AUTO mode tap vs hold
+DEFAULT_DEBOUNCE = 0.02           # seconds: ignore switch bounce shorter than this
+DEFAULT_LATENCY_BUDGET_MS = 30.0  # key event → key painted red
+
+# States in which the operator may talk
+TALK_ALLOWED_STATES = frozenset({AgentState.LIVE, AgentState.DEGRADED})
+# Boot in progress: channels restored from a crash snapshot are kept (not yet allowed)
+BOOTING_STATES = frozenset({
+    AgentState.BOOTING, AgentState.DISCOVERING_HW, AgentState.REGISTERING, AgentState.SYNCING_CONFIG,
+})
+
+
+class TalkEngine:
+    def __init__(
+        self,
+        channel_for_key: Callable,
+        paint_key: Callable | None = None,
+        on_change: Callable[[str, bool], None] | None = None,
+        hold_threshold: float = DEFAULT_HOLD_THRESHOLD,
+        debounce: float = DEFAULT_DEBOUNCE,
+        latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            channel_for_key: key index → ChannelConfig (or None), e.g.
+                             ConfigStore.channel_for_key
+            paint_key: paint_key(channel, talking) repaints one key (fast path)
+            on_change: on_change(channel_id, talking) after every talk change
+                       (e.g. to save a snapshot). Called outside the hot path.
+            clock: Where "now" comes from (a replay passes its recorded time)
+        """
+        self.channel_for_key = channel_for_key
+        self.paint_key = paint_key
+        self.on_change = on_change
+        self.hold_threshold = hold_threshold
+        self.debounce = debounce
+        self.latency_budget_ms = latency_budget_ms
+        self.clock = clock
+
+        self.allowed = False
+        self.latencies_ms = deque(maxlen=256)   # key event → key painted (talk on)
+        self.over_budget = 0
+        self.debounced = 0
+
+        # Replaced, never changed in place (under _lock), so is_talking can read it lock-free
+        self._talking: dict[str, bool] = {}
+        self._down: dict[int, bool] = {}            # key → currently held
+        self._last_event_at: dict[int, float] = {}  # key → last accepted event
+        self._pressed_at: dict[int, float] = {}     # key → press time, if this press turned talk ON
+        self._pending_release: dict[int, tuple[float, threading.Timer]] = {}   # key → (release time, timer)
+        self._lock = profiled_lock("talk_engine")
+
+    @property
+    def talk_states(self) -> dict[str, bool]:
+        """channel_id → True for every channel that is talking now."""
+        with self._lock:
+            return {channel_id: True for channel_id, on in self._talking.items() if on}
+
+    def is_talking(self, channel_id: str) -> bool:
+        """
+        Lock-free on purpose: the controller asks while holding its paint lock,
+        and the hot path takes that lock while holding ours. _talking is only
+        ever replaced, so this reads one consistent dict.
+        """
+        return self._talking.get(channel_id, False)
+
+    def restore(self, talk_states: dict[str, bool]) -> None:
+        """Bring back latched channels (e.g. from a crash snapshot)."""
+        with self._lock:
+            self._talking = {k: True for k, v in talk_states.items() if v}
+
+    # ── Key events ─────────────────────────────────
+
+    def on_key(self, device, key: int, pressed: int) -> None:
+        """StreamDock key callback (runs on the deck's reader thread)."""
+        self.handle_key(key, bool(pressed))
+
+    def handle_key(self, key: int, pressed: bool, at: float | None = None) -> bool:
+        """
+        Apply one key event. `at` is when it arrived (clock() reading,
+        default now). Returns True if a channel's talk state changed.
+        """
+        at = self.clock() if at is None else at
+        channel = self.channel_for_key(key)
+        if channel is None:
+            return False
+
+        with self._lock:
+            changes = self._settle_due(at, skip=key)
+            pending = self._pending_release.pop(key, None)
+            if pending is not None:
+                released_at, timer = pending
+                timer.cancel()
+                if pressed and at - released_at < self.debounce:
+                    self.debounced += 1       # press-release-press bounce: still down
+                    return False
+                changes.append(self._apply(channel, key, False, released_at))
+
+            if self._down.get(key, False) == pressed:
+                return self._finish(changes)  # Repeat of the state we already have
+            last = self._last_event_at.get(key)
+            if last is not None and at - last < self.debounce:
+                if pressed:
+                    self.debounced += 1
+                    return self._finish(changes)
+                # Maybe bounce, maybe a very quick tap: decide once the debounce time is over
+                timer = threading.Timer(self.debounce, self._settle_release, args=(key, at))
+                timer.daemon = True
+                self._pending_release[key] = (at, timer)
+                timer.start()
+                return self._finish(changes)
+            changes.append(self._apply(channel, key, pressed, at))
+        return self._finish(changes)
+
+    def _apply(self, channel, key: int, pressed: bool, at: float) -> tuple | None:
+        """Accept one key event. Returns (key, channel_id, talking, at) if talk changed. Lock held."""
+        self._down[key] = pressed
+        self._last_event_at[key] = at
+
+        if not self.allowed:
+            return None
+        talking = self._next_state(channel, key, pressed, at)
+        if talking is None or talking == self._talking.get(channel.channel_id, False):
+            return None
+        self._talking = {**self._talking, channel.channel_id: talking}
+
+        # Hot path: repaint the key while still holding the lock, so a
+        # SAFE_MODE force-off can never be overtaken by a late RED.
+        if self.paint_key:
+            try:
+                self.paint_key(channel, talking)
+            except Exception as e:
+                logger.error(f"Painting key {key} failed: {e}")
+        return key, channel.channel_id, talking, at
+
+    def _finish(self, changes: list) -> bool:
+        """After the lock is released: time and announce the talk changes."""
+        changed = False
+        for change in changes:
+            if change is None:
+                continue
+            key, channel_id, talking, at = change
+            if talking:
+                self._record_latency(key, at)
+            self._notify(channel_id, talking)
+            changed = True
+        return changed
+
+    def settle(self, at: float | None = None) -> bool:
+        """
+        Apply every waiting release whose debounce time is over at `at`
+        (default now). Timers do this by themselves; a replay calls it to
+        stay on recorded time.
+        """
+        at = self.clock() if at is None else at
+        with self._lock:
+            changes = self._settle_due(at)
+        return self._finish(changes)
+
+    def _settle_release(self, key: int, released_at: float) -> None:
+        """Timer: no press came within the debounce time, so the release was real."""
+        with self._lock:
+            pending = self._pending_release.get(key)
+            if pending is None or pending[0] != released_at:
+                return                        # Cancelled (bounce) or already applied
+            changes = self._settle_due(released_at + self.debounce)
+        self._finish(changes)
+
+    def _settle_due(self, at: float, skip: int | None = None) -> list:
+        """Apply the waiting releases that are over at `at` (except on key `skip`). Lock held."""
+        changes = []
+        for key, (released_at, timer) in list(self._pending_release.items()):
+            if key == skip or at - released_at < self.debounce:
+                continue
+            del self._pending_release[key]
+            timer.cancel()
+            channel = self.channel_for_key(key)
+            if channel is not None:
+                changes.append(self._apply(channel, key, False, released_at))
+        return changes
+
+    def _next_state(self, channel, key: int, pressed: bool, at: float) -> bool | None:
+        """The channel's new talk state for this event (None = no change). Lock held."""
+        talking = self._talking.get(channel.channel_id, False)
+        mode = channel.talk_mode
+
+        if mode == TalkMode.LATCH:
+            return (not talking) if pressed else None
+
+        if mode == TalkMode.AUTO:
+            if pressed:
+                if talking:
+                    self._pressed_at.pop(key, None)
+                    return False                # Tap while latched: off
+                self._pressed_at[key] = at
+                return True
+            pressed_at = self._pressed_at.pop(key, None)
+            if pressed_at is not None and at - pressed_at >= self.hold_threshold:
+                return False                    # Long hold: it was push-to-talk
+            return None                         # Quick tap: stay latched
+
+        return pressed                          # PTT
+
+    def _record_latency(self, key: int, at: float) -> None:
+        latency_ms = (self.clock() - at) * 1000.0
+        self.latencies_ms.append(latency_ms)
+        if latency_ms > self.latency_budget_ms:
+            self.over_budget += 1
+            logger.warning(f"Key {key} went red {latency_ms:.1f} ms after the press "
+                           f"(budget {self.latency_budget_ms:.0f} ms)")
+
+    def _notify(self, channel_id: str, talking: bool) -> None:
+        if self.on_change:
+            try:
+                self.on_change(channel_id, talking)
+            except Exception as e:
+                logger.error(f"Talk change listener failed: {e}")
+
+    # ── Safety ─────────────────────────────────────
+
+    def on_transition(self, transition) -> None:
+        """StateMachine listener: talk only while LIVE / DEGRADED, all off in any other state."""
+        if transition.to_state in TALK_ALLOWED_STATES:
+            self.allowed = True
+        elif transition.from_state in BOOTING_STATES and transition.to_state in BOOTING_STATES:
+            self.allowed = False              # Still booting: keep what a crash snapshot restored
+        else:
+            self.force_off(transition.reason or transition.to_state.value)
+
+    def force_off(self, reason: str = "") -> None:
+        """Forbid talk and switch every channel off, right now."""
+        with self._lock:
+            self.allowed = False
+            stopped = [channel_id for channel_id, on in self._talking.items() if on]
+            self._talking = {}
+            self._pressed_at.clear()
+        if stopped:
+            logger.warning(f"Talk forced off ({reason or 'not allowed'}): {', '.join(stopped)}")
+        for channel_id in stopped:
+            self._notify(channel_id, False)
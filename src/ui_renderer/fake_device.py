@@ -0,0 +1,136 @@
+"""
+ui_renderer/fake_device.py — A pretend MiraBox, for tests and replays.
+
+FakeDeck looks like a StreamDock to the renderer (same methods, same key
+image format as the StreamDock293), but instead of USB it has a
+FakeTransport that only writes down what it was sent:
+
+    deck = FakeDeck()
+    renderer = MiraBoxRenderer(device=deck)
+    renderer.update(view_model)
+    deck.transport.writes        # [KeyWrite(key=1, image=b"/tmp/ixg-keys/...jpg", at=...), ...]
+
+`press()` / `release()` play the deck's reader thread: they call the key
+callback the renderer installed, just like a real key.
+
+A FakeTransport can also be slow on purpose (`write_delay`), to see what a
+sluggish USB bus does to the talk latency. It can sit under a REAL
+SteamDock device class too (StreamDock293(FakeTransport(), info)), so the
+library's own set_key_image() path runs without USB. For very long runs,
+`keep_writes` limits how many writes are remembered.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class KeyWrite:
+    """
+    One image sent to a key.
+
+    Fields:
+        key: Key index (1-15)
+        image: Path of the image that was sent
+        at: When (time.monotonic())
+    """
+    key: int
+    image: bytes | str
+    at: float
+
+
+class FakeTransport:
+    def __init__(self, write_delay: float = 0.0, keep_writes: int | None = None):
+        self.write_delay = write_delay
+        self.writes: deque[KeyWrite] = deque(maxlen=keep_writes)   # newest last
+        self.on_write: Callable[[KeyWrite], None] | None = None   # called after each write
+        self._lock = threading.Lock()
+
+    # ── What a SteamDock device class calls besides key images ──
+
+    def open(self, path) -> int:
+        return 1
+
+    def read_(self, length: int) -> bytes:
+        """The device's reader thread polls this: no key reports, ever."""
+        time.sleep(0.1)
+        return b""
+
+    def wakeScreen(self) -> None:
+        pass
+
+    def disconnected(self) -> None:
+        pass
+
+    def setKeyImg(self, path, key: int) -> int:
+        return self._write(key, path)
+
+    def setKeyImgDualDevice(self, path, key: int) -> int:
+        return self._write(key, path)
+
+    def last_image(self, key: int):
+        """What key `key` shows now (None if nothing was ever sent to it)."""
+        with self._lock:
+            for write in reversed(self.writes):
+                if write.key == key:
+                    return write.image
+        return None
+
+    def _write(self, key: int, path) -> int:
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        write = KeyWrite(key, path, time.monotonic())
+        with self._lock:
+            self.writes.append(write)
+        if self.on_write:
+            self.on_write(write)
+        return 1
+
+
+class FakeDeck:
+    """Stands in for a StreamDock device object."""
+    def __init__(self, transport: FakeTransport | None = None, path: str = "/dev/hidraw-fake"):
+        self.transport = transport or FakeTransport()
+        self.path = path
+        self.is_open = False
+        self.key_callback = None
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def wakeScreen(self):
+        pass
+
+    def id(self):
+        return self.path
+
+    def key(self, k: int) -> int:
+        return k
+
+    def key_image_format(self):
+        return {"size": (100, 100), "format": "JPEG", "rotation": 180, "flip": (False, False)}
+
+    def set_key_image(self, key: int, path: str) -> int:
+        """Slow path: the renderer drew a file for us."""
+        return self.transport.setKeyImg(path, key)
+
+    def set_key_callback(self, callback):
+        self.key_callback = callback
+
+    # ── Playing the operator ───────────────────────
+
+    def press(self, key: int) -> None:
+        self._key_event(key, 1)
+
+    def release(self, key: int) -> None:
+        self._key_event(key, 0)
+
+    def _key_event(self, key: int, pressed: int) -> None:
+        if self.key_callback is not None:
+            self.key_callback(self, key, pressed)
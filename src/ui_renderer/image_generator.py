@@ -23,6 +23,11 @@ class ImageGenerator:
         Create an image with a solid background color and centered text.
         Save it to output_path.
         """
+        img = self.draw_button(label, color)
+        img.save(output_path, "JPEG", quality=95)
+
+    def draw_button(self, label: str, color: ButtonColor) -> Image.Image:
+        """Draw the button in memory (see generate_button_image)."""
         # 1. Determine RGB color
         bg_color = (50, 50, 50) # Default Grey
         if color == ButtonColor.RED:
@@ -46,6 +51,4 @@ class ImageGenerator:
         # Improvement: Centered Text
         # For now, just placing it in the middle roughly
         draw.text((10, 40), label, fill=(255, 255, 255))
-
-        # 4. Save
-        img.save(output_path, "JPEG", quality=95)
+        return img
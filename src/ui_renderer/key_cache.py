@@ -0,0 +1,136 @@
+"""
+ui_renderer/key_cache.py — Key images, drawn once and reused.
+
+Painting one key the normal way is slow on a Pi:
+
+    Pillow draws the button → JPEG file → the SteamDock library opens it
+    again, rotates it to the deck's native format, saves ANOTHER JPEG →
+    USB write
+
+Most of that is the same every time: a channel only ever shows a handful
+of looks ("Director" grey, "Director" red, "OFFLINE"...). So each look is
+drawn and encoded in the deck's native format ONCE, saved in a cache
+directory, and after that a key press only costs the USB write:
+
+    native_path(device, "Director", RED)   → b"/tmp/ixg-keys/StreamDock293-3f9a....jpg"
+
+`prewarm()` does the drawing up front (e.g. when the station config
+arrives), so even the very first press of a key is fast.
+
+Some decks have keys on a second screen with their own image size (the
+StreamDock N4's keys 11-14 are 176x112, not 112x112). native_screen() says
+which screen a key is on, and the cache keeps one image per screen.
+
+How to use:
+    cache = KeyImageCache()
+    cache.prewarm(device, ["Director", "Producer"])
+    screen = native_screen(device, 3)
+    write_native_key(device, 3, cache.native_path(device, "Director", ButtonColor.RED, screen))
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from src.loggingx.lock_profiler import profiled_lock
+from src.loggingx.tracing import span
+from .image_generator import ImageGenerator
+from .view_model import ButtonColor
+
+# Every look a talk key can have while the agent is online
+TALK_KEY_COLORS = (ButtonColor.GREY, ButtonColor.RED)
+
+KEY_SCREEN = "key"
+SECOND_SCREEN = "secondscreen"
+
+# Each model: (the transport call for a native key image, the keys on its
+# second screen). Default: the dual-device call, no second screen.
+NATIVE_KEY_WRITERS = {
+    "StreamDock293": ("setKeyImg", ()),
+    "StreamDock293s": ("setKeyImg", ()),
+    # Keys 11-14 are the second screen: what set_seondscreen_image() sends
+    "StreamDockN4": ("setKeyImgDualDevice", range(11, 15)),
+}
+DEFAULT_NATIVE_KEY_WRITER = ("setKeyImgDualDevice", ())
+
+
+def native_screen(device, index: int) -> str:
+    """Which screen key `index` is on: KEY_SCREEN or SECOND_SCREEN."""
+    _writer, second_screen = NATIVE_KEY_WRITERS.get(type(device).__name__, DEFAULT_NATIVE_KEY_WRITER)
+    return SECOND_SCREEN if index in second_screen else KEY_SCREEN
+
+
+def write_native_key(device, index: int, native_path: bytes) -> int:
+    """
+    Send an image that is ALREADY in the deck's native format (for the
+    screen native_screen() names) to key `index` (1-15). Skips the
+    library's own open/rotate/re-save step.
+    """
+    writer, _second_screen = NATIVE_KEY_WRITERS.get(type(device).__name__, DEFAULT_NATIVE_KEY_WRITER)
+    with span("transport.write", key=index):
+        return getattr(device.transport, writer)(native_path, device.key(index))
+
+
+class KeyImageCache:
+    def __init__(self, cache_dir: str | Path | None = None, generator: ImageGenerator | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / "ixg-keys"
+        self.generator = generator or ImageGenerator()
+        self.hits = 0
+        self.misses = 0
+
+        self._paths: dict[tuple[str, str, str, ButtonColor], bytes] = {}
+        self._lock = profiled_lock("key_cache")
+
+    def native_path(self, device, label: str, color: ButtonColor, screen: str = KEY_SCREEN) -> bytes:
+        """The native JPEG for this look on this screen (drawn now if it is not cached yet)."""
+        key = (type(device).__name__, screen, label, color)
+        path = self._paths.get(key)
+        if path is not None:
+            self.hits += 1
+            return path
+
+        with self._lock:
+            path = self._paths.get(key)
+            if path is None:
+                self.misses += 1
+                path = self._encode(device, label, color, screen)
+                self._paths[key] = path
+        return path
+
+    def look_for(self, native_path: bytes) -> tuple[str, ButtonColor] | None:
+        """(label, color) of a cached image path (None if it isn't one of ours)."""
+        for (_model, _screen, label, color), path in list(self._paths.items()):
+            if path == native_path:
+                return label, color
+        return None
+
+    def prewarm(self, device, labels) -> None:
+        """Draw every talk look of every label, plus OFFLINE, on every screen, ahead of time."""
+        _writer, second_screen = NATIVE_KEY_WRITERS.get(type(device).__name__, DEFAULT_NATIVE_KEY_WRITER)
+        for screen in (KEY_SCREEN, SECOND_SCREEN) if second_screen else (KEY_SCREEN,):
+            self.native_path(device, "OFFLINE", ButtonColor.BLACK, screen)
+            for label in labels:
+                for color in TALK_KEY_COLORS:
+                    self.native_path(device, label, color, screen)
+
+    def _encode(self, device, label: str, color: ButtonColor, screen: str) -> bytes:
+        from SteamDock.ImageHelpers.PILHelper import to_native_key_format, to_native_seondscreen_format
+
+        model = type(device).__name__
+        digest = hashlib.sha1(f"{model}\0{screen}\0{label}\0{color.value}".encode("utf-8")).hexdigest()[:16]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{model}-{digest}.jpg"
+
+        with span("render.draw", label=label):
+            image = self.generator.draw_button(label, color)
+        with span("render.transform"):
+            if screen == SECOND_SCREEN:
+                image = to_native_seondscreen_format(device, image)
+            else:
+                image = to_native_key_format(device, image)
+        tmp_path = path.with_suffix(".tmp")
+        with span("render.encode"):
+            image.save(tmp_path, "JPEG", subsampling=0, quality=95)
+            os.replace(tmp_path, path)
+        return os.fsencode(path)
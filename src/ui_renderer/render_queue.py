@@ -0,0 +1,191 @@
+"""
+ui_renderer/render_queue.py — The Painter's To-Do List.
+
+Drawing a key (Pillow + JPEG + USB write) is slow on a Pi, so callers don't
+paint directly. They drop updates into this queue and ONE background thread
+paints them.
+
+Two kinds of updates:
+    critical=True   → talk indicator, online/offline, errors.
+                      Painted as soon as possible, never skipped.
+    critical=False  → nice-to-have (backgrounds, label animations).
+                      Painted at most `fps` times per second, and dropped
+                      completely when the Pi is under CRITICAL pressure.
+
+If the same key is updated twice before it is painted, only the newest
+version is drawn (older ones are useless by then).
+
+How to use:
+    queue = RenderQueue(MiraBoxRenderer())
+    queue.start()
+    hardware_manager.subscribe_pressure(queue.apply_pressure)
+    queue.submit(view_model)                    # critical
+    queue.submit(anim_frame, critical=False)    # can be slowed/skipped
+"""
+
+import threading
+import time
+
+from src.shared.enums import PressureLevel
+from src.loggingx.event_log import get_logger
+from src.loggingx.lock_profiler import profiled_lock, watch_queue
+from .view_model import MiraBoxViewModel, ChannelView
+
+logger = get_logger("render_queue")
+
+# Non-critical frame rate at each pressure level (None = skip entirely)
+PRESSURE_FPS = {
+    PressureLevel.NORMAL: 30.0,
+    PressureLevel.ELEVATED: 10.0,
+    PressureLevel.CRITICAL: None,
+}
+
+
+class RenderQueue:
+    def __init__(self, renderer, fps_by_level: dict | None = None):
+        self.renderer = renderer
+        self.fps_by_level = fps_by_level or dict(PRESSURE_FPS)
+        self.level = PressureLevel.NORMAL
+
+        # Counters (handy for tests and for the health rollup)
+        self.frames_painted = 0
+        self.updates_skipped = 0
+
+        self._cond = threading.Condition(profiled_lock("render_queue"))
+        self._critical: dict[int, ChannelView] = {}
+        self._background: dict[int, ChannelView] = {}
+        self._is_online = True
+        self._next_background_frame = 0.0
+        self._running = False
+        self._painting = False        # the painter thread holds updates it took
+        self._thread = None
+        watch_queue("render_queue", self.depth)
+
+    # ── Public API ─────────────────────────────────
+
+    def start(self):
+        """Start the painter thread."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._paint_loop,
+            name="RenderQueueThread",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the painter thread (pending critical updates are painted first)."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, view_model: MiraBoxViewModel, critical: bool = True):
+        """
+        Queue a view model for painting.
+        Only the newest update per key is kept until it is painted.
+        """
+        with self._cond:
+            self._is_online = view_model.is_online
+            if critical:
+                for channel in view_model.channels:
+                    self._critical[channel.index] = channel
+                    # A newer critical image makes an older background one pointless
+                    self._background.pop(channel.index, None)
+            elif self.fps_by_level[self.level] is None:
+                self.updates_skipped += len(view_model.channels)
+                return
+            else:
+                for channel in view_model.channels:
+                    self._background[channel.index] = channel
+            self._cond.notify()
+
+    def apply_pressure(self, level: PressureLevel):
+        """
+        Pressure subscriber: lower the frame rate / drop extras when the Pi
+        is struggling, and go back to normal when it recovers.
+        """
+        with self._cond:
+            self.level = level
+            if self.fps_by_level[level] is None and self._background:
+                self.updates_skipped += len(self._background)
+                self._background.clear()
+            self._cond.notify()
+        logger.info(f"Render queue pressure={level.value} "
+                    f"(background fps={self.fps_by_level[level]})")
+
+    def wait_idle(self, timeout: float = 1.0) -> bool:
+        """
+        Wait until every update that may be painted has been painted
+        (background updates shed at the current pressure level don't count).
+        Returns False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                pending = self._critical or (self._background and self.fps_by_level[self.level] is not None)
+                if not pending and not self._painting:
+                    return True
+            time.sleep(0.002)
+        return False
+
+    def depth(self) -> int:
+        """Keys waiting to be painted."""
+        return len(self._critical) + len(self._background)
+
+    def flush(self):
+        """Paint everything that is due right now on the calling thread."""
+        channels = self._take_due(time.monotonic())
+        if channels:
+            self._paint(channels)
+        with self._cond:
+            self._painting = False
+
+    # ── Internals ──────────────────────────────────
+
+    def _take_due(self, now: float) -> list[ChannelView]:
+        """Pop all updates that may be painted at `now` (caller need not hold the lock)."""
+        with self._cond:
+            due = dict(self._critical)
+            self._critical.clear()
+            self._painting = True
+
+            fps = self.fps_by_level[self.level]
+            if self._background and fps is not None and now >= self._next_background_frame:
+                for index, channel in self._background.items():
+                    due.setdefault(index, channel)
+                self._background.clear()
+                self._next_background_frame = now + 1.0 / fps
+            return list(due.values())
+
+    def _wait_timeout(self, now: float) -> float | None:
+        """How long the painter may sleep (None = until notified). Lock must be held."""
+        if self._critical:
+            return 0.0
+        if self._background and self.fps_by_level[self.level] is not None:
+            return max(0.0, self._next_background_frame - now)
+        return None
+
+    def _paint_loop(self):
+        while True:
+            with self._cond:
+                timeout = self._wait_timeout(time.monotonic())
+                if not self._running and not self._critical:
+                    break
+                if timeout != 0.0:
+                    self._cond.wait(timeout)
+
+            channels = self._take_due(time.monotonic())
+            if channels:
+                self._paint(channels)
+            with self._cond:
+                self._painting = False
+
+    def _paint(self, channels: list[ChannelView]):
+        try:
+            self.renderer.update(MiraBoxViewModel(is_online=self._is_online, channels=channels))
+            self.frames_painted += 1
+        except Exception as e:
+            logger.error(f"Render queue paint failed: {e}")
@@ -6,6 +6,10 @@ It handles:
 1.  Connecting to the MiraBox (StreamDock).
 2.  Generating Images (using image_generator.py).
 3.  Sending Images to the device.
+
+Key images are drawn once per look and kept in the deck's native format
+(see key_cache.py), so repainting a key is a single USB write.
+`paint_key()` is that fast path for one key (used for the talk indicator).
 """
 
 import os
@@ -14,24 +18,47 @@ import logging
 import time
 from .view_model import MiraBoxViewModel, ChannelView
 from .image_generator import ImageGenerator
+from .key_cache import KeyImageCache, native_screen, write_native_key
+from src.loggingx.boot_profiler import get_boot_profiler
+from src.loggingx.event_log import get_logger
+from src.loggingx.event_journal import EventType
+from src.loggingx.lock_profiler import profiled_lock
+from src.loggingx.tracing import span
+from src.bootstrap.mirabox_detect import MiraBoxMatch, find_mirabox, last_mirabox_match
 
 # Ensure SteamDock is importable
 # Assuming running from agent/ root
+# (OSError: the library is there but its native HID library is not installed)
 try:
     from SteamDock.DeviceManager import DeviceManager
+    from SteamDock.Transport.LibUSBHIDAPI import LibUSBHIDAPI
     HAS_HARDWARE_LIB = True
-except ImportError:
+except (ImportError, OSError):
     HAS_HARDWARE_LIB = False
     logging.warning("SteamDock library not found. Running in Mock Mode.")
 
 class MiraBoxRenderer:
-    def __init__(self):
-        self.device = None
+    def __init__(self, match: MiraBoxMatch | None = None, device=None):
+        """
+        Args:
+            match: Connect to this deck (e.g. from a crash snapshot) instead
+                   of looking for one.
+            device: Use this (already made) device instead, e.g. a FakeDeck
+                    from fake_device.py for tests and replays.
+        """
+        self.device = device
+        self.match = match
         self.generator = ImageGenerator()
-        self.logger = logging.getLogger("ui_renderer")
+        self.key_cache = KeyImageCache(generator=self.generator)
+        self.logger = get_logger("ui_renderer")
+        self._write_lock = profiled_lock("renderer.write")   # one USB write at a time
+        self.journal = None                   # EventJournal for key writes (optional)
         
         # Connect to hardware
-        self._connect()
+        if device is not None:
+            device.open()
+        else:
+            self._connect()
 
     def _connect(self):
         """
@@ -40,13 +67,26 @@ class MiraBoxRenderer:
         if not HAS_HARDWARE_LIB:
             return
 
+        profiler = get_boot_profiler()
         try:
-            manager = DeviceManager()
-            devices = manager.enumerate()
+            # Reuse the device preflight already found in sysfs, so we do not
+            # enumerate every HID device a second time.
+            with profiler.phase("deck.enumerate"):
+                match = self.match or last_mirabox_match() or find_mirabox()
+                self.match = match
+                if match:
+                    devices = [match.model(LibUSBHIDAPI(), match.device_info())]
+                elif not os.path.isdir("/sys/class/hidraw"):
+                    # No sysfs (not Linux?): ask the HID library instead
+                    devices = DeviceManager().enumerate()
+                else:
+                    devices = []
             if devices:
                 self.device = devices[0]
-                self.device.open()
-                self.device.wakeScreen()
+                with profiler.phase("deck.open"):
+                    self.device.open()
+                with profiler.phase("deck.init"):
+                    self.device.wakeScreen()
                 self.logger.info(f"Connected to MiraBox: {self.device.id()}")
             else:
                 self.logger.warning("No MiraBox device found.")
@@ -64,32 +104,64 @@ class MiraBoxRenderer:
 
         # 1. Update Buttons
         for channel in view_model.channels:
-            self._render_channel(channel)
+            self.paint_key(channel)
+        get_boot_profiler().mark("first_paint")
             
         # 2. Refresh Screen (if needed)
         # self.device.refresh() needed? Usually set_key_image does it?
         # StreamDock implementation seems to handle it.
 
+    def paint_key(self, channel: ChannelView):
+        """
+        Fast path: send the cached native image for this key's look.
+        Falls back to the slow path if the deck can't take native images.
+        """
+        if not self.device:
+            return
+        try:
+            screen = native_screen(self.device, channel.index)
+            path = self.key_cache.native_path(self.device, channel.label, channel.color, screen)
+            with self._write_lock:
+                result = write_native_key(self.device, channel.index, path)
+            if self.journal:
+                self.journal.record(EventType.WRITE_OK, key=channel.index, value=result or 0)
+        except Exception as e:
+            if self.journal:
+                self.journal.record(EventType.WRITE_FAILED, key=channel.index)
+            self.logger.warning(f"Fast paint of key {channel.index} failed ({e}), drawing it instead")
+            self._render_channel(channel)
+
+    def prewarm(self, labels):
+        """Draw every look of these labels now, so the first press is fast too."""
+        if not self.device:
+            return
+        try:
+            self.key_cache.prewarm(self.device, labels)
+        except Exception as e:
+            self.logger.error(f"Failed to prepare key images: {e}")
+
     def _render_channel(self, channel: ChannelView):
         """
-        Render a single channel button.
+        Render a single channel button (slow path: draw, let the library convert it).
         """
         # 1. Generate Image File
         # We need a temp path.
         temp_path = f"/tmp/mirabox_key_{channel.index}.jpg"
         
         # 2. Draw it
-        self.generator.generate_button_image(
-            label=channel.label,
-            color=channel.color,
-            output_path=temp_path
-        )
+        with span("render.draw_file", label=channel.label):
+            self.generator.generate_button_image(
+                label=channel.label,
+                color=channel.color,
+                output_path=temp_path
+            )
 
         # 3. Send to Device
         try:
             # StreamDock expects key index 1-15?
             # Our ViewModel uses 1-based index ideally.
-            self.device.set_key_image(channel.index, temp_path)
+            with self._write_lock, span("transport.set_key_image", key=channel.index):
+                self.device.set_key_image(channel.index, temp_path)
         except Exception as e:
             self.logger.error(f"Failed to update key {channel.index}: {e}")
         finally:
@@ -97,6 +169,19 @@ class MiraBoxRenderer:
             # Actually keeping it might be fine, or overwrite next time.
             pass
 
+    def set_key_callback(self, callback):
+        """
+        Call `callback(device, key, pressed)` for every key change, straight
+        from the deck's reader thread. Does nothing in Mock Mode.
+        """
+        if not self.device:
+            return
+
+        def on_key(device, key, pressed):
+            with span("hid.key_event", key=key, pressed=pressed):
+                callback(device, key, pressed)
+        self.device.set_key_callback(on_key)
+
     def close(self):
         if self.device:
             self.device.close()
@@ -0,0 +1,69 @@
+"""
+test_boot_profiler.py — Tests for the boot-phase stopwatch and its history file.
+
+1. Phases and marks are recorded relative to the boot origin
+2. Nothing is recorded after finish() (e.g. background re-checks)
+3. The history file gets one line per boot and is trimmed
+4. The summaries mention every phase
+"""
+
+import time
+from pathlib import Path
+
+from src.loggingx.boot_profiler import (
+    BootProfiler,
+    append_boot_history,
+    format_history_summary,
+    load_boot_history,
+)
+
+
+# ── Test 1: Phases and marks ──
+
+def test_phases_and_marks():
+    profiler = BootProfiler(origin=time.monotonic())
+
+    with profiler.phase("bootstrap"):
+        with profiler.phase("bootstrap.identity"):
+            time.sleep(0.01)
+    profiler.mark("first_paint")
+    profiler.mark("first_paint")   # only counted once
+
+    names = [p.name for p in profiler.phases]
+    assert names == ["bootstrap.identity", "bootstrap", "first_paint"]
+    identity = profiler.phases[0]
+    assert identity.duration_ms >= 10.0
+    assert profiler.phases[2].duration_ms == 0.0
+
+    summary = profiler.format_summary()
+    assert "bootstrap.identity" in summary and "first_paint" in summary
+
+
+# ── Test 2: finish() freezes the profile ──
+
+def test_finish_stops_recording():
+    profiler = BootProfiler()
+    profiler.record("a", profiler.origin, profiler.origin + 0.5)
+    total = profiler.finish()
+    profiler.record("late", profiler.origin, profiler.origin + 1.0)
+
+    assert [p.name for p in profiler.phases] == ["a"]
+    assert profiler.total_ms() == total
+
+
+# ── Test 3: History is append-only and bounded ──
+
+def test_history_append_and_trim(tmp_path: Path):
+    for i in range(16):
+        profiler = BootProfiler()
+        profiler.record("bootstrap", profiler.origin, profiler.origin + i / 1000.0)
+        profiler.finish()
+        append_boot_history(profiler, tmp_path, max_entries=10, extra={"boot": i})
+
+    history = load_boot_history(tmp_path)
+    assert 10 <= len(history) <= 15
+    assert history[-1]["boot"] == 15
+    assert history[-1]["phases"]["bootstrap"][1] == 15.0
+
+    summary = format_history_summary(history)
+    assert "bootstrap" in summary
@@ -0,0 +1,87 @@
+"""
+test_config_sync.py — Tests for the versioned station config store.
+
+1. Deltas are applied in order and committed to disk
+2. A delta for the wrong version is rejected (nothing changes)
+3. The syncer falls back to a full config when deltas are too old
+4. A restart loads the cached config (lookups work without syncing)
+"""
+
+import pytest
+
+from src.config_sync import ConfigSyncer
+from src.config_sync.source import LocalConfigSource
+from src.config_sync.store import CONFIG_FILE_NAME, ConfigDelta, ConfigStore
+from src.shared.enums import TalkMode
+from src.shared.errors import ConfigSyncError
+
+
+def first_delta() -> ConfigDelta:
+    return ConfigDelta(0, 1, upsert={
+        "director": {"label": "Director", "key": 1, "talk_mode": "PTT"},
+        "producer": {"label": "Producer", "key": 2, "talk_mode": "LATCH"},
+    })
+
+
+# ── Test 1: Deltas build up the config ──
+
+def test_apply_deltas(tmp_path):
+    store = ConfigStore(tmp_path)
+    assert store.version == 0
+
+    store.apply(first_delta())
+    store.apply(ConfigDelta(1, 2, upsert={"producer": {"label": "Prod"}}, remove=["director"]))
+
+    assert store.version == 2
+    assert store.channel("director") is None
+    assert store.channel_for_key(2).label == "Prod"
+    assert store.channel_for_key(2).talk_mode == TalkMode.LATCH
+    assert (tmp_path / CONFIG_FILE_NAME).exists()
+    assert not (tmp_path / "station_config.tmp").exists()
+
+
+# ── Test 2: Out-of-order or invalid deltas are rejected ──
+
+def test_rejects_bad_deltas(tmp_path):
+    store = ConfigStore(tmp_path)
+    store.apply(first_delta())
+
+    with pytest.raises(ConfigSyncError):
+        store.apply(ConfigDelta(5, 6, upsert={"x": {"label": "X", "key": 9}}))
+    with pytest.raises(ConfigSyncError):
+        store.apply(ConfigDelta(1, 2, upsert={"talent": {"label": "Talent", "key": 1}}))  # key taken
+
+    assert store.version == 1
+    assert store.channel_for_key(1).channel_id == "director"
+
+
+# ── Test 3: Syncer uses deltas, or the full config when they're gone ──
+
+def test_syncer_delta_and_full_resync(tmp_path):
+    source = LocalConfigSource(keep_deltas=1)
+    source.publish(first_delta())
+    source.publish(ConfigDelta(1, 2, upsert={"director": {"label": "Dir"}}))
+
+    synced = []
+    store = ConfigStore(tmp_path)
+    ConfigSyncer(store, source, on_synced=synced.append).reconcile()   # 0→1 dropped: full
+    assert store.version == 2
+    assert store.channel("director").label == "Dir"
+
+    source.publish(ConfigDelta(2, 3, upsert={"talent": {"label": "Talent", "key": 3}}))
+    ConfigSyncer(store, source, on_synced=synced.append).reconcile()   # 2→3 by delta
+    assert store.channel_for_key(3).label == "Talent"
+    assert [c.version for c in synced] == [2, 3]
+
+
+# ── Test 4: Restart goes live from the cache ──
+
+def test_restart_loads_cached_config(tmp_path):
+    ConfigStore(tmp_path).apply(first_delta())
+
+    reloaded = ConfigStore(tmp_path)
+    assert reloaded.version == 1
+    assert reloaded.channel_for_key(1).label == "Director"
+
+    (tmp_path / CONFIG_FILE_NAME).write_text("{not json")
+    assert ConfigStore(tmp_path).version == 0
@@ -0,0 +1,174 @@
+"""
+test_control_plane.py — Tests for the control-plane client.
+
+A small stand-in control plane runs on localhost for each test.
+
+1. Many calls share one keep-alive connection and one session
+2. 503s are retried with (jittered) backoff, then succeed
+3. An expired token (401) renews the session once
+4. Metrics count requests, errors and retries
+5. The client works as a ConfigSyncer source
+"""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.bootstrap.identity import DeviceIdentity
+from src.config_sync import ConfigSyncer
+from src.config_sync.store import ConfigStore
+from src.control_plane.client import BackoffPolicy, ControlPlaneClient, sign_session_request
+from src.shared.errors import ControlPlaneError
+
+IDENTITY = DeviceIdentity(device_id="box-1", secret="s3cret", profile="p", config_version=0)
+
+
+class FakeControlPlane:
+    """A tiny control plane: sessions, config deltas, injectable failures."""
+    def __init__(self):
+        self.tokens = set()
+        self.sessions = 0
+        self.connections = 0
+        self.fail_next = []          # statuses to return before answering normally
+        self.deltas = [{"from_version": 0, "to_version": 1,
+                        "upsert": {"director": {"label": "Director", "key": 1}}, "remove": []}]
+
+        plane = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"    # keep-alive
+
+            def setup(self):
+                super().setup()
+                plane.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body=None):
+                data = json.dumps(body or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                expected = sign_session_request("s3cret", body["device_id"], body["timestamp"], body["nonce"])
+                if body["signature"] != expected:
+                    return self.reply(403)
+                plane.sessions += 1
+                token = f"t{plane.sessions}"
+                plane.tokens.add(token)
+                self.reply(200, {"token": token, "expires_in": 3600})
+
+            def do_GET(self):
+                if plane.fail_next:
+                    return self.reply(plane.fail_next.pop(0))
+                if self.headers.get("Authorization", "")[len("Bearer "):] not in plane.tokens:
+                    return self.reply(401)
+                url = urlsplit(self.path)
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+                self.reply(200, {"deltas": [d for d in plane.deltas if d["from_version"] >= since]})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def plane():
+    server = FakeControlPlane()
+    yield server
+    server.close()
+
+
+def make_client(plane, **kwargs) -> ControlPlaneClient:
+    return ControlPlaneClient(plane.url, IDENTITY, rng=random.Random(1), **kwargs)
+
+
+# ── Test 1: Connection and session are reused ──
+
+def test_keepalive_and_cached_session(plane):
+    client = make_client(plane)
+    for _ in range(5):
+        assert len(client.deltas_since(0)) == 1
+
+    assert plane.sessions == 1
+    assert plane.connections == 1
+    assert client.metrics.connections_opened == 1
+    client.close()
+
+
+# ── Test 2: Retries with backoff ──
+
+def test_retries_with_jittered_backoff(plane):
+    delays = []
+    client = make_client(plane, sleep=delays.append, backoff=BackoffPolicy(base_delay=0.1, max_attempts=4))
+    client.register()
+
+    plane.fail_next = [503, 503]
+    assert len(client.deltas_since(0)) == 1
+    assert len(delays) == 2
+    assert 0.0 <= delays[0] <= 0.1 and 0.0 <= delays[1] <= 0.2
+
+    plane.fail_next = [503] * 4
+    with pytest.raises(ControlPlaneError):
+        client.deltas_since(0)
+
+    plane.fail_next = [404]
+    with pytest.raises(ControlPlaneError):
+        client.deltas_since(0)          # not retryable
+    assert len(delays) == 5
+    client.close()
+
+
+# ── Test 3: Expired token renews the session ──
+
+def test_401_renews_session(plane):
+    client = make_client(plane)
+    client.deltas_since(0)
+    plane.tokens.clear()                 # server forgot every session
+
+    client.deltas_since(0)
+    assert plane.sessions == 2
+    client.close()
+
+
+# ── Test 4: Metrics ──
+
+def test_metrics(plane):
+    client = make_client(plane, sleep=lambda s: None)
+    plane.fail_next = [502]
+    client.deltas_since(0)
+    plane.fail_next = [400]
+    with pytest.raises(ControlPlaneError):
+        client.deltas_since(0)
+
+    stats = client.metrics.snapshot()["endpoints"]["GET /v1/config/deltas"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert stats["retries"] == 1
+    assert stats["p95_ms"] > 0.0
+    client.close()
+
+
+# ── Test 5: Feeds the config store ──
+
+def test_client_as_config_source(plane, tmp_path):
+    client = make_client(plane)
+    store = ConfigStore(tmp_path)
+    ConfigSyncer(store, client).reconcile()
+
+    assert store.version == 1
+    assert store.channel_for_key(1).label == "Director"
+    client.close()
@@ -0,0 +1,219 @@
+"""
+test_controller_paint.py — Tests for how the controller paints the deck from several threads.
+
+1. Paints from the snapshot timer and from posted events end on the newest view
+2. Talk keys painted from the deck's reader thread while full paints run: no crash, no stale key
+3. Label-only paints are throttled at ELEVATED pressure and shed at CRITICAL; talk keys are not
+4. A talk press doesn't wait behind a full repaint, and the repaint can't paint over it
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.config_sync.store import ChannelConfig, ConfigStore, StationConfig
+from src.controller import MainController
+from src.hardware_manager.fake import FakeHardwareManager
+from src.hardware_manager.pressure import PressureConfig
+from src.hardware_manager.system import SystemMetrics
+from src.shared.enums import AgentState, TalkMode
+
+
+class RecordingRenderer:
+    """Paints into a dict, one key write at a time (like MiraBoxRenderer's write lock)."""
+    match = None
+
+    def __init__(self, delay: float = 0.0005):
+        self.delay = delay
+        self.keys = {}
+        self.paints = []
+        self._write_lock = threading.Lock()
+
+    def update(self, view_model):
+        for channel in view_model.channels:
+            self.paint_key(channel)
+
+    def paint_key(self, view):
+        with self._write_lock:
+            time.sleep(self.delay)
+            self.keys[view.index] = (view.label, view.color.value)
+            self.paints.append((view.index, view.label, view.color.value))
+
+    def prewarm(self, labels):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_config(version: int, label: str = "Director") -> StationConfig:
+    return StationConfig(version, {
+        "director": ChannelConfig("director", label, 1, TalkMode.PTT),
+        "producer": ChannelConfig("producer", "Producer", 2, TalkMode.LATCH),
+    })
+
+
+def make_controller(tmp_path, renderer) -> MainController:
+    controller = MainController(renderer=renderer)
+    controller.config_store = ConfigStore(tmp_path)
+    controller.config_store.replace(make_config(1))
+    controller._snapshot_writer = MagicMock()
+    controller._fingerprint = "fp"
+    controller.machine.transition(AgentState.DISCOVERING_HW)
+    controller.machine.transition(AgentState.LIVE)
+    return controller
+
+
+# ── Test 1: Concurrent paints ──
+
+def test_concurrent_paints_end_on_newest_view(tmp_path):
+    renderer = RecordingRenderer()
+    controller = make_controller(tmp_path, renderer)
+    stop = threading.Event()
+
+    def painter():
+        while not stop.is_set():
+            controller._paint()
+
+    painters = [threading.Thread(target=painter) for _ in range(3)]
+    for thread in painters:
+        thread.start()
+    for version in range(2, 60):
+        controller.config_store.replace(make_config(version, f"Director {version}"))
+    stop.set()
+    for thread in painters:
+        thread.join(2.0)
+    controller._paint()
+
+    assert renderer.keys == controller.deck_keys()
+    assert renderer.keys[1] == ("Director 59", "GREY")
+
+
+# ── Test 2: Key presses during paints ──
+
+def test_key_presses_while_painting(tmp_path):
+    renderer = RecordingRenderer(delay=0.0001)
+    controller = make_controller(tmp_path, renderer)
+    errors = []
+    stop = threading.Event()
+
+    def painter():
+        version = 2
+        try:
+            while not stop.is_set():
+                # Every other config drops the producer key, so _paint also removes keys
+                config = make_config(version)
+                if version % 2:
+                    del config.channels["producer"]
+                controller.config_store.replace(config)
+                controller._paint()
+                version += 1
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=painter)
+    thread.start()
+    at = 100.0
+    try:
+        for n in range(400):                     # PTT on director: press, release, ...
+            at += 0.05
+            controller.talk_engine.handle_key(1, n % 2 == 0, at=at)
+    finally:
+        stop.set()
+        thread.join(2.0)
+
+    assert errors == []
+    # The last event was a release: the deck must show it, and agree with _painted
+    assert not controller.talk_engine.is_talking("director")
+    assert renderer.keys[1][1] == "GREY"
+    assert renderer.keys[1] == controller.deck_keys()[1]
+
+
+# ── Test 3: Paints under pressure ──
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_label_paints_follow_pressure(tmp_path):
+    renderer = RecordingRenderer(delay=0)
+    hardware = FakeHardwareManager(pressure_config=PressureConfig(clear_samples=1))
+    controller = make_controller(tmp_path, renderer)
+    controller.hardware_manager = hardware
+    controller._start_render_queue()
+    queue = controller.render_queue
+    try:
+        # ELEVATED: 30 quick renames become a handful of frames, ending on the last name
+        hardware.feed_metrics(SystemMetrics(90.0, 30.0, 40.0))
+        renderer.paints.clear()
+        for version in range(2, 32):
+            controller.config_store.replace(make_config(version, f"Director {version}"))
+            controller._paint()
+        assert wait_for(lambda: renderer.keys[1] == ("Director 31", "GREY"))
+        assert len([p for p in renderer.paints if p[0] == 1]) <= 5
+
+        # CRITICAL: renames are dropped, but a talk press still paints right away
+        hardware.feed_metrics(SystemMetrics(99.0, 30.0, 40.0))
+        controller.config_store.replace(make_config(40, "Director 40"))
+        controller._paint()
+        assert queue.wait_idle()
+        assert renderer.keys[1] == ("Director 31", "GREY")
+        assert queue.updates_skipped > 0
+
+        controller.talk_engine.handle_key(2, True, at=100.0)
+        assert renderer.keys[2] == ("Producer", "RED")
+
+        # Back to NORMAL: the shed rename is painted
+        hardware.feed_metrics(SystemMetrics(12.0, 30.0, 40.0))
+        controller._paint()
+        assert wait_for(lambda: renderer.keys[1] == ("Director 40", "GREY"))
+        assert renderer.keys == controller.deck_keys()
+    finally:
+        queue.stop()
+
+
+# ── Test 4: Talk press during a full repaint ──
+
+class BlockingRenderer(RecordingRenderer):
+    """The first full update() stalls before writing, like a slow-path draw."""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.release = threading.Event()
+        self.stalled = threading.Event()
+        self._blocked_once = False
+
+    def update(self, view_model):
+        if not self._blocked_once:
+            self._blocked_once = True
+            self.stalled.set()
+            self.release.wait(2.0)
+        super().update(view_model)
+
+
+def test_talk_press_does_not_wait_for_full_repaint(tmp_path):
+    renderer = BlockingRenderer()
+    renderer._blocked_once = True                # let the first paint through
+    controller = make_controller(tmp_path, renderer)
+    controller._paint()
+    renderer._blocked_once = False
+
+    # A full repaint picks key 1 grey ("Director 2"), then stalls
+    controller.config_store.replace(make_config(2, "Director 2"))
+    painter = threading.Thread(target=controller._paint)
+    painter.start()
+    assert renderer.stalled.wait(2.0)
+
+    started = time.monotonic()
+    controller.talk_engine.handle_key(1, True, at=100.0)
+    assert (time.monotonic() - started) * 1000 < 30.0
+    assert renderer.keys[1] == ("Director 2", "RED")
+
+    # The stalled repaint now writes its grey key 1: it must put red back
+    renderer.release.set()
+    painter.join(2.0)
+    assert renderer.keys[1] == ("Director 2", "RED")
+    assert renderer.keys == controller.deck_keys()
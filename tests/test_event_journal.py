@@ -0,0 +1,104 @@
+"""
+test_event_journal.py — Tests for the binary event journal.
+
+1. Events written are read back in order, with decoded fields
+2. The ring keeps only the newest `capacity` events
+3. The journal survives a crash (the writer never closed it) and continues
+4. A journal with another capacity is started over
+5. The controller journals state changes and key presses
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from src.controller import MainController
+from src.loggingx.event_journal import (
+    JOURNAL_FILE_NAME, RECORD, STATE_CODES, EventJournal, EventType, read_journal,
+)
+from src.shared.enums import AgentState
+
+
+# ── Test 1: Round trip ──
+
+def test_events_round_trip(tmp_path):
+    journal = EventJournal(tmp_path, capacity=64)
+    journal.record(EventType.KEY_DOWN, key=3)
+    journal.record(EventType.UDEV, value=1, payload=b"hidraw0")
+    journal.record(EventType.STATE_CHANGE, key=STATE_CODES[AgentState.LIVE],
+                   value=STATE_CODES[AgentState.SAFE_MODE], payload=b"mic unplugged and a very long reason")
+    journal.close()
+
+    events = read_journal(tmp_path)
+    assert [e["event"] for e in events] == ["OPEN", "KEY_DOWN", "UDEV", "STATE_CHANGE"]
+    assert events[1]["key"] == 3
+    assert events[2]["payload"] == "hidraw0"
+    assert events[3]["from_state"] == "LIVE" and events[3]["to_state"] == "SAFE_MODE"
+    assert events[3]["payload"] == "mic unplugged and a "            # cut at 20 bytes
+    assert abs(events[1]["wall_time"] - time.time()) < 5
+    assert (tmp_path / JOURNAL_FILE_NAME).stat().st_size == 64 + 64 * RECORD.size
+
+
+# ── Test 2: Ring buffer ──
+
+def test_ring_keeps_newest(tmp_path):
+    journal = EventJournal(tmp_path, capacity=16)
+    for key in range(40):
+        journal.record(EventType.KEY_UP, key=key)
+    journal.close()
+
+    events = read_journal(tmp_path)
+    assert len(events) == 16
+    assert [e["key"] for e in events] == list(range(24, 40))
+    assert all(e["wall_time"] is None for e in events)             # OPEN was overwritten
+
+
+# ── Test 3: Crash survival ──
+
+def test_survives_crash(tmp_path):
+    script = (
+        "import os, sys\n"
+        "from src.loggingx.event_journal import EventJournal, EventType\n"
+        f"journal = EventJournal({str(tmp_path)!r}, capacity=64)\n"
+        "for key in range(5):\n"
+        "    journal.record(EventType.KEY_DOWN, key=key)\n"
+        "os._exit(1)\n"                                              # no close, no flush
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=os.getcwd(), check=False)
+
+    journal = EventJournal(tmp_path, capacity=64)
+    journal.record(EventType.KEY_DOWN, key=99)
+    journal.close()
+    events = read_journal(tmp_path)
+    assert [e["key"] for e in events if e["event"] == "KEY_DOWN"] == [0, 1, 2, 3, 4, 99]
+    assert [e["event"] for e in events].count("OPEN") == 2
+
+
+# ── Test 4: Capacity change ──
+
+def test_other_capacity_starts_over(tmp_path):
+    journal = EventJournal(tmp_path, capacity=16)
+    journal.record(EventType.KEY_DOWN, key=1)
+    journal.close()
+
+    journal = EventJournal(tmp_path, capacity=32)
+    journal.close()
+    assert [e["event"] for e in read_journal(tmp_path)] == ["OPEN"]
+
+
+# ── Test 5: Controller wiring ──
+
+def test_controller_journals_events(tmp_path):
+    controller = MainController()
+    controller.config_cache_dir = tmp_path
+    controller._open_journal()
+    controller.machine.transition(AgentState.SAFE_MODE, "bootstrap failed")
+    controller._on_key(None, 4, True)
+    controller.journal.close()
+
+    events = read_journal(tmp_path)
+    state = next(e for e in events if e["event"] == "STATE_CHANGE")
+    assert state["from_state"] == "BOOTING" and state["to_state"] == "SAFE_MODE"
+    assert state["payload"] == "bootstrap failed"
+    assert any(e["event"] == "KEY_DOWN" and e["key"] == 4 for e in events)
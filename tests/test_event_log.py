@@ -0,0 +1,56 @@
+"""
+test_event_log.py — Tests for the JSON log formatter.
+
+1. The timestamp is the record's creation time (UTC, microseconds)
+2. Every line is valid JSON with the usual fields, even with odd characters
+3. Extras (detail and anything else) are passed through
+"""
+
+import json
+import logging
+
+from src.loggingx.event_log import JsonFormatter
+
+
+def make_record(message: str, created: float = 1760850000.25, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("talk_engine", logging.INFO, __file__, 1, message, None, None)
+    record.created = created
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+# ── Test 1: Record-time timestamps ──
+
+def test_timestamp_is_record_time():
+    formatter = JsonFormatter()
+    first = json.loads(formatter.format(make_record("a", created=1760850000.25)))
+    same_second = json.loads(formatter.format(make_record("b", created=1760850000.5)))
+    next_second = json.loads(formatter.format(make_record("c", created=1760850001.000001)))
+
+    assert first["timestamp"] == "2025-10-19T05:00:00.250000+00:00"
+    assert same_second["timestamp"] == "2025-10-19T05:00:00.500000+00:00"
+    assert next_second["timestamp"].startswith("2025-10-19T05:00:01.0000")
+
+
+# ── Test 2: Valid JSON lines ──
+
+def test_lines_are_valid_json():
+    formatter = JsonFormatter()
+    entry = json.loads(formatter.format(make_record('Mic "USB" gone\nretrying… ✓')))
+    assert entry["level"] == "INFO"
+    assert entry["module"] == "talk_engine"
+    assert entry["message"] == 'Mic "USB" gone\nretrying… ✓'
+    assert list(entry) == ["timestamp", "level", "module", "message"]
+
+
+# ── Test 3: Structured extras ──
+
+def test_extras_passed_through():
+    formatter = JsonFormatter()
+    line = formatter.format(make_record("done", detail={"key": 3, "ok": True}, check="mic", took=object()))
+    entry = json.loads(line)
+    assert entry["detail"] == {"key": 3, "ok": True}
+    assert entry["check"] == "mic"
+    assert entry["took"].startswith("<object object")   # not JSON: written as text
+    assert list(entry)[4] == "detail"
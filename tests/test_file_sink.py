@@ -0,0 +1,103 @@
+"""
+test_file_sink.py — Tests for the SD-card-friendly log files.
+
+1. Lines are buffered and written in chunks, fsync only now and then
+2. A full file is rotated and gzipped, content intact
+3. Old segments are deleted to stay under the disk cap
+4. Files are also rotated by age
+5. The queued log writer feeds the sink, and the write stats add up
+"""
+
+import gzip
+import io
+import json
+import logging
+import time
+
+from src.loggingx.event_log import JsonFormatter
+from src.loggingx.file_sink import RotatingGzipFileSink
+from src.loggingx.log_queue import BackgroundLogWriter
+
+
+def lines(count: int, width: int = 100) -> list[str]:
+    return [f"{n:06d} " + "x" * (width - 8) + "\n" for n in range(count)]
+
+
+# ── Test 1: Buffered writes ──
+
+def test_buffers_until_chunk_is_full(tmp_path):
+    sink = RotatingGzipFileSink(tmp_path, buffer_size=1000, flush_interval=60, fsync_interval=60)
+    for line in lines(5):
+        sink.write(line)
+        sink.flush()                       # not due yet: stays in memory
+    assert sink.path.stat().st_size == 0
+
+    for line in lines(5):
+        sink.write(line)                   # 1000 bytes: one chunk
+    assert sink.path.stat().st_size == 1000
+    assert sink.fsyncs == 0
+
+    sink.close()
+    assert sink.fsyncs == 1
+
+
+# ── Test 2: Rotation + gzip ──
+
+def test_rotates_and_compresses(tmp_path):
+    sink = RotatingGzipFileSink(tmp_path, max_bytes=5000, buffer_size=1000)
+    written = lines(60)
+    for line in written:
+        sink.write(line)
+    sink.close()
+
+    segments = sink.segments()
+    assert sink.rotations == 1 and len(segments) == 1
+    assert not list(tmp_path.glob("*.tmp")) and len(list(tmp_path.glob("agent.log.*"))) == 1
+    with gzip.open(segments[0], "rt") as f:
+        rotated = f.read()
+    assert rotated + sink.path.read_text() == "".join(written)
+
+
+# ── Test 3: Disk footprint cap ──
+
+def test_total_size_is_capped(tmp_path):
+    sink = RotatingGzipFileSink(tmp_path, max_bytes=2000, buffer_size=500, max_total_bytes=600)
+    for n in range(100):
+        for line in lines(5, width=100):
+            sink.write(f"{n:02d}" + line)      # ~2 KB per segment, much less gzipped
+    sink.close()
+    total = sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert sink.deleted_segments > 0
+    assert total <= 600 + 2000                 # the cap, plus the file being written
+
+
+# ── Test 4: Time-based rotation ──
+
+def test_rotates_by_age(tmp_path):
+    sink = RotatingGzipFileSink(tmp_path, rotate_interval=0.05, buffer_size=10)
+    sink.write("first line\n")
+    time.sleep(0.06)
+    sink.write("second line\n")
+    sink.close()
+    assert sink.rotations >= 1
+    assert sink.segments()
+
+
+# ── Test 5: Fed by the queued writer ──
+
+def test_queued_writer_feeds_sink(tmp_path):
+    sink = RotatingGzipFileSink(tmp_path)
+    writer = BackgroundLogWriter(io.StringIO(), JsonFormatter(), sinks=[sink])
+    logger = logging.getLogger("test_file_sink.writer")
+    logger.handlers = [writer.handler]
+    logger.propagate = False
+    writer.start()
+    for n in range(50):
+        logger.warning(f"udev event {n}")
+    writer.stop()                              # closes the sink too
+
+    entries = [json.loads(line) for line in sink.path.read_text().splitlines()]
+    assert [e["message"] for e in entries] == [f"udev event {n}" for n in range(50)]
+    stats = sink.stats()
+    assert stats["write_amplification"] == 1.0   # nothing rotated: every byte once
+    assert stats["disk_bytes"] == stats["logged_bytes"] > 0
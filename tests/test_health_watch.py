@@ -0,0 +1,133 @@
+"""
+test_health_watch.py — Tests for the continuous health checker.
+
+1. A burst of udev events is coalesced into ONE evaluation
+2. Only the checks triggered by the event's subsystem are re-run
+3. Failures move the state LIVE → DEGRADED → SAFE_MODE and back
+4. The event → state-change latency is recorded
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.bootstrap.preflight import (
+    PreflightCheck,
+    PreflightRegistry,
+    PreflightResult,
+    PreflightSummary,
+)
+from src.controller.health_watch import ContinuousHealthChecker
+from src.shared.enums import AgentState, CheckSeverity, CheckStatus
+
+
+class FakeHardware:
+    """Which checks currently pass, plus a count of how often each ran."""
+    def __init__(self):
+        self.passing = {"mic": True, "phone": True, "deck": True}
+        self.runs = {"mic": 0, "phone": 0, "deck": 0}
+
+    def check(self, name: str, severity: CheckSeverity):
+        def run(ctx):
+            self.runs[name] += 1
+            status = CheckStatus.PASS if self.passing[name] else CheckStatus.FAIL
+            return PreflightResult(name, severity, status, "fake")
+        return run
+
+
+def make_checker(hardware: FakeHardware, tmp_path, **kwargs) -> tuple[ContinuousHealthChecker, list]:
+    registry = PreflightRegistry()
+    registry.register(PreflightCheck("mic", CheckSeverity.CRITICAL,
+                                     hardware.check("mic", CheckSeverity.CRITICAL),
+                                     triggers=frozenset({"sound"})))
+    registry.register(PreflightCheck("phone", CheckSeverity.WARNING,
+                                     hardware.check("phone", CheckSeverity.WARNING),
+                                     triggers=frozenset({"sound"})))
+    registry.register(PreflightCheck("deck", CheckSeverity.CRITICAL,
+                                     hardware.check("deck", CheckSeverity.CRITICAL),
+                                     triggers=frozenset({"hidraw"})))
+    initial = PreflightSummary(
+        results=[PreflightResult(n, CheckSeverity.CRITICAL, CheckStatus.PASS, "boot")
+                 for n in ("mic", "phone", "deck")],
+        has_critical_failure=False,
+        timestamp="2026-01-01T00:00:00+00:00",
+    )
+    changes = []
+    checker = ContinuousHealthChecker(
+        tmp_path, None, on_state_change=lambda state, reason: changes.append(state),
+        initial=initial, registry=registry, **kwargs,
+    )
+    return checker, changes
+
+
+# ── Test 1: One evaluation per burst ──
+
+@patch("src.controller.health_watch.build_alsa_inventory")
+def test_burst_is_coalesced(mock_inventory, tmp_path):
+    hardware = FakeHardware()
+    checker, _ = make_checker(hardware, tmp_path, coalesce_window=0.05)
+
+    done = threading.Event()
+    original = checker.evaluate
+    def evaluate(*args):
+        result = original(*args)
+        done.set()
+        return result
+    checker.evaluate = evaluate
+
+    for subsystem in ("usb", "sound", "sound", "input"):
+        checker.on_udev_event(SimpleNamespace(subsystem=subsystem))
+    assert done.wait(2.0)
+
+    assert checker.evaluations == 1
+    assert hardware.runs == {"mic": 1, "phone": 1, "deck": 0}
+    checker.stop()
+
+
+# ── Test 2: Only affected checks run ──
+
+@patch("src.controller.health_watch.build_alsa_inventory")
+def test_only_triggered_checks_rerun(mock_inventory, tmp_path):
+    hardware = FakeHardware()
+    checker, _ = make_checker(hardware, tmp_path)
+
+    checker.evaluate({"hidraw"})
+    assert hardware.runs == {"mic": 0, "phone": 0, "deck": 1}
+
+    checker.evaluate({"input"})           # nothing listens to "input"
+    assert checker.evaluations == 1
+
+
+# ── Test 3: State follows the failing checks ──
+
+@patch("src.controller.health_watch.build_alsa_inventory")
+def test_state_transitions(mock_inventory, tmp_path):
+    hardware = FakeHardware()
+    checker, changes = make_checker(hardware, tmp_path)
+    assert checker.state == AgentState.LIVE
+
+    hardware.passing["phone"] = False
+    assert checker.evaluate({"sound"}) == AgentState.DEGRADED
+
+    hardware.passing["mic"] = False
+    assert checker.evaluate({"sound"}) == AgentState.SAFE_MODE
+
+    hardware.passing.update(mic=True, phone=True)
+    assert checker.evaluate({"sound"}) == AgentState.LIVE
+
+    assert changes == [AgentState.DEGRADED, AgentState.SAFE_MODE, AgentState.LIVE]
+
+
+# ── Test 4: Latency is measured from the first event ──
+
+@patch("src.controller.health_watch.build_alsa_inventory")
+def test_latency_recorded(mock_inventory, tmp_path):
+    hardware = FakeHardware()
+    checker, _ = make_checker(hardware, tmp_path)
+
+    # Pretend the first udev event arrived 250 ms ago
+    checker.evaluate({"sound"}, first_event_at=time.monotonic() - 0.25)
+
+    assert len(checker.latencies_ms) == 1
+    assert 250.0 <= checker.latencies_ms[0] < checker.latency_budget_ms
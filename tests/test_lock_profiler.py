@@ -0,0 +1,153 @@
+"""
+test_lock_profiler.py — Tests for the lock contention profiler.
+
+1. While disabled, profiled_lock() is a plain lock
+2. Waits, holds and contention are counted per lock name
+3. A profiled lock works under a threading.Condition, and queue depths are sampled
+4. Thread CPU times come from /proc/self/task, under the Python thread names
+5. The report file holds locks, queues, threads and flat metrics
+"""
+
+import json
+import threading
+import time
+
+from src.loggingx.lock_profiler import LockProfiler, ProfiledLock, thread_cpu_times
+from src.ui_renderer.render_queue import RenderQueue
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+
+
+# ── Test 1: Off by default ──
+
+def test_disabled_profiler_makes_plain_locks():
+    profiler = LockProfiler()
+    assert not isinstance(profiler.lock("talk_engine"), ProfiledLock)
+    profiler.watch_queue("render_queue", lambda: 3)
+    profiler.sample()
+    assert profiler.report()["locks"] == []
+    assert profiler.report()["queues"] == []
+
+
+# ── Test 2: Wait / hold / contention ──
+
+def test_contended_lock_records_wait_and_hold():
+    profiler = LockProfiler()
+    profiler.enable()
+    lock = profiler.lock("renderer.write")
+    held = threading.Event()
+
+    def slow_writer():
+        with lock:
+            held.set()
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=slow_writer)
+    thread.start()
+    held.wait(1.0)
+    with lock:                                   # has to wait for slow_writer
+        pass
+    thread.join()
+
+    stats = profiler.report()["locks"][0]
+    assert stats["name"] == "renderer.write"
+    assert stats["acquisitions"] == 2
+    assert stats["contended"] == 1
+    assert stats["max_wait_ns"] >= 20_000_000
+    assert stats["max_hold_ns"] >= 45_000_000
+    assert not lock.locked()
+
+    # Re-entrant locks count the outermost hold only
+    rlock = profiler.lock("levels", reentrant=True)
+    with rlock:
+        with rlock:
+            pass
+    levels = next(s for s in profiler.report()["locks"] if s["name"] == "levels")
+    assert levels["acquisitions"] == 2 and levels["contended"] == 0
+
+
+# ── Test 3: Condition + queue depth ──
+
+class _NullRenderer:
+    def update(self, view_model):
+        pass
+
+
+def test_render_queue_lock_and_depth_are_profiled(monkeypatch):
+    import src.ui_renderer.render_queue as render_queue
+    profiler = LockProfiler()
+    profiler.enable()
+    monkeypatch.setattr(render_queue, "profiled_lock", profiler.lock)
+    monkeypatch.setattr(render_queue, "watch_queue", profiler.watch_queue)
+
+    queue = RenderQueue(_NullRenderer())
+    queue.submit(MiraBoxViewModel(is_online=True, channels=[
+        ChannelView(1, "Director", ButtonColor.GREY, "ch-1"),
+        ChannelView(2, "Camera", ButtonColor.GREY, "ch-2"),
+    ]))
+    profiler.sample()
+    queue.start()                                # paints, waiting on the Condition
+    deadline = time.monotonic() + 2.0
+    while queue.depth() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    queue.stop()
+    profiler.sample()
+
+    report = profiler.report()
+    depth = report["queues"][0]
+    assert depth["name"] == "render_queue"
+    assert (depth["samples"], depth["max"], depth["last"]) == (2, 2, 0)
+    assert report["locks"][0]["name"] == "render_queue"
+    assert report["locks"][0]["acquisitions"] >= 3
+
+    # A watched queue that is gone is dropped
+    del queue
+    profiler.sample()
+    assert profiler.report()["queues"] == []
+
+
+# ── Test 4: Thread CPU ──
+
+def test_thread_cpu_times_use_python_names():
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=spin, name="SpinThread", daemon=True)
+    thread.start()
+    try:
+        profiler = LockProfiler()
+        profiler.sample()
+        time.sleep(0.2)
+        profiler.sample()
+    finally:
+        stop.set()
+        thread.join()
+
+    threads = {t.tid: t for t in thread_cpu_times()}
+    assert threading.main_thread().native_id in threads
+    spinner = next(t for t in profiler.report()["threads"] if t["name"] == "SpinThread")
+    assert spinner["cpu_percent"] > 10.0
+    assert spinner["cpu_seconds"] > 0.0
+
+
+# ── Test 5: Report file ──
+
+def test_dump_writes_report_and_metrics(tmp_path):
+    profiler = LockProfiler()
+    profiler.enable()
+    lock = profiler.lock("talk_engine")
+    for _ in range(3):
+        with lock:
+            pass
+    profiler.watch_queue("log_writer", lambda: 7)
+    profiler.sample()
+
+    path = profiler.dump(tmp_path / "lock-profile.json")
+    data = json.loads(path.read_text())
+    assert data["locks"][0]["acquisitions"] == 3
+    assert data["queues"][0]["last"] == 7
+    assert data["metrics"]["lock.talk_engine.acquisitions"] == 3
+    assert data["metrics"]["queue.log_writer.max_depth"] == 7
+    assert "talk_engine" in profiler.format_report()
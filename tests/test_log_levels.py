@@ -0,0 +1,118 @@
+"""
+test_log_levels.py — Tests for log levels that change while running.
+
+1. Levels come from the file: a default plus per-logger overrides
+2. set/reset change a live logger, including ones made later
+3. Reloading the file (what SIGUSR1 does) replaces live changes
+4. The control socket takes get/set commands and rejects bad ones
+5. A disabled level never formats its %-arguments
+"""
+
+import io
+import json
+import logging
+
+from src.loggingx import event_log
+from src.loggingx.levels import LogLevels, LogLevelServer, send_command
+
+
+def write_levels(path, default="INFO", **loggers):
+    path.write_text(json.dumps({"default": default, "loggers": loggers}))
+
+
+# ── Test 1: Levels file ──
+
+def test_levels_from_file(tmp_path):
+    path = tmp_path / "log_levels.json"
+    write_levels(path, usb_monitor="DEBUG")
+    levels = event_log.enable_log_levels(path)
+    try:
+        usb = event_log.get_logger("usb_monitor")
+        quiet = event_log.get_logger("test_log_levels.quiet")
+        assert usb.level == logging.DEBUG
+        assert quiet.level == logging.INFO
+        assert levels.levels()["loggers"]["usb_monitor"] == "DEBUG"
+    finally:
+        event_log.disable_log_levels()
+    assert quiet.level == logging.DEBUG
+
+
+# ── Test 2: Live changes ──
+
+def test_set_and_reset_live():
+    levels = LogLevels(default="WARNING")
+    logger = logging.getLogger("test_log_levels.live")
+    levels.attach(logger)
+    assert not logger.isEnabledFor(logging.INFO)
+
+    levels.set_level("test_log_levels.live", "debug")
+    assert logger.isEnabledFor(logging.DEBUG)
+    levels.reset("test_log_levels.live")
+    assert logger.level == logging.WARNING
+
+    levels.set_level("default", "ERROR")
+    assert logger.level == logging.ERROR
+
+
+# ── Test 3: Reload ──
+
+def test_reload_replaces_live_changes(tmp_path):
+    path = tmp_path / "log_levels.json"
+    write_levels(path, default="WARNING")
+    levels = LogLevels(path)
+    logger = logging.getLogger("test_log_levels.reload")
+    levels.attach(logger)
+    levels.set_level("test_log_levels.reload", "DEBUG")
+
+    write_levels(path, default="INFO")
+    levels.reload()
+    assert logger.level == logging.INFO
+
+    path.write_text("{not json")
+    levels.reload()                                    # broken file: keep what we have
+    assert logger.level == logging.INFO
+
+
+# ── Test 4: Control socket ──
+
+def test_control_socket(tmp_path):
+    levels = LogLevels()
+    logger = logging.getLogger("test_log_levels.socket")
+    levels.attach(logger)
+    server = LogLevelServer(levels, tmp_path / "levels.sock")
+    server.start()
+    try:
+        reply = send_command("set test_log_levels.socket DEBUG", server.path)
+        assert reply["ok"] and reply["loggers"]["test_log_levels.socket"] == "DEBUG"
+        assert logger.level == logging.DEBUG
+        assert send_command("get", server.path)["default"] == "INFO"
+        assert not send_command("set test_log_levels.socket LOUD", server.path)["ok"]
+        assert not send_command("explode", server.path)["ok"]
+        assert (server.path.stat().st_mode & 0o777) == 0o600
+    finally:
+        server.stop()
+    assert not server.path.exists()
+
+
+# ── Test 5: Lazy formatting ──
+
+def test_disabled_level_skips_formatting():
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return "expensive"
+
+    levels = LogLevels(default="INFO")
+    logger = logging.getLogger("test_log_levels.lazy")
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    levels.attach(logger)
+
+    logger.debug("Value: %s", Expensive())
+    assert Expensive.formatted == 0
+    levels.set_level("test_log_levels.lazy", "DEBUG")
+    logger.handlers = [logging.StreamHandler(io.StringIO())]
+    logger.debug("Value: %s", Expensive())
+    assert Expensive.formatted == 1
@@ -0,0 +1,155 @@
+"""
+test_log_queue.py — Tests for queued (background) logging.
+
+1. Records are formatted and written as JSON lines by the writer, in batches
+2. A full queue drops records, counts them and says so in the log
+3. A slow console never slows down the logging thread
+4. enable_queued_logging() switches existing loggers over, and back again
+5. Messages and tracebacks are made into text when logged; drops are counted exactly
+"""
+
+import io
+import json
+import logging
+import threading
+import time
+
+from src.loggingx.event_log import (
+    JsonFormatter,
+    disable_queued_logging,
+    enable_queued_logging,
+    get_logger,
+)
+from src.loggingx.log_queue import BackgroundLogWriter, QueuedLogHandler
+
+
+def make_logger(name: str, writer: BackgroundLogWriter) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [writer.handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+# ── Test 1: Batched JSON lines ──
+
+def test_records_written_in_batches():
+    stream = io.StringIO()
+    writer = BackgroundLogWriter(stream, JsonFormatter(), batch_size=10)
+    logger = make_logger("test_log_queue.batches", writer)
+
+    for n in range(25):
+        logger.info(f"line {n}")
+    writer.flush()            # (writer thread not started: flush on this thread)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [entry["message"] for entry in lines] == [f"line {n}" for n in range(25)]
+    assert lines[0]["module"] == "test_log_queue.batches"
+    assert writer.written == 25
+    assert writer.batches == 3
+
+
+# ── Test 2: Bounded queue with a drop counter ──
+
+def test_full_queue_drops_and_reports():
+    stream = io.StringIO()
+    writer = BackgroundLogWriter(stream, JsonFormatter(), maxsize=5)
+    logger = make_logger("test_log_queue.drops", writer)
+
+    for n in range(8):
+        logger.info(f"line {n}")
+    assert writer.dropped == 3
+    writer.flush()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages[:5] == [f"line {n}" for n in range(5)]
+    assert "Dropped 3 log records" in messages[5]
+
+
+# ── Test 3: A stuck console doesn't block the caller ──
+
+class SlowStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait(2.0)
+        return super().write(text)
+
+
+def test_slow_stream_does_not_block_logging():
+    stream = SlowStream()
+    writer = BackgroundLogWriter(stream, JsonFormatter(), maxsize=100)
+    logger = make_logger("test_log_queue.slow", writer)
+    writer.start()
+
+    started = time.perf_counter()
+    for n in range(1000):
+        logger.info(f"press {n}")
+    elapsed = time.perf_counter() - started
+
+    stream.release.set()
+    writer.stop()
+    assert elapsed < 0.5                       # ~microseconds per call, not 2 s
+    assert writer.dropped > 0                  # the queue was full, nothing waited
+    assert writer.written + writer.dropped == 1000
+
+
+# ── Test 4: Switching modes ──
+
+def test_enable_and_disable_switch_existing_loggers():
+    logger = get_logger("test_log_queue.switch")
+    assert not isinstance(logger.handlers[0], QueuedLogHandler)
+
+    stream = io.StringIO()
+    writer = enable_queued_logging(stream)
+    try:
+        assert enable_queued_logging() is writer
+        assert logger.handlers == [writer.handler]
+        assert isinstance(get_logger("test_log_queue.later").handlers[0], QueuedLogHandler)
+        logger.warning("queued")
+    finally:
+        disable_queued_logging()
+
+    assert not isinstance(logger.handlers[0], QueuedLogHandler)
+    assert json.loads(stream.getvalue().splitlines()[-1])["message"] == "queued"
+
+
+# ── Test 5: Prepared on the caller's thread ──
+
+def test_records_prepared_when_logged():
+    stream = io.StringIO()
+    writer = BackgroundLogWriter(stream, JsonFormatter())
+    logger = make_logger("test_log_queue.prepare", writer)
+
+    keys = [1, 2]
+    logger.info("Keys pressed: %s", keys)
+    keys.append(3)                                 # changed before the writer runs
+    try:
+        raise ValueError("deck gone")
+    except ValueError:
+        logger.exception("Read failed")
+    writer.flush()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["message"] == "Keys pressed: [1, 2]"
+    assert lines[1]["message"] == "Read failed"
+    assert "ValueError: deck gone" in lines[1]["exception"]
+
+
+def test_drops_counted_exactly_across_threads():
+    writer = BackgroundLogWriter(io.StringIO(), JsonFormatter(), maxsize=1)
+    logger = make_logger("test_log_queue.drop_count", writer)
+    logger.info("fills the queue")
+
+    def spam():
+        for _ in range(2000):
+            logger.info("dropped")
+
+    threads = [threading.Thread(target=spam) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.dropped == 8000
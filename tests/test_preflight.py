@@ -8,14 +8,24 @@ We use unittest.mock.patch to replace the real check functions with fake ones
 that return whatever result we want.
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import patch
 
 from src.bootstrap.preflight import (
+    PreflightCheck,
+    PreflightRegistry,
     PreflightResult,
     PreflightSummary,
+    build_alsa_inventory,
+    check_audio_capture_device,
+    check_mirabox_reachable,
+    check_phone_audio,
     run_all_preflight_checks,
 )
+from src.bootstrap.mirabox_detect import last_mirabox_match
 from src.shared.enums import CheckSeverity, CheckStatus
 
 
@@ -114,3 +124,159 @@ def test_warning_does_not_block(
 
     # Phone is missing but it's only a warning, so no critical failure
     assert summary.has_critical_failure is False
+
+
+# ── Test 4: ALSA inventory is read from /proc/asound ──
+
+def test_alsa_inventory_from_proc(tmp_path):
+    """Cards and their capture/playback abilities come from /proc, no subprocess."""
+    (tmp_path / "cards").write_text(
+        " 0 [ICUSBAUDIO7D   ]: USB-Audio - ICUSBAUDIO7D\n"
+        "                      ICUSBAUDIO7D at usb-0000:01:00.0-1.1, full speed\n"
+        " 4 [Audio          ]: USB-Audio - KT USB Audio\n"
+        "                      KTMicro KT USB Audio at usb-0000:01:00.0-1.3, full speed\n"
+    )
+    (tmp_path / "pcm").write_text(
+        "00-00: USB Audio : USB Audio : capture 1\n"
+        "04-00: USB Audio : USB Audio : playback 1 : capture 1\n"
+    )
+
+    with patch("src.bootstrap.preflight.subprocess.run") as mock_run:
+        inventory = build_alsa_inventory(proc_root=tmp_path)
+
+    mock_run.assert_not_called()
+    assert inventory.source == "proc"
+    assert inventory.has_capture("KT USB Audio")
+    assert inventory.has_playback("KT USB Audio")
+    assert inventory.has_capture("ICUSBAUDIO7D")
+    assert not inventory.has_playback("ICUSBAUDIO7D")
+
+    assert check_audio_capture_device(inventory).status == CheckStatus.PASS
+    assert check_phone_audio(inventory).status == CheckStatus.PASS
+
+
+# ── Test 5: A hung check times out instead of stalling boot ──
+
+@patch("src.bootstrap.preflight.check_mirabox_reachable")
+def test_hung_check_times_out(mock_mirabox):
+    """A check that never returns is recorded as FAIL after its timeout."""
+    release = threading.Event()
+
+    def hang():
+        release.wait(5)
+        return make_result("mirabox_reachable", CheckSeverity.CRITICAL, CheckStatus.PASS)
+
+    mock_mirabox.side_effect = hang
+    started = time.monotonic()
+    summary = run_all_preflight_checks(check_timeout=0.2, deadline=0.5)
+    release.set()
+
+    assert time.monotonic() - started < 2.0
+    mirabox = next(r for r in summary.results if r.check_name == "mirabox_reachable")
+    assert mirabox.status == CheckStatus.FAIL
+    assert "timed out" in mirabox.detail
+    assert summary.has_critical_failure is True
+    assert all(r.duration_ms >= 0.0 for r in summary.results)
+
+
+# ── Test 6: Registry — profiles, dependencies and SKIP ──
+
+def test_registry_profiles_and_dependency_skip(tmp_path):
+    """Checks are picked by profile, and dependents of a failed check are SKIPped."""
+    registry = PreflightRegistry()
+
+    @registry.check("deck_1", CheckSeverity.CRITICAL)
+    def deck_1(ctx):
+        return PreflightResult("deck_1", CheckSeverity.CRITICAL, CheckStatus.FAIL, "missing")
+
+    @registry.check("deck_1_firmware", CheckSeverity.WARNING, depends_on=("deck_1",))
+    def deck_1_firmware(ctx):
+        raise AssertionError("must not run when deck_1 failed")
+
+    @registry.check("deck_2", CheckSeverity.CRITICAL, profiles={"dual-deck"})
+    def deck_2(ctx):
+        return PreflightResult("deck_2", CheckSeverity.CRITICAL, CheckStatus.PASS, "ok")
+
+    single = run_all_preflight_checks(config_cache_dir=tmp_path, profile="single", registry=registry)
+    assert [r.check_name for r in single.results] == ["deck_1", "deck_1_firmware"]
+    assert single.results[1].status == CheckStatus.SKIP
+    assert single.duration_ms > 0.0
+
+    dual = run_all_preflight_checks(config_cache_dir=tmp_path, profile="dual-deck", registry=registry)
+    assert [r.check_name for r in dual.results] == ["deck_1", "deck_1_firmware", "deck_2"]
+
+
+def test_registry_rejects_cycles():
+    registry = PreflightRegistry()
+    registry.register(PreflightCheck("a", CheckSeverity.WARNING, lambda ctx: None, depends_on=("b",)))
+    registry.register(PreflightCheck("b", CheckSeverity.WARNING, lambda ctx: None, depends_on=("a",)))
+
+    with pytest.raises(ValueError):
+        registry.select()
+
+
+# ── Test 7: MiraBox is matched by VID/PID in sysfs ──
+
+def make_hidraw(sys_root, name: str, usb_interface: str, hid_id: str):
+    """Fake /sys/class/hidraw/<name>/device -> .../<usb_interface>/<hid_id>."""
+    hid_device = sys_root / "devices" / "usb1" / usb_interface / hid_id
+    hid_device.mkdir(parents=True)
+    node = sys_root / "class" / "hidraw" / name
+    node.mkdir(parents=True)
+    (node / "device").symlink_to(hid_device)
+
+
+def test_mirabox_matched_by_vid_pid(tmp_path):
+    """A keyboard is not a MiraBox, and hidraw10+ is still found."""
+    make_hidraw(tmp_path, "hidraw0", "1-1.2:1.0", "0003:046D:C31C.0001")   # keyboard
+    assert check_mirabox_reachable(sys_root=tmp_path).status == CheckStatus.FAIL
+
+    make_hidraw(tmp_path, "hidraw12", "1-1.3:1.0", "0003:5500:1001.0004")  # StreamDock293
+    result = check_mirabox_reachable(sys_root=tmp_path)
+    assert result.status == CheckStatus.PASS
+    assert "StreamDock293" in result.detail
+
+    match = last_mirabox_match()
+    assert match.hidraw == "/dev/hidraw12"
+    assert match.device_info() == {"path": "1-1.3:1.0", "vendor_id": 0x5500, "product_id": 0x1001}
+
+
+# ── Test 8: A skipped critical check blocks boot ──
+
+def test_skipped_critical_check_is_a_critical_failure(tmp_path):
+    """A CRITICAL check skipped because a WARNING check it needs failed still blocks boot."""
+    registry = PreflightRegistry()
+
+    @registry.check("usb_hub", CheckSeverity.WARNING)
+    def usb_hub(ctx):
+        return PreflightResult("usb_hub", CheckSeverity.WARNING, CheckStatus.FAIL, "hub not powered")
+
+    @registry.check("headset_mic", CheckSeverity.CRITICAL, depends_on=("usb_hub",))
+    def headset_mic(ctx):
+        raise AssertionError("must not run when usb_hub failed")
+
+    summary = run_all_preflight_checks(config_cache_dir=tmp_path, profile="single", registry=registry)
+    assert summary.results[1].status == CheckStatus.SKIP
+    assert summary.has_critical_failure is True
+
+
+# ── Test 9: No native HID library ──
+
+def test_mirabox_scan_survives_missing_native_library(tmp_path, monkeypatch):
+    """SteamDock is installed but its libusb/hid bindings fail to load (OSError)."""
+    import builtins
+    import src.bootstrap.mirabox_detect as mirabox_detect
+
+    real_import = builtins.__import__
+
+    def failing_import(name, *args, **kwargs):
+        if name.startswith("SteamDock"):
+            raise OSError("libhidapi-libusb.so.0: cannot open shared object file")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(mirabox_detect, "_product_index", None)
+    monkeypatch.setattr(builtins, "__import__", failing_import)
+    make_hidraw(tmp_path, "hidraw0", "1-1.3:1.0", "0003:5500:1001.0001")
+
+    result = check_mirabox_reachable(sys_root=tmp_path)
+    assert result.status == CheckStatus.FAIL
@@ -0,0 +1,140 @@
+"""
+test_preflight_cache.py — Tests for warm-restart preflight caching.
+
+1. The hardware fingerprint changes when a USB device / card / hidraw changes
+2. A cached summary is returned only for the same fingerprint and while fresh
+3. invalidate() forgets the cached result
+4. run_bootstrap trusts a matching cache and verifies in the background
+5. On a cache hit only the verified result goes into the preflight history
+"""
+
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from src.bootstrap import run_bootstrap
+from src.bootstrap.preflight import PreflightResult, PreflightSummary
+from src.bootstrap.preflight_cache import PreflightCache, hardware_fingerprint
+from src.bootstrap.preflight_history import PreflightHistory
+from src.shared.enums import AgentState, CheckSeverity, CheckStatus
+
+
+def make_summary() -> PreflightSummary:
+    return PreflightSummary(
+        results=[PreflightResult("headset_mic", CheckSeverity.CRITICAL, CheckStatus.PASS, "ok", 1.5)],
+        has_critical_failure=False,
+        timestamp="2026-01-01T00:00:00+00:00",
+    )
+
+
+def make_fake_hardware(root: Path) -> tuple[Path, Path]:
+    """Build a tiny fake /sys and /proc/asound tree."""
+    sys_root, proc_root = root / "sys", root / "asound"
+    usb = sys_root / "bus" / "usb" / "devices" / "1-1.3"
+    usb.mkdir(parents=True)
+    (usb / "idVendor").write_text("5500\n")
+    (usb / "idProduct").write_text("1001\n")
+    (sys_root / "class" / "hidraw" / "hidraw0").mkdir(parents=True)
+    proc_root.mkdir()
+    (proc_root / "cards").write_text(" 4 [Audio          ]: USB-Audio - KT USB Audio\n")
+    return sys_root, proc_root
+
+
+# ── Test 1: Fingerprint follows the hardware ──
+
+def test_fingerprint_changes_with_hardware(tmp_path: Path):
+    sys_root, proc_root = make_fake_hardware(tmp_path)
+    first = hardware_fingerprint(sys_root, proc_root)
+    assert hardware_fingerprint(sys_root, proc_root) == first
+
+    (sys_root / "class" / "hidraw" / "hidraw1").mkdir()
+    assert hardware_fingerprint(sys_root, proc_root) != first
+
+
+# ── Test 2: Only fresh, matching results are trusted ──
+
+def test_cache_roundtrip_and_staleness(tmp_path: Path):
+    cache = PreflightCache(tmp_path, max_age=60)
+    cache.save(make_summary(), "abc")
+
+    loaded = cache.load("abc")
+    assert loaded is not None
+    assert loaded.results[0].status == CheckStatus.PASS
+    assert loaded.results[0].duration_ms == 1.5
+
+    assert cache.load("different-hardware") is None
+
+    with patch("src.bootstrap.preflight_cache.time.time", return_value=10**12):
+        assert cache.load("abc") is None
+
+
+# ── Test 3: Invalidation ──
+
+def test_invalidate_removes_cache(tmp_path: Path):
+    cache = PreflightCache(tmp_path)
+    cache.save(make_summary(), "abc")
+    cache.invalidate()
+    assert cache.load("abc") is None
+    cache.invalidate()   # second time is harmless
+
+
+# ── Test 4: Warm restart skips the synchronous checks ──
+
+def test_bootstrap_uses_cache_and_verifies(tmp_path: Path):
+    identity_file = tmp_path / "identity.json"
+    identity_file.write_text(json.dumps({
+        "device_id": "box-1", "secret": "s", "profile": "p", "config_version": 0,
+    }))
+    PreflightCache(tmp_path).save(make_summary(), "fp", "p")
+
+    verified = threading.Event()
+    with patch("src.bootstrap.hardware_fingerprint", return_value="fp"), \
+         patch("src.bootstrap.run_all_preflight_checks", return_value=make_summary()) as mock_run:
+        outcome = run_bootstrap(
+            identity_path=identity_file,
+            config_cache_dir=tmp_path,
+            preflight_cache_ttl=60,
+            on_preflight_verified=lambda summary: verified.set(),
+        )
+        assert outcome.success is True
+        assert outcome.state == AgentState.DISCOVERING_HW
+        assert outcome.preflight_from_cache is True
+        assert verified.wait(2.0)
+
+    mock_run.assert_called_once()   # only the background verification ran
+
+
+# ── Test 5: History records what was verified ──
+
+def test_cache_hit_saves_only_the_fresh_result(tmp_path: Path):
+    identity_file = tmp_path / "identity.json"
+    identity_file.write_text(json.dumps({
+        "device_id": "box-1", "secret": "s", "profile": "p", "config_version": 0,
+    }))
+    PreflightCache(tmp_path).save(make_summary(), "fp", "p")
+    fresh = PreflightSummary(
+        results=[PreflightResult("headset_mic", CheckSeverity.CRITICAL, CheckStatus.SKIP, "not plugged in yet", 2.0)],
+        has_critical_failure=False,
+        timestamp="2026-01-02T00:00:00+00:00",
+    )
+    history_path = tmp_path / "history.jsonl"
+
+    verified = threading.Event()
+    with patch("src.bootstrap.hardware_fingerprint", return_value="fp"), \
+         patch("src.bootstrap.run_all_preflight_checks", return_value=fresh):
+        outcome = run_bootstrap(
+            identity_path=identity_file,
+            config_cache_dir=tmp_path,
+            preflight_save_path=history_path,
+            preflight_cache_ttl=60,
+            on_preflight_verified=lambda summary: verified.set(),
+        )
+        assert outcome.preflight_from_cache is True
+        assert verified.wait(2.0)
+
+    history = PreflightHistory(history_path)
+    boots = history.boots()
+    assert len(boots) == 1
+    assert history.get(boots[0]).timestamp == fresh.timestamp
+    assert history.get(boots[0]).results[0].status == CheckStatus.SKIP
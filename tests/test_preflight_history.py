@@ -0,0 +1,110 @@
+"""
+test_preflight_history.py — Tests for the append-only preflight history.
+
+1. Appends survive a reopen and are queryable by check name and time
+2. diff() reports exactly the checks that changed status
+3. Each boot's append is fsynced, and the line count comes from the sidecar, not a re-read
+4. Retention keeps the file bounded, also when every boot opens its own history
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from src.bootstrap.preflight import PreflightResult, PreflightSummary
+from src.bootstrap.preflight_history import CheckChange, PreflightHistory
+from src.shared.enums import CheckSeverity, CheckStatus
+
+
+def make_summary(mic: CheckStatus, phone: CheckStatus = CheckStatus.PASS) -> PreflightSummary:
+    return PreflightSummary(
+        results=[
+            PreflightResult("headset_mic", CheckSeverity.CRITICAL, mic, "mic"),
+            PreflightResult("phone_audio", CheckSeverity.WARNING, phone, "phone"),
+        ],
+        has_critical_failure=mic == CheckStatus.FAIL,
+        timestamp="2026-01-01T00:00:00+00:00",
+    )
+
+
+# ── Test 1: Append, reopen, query ──
+
+def test_append_and_query(tmp_path: Path):
+    path = tmp_path / "preflight_history.jsonl"
+    history = PreflightHistory(path)
+    with patch("src.bootstrap.preflight_history.time.time", side_effect=[100.0, 200.0, 300.0]):
+        history.append(make_summary(CheckStatus.PASS), boot_id="b1")
+        history.append(make_summary(CheckStatus.FAIL), boot_id="b2")
+        history.append(make_summary(CheckStatus.PASS), boot_id="b3")
+    history.close()
+
+    reopened = PreflightHistory(path)
+    assert reopened.boots() == ["b1", "b2", "b3"]
+
+    mic = reopened.query(check_name="headset_mic", since=150.0)
+    assert [(boot, r.status) for boot, _t, r in mic] == [
+        ("b2", CheckStatus.FAIL),
+        ("b3", CheckStatus.PASS),
+    ]
+    assert len(reopened.query(until=100.0)) == 2   # both checks of b1
+
+
+# ── Test 2: Diff between two boots ──
+
+def test_diff_between_boots(tmp_path: Path):
+    history = PreflightHistory(tmp_path / "h.jsonl")
+    history.append(make_summary(CheckStatus.PASS, CheckStatus.PASS), boot_id="yesterday")
+    history.append(make_summary(CheckStatus.FAIL, CheckStatus.PASS), boot_id="today")
+
+    assert history.diff("yesterday", "today") == [
+        CheckChange("headset_mic", CheckStatus.PASS, CheckStatus.FAIL),
+    ]
+    assert history.diff("today", "today") == []
+
+
+# ── Test 3: One fsync per boot, no re-read ──
+
+def test_each_boot_fsyncs_and_reuses_line_count(tmp_path: Path):
+    path = tmp_path / "h.jsonl"
+    with patch("src.bootstrap.preflight_history.os.fsync") as fsync:
+        for _ in range(3):                       # three boots
+            history = PreflightHistory(path)
+            history.append(make_summary(CheckStatus.PASS))
+            history.close()
+        assert fsync.call_count == 3
+
+    with patch.object(Path, "read_bytes", side_effect=AssertionError("history was re-read")):
+        history = PreflightHistory(path)
+        history.append(make_summary(CheckStatus.PASS))
+        history.close()
+    assert history._line_count == 4
+
+    # A sidecar that doesn't match the file (e.g. power cut in between) → count again
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"boot_id":"by-hand","t":1.0,"summary":{}}\n')
+    history = PreflightHistory(path)
+    history.append(make_summary(CheckStatus.PASS))
+    history.close()
+    assert history._line_count == 6
+
+
+# ── Test 4: Retention ──
+
+def test_retention_bounds_file(tmp_path: Path):
+    path = tmp_path / "h.jsonl"
+    history = PreflightHistory(path, max_entries=10)
+    ids = [history.append(make_summary(CheckStatus.PASS)) for _ in range(40)]
+    history.close()
+
+    kept = PreflightHistory(path).boots()
+    assert 10 <= len(kept) <= 15
+    assert kept[-1] == ids[-1]
+    assert len(path.read_text().splitlines()) == len(kept)
+
+    # Every boot opens its own history: the sidecar keeps the count between them
+    for _ in range(40):
+        history = PreflightHistory(path, max_entries=10)
+        last = history.append(make_summary(CheckStatus.PASS))
+        history.close()
+    kept = PreflightHistory(path).boots()
+    assert 10 <= len(kept) <= 15
+    assert kept[-1] == last
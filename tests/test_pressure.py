@@ -0,0 +1,122 @@
+"""
+test_pressure.py — Tests for thermal/load-based load shedding.
+
+We feed synthetic metric series (no real heat needed!) and check that:
+1. Heat and throttling flags raise the pressure level immediately
+2. The level only drops after several calm samples (no bouncing)
+3. Subscribers react and then recover (monitor interval, rollups)
+4. The render queue drops non-critical updates under CRITICAL pressure
+   but still paints the talk indicator
+"""
+
+from unittest.mock import patch
+
+from src.hardware_manager.pressure import (
+    PressureConfig,
+    PressureMonitor,
+    THROTTLE_THROTTLED,
+)
+from src.hardware_manager.system import HealthMonitor, SystemMetrics
+from src.shared.enums import PressureLevel
+from src.ui_renderer.render_queue import RenderQueue
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+
+
+def metrics(temp=50.0, cpu=20.0, mem=40.0, flags=0) -> SystemMetrics:
+    return SystemMetrics(cpu, mem, 50.0, temp, flags)
+
+
+class FakeRenderer:
+    """Records what would have been painted."""
+    def __init__(self):
+        self.painted = []
+
+    def update(self, view_model):
+        self.painted.extend(view_model.channels)
+
+
+# ── Test 1: Heat and throttling raise the level right away ──
+
+def test_level_rises_immediately():
+    monitor = PressureMonitor(PressureConfig(temp_elevated=70.0, temp_critical=80.0))
+
+    assert monitor.observe(metrics(temp=55.0)) == PressureLevel.NORMAL
+    assert monitor.observe(metrics(temp=72.0)) == PressureLevel.ELEVATED
+    assert monitor.observe(metrics(temp=60.0, flags=THROTTLE_THROTTLED)) == PressureLevel.CRITICAL
+
+
+# ── Test 2: Recovery needs several calm samples ──
+
+def test_level_drops_after_calm_samples():
+    monitor = PressureMonitor(PressureConfig(clear_samples=3))
+    series = [85.0, 50.0, 50.0, 90.0, 50.0, 50.0, 50.0]   # °C
+
+    levels = [monitor.observe(metrics(temp=t)) for t in series]
+
+    assert levels == [
+        PressureLevel.CRITICAL,
+        PressureLevel.CRITICAL,   # 1 calm sample
+        PressureLevel.CRITICAL,   # 2 calm samples
+        PressureLevel.CRITICAL,   # hot again → counter resets
+        PressureLevel.CRITICAL,
+        PressureLevel.CRITICAL,
+        PressureLevel.NORMAL,     # 3 calm samples in a row
+    ]
+
+
+# ── Test 3: Subscribers are told, and the change is reversible ──
+
+def test_subscribers_follow_level():
+    monitor = PressureMonitor(PressureConfig(clear_samples=1))
+    health = HealthMonitor()
+    seen = []
+    monitor.subscribe(seen.append)
+    monitor.subscribe(health.apply_pressure)
+
+    monitor.observe(metrics(cpu=99.0))
+    assert health.rollup_scale > 1.0
+
+    monitor.observe(metrics(cpu=10.0))
+    assert health.rollup_scale == 1.0
+    assert seen == [PressureLevel.NORMAL, PressureLevel.CRITICAL, PressureLevel.NORMAL]
+
+
+# ── Test 4: Render queue sheds extras but keeps the talk indicator ──
+
+def test_render_queue_sheds_background_updates():
+    renderer = FakeRenderer()
+    queue = RenderQueue(renderer)
+    queue.apply_pressure(PressureLevel.CRITICAL)
+
+    talk = ChannelView(1, "Director", ButtonColor.RED, None)
+    anim = ChannelView(2, "Producer", ButtonColor.GREY, None)
+    queue.submit(MiraBoxViewModel(True, [anim]), critical=False)
+    queue.submit(MiraBoxViewModel(True, [talk]))
+    queue.flush()
+
+    assert renderer.painted == [talk]
+    assert queue.updates_skipped == 1
+
+    # Back to NORMAL → background updates are painted again
+    queue.apply_pressure(PressureLevel.NORMAL)
+    queue.submit(MiraBoxViewModel(True, [anim]), critical=False)
+    queue.flush()
+    assert renderer.painted[-1] == anim
+
+
+def test_render_queue_paces_background_frames():
+    renderer = FakeRenderer()
+    queue = RenderQueue(renderer)
+    queue.apply_pressure(PressureLevel.ELEVATED)   # 10 fps
+
+    frame = ChannelView(2, "Producer", ButtonColor.GREY, None)
+    with patch("src.ui_renderer.render_queue.time.monotonic", return_value=100.0):
+        queue.submit(MiraBoxViewModel(True, [frame]), critical=False)
+        queue.flush()
+        queue.submit(MiraBoxViewModel(True, [frame]), critical=False)
+        queue.flush()                             # too soon → waits
+    assert len(renderer.painted) == 1
+
+    with patch("src.ui_renderer.render_queue.time.monotonic", return_value=100.2):
+        queue.flush()
+    assert len(renderer.painted) == 2
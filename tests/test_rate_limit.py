@@ -0,0 +1,159 @@
+"""
+test_rate_limit.py — Tests for log deduplication and rate limiting.
+
+1. A repeated line is written once, then summarised with its count
+2. A logger that writes too fast is cut off by its token bucket
+3. CRITICAL lines are never dropped
+4. enable_rate_limiting() covers existing and new loggers
+5. Dropping a line is cheap
+6. f-string lines that differ only in numbers count as the same line
+7. The last burst of a storm is reported by the timer, or on close()
+"""
+
+import logging
+import time
+
+from src.loggingx import event_log
+from src.loggingx.rate_limit import LogRateLimiter
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_logger(name: str, limiter: LogRateLimiter) -> tuple[logging.Logger, ListHandler]:
+    logger = logging.getLogger(name)
+    handler = ListHandler()
+    logger.handlers = [handler]
+    logger.filters = [limiter]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, handler
+
+
+# ── Test 1: Deduplication ──
+
+def test_repeats_are_summarised():
+    limiter = LogRateLimiter(window=0.05, rate=1000, burst=1000)
+    logger, handler = make_logger("test_rate_limit.dedup", limiter)
+    for n in range(100):
+        logger.warning("Transport read failed on %s", f"hid{n}")   # same template
+    logger.warning("Something else")
+
+    assert [r.getMessage() for r in handler.records] == ["Transport read failed on hid0", "Something else"]
+    assert limiter.suppressed_duplicates == 99
+
+    time.sleep(0.06)
+    logger.warning("Transport read failed on %s", "hid100")       # window over: summary, then the line
+    summary = handler.records[2]
+    assert summary.repeated == 99 and "repeated 99 times" in summary.getMessage()
+    assert summary.levelno == logging.WARNING
+    assert handler.records[3].getMessage() == "Transport read failed on hid100"
+
+
+# ── Test 2: Token bucket ──
+
+def test_rate_limit_per_logger():
+    limiter = LogRateLimiter(window=60, rate=0.001, burst=5)
+    noisy, noisy_handler = make_logger("test_rate_limit.noisy", limiter)
+    quiet, quiet_handler = make_logger("test_rate_limit.quiet", limiter)
+    for n in range(20):
+        noisy.info(f"udev event on usb-{chr(ord('a') + n)}")        # all different: no dedup
+    quiet.info("still here")
+
+    assert len(noisy_handler.records) == 5
+    assert len(quiet_handler.records) == 1                          # own bucket
+    assert limiter.suppressed_rate_limited == 15
+    assert limiter.suppressed_by_logger == {"test_rate_limit.noisy": 15}
+
+    limiter.flush()
+    summary = noisy_handler.records[-1]
+    assert summary.suppressed == 15 and "suppressed 15 lines" in summary.getMessage()
+
+
+# ── Test 3: CRITICAL is exempt ──
+
+def test_critical_never_dropped():
+    limiter = LogRateLimiter(window=60, rate=0.001, burst=1)
+    logger, handler = make_logger("test_rate_limit.critical", limiter)
+    for _ in range(10):
+        logger.critical("Deck lost during a talk")
+    assert len(handler.records) == 10
+    assert limiter.suppressed_duplicates == limiter.suppressed_rate_limited == 0
+
+
+# ── Test 4: Wired into get_logger ──
+
+def test_enable_rate_limiting_covers_all_loggers():
+    before = event_log.get_logger("test_rate_limit.before")
+    limiter = event_log.enable_rate_limiting(window=60)
+    try:
+        after = event_log.get_logger("test_rate_limit.after")
+        assert limiter in before.filters and limiter in after.filters
+        assert event_log.enable_rate_limiting() is limiter
+    finally:
+        event_log.disable_rate_limiting()
+    assert limiter not in before.filters and limiter not in after.filters
+
+
+# ── Test 5: Cheap suppression ──
+
+def test_suppressed_call_is_cheap():
+    limiter = LogRateLimiter(window=60)
+    logger, handler = make_logger("test_rate_limit.cost", limiter)
+    logger.info("Battery low on key %d", 1)
+
+    count = 20000
+    started = time.perf_counter()
+    for n in range(count):
+        logger.info("Battery low on key %d", n)
+    per_call = (time.perf_counter() - started) / count
+
+    assert len(handler.records) == 1
+    assert limiter.suppressed_duplicates == count
+    assert per_call < 50e-6          # record creation + a dict lookup; generous for slow CI
+
+
+# ── Test 6: Numbers don't make a line new ──
+
+def test_fstring_numbers_are_deduplicated():
+    limiter = LogRateLimiter(window=60, rate=1000, burst=1000)
+    logger, handler = make_logger("test_rate_limit.fstring", limiter)
+    for n in range(50):
+        logger.warning(f"Key {n % 15 + 1} went red {30.0 + n / 10:.1f} ms after the press")
+    logger.warning("Pressure level is now ELEVATED")
+    logger.warning("Pressure level is now NORMAL")      # different words: not a repeat
+
+    assert [r.getMessage() for r in handler.records] == [
+        "Key 1 went red 30.0 ms after the press",
+        "Pressure level is now ELEVATED",
+        "Pressure level is now NORMAL",
+    ]
+    assert limiter.suppressed_duplicates == 49
+
+
+# ── Test 7: The last burst is reported ──
+
+def test_last_burst_reported_without_another_line():
+    limiter = LogRateLimiter(window=0.05, rate=1000, burst=1000)
+    logger, handler = make_logger("test_rate_limit.timer", limiter)
+    for n in range(20):
+        logger.warning(f"Transport read failed on hid{n}")
+
+    deadline = time.monotonic() + 2.0
+    while len(handler.records) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert handler.records[1].repeated == 19
+    assert handler.records[1].getMessage() == "Transport read failed on hid0 (repeated 19 times in 0s)"
+
+    closing = LogRateLimiter(window=60)
+    logger, handler = make_logger("test_rate_limit.close", closing)
+    for _ in range(5):
+        logger.warning("Deck read failed")
+    closing.close()
+    assert [r.getMessage() for r in handler.records][-1] == "Deck read failed (repeated 4 times in 60s)"
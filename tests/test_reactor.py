@@ -0,0 +1,111 @@
+"""
+test_reactor.py — Tests for the controller's asyncio reactor.
+
+1. Events posted from other threads are handled in arrival order
+2. Blocking work runs in the pool, not on the loop
+3. Timers repeat, and stop() cancels them and returns cleanly
+4. A watched fd (like the udev socket) wakes the loop
+"""
+
+import os
+import threading
+
+from src.controller.reactor import Reactor
+
+
+def run_in_thread(reactor: Reactor, setup=None) -> threading.Thread:
+    thread = threading.Thread(target=reactor.run, args=(setup,), daemon=True)
+    thread.start()
+    assert reactor.wait_ready(2.0)
+    return thread
+
+
+# ── Test 1: Ordered dispatch, sync and async handlers ──
+
+def test_events_dispatched_in_order():
+    reactor = Reactor()
+    seen = []
+    done = threading.Event()
+
+    async def async_handler(n):
+        seen.append(("async", n))
+        if n == 99:
+            done.set()
+
+    reactor.on("tick", lambda n: seen.append(("sync", n)))
+    reactor.on("tick", async_handler)
+    thread = run_in_thread(reactor)
+
+    for n in range(100):
+        reactor.post("tick", n)
+    assert done.wait(2.0)
+    reactor.stop()
+    thread.join(2.0)
+
+    assert [n for kind, n in seen if kind == "sync"] == list(range(100))
+    assert reactor.dispatched == 100
+    assert len(reactor.dispatch_latency_ms) == 100
+
+
+# ── Test 2: Blocking work leaves the loop thread ──
+
+def test_run_blocking_uses_pool():
+    reactor = Reactor()
+    threads = {}
+
+    async def setup():
+        threads["loop"] = threading.get_ident()
+        threads["worker"] = await reactor.run_blocking(threading.get_ident)
+        reactor.stop()
+
+    reactor.run(setup())
+    assert threads["worker"] != threads["loop"]
+
+
+# ── Test 3: Timers and clean cancellation ──
+
+def test_timer_repeats_and_stop_cancels():
+    reactor = Reactor()
+    ticks = []
+    three = threading.Event()
+
+    def tick():
+        ticks.append(1)
+        if len(ticks) == 3:
+            three.set()
+
+    async def setup():
+        reactor.every(0.01, tick, name="tick")
+
+    thread = run_in_thread(reactor, setup())
+    assert three.wait(2.0)
+    reactor.stop()
+    thread.join(2.0)
+
+    assert not thread.is_alive()
+    count = len(ticks)
+    threading.Event().wait(0.05)
+    assert len(ticks) == count        # nothing runs after stop()
+
+
+# ── Test 4: fd readiness ──
+
+def test_add_reader_wakes_loop():
+    reactor = Reactor()
+    read_fd, write_fd = os.pipe()
+    got = threading.Event()
+
+    def on_readable():
+        os.read(read_fd, 1)
+        got.set()
+
+    async def setup():
+        reactor.add_reader(read_fd, on_readable)
+
+    thread = run_in_thread(reactor, setup())
+    os.write(write_fd, b"x")
+    assert got.wait(2.0)
+    reactor.stop()
+    thread.join(2.0)
+    os.close(read_fd)
+    os.close(write_fd)
@@ -0,0 +1,47 @@
+"""
+test_render_memory.py — Tests for the render path memory harness (bench_render_memory.py).
+
+1. Fast-path key updates keep no memory (a short run of the real renderer)
+2. Slow-path key updates (draw + library conversion) keep no memory either
+3. The harness does catch a leak, and names where it was allocated
+"""
+
+from bench_render_memory import measure, run_fast, run_slow
+
+
+# ── Test 1: Fast path ──
+
+def test_fast_path_does_not_grow(tmp_path):
+    report = run_fast(20000, tmp_path, interval=2000)
+    assert report.updates == 20000
+    assert len(report.samples) == 11
+    assert report.growth_bytes < 64 * 1024
+    assert report.bytes_per_update < 1.0
+
+
+# ── Test 2: Slow path ──
+
+def test_slow_path_does_not_grow(tmp_path):
+    report = run_slow(200, tmp_path, interval=50)
+    assert report.growth_bytes < 256 * 1024
+    assert not (tmp_path / "Temporary.jpg").exists()
+
+
+# ── Test 3: A leak is caught ──
+
+_kept = []
+
+
+def _leaky_paint(n):
+    _kept.append(bytearray(100))
+
+
+def test_leak_is_reported():
+    try:
+        report = measure("leaky", _leaky_paint, 5000, warmup=10)
+    finally:
+        _kept.clear()
+    assert report.growth_bytes > 5000 * 100
+    assert report.bytes_per_update > 100
+    assert "test_render_memory.py" in report.top_sites[0]
+    assert "retained growth" in report.format()
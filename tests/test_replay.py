@@ -0,0 +1,159 @@
+"""
+test_replay.py — Tests for recording and replaying controller inputs.
+
+1. The fake deck is painted through the renderer and plays key presses
+2. A recorded session replays to the same deck and state
+3. Replays are deterministic: taps and holds are judged on recorded time, at any speed
+4. A recorded SAFE_MODE switches talk off; a different ending is reported
+5. The report has per-stage latencies, including key press → USB write
+"""
+
+import json
+
+from src.config_sync.store import ChannelConfig, StationConfig, config_to_dict
+from src.controller import MainController
+from src.controller.recorder import InputRecorder
+from src.controller.replay import ReplayHarness, ReplayHealthChecker, load_recording
+from src.hardware_manager.fake import FakeHardwareManager, FakeUdevDevice
+from src.hardware_manager.system import SystemMetrics
+from src.shared.enums import AgentState, TalkMode
+from src.ui_renderer.fake_device import FakeDeck
+from src.ui_renderer.renderer import MiraBoxRenderer
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+
+CONFIG = StationConfig(1, {
+    "director": ChannelConfig("director", "Director", 1, TalkMode.PTT),
+    "producer": ChannelConfig("producer", "Producer", 2, TalkMode.AUTO),
+})
+
+
+def write_recording(path, inputs, end=None, state="LIVE"):
+    lines = [{"kind": "start", "state": state, "health_state": state,
+              "config": config_to_dict(CONFIG), "talk_states": {}}]
+    lines += inputs
+    if end is not None:
+        lines.append({"t": inputs[-1]["t"] if inputs else 0.0, "kind": "end", **end})
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    return path
+
+
+def key(t, index, pressed):
+    return {"t": t, "kind": "key", "key": index, "pressed": pressed}
+
+
+# ── Test 1: Fake deck ──
+
+def test_fake_deck_records_writes_and_plays_keys():
+    deck = FakeDeck()
+    renderer = MiraBoxRenderer(device=deck)
+    renderer.update(MiraBoxViewModel(True, [ChannelView(3, "Director", ButtonColor.RED, None)]))
+    assert [w.key for w in deck.transport.writes] == [3]
+    assert renderer.key_cache.look_for(deck.transport.last_image(3)) == ("Director", ButtonColor.RED)
+
+    seen = []
+    renderer.set_key_callback(lambda device, k, pressed: seen.append((k, pressed)))
+    deck.press(3)
+    deck.release(3)
+    assert seen == [(3, 1), (3, 0)]
+
+
+# ── Test 2: Record, then replay ──
+
+def test_recorded_session_replays_the_same(tmp_path):
+    live_dir, replay_dir = tmp_path / "live", tmp_path / "replay"
+    live_dir.mkdir()
+    replay_dir.mkdir()
+
+    # A "live" session on fake hardware, recorded
+    from src.config_sync.store import ConfigStore
+    ConfigStore(live_dir).replace(CONFIG)
+    deck, hardware = FakeDeck(), FakeHardwareManager()
+    recorder = InputRecorder(tmp_path / "show.jsonl")
+    controller = MainController(hardware_manager=hardware, renderer=MiraBoxRenderer(device=deck),
+                                health_checker=ReplayHealthChecker(AgentState.LIVE), recorder=recorder)
+    controller.config_cache_dir = live_dir
+    controller._fingerprint = "fp"
+    controller.machine.transition(AgentState.DISCOVERING_HW)
+    controller.start_services()
+    recorder.begin(controller.state, AgentState.LIVE, controller.config_store.config, {})
+    controller.renderer.set_key_callback(controller._on_key)
+
+    deck.press(2)                                         # AUTO tap: latched
+    deck.release(2)
+    deck.press(1)                                         # PTT held
+    hardware.emit_usb(FakeUdevDevice("add", "sound", "card2"))
+    hardware.feed_metrics(SystemMetrics(12.0, 30.0, 40.0, temperature_c=51.0))
+    controller.stop()
+
+    header, inputs, end = load_recording(tmp_path / "show.jsonl")
+    assert [e["kind"] for e in inputs] == ["key", "key", "key", "udev", "metrics"]
+    assert end["keys"] == {"1": ["Director", "RED"], "2": ["Producer", "RED"]}
+
+    report = ReplayHarness(tmp_path / "show.jsonl", replay_dir, speed=None).run()
+    assert report.mismatches == []
+    assert report.keys == {1: ("Director", "RED"), 2: ("Producer", "RED")}
+
+
+# ── Test 3: Deterministic at any speed ──
+
+def test_replay_is_deterministic_across_speeds(tmp_path):
+    inputs = [
+        key(0.10, 2, True), key(0.20, 2, False),          # 100 ms tap: AUTO latches on
+        key(0.30, 1, True), key(0.305, 1, False),         # 5 ms tap: the release still counts
+        key(0.50, 1, True), key(0.505, 1, False), key(0.51, 1, True),   # bounce: still held
+        key(0.60, 2, True), key(0.70, 2, False),          # tap while latched: off
+        key(0.80, 2, True), key(1.40, 2, False),          # 600 ms hold: push-to-talk, off again
+        key(1.50, 2, True), key(1.55, 2, False),          # tap: latched on
+    ]
+    path = write_recording(tmp_path / "taps.jsonl", inputs)
+
+    results = []
+    for n, speed in enumerate((None, 10.0)):
+        cache = tmp_path / f"cache{n}"
+        cache.mkdir()
+        report = ReplayHarness(path, cache, speed=speed).run()
+        results.append(report.keys)
+    assert results[0] == results[1] == {1: ("Director", "RED"), 2: ("Producer", "RED")}
+
+
+# ── Test 4: Recorded health decisions ──
+
+def test_safe_mode_from_recording_and_mismatch_report(tmp_path):
+    inputs = [
+        key(0.1, 1, True),
+        {"t": 0.2, "kind": "udev", "action": "remove", "subsystem": "sound", "sys_name": "card1"},
+        {"t": 0.3, "kind": "health", "state": "SAFE_MODE", "reason": "headset_mic failed"},
+    ]
+    end = {"state": "LIVE", "keys": {"1": ["Director", "RED"]}}      # not what will happen
+    path = write_recording(tmp_path / "unplug.jsonl", inputs, end=end)
+    report = ReplayHarness(path, tmp_path, speed=None).run()
+
+    assert report.final_state == AgentState.SAFE_MODE
+    assert report.keys[1] == ("OFFLINE", "BLACK")
+    assert "state: recorded LIVE, replayed SAFE_MODE" in report.mismatches
+    assert any(m.startswith("key 1:") for m in report.mismatches)
+
+
+# ── Test 5: Stage latencies ──
+
+def test_report_has_stage_latencies(tmp_path):
+    new_config = config_to_dict(StationConfig(2, {
+        "director": ChannelConfig("director", "Dir", 1, TalkMode.LATCH),
+    }))
+    inputs = [
+        key(0.1, 1, True), key(0.2, 1, False),            # PTT on, off: two writes
+        {"t": 0.3, "kind": "metrics", "cpu_percent": 99.0, "memory_percent": 50.0,
+         "disk_percent": 10.0, "temperature_c": 85.0, "throttled_flags": 0},
+        {"t": 0.4, "kind": "config", "config": new_config},
+        key(0.5, 1, True),                                # LATCH on
+    ]
+    path = write_recording(tmp_path / "stages.jsonl", inputs)
+    report = ReplayHarness(path, tmp_path, speed=None).run()
+
+    summary = report.stage_summary()
+    assert summary["key"]["count"] == 3
+    assert summary["key_to_write"]["count"] == 3
+    assert summary["config"]["count"] == 1 and summary["metrics"]["count"] == 1
+    # Blanking the removed key 2 is not urgent: shed under CRITICAL pressure
+    assert report.keys == {1: ("Dir", "RED"), 2: ("Producer", "GREY")}
+    assert "key_to_write" in report.format()
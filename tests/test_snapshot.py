@@ -0,0 +1,91 @@
+"""
+test_snapshot.py — Tests for the crash-restart snapshot.
+
+1. The writer only writes changes, at most once per interval
+2. Old snapshots are not trusted
+3. The recovering view is greyed out (no RED keys)
+4. A matching snapshot repaints the deck before bootstrap
+"""
+
+import time
+from unittest.mock import patch
+
+from src.controller import MainController
+from src.controller.snapshot import (
+    AgentSnapshot,
+    SnapshotWriter,
+    load_snapshot,
+    recovering_view,
+)
+from src.shared.enums import AgentState
+from src.ui_renderer.view_model import ButtonColor, ChannelView, MiraBoxViewModel
+
+
+def make_snapshot(color: ButtonColor = ButtonColor.RED, saved_at: float | None = None) -> AgentSnapshot:
+    return AgentSnapshot(
+        state=AgentState.LIVE,
+        view_model=MiraBoxViewModel(True, [
+            ChannelView(1, "Director", color, None),
+            ChannelView(2, "Producer", ButtonColor.GREY, None),
+        ]),
+        talk_states={"director": True},
+        fingerprint="fp",
+        saved_at=time.time() if saved_at is None else saved_at,
+    )
+
+
+# ── Test 1: Change-only, rate-limited writes ──
+
+def test_writer_rate_limits_and_skips_unchanged(tmp_path):
+    writer = SnapshotWriter(tmp_path, min_interval=60)
+    writer.update(make_snapshot())
+    writer.update(make_snapshot())                      # unchanged: ignored
+    assert writer.writes == 1
+
+    writer.update(make_snapshot(ButtonColor.GREY))      # changed, but too soon
+    assert writer.writes == 1
+    writer.close()                                      # pending change written
+    assert writer.writes == 2
+    assert load_snapshot(tmp_path).view_model.channels[0].color == ButtonColor.GREY
+
+
+# ── Test 2: Stale snapshots are ignored ──
+
+def test_old_snapshot_ignored(tmp_path):
+    writer = SnapshotWriter(tmp_path, min_interval=0)
+    writer.update(make_snapshot(saved_at=time.time() - 3600))
+    assert load_snapshot(tmp_path, max_age=300) is None
+    assert load_snapshot(tmp_path, max_age=7200) is not None
+
+
+# ── Test 3: Recovering view ──
+
+def test_recovering_view_is_greyed():
+    view = recovering_view(make_snapshot().view_model)
+    assert [c.label for c in view.channels] == ["Director", "Producer"]
+    assert all(c.color == ButtonColor.GREY for c in view.channels)
+    assert view.is_online is False
+
+
+# ── Test 4: Fast restart paints before bootstrap ──
+
+@patch("src.controller.MiraBoxRenderer")
+@patch("src.controller.hardware_fingerprint", return_value="fp")
+def test_controller_resumes_from_snapshot(mock_fingerprint, mock_renderer, tmp_path):
+    SnapshotWriter(tmp_path, min_interval=0).update(make_snapshot())
+
+    controller = MainController()
+    controller.config_cache_dir = tmp_path
+    started = time.monotonic()
+    assert controller._resume_from_snapshot() is True
+    assert time.monotonic() - started < 1.0
+
+    painted = mock_renderer.return_value.update.call_args[0][0]
+    assert painted.channels[0].color == ButtonColor.GREY
+    assert controller.talk_states == {"director": True}
+
+    # Different hardware: no resume
+    mock_fingerprint.return_value = "other"
+    controller = MainController()
+    controller.config_cache_dir = tmp_path
+    assert controller._resume_from_snapshot() is False
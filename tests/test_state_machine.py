@@ -0,0 +1,150 @@
+"""
+test_state_machine.py — Tests for the AgentState machine.
+
+1. Allowed moves change the state and are counted; "moving" to the same state does nothing
+2. A move that is not in the table raises and leaves the state alone
+3. Time spent in each state is recorded
+4. Sync listeners run on the moving thread, async ones on their loop
+5. SAFE_MODE forces talk off and paints the deck OFFLINE
+6. A health decision before the first station config waits for the config
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config_sync.store import ChannelConfig, ConfigStore, StationConfig
+from src.controller import MainController
+from src.controller.state_machine import StateMachine
+from src.shared.enums import AgentState, TalkMode
+from src.shared.errors import StateTransitionError
+
+
+# ── Test 1: Allowed moves ──
+
+def test_allowed_transitions_are_counted():
+    machine = StateMachine()
+
+    assert machine.transition(AgentState.DISCOVERING_HW, "bootstrap passed")
+    assert machine.transition(AgentState.LIVE)
+    assert machine.transition(AgentState.SAFE_MODE)
+    assert machine.transition(AgentState.LIVE)
+    assert machine.transition(AgentState.SAFE_MODE)
+    assert not machine.transition(AgentState.SAFE_MODE)   # already there
+
+    assert machine.state == AgentState.SAFE_MODE
+    assert machine.transition_counts[(AgentState.LIVE, AgentState.SAFE_MODE)] == 2
+    assert machine.metrics()["transitions"]["SAFE_MODE->LIVE"] == 1
+
+
+# ── Test 2: Forbidden moves ──
+
+def test_invalid_transition_raises():
+    machine = StateMachine()
+    with pytest.raises(StateTransitionError):
+        machine.transition(AgentState.LIVE)      # must discover hardware first
+    assert machine.state == AgentState.BOOTING
+    assert not machine.can_transition(AgentState.LIVE)
+
+    machine.transition(AgentState.DISCOVERING_HW)
+    with pytest.raises(StateTransitionError):
+        machine.transition(AgentState.BOOTING)   # boot never starts over
+    assert machine.transition_counts == {(AgentState.BOOTING, AgentState.DISCOVERING_HW): 1}
+
+
+# ── Test 3: Time in state ──
+
+def test_time_in_state():
+    fake_time = MagicMock()
+    fake_time.monotonic.side_effect = [100.0, 101.5, 104.5, 110.0]
+    with patch("src.controller.state_machine.time", fake_time):
+        machine = StateMachine()                        # enters BOOTING at 100.0
+        machine.transition(AgentState.DISCOVERING_HW)   # 101.5
+        machine.transition(AgentState.READY)            # 104.5
+        seconds = machine.time_in_state()               # now = 110.0
+
+    assert seconds == {
+        AgentState.BOOTING: 1.5,
+        AgentState.DISCOVERING_HW: 3.0,
+        AgentState.READY: 5.5,
+    }
+
+
+# ── Test 4: Listeners ──
+
+def test_sync_and_async_listeners():
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+
+    machine = StateMachine()
+    sync_seen, async_seen = [], []
+    async_done = threading.Event()
+
+    machine.subscribe(lambda t: sync_seen.append((t.to_state, threading.get_ident())))
+
+    async def on_async(t):
+        async_seen.append((t.to_state, threading.get_ident()))
+        async_done.set()
+
+    machine.subscribe_async(on_async, loop)
+    machine.subscribe(lambda t: 1 / 0)   # a broken listener must not stop the others
+
+    machine.transition(AgentState.DISCOVERING_HW, "test")
+    assert async_done.wait(2.0)
+    loop.call_soon_threadsafe(loop.stop)
+    loop_thread.join(2.0)
+    loop.close()
+
+    assert sync_seen == [(AgentState.DISCOVERING_HW, threading.get_ident())]
+    assert async_seen == [(AgentState.DISCOVERING_HW, loop_thread.ident)]
+
+
+# ── Test 5: SAFE_MODE forces talk off and paints OFFLINE ──
+
+def test_safe_mode_forces_talk_off_and_paints_offline(tmp_path):
+    controller = MainController()
+    controller.config_store = ConfigStore(tmp_path)
+    controller.config_store.replace(StationConfig(1, {
+        "producer": ChannelConfig("producer", "Producer", 1, TalkMode.LATCH),
+    }))
+    controller.renderer = MagicMock()
+    controller.renderer.match = None
+    controller._snapshot_writer = MagicMock()
+    controller._fingerprint = "fp"
+    controller.machine.transition(AgentState.DISCOVERING_HW)
+    controller.machine.transition(AgentState.LIVE)
+    controller.talk_engine.restore({"producer": True})
+
+    controller._on_health_state(AgentState.SAFE_MODE, "mic unplugged")
+
+    assert controller.state == AgentState.SAFE_MODE
+    assert controller.talk_states == {}
+    painted = controller.renderer.update.call_args[0][0]
+    assert painted.is_online is False
+    assert painted.channels[0].label == "OFFLINE"
+
+
+# ── Test 6: Health decisions wait for the station config ──
+
+def test_health_state_waits_for_first_config(tmp_path):
+    controller = MainController()
+    controller.config_store = ConfigStore(tmp_path)
+    controller.health_checker = MagicMock(state=AgentState.LIVE)
+    controller.machine.transition(AgentState.DISCOVERING_HW)
+    controller.machine.transition(AgentState.SYNCING_CONFIG)
+
+    controller._on_health_state(AgentState.LIVE, "all checks pass")
+    assert controller.state == AgentState.SYNCING_CONFIG
+    assert controller.talk_engine.allowed is False
+
+    config = StationConfig(1, {"producer": ChannelConfig("producer", "Producer", 1, TalkMode.LATCH)})
+    controller._on_config_synced(config)
+    assert controller.state == AgentState.LIVE
+    assert controller.talk_engine.allowed is True
+
+    # Once running, health decisions apply right away
+    controller._on_health_state(AgentState.DEGRADED, "phone audio lost")
+    assert controller.state == AgentState.DEGRADED
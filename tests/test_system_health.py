@@ -0,0 +1,70 @@
+"""
+test_system_health.py — Tests for the state-change-only health monitor.
+
+We feed synthetic metric samples (no real CPU load needed) and check that:
+1. Steady normal load produces no transitions
+2. Crossing the warn threshold flips to HIGH exactly once
+3. Hysteresis: HIGH only clears below the lower "clear" threshold
+4. A rollup is written once per rollup_interval
+"""
+
+from unittest.mock import patch
+
+from src.hardware_manager.system import HealthConfig, HealthMonitor, SystemMetrics
+from src.shared.enums import ResourceState
+
+
+def sample(cpu: float, mem: float = 40.0, disk: float = 50.0) -> SystemMetrics:
+    return SystemMetrics(cpu, mem, disk)
+
+
+# ── Test 1: Normal load → nothing to report ──
+
+def test_steady_load_has_no_transitions():
+    monitor = HealthMonitor(HealthConfig())
+
+    for t in range(100):
+        assert monitor.observe(sample(20.0), now=float(t)) == []
+
+    assert monitor.transitions == 0
+    assert monitor.states["cpu"] == ResourceState.OK
+
+
+# ── Test 2: High load warns once, not every sample ──
+
+def test_high_load_warns_once():
+    monitor = HealthMonitor(HealthConfig(cpu_warn=80.0, cpu_clear=70.0))
+
+    changes = [monitor.observe(sample(95.0), now=float(t)) for t in range(10)]
+
+    assert changes[0] == [("cpu", ResourceState.HIGH)]
+    assert all(c == [] for c in changes[1:])
+    assert monitor.transitions == 1
+
+
+# ── Test 3: Hysteresis stops flapping around the threshold ──
+
+def test_hysteresis_prevents_flapping():
+    monitor = HealthMonitor(HealthConfig(cpu_warn=80.0, cpu_clear=70.0))
+
+    monitor.observe(sample(85.0), now=0.0)   # → HIGH
+    monitor.observe(sample(78.0), now=1.0)   # below warn, above clear → still HIGH
+    monitor.observe(sample(82.0), now=2.0)   # still HIGH, no new warning
+    assert monitor.states["cpu"] == ResourceState.HIGH
+    assert monitor.transitions == 1
+
+    assert monitor.observe(sample(65.0), now=3.0) == [("cpu", ResourceState.OK)]
+    assert monitor.transitions == 2
+
+
+# ── Test 4: Rollups are periodic ──
+
+def test_rollup_once_per_interval():
+    monitor = HealthMonitor(HealthConfig(rollup_interval=60.0))
+
+    with patch.object(monitor, "log_rollup", wraps=monitor.log_rollup) as rollup:
+        for t in range(0, 185, 5):
+            monitor.observe(sample(30.0), now=float(t))
+
+    # t = 60, 120, 180
+    assert rollup.call_count == 3
@@ -0,0 +1,285 @@
+"""
+test_talk_engine.py — Tests for the talk engine and the key image fast path.
+
+1. PTT talks while held; the key is painted red and the latency recorded
+2. LATCH toggles on each press
+3. AUTO: a quick tap latches, a long hold is push-to-talk
+4. Switch bounce and repeated events are ignored
+5. Leaving LIVE / DEGRADED (for SAFE_MODE or any other state) forces talk off
+6. Key images are encoded once and sent natively to the mapped key
+7. Debounce never loses the release of an accepted press
+8. Channels restored from a crash snapshot survive boot, but not a boot that ends in READY
+9. Reading talk states while keys and force-offs change them from other threads
+10. On a StreamDock N4, keys 11-14 get second-screen images
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.config_sync.store import ChannelConfig
+from src.controller.state_machine import Transition
+from src.shared.enums import AgentState, TalkMode
+from src.talk_engine import TalkEngine
+from src.ui_renderer.key_cache import SECOND_SCREEN, KeyImageCache, native_screen, write_native_key
+from src.ui_renderer.view_model import ButtonColor
+
+CHANNELS = {
+    1: ChannelConfig("director", "Director", 1, TalkMode.PTT),
+    2: ChannelConfig("producer", "Producer", 2, TalkMode.LATCH),
+    3: ChannelConfig("camera", "Camera", 3, TalkMode.AUTO),
+}
+
+
+def make_engine(**kwargs) -> tuple[TalkEngine, list]:
+    painted = []
+    engine = TalkEngine(CHANNELS.get, paint_key=lambda c, on: painted.append((c.key, on)), **kwargs)
+    engine.allowed = True
+    return engine, painted
+
+
+def move(to_state: AgentState, from_state: AgentState = AgentState.LIVE) -> Transition:
+    return Transition(from_state, to_state, "test", 0.0)
+
+
+# ── Test 1: Push-to-talk ──
+
+def test_ptt_talks_while_held():
+    changes = []
+    engine, painted = make_engine(on_change=lambda cid, on: changes.append((cid, on)))
+
+    assert engine.handle_key(1, True, at=10.0)
+    assert engine.talk_states == {"director": True}
+    assert engine.handle_key(1, False, at=10.5)
+    assert engine.talk_states == {}
+
+    assert painted == [(1, True), (1, False)]
+    assert changes == [("director", True), ("director", False)]
+    assert len(engine.latencies_ms) == 1            # only talk-on is timed
+    assert not engine.handle_key(9, True, at=11.0)  # no channel on key 9
+
+
+# ── Test 2: Latch ──
+
+def test_latch_toggles_on_press():
+    engine, _ = make_engine()
+    engine.handle_key(2, True, at=1.0)
+    engine.handle_key(2, False, at=1.1)
+    assert engine.is_talking("producer")
+    engine.handle_key(2, True, at=2.0)
+    engine.handle_key(2, False, at=2.1)
+    assert not engine.is_talking("producer")
+
+
+# ── Test 3: Auto (tap = latch, hold = push-to-talk) ──
+
+def test_auto_mode_tap_and_hold():
+    engine, _ = make_engine(hold_threshold=0.35)
+
+    engine.handle_key(3, True, at=1.0)
+    engine.handle_key(3, False, at=1.1)      # quick tap: stays on
+    assert engine.is_talking("camera")
+    engine.handle_key(3, True, at=2.0)       # tap while latched: off
+    assert not engine.is_talking("camera")
+    engine.handle_key(3, False, at=2.1)
+    assert not engine.is_talking("camera")
+
+    engine.handle_key(3, True, at=3.0)
+    assert engine.is_talking("camera")       # on right away, even for a hold
+    engine.handle_key(3, False, at=4.0)      # long hold: off on release
+    assert not engine.is_talking("camera")
+
+
+# ── Test 4: Debounce ──
+
+def test_bounce_and_repeats_ignored():
+    engine, painted = make_engine(debounce=0.02)
+    engine.handle_key(1, True, at=1.000)
+    engine.handle_key(1, True, at=1.001)      # repeat
+    engine.handle_key(1, False, at=1.005)     # bounce
+    engine.handle_key(1, True, at=1.008)      # repeat again (still "down")
+
+    assert engine.is_talking("director")
+    assert painted == [(1, True)]
+    assert engine.debounced == 1
+
+
+# ── Test 5: Safety ──
+
+def test_leaving_live_forces_talk_off():
+    changes = []
+    engine, _ = make_engine(on_change=lambda cid, on: changes.append((cid, on)))
+    engine.handle_key(2, True, at=1.0)
+    engine.handle_key(2, False, at=1.1)
+    engine.handle_key(3, True, at=1.2)                  # AUTO tap: latched
+    engine.handle_key(3, False, at=1.3)
+
+    engine.on_transition(move(AgentState.DEGRADED))     # may still talk
+    assert engine.talk_states == {"producer": True, "camera": True}
+
+    engine.on_transition(move(AgentState.READY, AgentState.DEGRADED))
+    assert engine.talk_states == {}
+    assert sorted(changes[-2:]) == [("camera", False), ("producer", False)]
+    assert not engine.handle_key(1, True, at=2.0)
+
+    engine.on_transition(move(AgentState.LIVE, AgentState.READY))
+    engine.handle_key(2, True, at=3.0)
+    engine.handle_key(2, False, at=3.1)
+    engine.on_transition(move(AgentState.SAFE_MODE))
+    assert engine.talk_states == {}
+    assert changes[-1] == ("producer", False)
+    assert not engine.handle_key(2, True, at=4.0)
+    engine.handle_key(2, False, at=4.1)
+
+    engine.on_transition(move(AgentState.LIVE, AgentState.SAFE_MODE))
+    assert engine.talk_states == {}                     # nothing comes back by itself
+    assert engine.handle_key(2, True, at=5.0)
+
+
+# ── Test 6: Native key images ──
+
+class StreamDock293:
+    """Stand-in with the same class name (and key mapping) as the real deck."""
+    def __init__(self):
+        self.transport = MagicMock()
+
+    def key(self, k):
+        return {1: 11, 11: 1}.get(k, k)
+
+    def key_image_format(self):
+        return {"size": (100, 100), "format": "JPEG", "rotation": 180, "flip": (False, False)}
+
+
+def test_key_images_cached_and_sent_natively(tmp_path):
+    device = StreamDock293()
+    cache = KeyImageCache(tmp_path)
+    cache.prewarm(device, ["Director"])
+    assert cache.misses == 3                  # OFFLINE + Director grey/red
+
+    path = cache.native_path(device, "Director", ButtonColor.RED)
+    assert cache.misses == 3 and cache.hits == 1
+    assert (tmp_path / path.decode().rsplit("/", 1)[1]).exists()
+
+    write_native_key(device, 1, path)
+    device.transport.setKeyImg.assert_called_once_with(path, 11)
+
+
+# ── Test 7: A quick tap's release is never lost ──
+
+def test_release_of_quick_tap_is_not_dropped():
+    engine, painted = make_engine(debounce=0.02)
+
+    # 5 ms PTT tap, nothing after it: the timer applies the release
+    engine.handle_key(1, True, at=1.000)
+    engine.handle_key(1, False, at=1.005)
+    assert engine.is_talking("director")                # waiting out the debounce time
+    deadline = time.monotonic() + 1.0
+    while engine.is_talking("director") and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert not engine.is_talking("director")
+    assert painted == [(1, True), (1, False)]
+
+    # A later event (any key) applies it too, on the events' own time
+    engine.handle_key(1, True, at=10.000)
+    engine.handle_key(1, False, at=10.005)
+    engine.handle_key(2, True, at=10.100)
+    assert not engine.is_talking("director")
+
+    # Bounce: a press within the debounce time cancels the release
+    engine.handle_key(1, True, at=20.000)
+    engine.handle_key(1, False, at=20.005)
+    engine.handle_key(1, True, at=20.010)
+    time.sleep(0.05)
+    assert engine.is_talking("director")
+    engine.handle_key(1, False, at=21.0)
+    assert not engine.is_talking("director")
+
+
+# ── Test 8: Restored channels and boot ──
+
+def test_restored_channels_kept_while_booting_only():
+    engine = TalkEngine(CHANNELS.get)
+    engine.restore({"producer": True})
+    engine.on_transition(move(AgentState.DISCOVERING_HW, AgentState.BOOTING))
+    engine.on_transition(move(AgentState.SYNCING_CONFIG, AgentState.DISCOVERING_HW))
+    assert engine.talk_states == {"producer": True}
+    assert not engine.allowed
+
+    engine.on_transition(move(AgentState.READY, AgentState.SYNCING_CONFIG))
+    assert engine.talk_states == {}
+
+
+# ── Test 9: Reading talk states from other threads ──
+
+def test_talk_states_read_while_changing():
+    channels = {key: ChannelConfig(f"ch-{key}", f"Ch {key}", key, TalkMode.LATCH) for key in range(1, 65)}
+    engine = TalkEngine(channels.get, debounce=0.0)
+    engine.allowed = True
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        try:
+            while not stop.is_set():
+                states = engine.talk_states
+                assert all(states.values())
+                engine.is_talking("ch-1")
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    at = 0.0
+    try:
+        for _ in range(20):
+            for key in channels:                 # latch every channel on...
+                at += 1.0
+                engine.handle_key(key, True, at=at)
+                engine.handle_key(key, False, at=at + 0.5)
+            engine.force_off("test")             # ...then all off at once
+            engine.allowed = True
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join(2.0)
+
+    assert errors == []
+    assert engine.talk_states == {}
+
+
+# ── Test 10: StreamDock N4 second screen ──
+
+class StreamDockN4:
+    """Stand-in with the N4's class name: keys 11-14 are on a 176x112 second screen."""
+    def __init__(self):
+        self.transport = MagicMock()
+
+    def key(self, k):
+        return k + 100
+
+    def key_image_format(self):
+        return {"size": (112, 112), "format": "JPEG", "rotation": 180, "flip": (False, False)}
+
+    def secondscreen_image_format(self):
+        return {"size": (176, 112), "format": "JPEG", "rotation": 180, "flip": (False, False)}
+
+
+def test_n4_second_screen_keys(tmp_path):
+    from PIL import Image
+
+    device = StreamDockN4()
+    cache = KeyImageCache(tmp_path)
+    cache.prewarm(device, ["Director"])
+    assert cache.misses == 6                  # OFFLINE + Director grey/red, on both screens
+
+    assert native_screen(device, 10) != SECOND_SCREEN
+    assert [native_screen(device, k) for k in (11, 14)] == [SECOND_SCREEN, SECOND_SCREEN]
+    key_path = cache.native_path(device, "Director", ButtonColor.RED, native_screen(device, 3))
+    second_path = cache.native_path(device, "Director", ButtonColor.RED, native_screen(device, 12))
+    assert cache.misses == 6
+    assert Image.open(key_path.decode()).size == (112, 112)
+    assert Image.open(second_path.decode()).size == (176, 112)
+
+    write_native_key(device, 12, second_path)
+    device.transport.setKeyImgDualDevice.assert_called_once_with(second_path, 112)
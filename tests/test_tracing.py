@@ -0,0 +1,112 @@
+"""
+test_tracing.py — Tests for tracing spans.
+
+1. Spans record name, thread, nanosecond times and args
+2. While disabled nothing is recorded
+3. Each thread has its own ring buffer that keeps only the newest spans
+4. The Chrome trace file has one complete event per span, plus thread names
+5. Boot profiler phases show up as spans too
+"""
+
+import json
+import threading
+import time
+
+from src.loggingx.boot_profiler import BootProfiler
+from src.loggingx.tracing import Tracer, get_tracer
+
+
+# ── Test 1: Spans ──
+
+def test_span_records_timing_and_thread():
+    tracer = Tracer()
+    tracer.enable()
+
+    @tracer.traced("transport.write")
+    def write():
+        time.sleep(0.002)
+
+    with tracer.span("render.encode", key=3):
+        write()
+
+    spans = tracer.spans()
+    assert [s["name"] for s in spans] == ["render.encode", "transport.write"]
+    encode, transport = spans
+    assert encode["args"] == {"key": 3}
+    assert encode["tid"] == threading.get_native_id()
+    assert encode["start_ns"] <= transport["start_ns"] < transport["end_ns"] <= encode["end_ns"]
+    assert transport["end_ns"] - transport["start_ns"] >= 2_000_000
+
+
+# ── Test 2: Disabled ──
+
+def test_disabled_records_nothing():
+    tracer = Tracer()
+
+    @tracer.traced()
+    def draw():
+        return 42
+
+    with tracer.span("render.draw"):
+        assert draw() == 42
+    tracer.add("bootstrap", 0, 10)
+    assert tracer.spans() == []
+
+
+# ── Test 3: Per-thread ring buffers ──
+
+def test_per_thread_ring_buffers():
+    tracer = Tracer(buffer_size=10)
+    tracer.enable()
+
+    def work(prefix):
+        for n in range(25):
+            with tracer.span(f"{prefix}.{n}"):
+                pass
+
+    threads = [threading.Thread(target=work, args=(f"t{i}",), name=f"Worker{i}") for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    spans = tracer.spans()
+    assert len(spans) == 30                                  # 10 newest per thread
+    for i in range(3):
+        names = [s["name"] for s in spans if s["thread"] == f"Worker{i}"]
+        assert names == [f"t{i}.{n}" for n in range(15, 25)]
+
+
+# ── Test 4: Chrome trace export ──
+
+def test_chrome_trace_dump(tmp_path):
+    tracer = Tracer()
+    tracer.enable()
+    with tracer.span("render.draw", label="Director"):
+        pass
+    path = tracer.dump(tmp_path / "trace.json")
+
+    trace = json.loads(path.read_text())
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    meta = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert len(complete) == 1
+    assert complete[0]["name"] == "render.draw" and complete[0]["cat"] == "render"
+    assert complete[0]["args"] == {"label": "Director"} and complete[0]["dur"] >= 0
+    assert meta[0]["args"]["name"] == threading.current_thread().name
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+# ── Test 5: Boot phases ──
+
+def test_boot_phases_are_traced():
+    tracer = get_tracer()
+    tracer.clear()
+    tracer.enable()
+    try:
+        profiler = BootProfiler()
+        with profiler.phase("bootstrap.identity"):
+            pass
+    finally:
+        tracer.disable()
+    assert [s["name"] for s in tracer.spans()] == ["bootstrap.identity"]
+    tracer.clear()